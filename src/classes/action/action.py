@@ -61,6 +61,14 @@ class Action(ABC):
     # 是否允许触发世界随机事件（如奇遇、霉运）
     ALLOW_WORLD_EVENTS: bool | None = None
 
+    # 同月并发执行时额外占用的共享范围："region" 为所在区域，"sect" 为所属宗门。
+    # 占用同一范围的角色会按原顺序串行执行，见 src/sim/simulator_engine/action_scheduler.py
+    CONFLICT_SCOPES: tuple[str, ...] = ()
+
+    # 会指向其他角色 / 地点的参数名，用于推断并发冲突
+    CONFLICT_AVATAR_PARAMS: tuple[str, ...] = ("target_avatar", "avatar_name")
+    CONFLICT_POI_PARAMS: tuple[str, ...] = ("poi_id",)
+
     @classmethod
     def can_gather(cls) -> bool:
         """是否允许参加聚会：如果显式配置了则使用配置，否则重大行为默认不允许，非重大行为默认允许"""
@@ -133,6 +141,42 @@ class Action(ABC):
         """
         return True
 
+    def get_conflict_keys(self, params: dict) -> set[tuple[str, str]]:
+        """
+        返回本动作执行时会读写的他人/共享对象（不含自身）。
+        key 相同的角色在同一轮 tick 中不会并发执行。
+        """
+        keys: set[tuple[str, str]] = set()
+        for param_name in self.CONFLICT_AVATAR_PARAMS:
+            target = self._resolve_conflict_avatar(params.get(param_name))
+            if target is not None:
+                keys.add(("avatar", str(target.id)))
+        for param_name in self.CONFLICT_POI_PARAMS:
+            value = params.get(param_name)
+            if value not in (None, ""):
+                keys.add(("poi", str(value)))
+
+        for scope in self.CONFLICT_SCOPES:
+            if scope == "region":
+                region = getattr(getattr(self.avatar, "tile", None), "region", None)
+                if region is not None:
+                    keys.add(("region", str(region.id)))
+            elif scope == "sect":
+                sect = getattr(self.avatar, "sect", None)
+                if sect is not None:
+                    keys.add(("sect", str(sect.id)))
+        return keys
+
+    def _resolve_conflict_avatar(self, value) -> "Avatar | None":
+        if value is None or value == "":
+            return None
+        if not isinstance(value, str):
+            return value if hasattr(value, "id") else None
+        from src.classes.core.avatar import Avatar
+        from src.utils.resolution import resolve_query
+
+        return resolve_query(value, self.world, expected_types=[Avatar]).obj
+
 
 class DefineAction(Action):
     def __init__(self, avatar: Avatar, world: World):
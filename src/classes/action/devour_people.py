@@ -22,6 +22,7 @@ class DevourPeople(TimedAction):
     
     # 不需要翻译的常量
     EMOJI = "🩸"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {}
     POPULATION_LOSS_RATIO = 0.01
     LUCK_DELTA = -1.0
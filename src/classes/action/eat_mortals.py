@@ -15,6 +15,7 @@ class EatMortals(TimedAction):
     REQUIREMENTS_ID = "eat_mortals_requirements"
 
     EMOJI = "🍖"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {}
 
     duration_months = 1
@@ -20,6 +20,7 @@ class Educate(TimedAction):
     
     # 不需要翻译的常量
     EMOJI = "📖"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {}
 
     duration_months = 3
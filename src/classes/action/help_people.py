@@ -18,6 +18,7 @@ class HelpPeople(TimedAction):
     REQUIREMENTS_ID = "help_people_requirements"
     
     EMOJI = "🤝"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {}
     TOTAL_COST = 45
     TOTAL_POPULATION_GAIN = 1.8
@@ -38,6 +38,7 @@ class Move(DefineAction, ChunkActionMixin):
             self.avatar.pos_y = new_y
             target_tile = world.map.get_tile(new_x, new_y)
             self.avatar.tile = target_tile
+            world.avatar_manager.update_avatar_position(self.avatar)
         else:
             # 超出边界：不改变位置与tile
             pass
@@ -26,34 +26,61 @@ class ParamOptionSource(str, Enum):
     KNOWN_GRAVE_POI_ID = "known_grave_poi_id"
 
 
-def build_param_options(action_cls: type, avatar: "Avatar") -> dict[str, list[dict[str, Any]]]:
+def build_param_options(
+    action_cls: type,
+    avatar: "Avatar",
+    memo: dict[tuple, list[dict[str, Any]]] | None = None,
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    memo: 可选的单次调用缓存。同一轮为多个动作构建选项时传入同一个 dict，
+    与动作无关的候选项（可观测角色、已知区域、背包物品等）只计算一次，列表在动作之间共享。
+    """
     params = getattr(action_cls, "PARAMS", {}) or {}
     options: dict[str, list[dict[str, Any]]] = {}
     for param_name, param_type in params.items():
-        param_options = _options_for_param(action_cls, avatar, param_name, param_type)
+        param_options = _options_for_param(action_cls, avatar, param_name, param_type, memo)
         if param_options:
             options[param_name] = param_options
     return options
 
 
-def _options_for_param(action_cls: type, avatar: "Avatar", param_name: str, param_type: object) -> list[dict[str, Any]]:
+def _memoized(memo: dict[tuple, list[dict[str, Any]]] | None, key: tuple, build) -> list[dict[str, Any]]:
+    if memo is None:
+        return build()
+    if key not in memo:
+        memo[key] = build()
+    return memo[key]
+
+
+def _options_for_param(
+    action_cls: type,
+    avatar: "Avatar",
+    param_name: str,
+    param_type: object,
+    memo: dict[tuple, list[dict[str, Any]]] | None = None,
+) -> list[dict[str, Any]]:
     source = _get_declared_param_option_sources(action_cls).get(param_name)
     if source is not None:
-        return _options_for_source(action_cls, avatar, source)
+        return _options_for_source(action_cls, avatar, source, memo)
 
     action_name = action_cls.__name__
     normalized_type = str(param_type).lower().replace(" ", "")
 
     if action_name == "Buy" and param_name == "target_name":
-        return _store_item_options(avatar)
+        return _memoized(memo, ("store",), lambda: _store_item_options(avatar))
     if action_name == "Sell" and param_name == "target_name":
-        return _sellable_item_options(avatar)
+        return _memoized(memo, ("sellable",), lambda: _sellable_item_options(avatar))
     if action_name == "Gift" and param_name == "item_id":
-        return _gift_item_options(avatar)
+        return _memoized(memo, ("giftable",), lambda: _gift_item_options(avatar))
     if param_name in {"avatar_name", "target_avatar"} or "avatarname" in normalized_type:
-        return _avatar_options(avatar)
+        return _memoized(memo, ("avatars",), lambda: _avatar_options(avatar))
     if param_name in {"region", "region_name"} or "regionname" in normalized_type or "region_name" in normalized_type:
-        return _known_region_options(avatar, cultivate_only=action_name == "Occupy")
+        cultivate_only = action_name == "Occupy"
+        return _memoized(
+            memo,
+            ("regions", cultivate_only),
+            lambda: _known_region_options(avatar, cultivate_only=cultivate_only),
+        )
     if param_name == "target_realm":
         return _realm_options_for_material_action(action_cls, avatar)
     if param_name == "direction" or "direction" in normalized_type:
@@ -68,24 +95,29 @@ def _get_declared_param_option_sources(action_cls: type) -> dict[str, ParamOptio
     return sources
 
 
-def _options_for_source(action_cls: type, avatar: "Avatar", source: ParamOptionSource | str) -> list[dict[str, Any]]:
+def _options_for_source(
+    action_cls: type,
+    avatar: "Avatar",
+    source: ParamOptionSource | str,
+    memo: dict[tuple, list[dict[str, Any]]] | None = None,
+) -> list[dict[str, Any]]:
     try:
         source = ParamOptionSource(source)
     except ValueError:
         return []
 
     if source == ParamOptionSource.CURRENT_CITY_STORE_ITEM_NAME:
-        return _store_item_options(avatar)
+        return _memoized(memo, ("store",), lambda: _store_item_options(avatar))
     if source == ParamOptionSource.SELLABLE_ITEM_NAME:
-        return _sellable_item_options(avatar)
+        return _memoized(memo, ("sellable",), lambda: _sellable_item_options(avatar))
     if source == ParamOptionSource.GIFTABLE_ITEM_ID:
-        return _gift_item_options(avatar)
+        return _memoized(memo, ("giftable",), lambda: _gift_item_options(avatar))
     if source == ParamOptionSource.OBSERVABLE_AVATAR_NAME:
-        return _avatar_options(avatar)
+        return _memoized(memo, ("avatars",), lambda: _avatar_options(avatar))
     if source == ParamOptionSource.KNOWN_REGION_NAME:
-        return _known_region_options(avatar)
+        return _memoized(memo, ("regions", False), lambda: _known_region_options(avatar))
     if source == ParamOptionSource.KNOWN_CULTIVATE_REGION_NAME:
-        return _known_region_options(avatar, cultivate_only=True)
+        return _memoized(memo, ("regions", True), lambda: _known_region_options(avatar, cultivate_only=True))
     if source == ParamOptionSource.MATERIAL_REALM_VALUE:
         return _realm_options_for_material_action(action_cls, avatar)
     if source == ParamOptionSource.CARDINAL_DIRECTION:
@@ -18,6 +18,7 @@ class PlunderPeople(TimedAction):
     REQUIREMENTS_ID = "plunder_people_requirements"
     
     EMOJI = "💀"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {}
     TOTAL_GAIN = 90
     TOTAL_POPULATION_LOSS = 3.0
@@ -101,6 +101,7 @@ class SectMission(TimedAction):
     REQUIREMENTS_ID = "sect_mission_requirements"
 
     EMOJI = "📜"
+    CONFLICT_SCOPES = ("sect",)
     PARAMS = {}
     duration_months = 3
 
@@ -30,6 +30,7 @@ class SetFormation(InstantAction):
     REQUIREMENTS_ID = "set_formation_requirements"
 
     EMOJI = "🧭"
+    CONFLICT_SCOPES = ("region",)
     PARAMS = {
         "formation_type": "FormationType",
     }
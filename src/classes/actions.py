@@ -8,6 +8,7 @@ if TYPE_CHECKING:
 
 from src.classes.action.registry import ActionRegistry
 from src.classes.action.param_options import build_param_options
+from src.utils.prompt_fragments import get_prompt_fragment
 # 确保在收集注册表前加载所有动作模块（含 mutual actions）
 import src.classes.action  # noqa: F401
 import src.classes.mutual_action  # noqa: F401
@@ -19,40 +20,140 @@ ALL_ACTION_NAMES = [cls.__name__ for cls in ALL_ACTION_CLASSES]
 ALL_ACTUAL_ACTION_NAMES = [cls.__name__ for cls in ALL_ACTUAL_ACTION_CLASSES]
 
 
-def _build_action_info(action, avatar: "Avatar" | None = None):
-    info = {
+def _build_static_action_info(action) -> Dict[str, Any]:
+    """只依赖语言与类属性的部分：desc / require / params / cd_months"""
+    info: Dict[str, Any] = {
         "desc": action.get_desc(),
         "require": action.get_requirements(),
     }
     if hasattr(action, 'PARAMS') and action.PARAMS:
         info["params"] = action.PARAMS
-        if avatar is not None:
-            param_options = build_param_options(action, avatar)
-            if param_options:
-                info["param_options"] = param_options
-
     cd = int(getattr(action, "ACTION_CD_MONTHS", 0) or 0)
     if cd > 0:
         info["cd_months"] = cd
     return info
 
-def get_action_infos(avatar: "Avatar" | None = None) -> Dict[str, Any]:
+
+def _dump_action_entry(name: str, info: Dict[str, Any]) -> str:
+    """序列化单个动作条目，缩进与整体 json.dumps(indent=2) 的输出保持一致"""
+    body = json.dumps(info, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+    return f"  {json.dumps(name, ensure_ascii=False)}: {body}"
+
+
+def _dump_dynamic_action_entry(name: str, info: Dict[str, Any], list_dumps: dict[int, tuple[list, str]]) -> str:
     """
-    动态获取当前语言环境下的动作描述信息。
-    如果提供了 avatar，则会过滤掉该角色绝对不可能执行的动作。
+    序列化带 param_options 的条目。多个动作共享的候选列表（如可观测角色）只序列化一次，
+    以占位符嵌入后再替换，结果与直接 json.dumps 一致。
     """
-    infos = {}
+    placeholders: dict[str, str] = {}
+    options_with_tokens: Dict[str, Any] = {}
+    for param_name, options in info["param_options"].items():
+        cached = list_dumps.get(id(options))
+        if cached is None or cached[0] is not options:
+            # 列表位于条目内第 2 层（"param_options" -> 参数名），整体再右移 4 个空格
+            text = json.dumps(options, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+            cached = list_dumps[id(options)] = (options, text)
+        token = f"\x00{len(placeholders)}\x00"
+        placeholders[json.dumps(token)] = cached[1]
+        options_with_tokens[param_name] = token
+
+    body = json.dumps({**info, "param_options": options_with_tokens}, ensure_ascii=False, indent=2)
+    for token_json, text in placeholders.items():
+        body = body.replace(token_json, text, 1)
+    body = body.replace("\n", "\n  ")
+    return f"  {json.dumps(name, ensure_ascii=False)}: {body}"
+
+
+def _get_static_action_fragment(action) -> tuple[Dict[str, Any], str]:
+    """按语言缓存的 (静态描述 dict, 预序列化 JSON 片段)"""
+    def build() -> tuple[Dict[str, Any], str]:
+        info = _build_static_action_info(action)
+        return info, _dump_action_entry(action.__name__, info)
+
+    return get_prompt_fragment("action_info", action, build)
+
+
+def _build_action_info(action, avatar: "Avatar" | None = None, option_memo: dict | None = None):
+    static_info, _ = _get_static_action_fragment(action)
+    param_options = None
+    if avatar is not None and "params" in static_info:
+        param_options = build_param_options(action, avatar, option_memo)
+    if not param_options:
+        return dict(static_info)
+
+    # 保持字段顺序：desc, require, params, param_options, cd_months
+    info = {key: value for key, value in static_info.items() if key != "cd_months"}
+    info["param_options"] = param_options
+    if "cd_months" in static_info:
+        info["cd_months"] = static_info["cd_months"]
+    return info
+
+
+def _iter_available_actions(avatar: "Avatar" | None):
     for action_cls in ALL_ACTUAL_ACTION_CLASSES:
         if avatar is not None:
             # 实例化动作以检查是否可能执行
             action_inst = action_cls(avatar, avatar.world)
             if not action_inst.can_possibly_start():
                 continue
-        infos[action_cls.__name__] = _build_action_info(action_cls, avatar=avatar)
-    return infos
+        yield action_cls
+
+
+def get_action_infos(avatar: "Avatar" | None = None) -> Dict[str, Any]:
+    """
+    动态获取当前语言环境下的动作描述信息。
+    如果提供了 avatar，则会过滤掉该角色绝对不可能执行的动作。
+    """
+    option_memo: dict = {}
+    return {
+        action_cls.__name__: _build_action_info(action_cls, avatar=avatar, option_memo=option_memo)
+        for action_cls in _iter_available_actions(avatar)
+    }
 
 def get_action_infos_str(avatar: "Avatar" | None = None) -> str:
     """
     获取JSON格式的动作描述字符串
+    输出与 json.dumps(get_action_infos(avatar), ensure_ascii=False, indent=2) 一致；
+    不带 param_options 的动作直接复用按语言缓存的 JSON 片段，只序列化动态部分。
+    """
+    entries: list[str] = []
+    option_memo: dict = {}
+    list_dumps: dict[int, tuple[list, str]] = {}
+    for action_cls in _iter_available_actions(avatar):
+        static_info, fragment = _get_static_action_fragment(action_cls)
+        if avatar is not None and "params" in static_info:
+            info = _build_action_info(action_cls, avatar=avatar, option_memo=option_memo)
+            if "param_options" in info:
+                entries.append(_dump_dynamic_action_entry(action_cls.__name__, info, list_dumps))
+                continue
+        entries.append(fragment)
+    if not entries:
+        return "{}"
+    return "{\n" + ",\n".join(entries) + "\n}"
+
+
+def get_available_action_options(avatar: "Avatar") -> Dict[str, Dict[str, Any]]:
+    """
+    批量决策用：角色当前可能执行的动作名 -> param_options（没有候选项时为空 dict）。
+    动作的静态描述改由 get_action_catalogue_str 在整批提示词中只发送一次。
     """
-    return json.dumps(get_action_infos(avatar), ensure_ascii=False, indent=2)
+    option_memo: dict = {}
+    options: Dict[str, Dict[str, Any]] = {}
+    for action_cls in _iter_available_actions(avatar):
+        static_info, _ = _get_static_action_fragment(action_cls)
+        param_options = build_param_options(action_cls, avatar, option_memo) if "params" in static_info else None
+        options[action_cls.__name__] = param_options or {}
+    return options
+
+
+def get_action_catalogue_str(action_names) -> str:
+    """给定动作的静态描述（desc / require / params / cd_months），按注册顺序拼成 JSON 字符串"""
+    wanted = set(action_names)
+    entries = [
+        _get_static_action_fragment(action_cls)[1]
+        for action_cls in ALL_ACTUAL_ACTION_CLASSES
+        if action_cls.__name__ in wanted
+    ]
+    if not entries:
+        return "{}"
+    return "{\n" + ",\n".join(entries) + "\n}"
@@ -6,17 +6,37 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 import asyncio
+import json
+import os
 
 from src.classes.core.world import World
 from src.classes.event import Event, NULL_EVENT
-from src.utils.llm import call_llm_with_task_name
+from src.utils.llm import LLMError, call_llm_with_task_name
 from src.classes.typings import ACTION_NAME_PARAMS_PAIRS
-from src.classes.actions import get_action_infos_str
+from src.classes.actions import (
+    get_action_catalogue_str,
+    get_action_infos_str,
+    get_available_action_options,
+)
 from src.utils.config import CONFIG
 
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
+_BATCH_SIZE_ENV = "CWS_DECISION_BATCH_SIZE"
+
+
+def get_decision_batch_size() -> int:
+    """每个 action_decision 请求最多打包的角色数；<=1 表示逐个请求（默认）"""
+    size = getattr(getattr(CONFIG, "ai", None), "decision_batch_size", 1)
+    env_value = os.environ.get(_BATCH_SIZE_ENV)
+    if env_value is not None:
+        size = env_value
+    try:
+        return max(1, int(size))
+    except (TypeError, ValueError):
+        return 1
+
 class AI(ABC):
     """
     抽象AI：统一采用批量接口。
@@ -47,38 +67,177 @@ class LLMAI(AI):
     LLM AI
     """
 
+    @staticmethod
+    def build_decision_infos(world: World, avatar: Avatar) -> dict:
+        """构建 action_decision 的提示词参数（决策与预取共用，需保持无副作用）"""
+        general_action_infos = get_action_infos_str(avatar)
+        # 获取基于该角色已知区域的世界信息（包含距离计算）
+        world_info = world.get_info(avatar=avatar, detailed=True)
+
+        # 在提示中包含处于角色观测范围内的其他角色
+        observed = world.get_observable_avatars(avatar)
+        avatar_info = avatar.get_expanded_info(co_region_avatars=observed, detailed=True)
+        from src.classes.core.avatar.info_presenter import get_avatar_ai_context
+        avatar_ai_context = get_avatar_ai_context(avatar, co_region_avatars=observed)
+
+        return {
+            "avatar_name": avatar.name,
+            "avatar_info": avatar_info,
+            "avatar_ai_context": avatar_ai_context,
+            "world_info": world_info,
+            "world_lore": world.world_lore.text,
+            "general_action_infos": general_action_infos,
+            "player_command": "",
+        }
+
+    @staticmethod
+    async def request_decision(info: dict):
+        template_path = CONFIG.paths.templates / "ai.txt"
+        return await call_llm_with_task_name("action_decision", template_path, info)
+
+    @staticmethod
+    def build_batch_decision_infos(world: World, avatars: list[Avatar]) -> dict:
+        """
+        构建批量决策的提示词参数：世界观、动作静态说明（以及全员相同时的世界信息）只发一次，
+        每个角色只附带自身信息、决策上下文和可执行动作的参数候选项。
+        """
+        from src.classes.core.avatar.info_presenter import get_avatar_ai_context
+
+        world_infos = [world.get_info(avatar=avatar, detailed=True) for avatar in avatars]
+        shared_world_info = world_infos[0] if all(info == world_infos[0] for info in world_infos) else None
+
+        avatar_infos: dict[str, dict] = {}
+        action_names: set[str] = set()
+        option_lists: dict[str, tuple[str, list]] = {}
+        option_refs: dict[str, int] = {}
+        for avatar, world_info in zip(avatars, world_infos):
+            observed = world.get_observable_avatars(avatar)
+            available_actions = get_available_action_options(avatar)
+            action_names.update(available_actions)
+            for param_options in available_actions.values():
+                for param_name, options in param_options.items():
+                    key = json.dumps(options, ensure_ascii=False, sort_keys=True)
+                    option_lists.setdefault(key, (param_name, options))
+                    option_refs[key] = option_refs.get(key, 0) + 1
+            section = {
+                "avatar_info": avatar.get_expanded_info(co_region_avatars=observed, detailed=True),
+                "avatar_ai_context": get_avatar_ai_context(avatar, co_region_avatars=observed),
+                "available_actions": available_actions,
+            }
+            if shared_world_info is None:
+                section["world_info"] = world_info
+            avatar_infos[avatar.name] = section
+
+        # 同一份候选列表（可观测角色、已知区域、方向等）被多个动作或多个角色引用时只发送一次，原处改为 "@名称" 引用
+        shared_options: dict[str, list] = {}
+        labels: dict[str, str] = {}
+        for key, (param_name, options) in option_lists.items():
+            if option_refs[key] > 1:
+                label = f"@{param_name}_{len(shared_options) + 1}"
+                labels[key] = label
+                shared_options[label] = options
+        for section in avatar_infos.values():
+            section["available_actions"] = {
+                action_name: {
+                    param_name: labels.get(json.dumps(options, ensure_ascii=False, sort_keys=True), options)
+                    for param_name, options in param_options.items()
+                }
+                for action_name, param_options in section["available_actions"].items()
+            }
+
+        return {
+            "avatar_names": json.dumps([avatar.name for avatar in avatars], ensure_ascii=False),
+            "world_info": shared_world_info if shared_world_info is not None else {},
+            "world_lore": world.world_lore.text,
+            "action_catalogue": get_action_catalogue_str(action_names),
+            "param_option_lists": json.dumps(shared_options, ensure_ascii=False, indent=2),
+            "avatar_infos": avatar_infos,
+        }
+
+    @staticmethod
+    async def request_batch_decision(info: dict):
+        template_path = CONFIG.paths.templates / "ai_batch.txt"
+        return await call_llm_with_task_name("action_decision_batch", template_path, info)
+
+    @staticmethod
+    def group_for_batch(avatars: list[Avatar], batch_size: int) -> list[list[Avatar]]:
+        """按宗门（无宗门按所在区域）分组，每组再切成不超过 batch_size 的批次；同批内角色名不重复"""
+        groups: dict[tuple, list[list[Avatar]]] = {}
+        for avatar in avatars:
+            sect = getattr(avatar, "sect", None)
+            if sect is not None:
+                key = ("sect", sect.id)
+            else:
+                tile = getattr(avatar, "tile", None)
+                region = getattr(tile, "region", None) if tile is not None else None
+                key = ("region", getattr(region, "id", None))
+            batches = groups.setdefault(key, [[]])
+            for batch in batches:
+                if len(batch) < batch_size and all(other.name != avatar.name for other in batch):
+                    batch.append(avatar)
+                    break
+            else:
+                batches.append([avatar])
+        return [batch for batches in groups.values() for batch in batches]
+
+    def prefetch(self, world: World, avatars: list[Avatar]) -> int:
+        """为下个月预计需要决策的角色提前发出请求，见 src/classes/decision_prefetch.py"""
+        from src.classes.decision_prefetch import get_decision_prefetcher
+
+        return get_decision_prefetcher(world).schedule(
+            world, avatars, self.build_decision_infos, self.request_decision
+        )
+
     async def _decide(self, world: World, avatars_to_decide: list[Avatar]) -> dict[Avatar, tuple[ACTION_NAME_PARAMS_PAIRS, str, str]]:
         """
         异步决策逻辑：通过LLM决定执行什么动作和参数
         """
-        
+        prefetcher = getattr(world, "_decision_prefetcher", None)
+
         async def decide_one(avatar: Avatar):
-            general_action_infos = get_action_infos_str(avatar)
-            # 获取基于该角色已知区域的世界信息（包含距离计算）
-            world_info = world.get_info(avatar=avatar, detailed=True)
-            
-            # 在提示中包含处于角色观测范围内的其他角色
-            observed = world.get_observable_avatars(avatar)
-            avatar_info = avatar.get_expanded_info(co_region_avatars=observed, detailed=True)
-            from src.classes.core.avatar.info_presenter import get_avatar_ai_context
-            avatar_ai_context = get_avatar_ai_context(avatar, co_region_avatars=observed)
-            
-            info = {
-                "avatar_name": avatar.name,
-                "avatar_info": avatar_info,
-                "avatar_ai_context": avatar_ai_context,
-                "world_info": world_info,
-                "world_lore": world.world_lore.text,
-                "general_action_infos": general_action_infos,
-                "player_command": "",
-            }
-            template_path = CONFIG.paths.templates / "ai.txt"
-            res = await call_llm_with_task_name("action_decision", template_path, info)
-            return avatar, res
+            info = self.build_decision_infos(world, avatar)
+            prefetched = prefetcher.take(world, avatar, info) if prefetcher is not None else None
+            if prefetched is not None:
+                try:
+                    return avatar, await prefetched
+                except Exception:
+                    # 预取请求失败时照常重新请求一次
+                    pass
+            return avatar, await self.request_decision(info)
 
-        # 直接并发所有任务
-        tasks = [decide_one(avatar) for avatar in avatars_to_decide]
-        results_list = await asyncio.gather(*tasks)
+        async def decide_batch(batch: list[Avatar]):
+            try:
+                res = await self.request_batch_decision(self.build_batch_decision_infos(world, batch))
+            except LLMError:
+                res = None
+            res = res if isinstance(res, dict) else {}
+            decided, missing = [], []
+            for avatar in batch:
+                r = res.get(avatar.name)
+                if isinstance(r, dict) and r.get("action_name_params_pairs"):
+                    decided.append((avatar, {avatar.name: r}))
+                else:
+                    missing.append(avatar)
+            # 批量响应里缺失（或整批失败）的角色回退到单人请求
+            if missing:
+                decided.extend(await asyncio.gather(*(decide_one(avatar) for avatar in missing)))
+            return decided
+
+        batch_size = get_decision_batch_size()
+        if batch_size <= 1:
+            # 直接并发所有任务
+            tasks = [decide_one(avatar) for avatar in avatars_to_decide]
+            results_list = await asyncio.gather(*tasks)
+        else:
+            # 已有预取请求的角色照常单独处理，其余按宗门/区域打包
+            singles = [avatar for avatar in avatars_to_decide if prefetcher is not None and prefetcher.has(avatar)]
+            batches = self.group_for_batch([avatar for avatar in avatars_to_decide if avatar not in singles], batch_size)
+            singles.extend(batch[0] for batch in batches if len(batch) == 1)
+            batch_results = await asyncio.gather(
+                asyncio.gather(*(decide_one(avatar) for avatar in singles)),
+                *(decide_batch(batch) for batch in batches if len(batch) > 1),
+            )
+            results_list = [item for group in batch_results for item in group]
         
         results: dict[Avatar, tuple[ACTION_NAME_PARAMS_PAIRS, str, str]] = {}
         for avatar, res in results_list:
@@ -107,13 +266,8 @@ class LLMAI(AI):
             short_term_objective = r.get("short_term_objective", "")
             
             # 更新情绪
-            from src.classes.emotions import EmotionType
-            raw_emotion = r.get("current_emotion", "emotion_calm")
-            try:
-                # 尝试通过 value 获取枚举
-                avatar.emotion = EmotionType(raw_emotion)
-            except ValueError:
-                avatar.emotion = EmotionType.CALM
+            from src.classes.emotions import EmotionType, parse_emotion
+            avatar.emotion = parse_emotion(r.get("current_emotion")) or EmotionType.CALM
                 
             results[avatar] = (pairs, avatar_thinking, short_term_objective)
             
@@ -19,6 +19,12 @@ from src.run.log import get_logger
 
 from src.utils.config import CONFIG
 
+
+def _can_interrupt_major_events() -> bool:
+    # 该配置项通常缺省；omegaconf 查找缺失键时会计算拼写建议，开销不小，只在重大行为分支里按需读取
+    return bool(getattr(CONFIG.world, 'can_interrupt_major_events', False))
+
+
 class ActionMixin:
     """动作管理相关方法"""
     
@@ -230,14 +236,12 @@ class ActionMixin:
     @property
     def can_join_gathering(self: "Avatar") -> bool:
         """是否可以参加聚会"""
-        can_interrupt = getattr(CONFIG.world, 'can_interrupt_major_events', False)
-        
         if self.current_action and self.current_action.action:
             action_cls = self.current_action.action.__class__
             if action_cls.can_gather():
                 return True
             # 如果动作本身不允许参加聚会，但配置允许打断重大行为，且动作是没有显式拒绝的重大行为
-            if can_interrupt and getattr(action_cls, 'IS_MAJOR', False) and action_cls.ALLOW_GATHERING is None:
+            if getattr(action_cls, 'IS_MAJOR', False) and action_cls.ALLOW_GATHERING is None and _can_interrupt_major_events():
                 return True
             return False
             
@@ -246,14 +250,12 @@ class ActionMixin:
     @property
     def can_trigger_world_event(self: "Avatar") -> bool:
         """是否可以触发奇遇/霉运"""
-        can_interrupt = getattr(CONFIG.world, 'can_interrupt_major_events', False)
-        
         if self.current_action and self.current_action.action:
             action_cls = self.current_action.action.__class__
             if action_cls.can_trigger_events():
                 return True
             # 同上，处理全局打断配置
-            if can_interrupt and getattr(action_cls, 'IS_MAJOR', False) and action_cls.ALLOW_WORLD_EVENTS is None:
+            if getattr(action_cls, 'IS_MAJOR', False) and action_cls.ALLOW_WORLD_EVENTS is None and _can_interrupt_major_events():
                 return True
             return False
             
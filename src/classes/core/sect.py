@@ -762,11 +762,13 @@ def get_sect_decision_context(
     event_storage: "EventStorage",
     *,
     history_limit: int = 50,
+    shared=None,
 ):
     """
     便捷入口：获取宗门决策上下文。
 
     为避免领域层直接依赖具体系统实现，仅在此做一次转调。
+    shared 为 SectDecisionSharedContext，多个宗门共用同一份世界快照时传入。
     """
     from src.systems.sect_decision_context import build_sect_decision_context
 
@@ -775,4 +777,5 @@ def get_sect_decision_context(
         world=world,
         event_storage=event_storage,
         history_limit=history_limit,
+        shared=shared,
     )
@@ -63,12 +63,20 @@ class World():
     ranking_manager: RankingManager = field(default_factory=RankingManager)
     # 游玩单局 ID，用于区分存档
     playthrough_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    # 随机种子：设置后每月按 (seed, 月份) 重置 random，使推进可复现，见 src/utils/rng.py
+    seed: Optional[int] = None
     sect_relation_modifiers: list[dict[str, Any]] = field(default_factory=list)
     sect_wars: list[dict[str, Any]] = field(default_factory=list)
     # 机缘管理器：维护单人限时机缘状态与冷却。
     opportunity_manager: OpportunityManager = field(default_factory=OpportunityManager)
     # 宗门上下文（惰性初始化），用于统一本局启用宗门作用域
     _sect_context: Any = field(default=None, init=False, repr=False)
+    # 宗门势力范围缓存（噪声场 + 最近快照），由 SectManager 维护
+    _sect_territory_cache: Any = field(default=None, init=False, repr=False)
+    # 前端广播增量基线（上次推送的角色状态签名），由 server.loop_runtime 维护
+    _avatar_broadcast_tracker: Any = field(default=None, init=False, repr=False)
+    # 下个月 AI 决策的预取请求，由 src.classes.decision_prefetch 维护
+    _decision_prefetcher: Any = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
         if hasattr(self.event_manager, "set_subject_resolver"):
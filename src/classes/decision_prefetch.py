@@ -0,0 +1,120 @@
+"""
+AI 决策预取（可选）
+
+一个月结算完成后，为“下个月大概率需要决策”的空闲角色提前发出 action_decision 请求，
+让 LLM 在广播、自动存档、循环间隔期间就开始工作。
+
+下个月 decide_actions 相位会重新构建该角色的提示词参数：
+- 与预取时完全一致（同一月份、同一份 infos）才采用预取结果；
+- 否则（角色状态在此期间发生了变化）丢弃预取结果，照常重新请求。
+因此预取不改变模拟语义，只会在状态不变时省下等待时间。
+
+开启方式：config.yml 中 ai.decision_prefetch，或环境变量 CWS_DECISION_PREFETCH=1。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from src.run.log import get_logger
+from src.utils.config import CONFIG
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+    from src.classes.core.world import World
+
+_ENV_SWITCH = "CWS_DECISION_PREFETCH"
+
+
+def is_decision_prefetch_enabled() -> bool:
+    enabled = bool(getattr(getattr(CONFIG, "ai", None), "decision_prefetch", False))
+    env_value = os.environ.get(_ENV_SWITCH)
+    if env_value is not None:
+        enabled = env_value.strip().lower() in ("1", "true", "yes", "on")
+    return enabled
+
+
+@dataclass(slots=True)
+class _PrefetchEntry:
+    month_stamp: int
+    infos: dict[str, Any]
+    task: asyncio.Task
+
+
+class DecisionPrefetcher:
+    """按角色保存预取中的决策请求；每个条目只能被取用一次。"""
+
+    def __init__(self):
+        self._entries: dict[str, _PrefetchEntry] = {}
+        self.scheduled = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def schedule(
+        self,
+        world: "World",
+        avatars: list["Avatar"],
+        build_infos: Callable[["World", "Avatar"], dict[str, Any]],
+        request: Callable[[dict[str, Any]], Awaitable[Any]],
+    ) -> int:
+        self.discard_all()
+        month_stamp = int(world.month_stamp)
+        for avatar in avatars:
+            try:
+                infos = build_infos(world, avatar)
+            except Exception as exc:
+                get_logger().logger.warning("Decision prefetch skipped for %s: %s", avatar.name, exc)
+                continue
+            task = asyncio.create_task(request(infos))
+            # 预取失败只在取用时回退到正常请求，这里先吞掉异常避免 "never retrieved" 警告
+            task.add_done_callback(_consume_task_exception)
+            self._entries[str(avatar.id)] = _PrefetchEntry(month_stamp, infos, task)
+        self.scheduled += len(self._entries)
+        return len(self._entries)
+
+    def has(self, avatar: "Avatar") -> bool:
+        return str(avatar.id) in self._entries
+
+    def take(self, world: "World", avatar: "Avatar", infos: dict[str, Any]) -> asyncio.Task | None:
+        """取出与当前 infos 完全一致的预取请求；不一致则作废并返回 None。"""
+        entry = self._entries.pop(str(avatar.id), None)
+        if entry is None:
+            return None
+        if entry.month_stamp != int(world.month_stamp) or entry.infos != infos or entry.task.cancelled():
+            entry.task.cancel()
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.task
+
+    def discard_all(self) -> None:
+        for entry in self._entries.values():
+            entry.task.cancel()
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": len(self._entries),
+            "scheduled": self.scheduled,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _consume_task_exception(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def get_decision_prefetcher(world: "World") -> DecisionPrefetcher:
+    prefetcher = getattr(world, "_decision_prefetcher", None)
+    if prefetcher is None:
+        prefetcher = DecisionPrefetcher()
+        world._decision_prefetcher = prefetcher
+    return prefetcher
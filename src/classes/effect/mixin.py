@@ -10,14 +10,121 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from src.classes.core.avatar.core import Avatar
 
-from .process import _merge_effects, _evaluate_conditional_effect
+from .process import (
+    _merge_effects,
+    _evaluate_conditional_effect,
+    build_effect_eval_context,
+    evaluate_effect_values,
+)
 from .luck import build_luck_derived_effects, compute_luck_value
 from .consts import EXTRA_LUCK
 from src.classes.hp import HP_MAX_BY_REALM
 
 
+class _EffectCache:
+    """
+    单个角色的效果计算结果。
+
+    fingerprint 分两部分：scalars 按值比较（月份、语言、境界等），
+    refs 按对象身份比较（宗门、功法、装备、特质、丹药、天象等），
+    任一变化即视为失效，下次读取时整体重算。
+    """
+    __slots__ = ("scalars", "refs", "raw_breakdown", "breakdown", "merged", "luck")
+
+    def __init__(self, scalars: tuple, refs: tuple, raw_breakdown, breakdown, merged, luck: float):
+        self.scalars = scalars
+        self.refs = refs
+        self.raw_breakdown = raw_breakdown
+        self.breakdown = breakdown
+        self.merged = merged
+        self.luck = luck
+
+    def matches(self, scalars: tuple, refs: tuple) -> bool:
+        if self.scalars != scalars or len(self.refs) != len(refs):
+            return False
+        for old, new in zip(self.refs, refs):
+            if old is not new:
+                return False
+        return True
+
+
 class EffectsMixin:
     """效果计算相关方法"""
+
+    def invalidate_effects_cache(self: "Avatar") -> None:
+        """丢弃已缓存的效果，下次读取时重新计算（原地修改效果来源时调用）"""
+        self._effects_cache = None
+
+    def _effect_state_fingerprint(self: "Avatar") -> tuple[tuple, tuple]:
+        """收集会影响效果计算结果的状态，用于判断缓存是否仍然有效"""
+        from src.classes.language import language_manager
+
+        progress = self.cultivation_progress
+        personas = self.personas or []
+        elixirs = self.elixirs or []
+        temporary_effects = getattr(self, "temporary_effects", None) or []
+        persistent_effects = getattr(self, "persistent_effects", None) or []
+        auxiliary = self.auxiliary
+        spirit_animal = self.spirit_animal
+        special_data = getattr(auxiliary, "special_data", None)
+        scalars = (
+            int(self.world.month_stamp),
+            str(language_manager),
+            self.root,
+            getattr(self, "official_rank", None),
+            progress.realm,
+            progress.level,
+            self.alignment,
+            self.weapon_proficiency,
+            getattr(self, "luck_base", 0),
+            len(personas),
+            len(elixirs),
+            len(temporary_effects),
+            len(persistent_effects),
+            getattr(spirit_animal, "realm", None),
+            tuple(special_data.items()) if isinstance(special_data, dict) else None,
+        )
+        refs = (
+            self.sect,
+            getattr(self.sect, "effects", None),
+            getattr(self, "race", None),
+            self.technique,
+            getattr(self, "goldfinger", None),
+            self.weapon,
+            auxiliary,
+            spirit_animal,
+            self.world.current_phenomenon,
+            *personas,
+            *elixirs,
+            *temporary_effects,
+            *persistent_effects,
+        )
+        return scalars, refs
+
+    def _get_effect_cache(self: "Avatar") -> _EffectCache:
+        scalars, refs = self._effect_state_fingerprint()
+        cache = getattr(self, "_effects_cache", None)
+        if cache is not None and cache.matches(scalars, refs):
+            return cache
+
+        from src.i18n import t
+
+        raw_breakdown = self._compute_raw_effect_breakdown()
+        raw_merged: dict[str, object] = {}
+        for _, effect_dict in raw_breakdown:
+            raw_merged = _merge_effects(raw_merged, effect_dict)
+
+        luck_value = compute_luck_value(getattr(self, "luck_base", 0), raw_merged)
+        breakdown = list(raw_breakdown)
+        derived_effects = build_luck_derived_effects(luck_value)
+        merged = raw_merged
+        if derived_effects:
+            breakdown.append((t("Luck"), derived_effects))
+            merged = _merge_effects(raw_merged, derived_effects)
+
+        cache = _EffectCache(scalars, refs, raw_breakdown, breakdown, merged, luck_value)
+        self._effects_cache = cache
+        return cache
     
     def get_active_temporary_effects(self: "Avatar") -> list[dict[str, Any]]:
         """获取当前生效的临时效果列表"""
@@ -27,71 +134,36 @@ class EffectsMixin:
             if current_month < eff.get("start_month", 0) + eff.get("duration", 0)
         ]
 
-    def _evaluate_values(self, effects: dict[str, Any]) -> dict[str, Any]:
+    def _evaluate_values(self, effects: dict[str, Any], context: dict[str, Any] | None = None) -> dict[str, Any]:
         """
         评估效果字典中的动态值（字符串表达式）。
         支持明确的 'eval(...)' 格式，以及包含 'avatar.' 的隐式表达式。
+        表达式在配表加载时已预编译，这里只做求值。
         """
-        result = {}
-        # 安全的 eval 上下文
-        context = {
-            "__builtins__": {},
-            "avatar": self,
-            "max": max,
-            "min": min,
-            "int": int,
-            "float": float,
-            "round": round,
-        }
-        try:
-            from src.classes.items.auxiliary import get_ten_thousand_souls_banner_bonus
-            context["get_ten_thousand_souls_banner_bonus"] = get_ten_thousand_souls_banner_bonus
-        except Exception:
-            pass
-
-        for k, v in effects.items():
-            if isinstance(v, str):
-                s = v.strip()
-                expr = None
-                
-                # 检查是否为表达式
-                if s.startswith("eval(") and s.endswith(")"):
-                    expr = s[5:-1]
-                elif "avatar." in s: # 启发式：包含 avatar. 则视为表达式
-                    expr = s
-                
-                if expr:
-                    try:
-                        result[k] = eval(expr, context)
-                    except Exception:
-                        # 评估失败，保留原值（可能是普通字符串，或者表达式有误）
-                        result[k] = v
-                else:
-                    result[k] = v
-            else:
-                result[k] = v
-        return result
+        if context is None:
+            context = build_effect_eval_context(self)
+        return evaluate_effect_values(effects, context)
 
     @property
     def effects(self: "Avatar") -> dict[str, object]:
         """
         合并所有来源的效果：宗门、功法、灵根、特质、兵器、辅助装备、灵兽、天地灵机、丹药
-        直接复用 get_effect_breakdown 的逻辑，确保显示与实际效果一致。
+        与 get_effect_breakdown 共用同一份缓存，确保显示与实际效果一致。
+        返回的是缓存字典本身，调用方只读不写。
         """
-        merged: dict[str, object] = {}
-
-        # 我们只需要合并结果即可
-        for _, effect_dict in self.get_effect_breakdown():
-            merged = _merge_effects(merged, effect_dict)
-
-        return merged
+        return self._get_effect_cache().merged
 
     def _get_raw_effect_breakdown(self: "Avatar") -> list[tuple[str, dict[str, Any]]]:
         """
         获取未注入气运派生效果前的原始效果明细。
         """
+        return list(self._get_effect_cache().raw_breakdown)
+
+    def _compute_raw_effect_breakdown(self: "Avatar") -> list[tuple[str, dict[str, Any]]]:
+        """逐个来源评估条件与动态值，生成原始效果明细（不走缓存）"""
         from src.i18n import t
         breakdown = []
+        context = build_effect_eval_context(self)
         
         def _collect(name: str, source_obj=None, explicit_effects=None):
             """
@@ -107,9 +179,9 @@ class EffectsMixin:
                 return
 
             # 1. 评估条件 (when)
-            evaluated = _evaluate_conditional_effect(raw_effects, self)
+            evaluated = _evaluate_conditional_effect(raw_effects, self, context)
             # 2. 评估动态值 (expressions)
-            evaluated = self._evaluate_values(evaluated)
+            evaluated = evaluate_effect_values(evaluated, context)
             
             if evaluated:
                 breakdown.append((name, evaluated))
@@ -190,29 +262,14 @@ class EffectsMixin:
 
     @property
     def luck(self: "Avatar") -> float:
-        raw_merged: dict[str, object] = {}
-        for _, effect_dict in self._get_raw_effect_breakdown():
-            raw_merged = _merge_effects(raw_merged, effect_dict)
-        return compute_luck_value(getattr(self, "luck_base", 0), raw_merged)
+        return self._get_effect_cache().luck
 
     def get_effect_breakdown(self: "Avatar") -> list[tuple[str, dict[str, Any]]]:
         """
         获取最终效果明细，返回 [(来源名称, 生效的效果字典), ...]
         在原始来源之外，额外插入“气运”派生效果来源。
         """
-        from src.i18n import t
-
-        breakdown = self._get_raw_effect_breakdown()
-        raw_merged: dict[str, object] = {}
-        for _, effect_dict in breakdown:
-            raw_merged = _merge_effects(raw_merged, effect_dict)
-
-        luck_value = compute_luck_value(getattr(self, "luck_base", 0), raw_merged)
-        derived_effects = build_luck_derived_effects(luck_value)
-        if derived_effects:
-            breakdown.append((t("Luck"), derived_effects))
-
-        return breakdown
+        return list(self._get_effect_cache().breakdown)
 
     def recalc_effects(self: "Avatar") -> None:
         """
@@ -226,7 +283,8 @@ class EffectsMixin:
         # 计算基础最大值（基于境界）
         base_max_hp = HP_MAX_BY_REALM.get(self.cultivation_progress.realm, 100)
         
-        # 访问 self.effects 会触发 @property，重新 merge 所有 effects
+        # 显式重算：调用方可能原地修改了效果来源，不能依赖缓存指纹
+        self.invalidate_effects_cache()
         effects = self.effects
         extra_max_hp = int(effects.get("extra_max_hp", 0))
         extra_max_lifespan = int(effects.get("extra_max_lifespan", 0))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
+from types import CodeType
 from typing import Any, Callable, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -25,6 +27,7 @@ def load_effect_from_str(value: object) -> dict[str, Any] | list[dict[str, Any]]
     if value is None:
         return {}
     if isinstance(value, (dict, list)):
+        precompile_effect_expressions(value)
         return value
     s = str(value).strip()
     if not s or s == "nan":
@@ -34,6 +37,7 @@ def load_effect_from_str(value: object) -> dict[str, Any] | list[dict[str, Any]]
     try:
         obj = json.loads(s)
         if isinstance(obj, (dict, list)):
+            precompile_effect_expressions(obj)
             return obj
         return {}
     except Exception:
@@ -80,36 +84,64 @@ def load_effect_from_str(value: object) -> dict[str, Any] | list[dict[str, Any]]
         # 5. 尝试解析
         obj = json.loads(relaxed)
         if isinstance(obj, (dict, list)):
+            precompile_effect_expressions(obj)
             return obj
         return {}
     except Exception:
         return {}
 
 
-def _evaluate_conditional_effect(effect: dict[str, Any] | list[dict[str, Any]], avatar: "Avatar") -> dict[str, Any]:
+@lru_cache(maxsize=None)
+def compile_effect_expression(expr: str) -> CodeType | None:
     """
-    评估带条件的effect，返回实际生效的effect dict。
-    
-    支持三种格式：
-    1. 普通dict（无条件）: {"extra_battle_strength_points": 1}
-    2. 带条件的dict: {"extra_battle_strength_points": 2, "when": "avatar.weapon.type == WeaponType.SWORD"}
-    3. 条件数组: [{"extra_battle_strength_points": 2, "when": "..."}, {...}]
-    
-    Args:
-        effect: 原始effect配置（dict或list）
-        avatar: 当前角色对象
-    
-    Returns:
-        评估后实际生效的effect dict（合并所有满足条件的effects）
+    将效果表达式编译为 code object，同一表达式只编译一次。
+    语法错误返回 None（调用方按"评估失败"处理）。
     """
+    try:
+        return compile(expr, "<effect>", "eval")
+    except (SyntaxError, ValueError):
+        return None
+
+
+def extract_value_expression(value: object) -> str | None:
+    """
+    识别效果值中的动态表达式。
+    支持明确的 'eval(...)' 格式，以及包含 'avatar.' 的隐式表达式。
+    """
+    if not isinstance(value, str):
+        return None
+    s = value.strip()
+    if s.startswith("eval(") and s.endswith(")"):
+        return s[5:-1]
+    if "avatar." in s:  # 启发式：包含 avatar. 则视为表达式
+        return s
+    return None
+
+
+def precompile_effect_expressions(effect: object) -> None:
+    """配表加载时预编译 effects 中的 when 条件与动态值表达式"""
+    items = effect if isinstance(effect, list) else [effect]
+    for eff in items:
+        if not isinstance(eff, dict):
+            continue
+        for key, val in eff.items():
+            if key == "when":
+                if isinstance(val, str) and val:
+                    compile_effect_expression(val)
+                continue
+            expr = extract_value_expression(val)
+            if expr:
+                compile_effect_expression(expr)
+
+
+@lru_cache(maxsize=1)
+def _get_base_eval_context() -> dict[str, Any]:
     from src.classes.weapon_type import WeaponType
     from src.systems.cultivation import Realm
     from src.classes.alignment import Alignment
-    
-    # 构建安全的eval上下文
-    safe_context = {
+
+    context: dict[str, Any] = {
         "__builtins__": {},
-        "avatar": avatar,
         "WeaponType": WeaponType,
         "Realm": Realm,
         "Alignment": Alignment,
@@ -121,14 +153,83 @@ def _evaluate_conditional_effect(effect: dict[str, Any] | list[dict[str, Any]],
         "list": list,
         "max": max,
         "min": min,
+        "int": int,
+        "float": float,
+        "round": round,
     }
+    try:
+        from src.classes.items.auxiliary import get_ten_thousand_souls_banner_bonus
+        context["get_ten_thousand_souls_banner_bonus"] = get_ten_thousand_souls_banner_bonus
+    except Exception:
+        pass
+    return context
+
+
+def build_effect_eval_context(avatar: "Avatar") -> dict[str, Any]:
+    """
+    构建安全的 eval 上下文。
+    avatar 放在 globals 中，保证表达式里的生成器/推导式也能访问到。
+    """
+    context = dict(_get_base_eval_context())
+    context["avatar"] = avatar
+    return context
+
+
+def evaluate_effect_values(effects: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
+    """评估效果字典中的动态值（字符串表达式），评估失败时保留原值"""
+    result = {}
+    for k, v in effects.items():
+        expr = extract_value_expression(v)
+        if expr is None:
+            result[k] = v
+            continue
+        code = compile_effect_expression(expr)
+        if code is None:
+            result[k] = v
+            continue
+        try:
+            result[k] = eval(code, context)
+        except Exception:
+            # 评估失败，保留原值（可能是普通字符串，或者表达式有误）
+            result[k] = v
+    return result
+
+
+def _evaluate_conditional_effect(
+    effect: dict[str, Any] | list[dict[str, Any]],
+    avatar: "Avatar",
+    context: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """
+    评估带条件的effect，返回实际生效的effect dict。
+    
+    支持三种格式：
+    1. 普通dict（无条件）: {"extra_battle_strength_points": 1}
+    2. 带条件的dict: {"extra_battle_strength_points": 2, "when": "avatar.weapon.type == WeaponType.SWORD"}
+    3. 条件数组: [{"extra_battle_strength_points": 2, "when": "..."}, {...}]
+    
+    Args:
+        effect: 原始effect配置（dict或list）
+        avatar: 当前角色对象
+        context: 可选的 eval 上下文（见 build_effect_eval_context），批量评估时复用
+    
+    Returns:
+        评估后实际生效的effect dict（合并所有满足条件的effects）
+    """
+    if context is None:
+        context = build_effect_eval_context(avatar)
     
     def _check_condition(when_expr: str) -> bool:
         """检查条件表达式是否为真"""
         if not when_expr:
             return True
+        if not isinstance(when_expr, str):
+            return False
+        code = compile_effect_expression(when_expr)
+        if code is None:
+            return False
         try:
-            return bool(eval(when_expr, safe_context, {}))
+            return bool(eval(code, context, {}))
         except Exception:
             # 条件评估失败时视为False
             return False
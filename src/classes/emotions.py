@@ -12,6 +12,30 @@ class EmotionType(Enum):
     CONFUSED = "emotion_confused"
     TIRED = "emotion_tired"
 
+# 决策 prompt（各语言 ai.txt / ai_batch.txt）让模型用本地化词汇作答，词表顺序与 EmotionType 一致
+_EMOTION_PROMPT_WORDS = (
+    ("平静", "开心", "愤怒", "悲伤", "恐惧", "惊讶", "期待", "厌恶", "疑惑", "疲惫"),
+    ("平靜", "開心", "憤怒", "悲傷", "恐懼", "驚訝", "期待", "厭惡", "疑惑", "疲憊"),
+    ("Calm", "Happy", "Angry", "Sad", "Fearful", "Surprised", "Expectant", "Disgusted", "Confused", "Exhausted"),
+    ("Bình thản", "Vui mừng", "Phẫn nộ", "Bi thương", "Sợ hãi", "Kinh ngạc", "Kỳ vọng", "Chán ghét", "Nghi hoặc", "Mỏi mệt"),
+)
+
+_EMOTION_ALIASES: dict[str, "EmotionType"] = {}
+for _emotion in EmotionType:
+    _EMOTION_ALIASES[_emotion.value] = _emotion
+    _EMOTION_ALIASES[_emotion.name.lower()] = _emotion
+for _words in _EMOTION_PROMPT_WORDS:
+    for _emotion, _word in zip(EmotionType, _words):
+        _EMOTION_ALIASES[_word.lower()] = _emotion
+
+
+def parse_emotion(raw) -> "EmotionType | None":
+    """把模型返回的情绪（枚举值、枚举名或 prompt 中的本地化词）解析为 EmotionType，无法识别时返回 None"""
+    if isinstance(raw, EmotionType):
+        return raw
+    return _EMOTION_ALIASES.get(str(raw or "").strip().lower())
+
+
 # 情绪对应的 Emoji 配置
 EMOTION_EMOJIS = {
     EmotionType.CALM: "😌",
@@ -6,6 +6,7 @@ SQLite 事件存储层。
 from __future__ import annotations
 
 import json
+import re
 import sqlite3
 import threading
 from pathlib import Path
@@ -19,6 +20,82 @@ if TYPE_CHECKING:
     from src.classes.event import Event
     from src.classes.event_observation import EventObservation
 
+# WAL 模式下 synchronous=NORMAL 只在 checkpoint 时 fsync，掉电最多丢最近一批事务，但不会损坏数据库。
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16384",  # 负数单位为 KiB，即 16 MiB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+# 关联表冗余事件的 month_stamp / rowid / 大事标记，时间线分页可以直接沿覆盖索引倒序走，
+# 不必回表排序。major_scope = is_major AND NOT is_story，与 major_scope="major" 的筛选口径一致。
+_DENORMALIZED_COLUMNS = (
+    ("month_stamp", "INTEGER NOT NULL DEFAULT 0"),
+    ("event_rowid", "INTEGER NOT NULL DEFAULT 0"),
+    ("major_scope", "INTEGER NOT NULL DEFAULT 0"),
+)
+_MAJOR_SCOPE_SQL = "(CASE WHEN is_major AND NOT is_story THEN 1 ELSE 0 END)"
+
+# 旧的单列索引被下面的时间线索引（同前缀）取代；events(month_stamp DESC) 内 rowid 为升序，
+# 无法满足 ORDER BY month_stamp DESC, rowid DESC，改用升序索引倒序扫描。
+# 角色索引末尾带 event_id，Pair 查询按它连接第二个角色时也不必回表。
+_TIMELINE_INDEXES = """
+    DROP INDEX IF EXISTS idx_events_month_stamp;
+    DROP INDEX IF EXISTS idx_event_avatars_avatar_id;
+    DROP INDEX IF EXISTS idx_event_sects_sect_id;
+    CREATE INDEX IF NOT EXISTS idx_events_timeline
+        ON events(month_stamp);
+    CREATE INDEX IF NOT EXISTS idx_events_scope_timeline
+        ON events(major_scope, month_stamp);
+    CREATE INDEX IF NOT EXISTS idx_event_avatars_timeline
+        ON event_avatars(avatar_id, month_stamp DESC, event_rowid DESC, event_id);
+    CREATE INDEX IF NOT EXISTS idx_event_avatars_scope_timeline
+        ON event_avatars(avatar_id, major_scope, month_stamp DESC, event_rowid DESC, event_id);
+    CREATE INDEX IF NOT EXISTS idx_event_sects_timeline
+        ON event_sects(sect_id, month_stamp DESC, event_rowid DESC);
+    CREATE INDEX IF NOT EXISTS idx_event_sects_scope_timeline
+        ON event_sects(sect_id, major_scope, month_stamp DESC, event_rowid DESC);
+"""
+
+# 全文检索：普通 FTS5 表，rowid 与 events.rowid 一致；body 为事件正文，observed 为转述给旁观者的观察文本。
+# unicode61 不会切分连续的汉字，写入和查询前都先把 CJK 字符逐字隔开，再用短语查询匹配任意长度的片段。
+_SEARCH_INDEX_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(body, observed);
+    CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN
+        DELETE FROM events_fts WHERE rowid = old.rowid;
+    END;
+"""
+_SEARCH_BACKFILL_BATCH = 2000
+_CJK_CHAR_RE = re.compile(r"([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff])")
+
+_EVENT_COLUMNS_SQL = (
+    "e.rowid, e.id, e.month_stamp, e.content, e.is_major, e.is_story, "
+    "e.event_type, e.render_key, e.render_params, e.subject_snapshots, e.created_at"
+)
+
+
+def _segment_search_text(text: str) -> str:
+    """CJK 字符两侧补空格，让 unicode61 分词器逐字切分。"""
+    return _CJK_CHAR_RE.sub(r" \1 ", text or "")
+
+
+def _build_match_expression(query: str) -> str:
+    """
+    把用户输入转成 FTS5 MATCH 表达式：按空白拆词，每个词作为一个短语，词之间为 AND。
+
+    一律加引号，用户输入中的 FTS 语法字符（*、-、NEAR 等）按普通文本处理。
+    """
+    phrases = []
+    for term in (query or "").split():
+        tokens = _segment_search_text(term).split()
+        if tokens:
+            phrases.append('"' + " ".join(tokens).replace('"', '""') + '"')
+    return " ".join(phrases)
+
+
 def _format_time(ts: float) -> str:
     """将 timestamp float 转换为 SQLite 兼容的 UTC 字符串"""
     return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d %H:%M:%S.%f')
@@ -44,7 +121,7 @@ class EventStorage:
     SQLite 事件存储层。
 
     提供：
-    - 实时写入事件
+    - 实时写入事件（支持按月批量写入）
     - 分页查询（cursor-based）
     - 按角色/角色对查询
     - 历史清理
@@ -58,9 +135,15 @@ class EventStorage:
             db_path: 数据库文件路径。
         """
         self._db_path = db_path
+        # 查询连接：所有读操作走这里。
         self._conn: Optional[sqlite3.Connection] = None
-        # 单连接模型下，用可重入锁串行化所有 SQL 操作，避免读写交错污染连接状态。
+        # 同一连接上用可重入锁串行化 SQL 操作，避免交错污染连接状态。
         self._db_lock = threading.RLock()
+        # 写连接：WAL 模式下写事务不阻塞读连接上的查询；WAL 不可用时与查询连接共用。
+        self._write_conn: Optional[sqlite3.Connection] = None
+        self._write_lock = self._db_lock
+        # SQLite 未编译 FTS5 时为 False，搜索退化为 LIKE 扫描。
+        self._search_enabled = False
         self._logger = get_logger().logger
         self._init_db()
 
@@ -71,11 +154,8 @@ class EventStorage:
                 # 确保目录存在。
                 self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
-                self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
-                self._conn.row_factory = sqlite3.Row
-
-                # 启用外键约束。
-                self._conn.execute("PRAGMA foreign_keys = ON")
+                self._conn = self._connect()
+                wal_enabled = self._is_wal(self._conn)
 
                 # 创建表。
                 self._conn.executescript("""
@@ -89,34 +169,35 @@ class EventStorage:
                         render_key TEXT,
                         render_params TEXT,
                         subject_snapshots TEXT,
+                        major_scope INTEGER NOT NULL DEFAULT 0,
                         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     );
 
                     CREATE TABLE IF NOT EXISTS event_avatars (
                         event_id TEXT NOT NULL,
                         avatar_id TEXT NOT NULL,
+                        month_stamp INTEGER NOT NULL DEFAULT 0,
+                        event_rowid INTEGER NOT NULL DEFAULT 0,
+                        major_scope INTEGER NOT NULL DEFAULT 0,
                         PRIMARY KEY (event_id, avatar_id),
                         FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
                     );
 
-                    CREATE INDEX IF NOT EXISTS idx_events_month_stamp
-                        ON events(month_stamp DESC);
                     CREATE INDEX IF NOT EXISTS idx_events_is_major
                         ON events(is_major);
-                    CREATE INDEX IF NOT EXISTS idx_event_avatars_avatar_id
-                        ON event_avatars(avatar_id);
                     CREATE INDEX IF NOT EXISTS idx_event_avatars_event_id
                         ON event_avatars(event_id);
 
                     CREATE TABLE IF NOT EXISTS event_sects (
                         event_id TEXT NOT NULL,
                         sect_id INTEGER NOT NULL,
+                        month_stamp INTEGER NOT NULL DEFAULT 0,
+                        event_rowid INTEGER NOT NULL DEFAULT 0,
+                        major_scope INTEGER NOT NULL DEFAULT 0,
                         PRIMARY KEY (event_id, sect_id),
                         FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
                     );
 
-                    CREATE INDEX IF NOT EXISTS idx_event_sects_sect_id
-                        ON event_sects(sect_id);
                     CREATE INDEX IF NOT EXISTS idx_event_sects_event_id
                         ON event_sects(event_id);
 
@@ -139,27 +220,126 @@ class EventStorage:
                     CREATE INDEX IF NOT EXISTS idx_event_observations_subject_avatar_id
                         ON event_observations(subject_avatar_id);
                 """)
-                columns = {
-                    row["name"]
-                    for row in self._conn.execute("PRAGMA table_info(events)").fetchall()
-                }
+                columns = self._table_columns(self._conn, "events")
                 if "subject_snapshots" not in columns:
                     self._conn.execute("ALTER TABLE events ADD COLUMN subject_snapshots TEXT")
+                self._migrate_timeline_columns(self._conn)
+                self._conn.executescript(_TIMELINE_INDEXES)
+                self._search_enabled = self._init_search_index(self._conn)
                 self._conn.commit()
-            self._logger.info(f"EventStorage initialized: {self._db_path}")
+
+                if wal_enabled:
+                    self._write_conn = self._connect()
+                    self._write_lock = threading.RLock()
+                else:
+                    self._write_conn = self._conn
+            self._logger.info(f"EventStorage initialized: {self._db_path} (wal={wal_enabled})")
         except Exception as e:
             self._logger.error(f"Failed to initialize EventStorage: {e}")
             raise
 
+    @staticmethod
+    def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
+        return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+    def _migrate_timeline_columns(self, conn: sqlite3.Connection) -> None:
+        """旧库补齐冗余列并按事件主表回填（只在缺列时执行一次）。"""
+        if "major_scope" not in self._table_columns(conn, "events"):
+            conn.execute("ALTER TABLE events ADD COLUMN major_scope INTEGER NOT NULL DEFAULT 0")
+            conn.execute(f"UPDATE events SET major_scope = {_MAJOR_SCOPE_SQL}")
+
+        for table in ("event_avatars", "event_sects"):
+            columns = self._table_columns(conn, table)
+            missing = [(name, decl) for name, decl in _DENORMALIZED_COLUMNS if name not in columns]
+            if not missing:
+                continue
+            for name, decl in missing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+            conn.execute(
+                f"""
+                UPDATE {table}
+                SET (month_stamp, event_rowid, major_scope) = (
+                    SELECT e.month_stamp, e.rowid, e.major_scope FROM events e WHERE e.id = {table}.event_id
+                )
+                WHERE EXISTS (SELECT 1 FROM events e WHERE e.id = {table}.event_id)
+                """
+            )
+            self._logger.info(f"EventStorage migrated {table} timeline columns")
+
+    def _init_search_index(self, conn: sqlite3.Connection) -> bool:
+        """创建全文索引；新建时把已有事件补进索引（旧存档首次打开时执行一次）。"""
+        existed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events_fts'"
+        ).fetchone() is not None
+        try:
+            conn.executescript(_SEARCH_INDEX_SCHEMA)
+        except sqlite3.OperationalError as e:
+            self._logger.warning(f"FTS5 unavailable, event search falls back to LIKE: {e}")
+            return False
+        if not existed:
+            self._backfill_search_index(conn)
+        return True
+
+    def _backfill_search_index(self, conn: sqlite3.Connection) -> None:
+        last_rowid, indexed = 0, 0
+        while True:
+            rows = conn.execute(
+                f"SELECT {_EVENT_COLUMNS_SQL} FROM events e WHERE e.rowid > ? ORDER BY e.rowid LIMIT ?",
+                (last_rowid, _SEARCH_BACKFILL_BATCH),
+            ).fetchall()
+            if not rows:
+                break
+            observation_map = self._load_observation_map_for_events([row["id"] for row in rows])
+            search_rows = []
+            for row in rows:
+                event = self._row_to_event(row, avatar_map={}, sect_map={})
+                search_rows.append((
+                    row["rowid"],
+                    _segment_search_text(event.content),
+                    self._observed_search_text(event, observation_map.get(event.id, [])),
+                ))
+            conn.executemany("INSERT INTO events_fts (rowid, body, observed) VALUES (?, ?, ?)", search_rows)
+            indexed += len(rows)
+            last_rowid = rows[-1]["rowid"]
+        if indexed:
+            self._logger.info(f"EventStorage indexed {indexed} events for search")
+
+    @staticmethod
+    def _observed_search_text(event: "Event", observation_rows) -> str:
+        """旁观者看到的转述文本（去重，不含与正文相同的 self_direct 文本），已按 CJK 切分。"""
+        from src.classes.event_renderer import render_observed_event
+
+        texts: list[str] = []
+        for observation_row in observation_rows:
+            text = render_observed_event(event, observation_row)
+            if text and text != event.content and text not in texts:
+                texts.append(text)
+        return _segment_search_text("\n".join(texts))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _SQLITE_PRAGMAS:
+            conn.execute(pragma)
+        # 启用外键约束。
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    @staticmethod
+    def _is_wal(conn: sqlite3.Connection) -> bool:
+        row = conn.execute("PRAGMA journal_mode").fetchone()
+        return bool(row) and str(row[0]).lower() == "wal"
+
     @contextmanager
     def _transaction(self):
-        """事务上下文管理器。"""
-        with self._db_lock:
+        """写事务上下文管理器（在写连接上执行）。"""
+        with self._write_lock:
+            conn = self._write_conn
             try:
-                yield self._conn
-                self._conn.commit()
+                yield conn
+                conn.commit()
             except Exception:
-                self._conn.rollback()
+                conn.rollback()
                 raise
 
     def add_event(self, event: "Event") -> bool:
@@ -179,75 +359,134 @@ class EventStorage:
             return False
 
         try:
-            with self._transaction():
-                # 插入事件主表。
-                self._conn.execute(
-                    """
-                    INSERT OR IGNORE INTO events (
-                        id, month_stamp, content, is_major, is_story, event_type, render_key, render_params, subject_snapshots, created_at
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        event.id,
-                        int(event.month_stamp),
-                        event.content,
-                        event.is_major,
-                        event.is_story,
-                        event.event_type,
-                        event.render_key,
-                        json.dumps(event.render_params, ensure_ascii=False) if event.render_params is not None else None,
-                        json.dumps(getattr(event, "subject_snapshots", {}), ensure_ascii=False),
-                        _format_time(event.created_at),
-                    )
-                )
-
-                # 插入关联表。
-                if event.related_avatars:
-                    for avatar_id in event.related_avatars:
-                        self._conn.execute(
-                            """
-                            INSERT OR IGNORE INTO event_avatars (event_id, avatar_id)
-                            VALUES (?, ?)
-                            """,
-                            (event.id, str(avatar_id))
-                        )
-                
-                # 插入宗门关联表。
-                if getattr(event, "related_sects", None):
-                    for sect_id in event.related_sects:
-                        self._conn.execute(
-                            """
-                            INSERT OR IGNORE INTO event_sects (event_id, sect_id)
-                            VALUES (?, ?)
-                            """,
-                            (event.id, int(sect_id))
-                        )
-
-                for observation in self._build_observations_for_event(event):
-                    self._conn.execute(
-                        """
-                        INSERT OR IGNORE INTO event_observations (
-                            id, event_id, observer_avatar_id, subject_avatar_id,
-                            propagation_kind, relation_type, created_at
-                        )
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            observation.id,
-                            event.id,
-                            str(observation.observer_avatar_id),
-                            str(observation.subject_avatar_id) if observation.subject_avatar_id is not None else None,
-                            str(observation.propagation_kind),
-                            observation.relation_type,
-                            _format_time(observation.created_at),
-                        )
-                    )
+            with self._transaction() as conn:
+                self._write_events(conn, [event])
             return True
         except Exception as e:
             self._logger.error(f"Failed to write event {event.id}: {e}")
             return False
 
+    def add_events(self, events: list["Event"]) -> int:
+        """
+        批量写入事件（通常是一个月的全部事件）。
+
+        事件主表、角色/宗门关联表和观察记录在同一个事务里用 executemany 写入。
+        整批失败时回退为逐条写入，避免一条坏数据拖累同批其他事件。
+
+        Returns:
+            成功写入的事件数量。
+        """
+        if not events:
+            return 0
+        if self._conn is None:
+            self._logger.error("EventStorage not initialized")
+            return 0
+
+        try:
+            with self._transaction() as conn:
+                self._write_events(conn, events)
+            return len(events)
+        except Exception as e:
+            self._logger.error(f"Failed to write {len(events)} events in batch, retrying one by one: {e}")
+        return sum(1 for event in events if self.add_event(event))
+
+    def _write_events(self, conn: sqlite3.Connection, events: list["Event"]) -> None:
+        event_rows = []
+        avatar_rows = []
+        sect_rows = []
+        observation_rows = []
+        search_rows = []
+        for event in events:
+            event_rows.append((
+                event.id,
+                int(event.month_stamp),
+                event.content,
+                event.is_major,
+                event.is_story,
+                event.event_type,
+                event.render_key,
+                json.dumps(event.render_params, ensure_ascii=False) if event.render_params is not None else None,
+                json.dumps(getattr(event, "subject_snapshots", {}), ensure_ascii=False),
+                int(bool(event.is_major) and not bool(event.is_story)),
+                _format_time(event.created_at),
+            ))
+            for avatar_id in event.related_avatars or []:
+                avatar_rows.append((event.id, str(avatar_id)))
+            for sect_id in getattr(event, "related_sects", None) or []:
+                sect_rows.append((event.id, int(sect_id)))
+            observations = self._build_observations_for_event(event)
+            if self._search_enabled:
+                rendered_rows = [
+                    {"propagation_kind": o.propagation_kind, "subject_avatar_id": o.subject_avatar_id}
+                    for o in observations
+                ]
+                search_rows.append((
+                    _segment_search_text(event.content),
+                    self._observed_search_text(event, rendered_rows),
+                    event.id,
+                ))
+            for observation in observations:
+                observation_rows.append((
+                    observation.id,
+                    event.id,
+                    str(observation.observer_avatar_id),
+                    str(observation.subject_avatar_id) if observation.subject_avatar_id is not None else None,
+                    str(observation.propagation_kind),
+                    observation.relation_type,
+                    _format_time(observation.created_at),
+                ))
+
+        # 插入事件主表。
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO events (
+                id, month_stamp, content, is_major, is_story, event_type, render_key, render_params,
+                subject_snapshots, major_scope, created_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            event_rows,
+        )
+        # 全文索引：只为首次落库的事件建索引（重复写入被 INSERT OR IGNORE 忽略，索引同样跳过）。
+        if search_rows:
+            conn.executemany(
+                """
+                INSERT INTO events_fts (rowid, body, observed)
+                SELECT e.rowid, ?, ? FROM events e
+                WHERE e.id = ? AND NOT EXISTS (SELECT 1 FROM events_fts f WHERE f.rowid = e.rowid)
+                """,
+                search_rows,
+            )
+        # 插入关联表：冗余列取自已落库的事件行（重复写入时与首次写入保持一致）。
+        if avatar_rows:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO event_avatars (event_id, avatar_id, month_stamp, event_rowid, major_scope)
+                SELECT e.id, ?, e.month_stamp, e.rowid, e.major_scope FROM events e WHERE e.id = ?
+                """,
+                [(avatar_id, event_id) for event_id, avatar_id in avatar_rows],
+            )
+        # 插入宗门关联表。
+        if sect_rows:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO event_sects (event_id, sect_id, month_stamp, event_rowid, major_scope)
+                SELECT e.id, ?, e.month_stamp, e.rowid, e.major_scope FROM events e WHERE e.id = ?
+                """,
+                [(sect_id, event_id) for event_id, sect_id in sect_rows],
+            )
+        if observation_rows:
+            conn.executemany(
+                """
+                INSERT OR IGNORE INTO event_observations (
+                    id, event_id, observer_avatar_id, subject_avatar_id,
+                    propagation_kind, relation_type, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                observation_rows,
+            )
+
     def _build_observations_for_event(self, event: "Event") -> list["EventObservation"]:
         from src.classes.event_observation import EventObservation
 
@@ -412,6 +651,86 @@ class EventStorage:
         """生成复合 cursor。"""
         return f"{month_stamp}_{rowid}"
 
+    def _build_timeline_query(
+        self,
+        *,
+        avatar_id: Optional[str] = None,
+        avatar_id_pair: Optional[tuple[str, str]] = None,
+        sect_id: Optional[int] = None,
+        major_scope: Optional[str] = None,
+        since_month_stamp: Optional[int] = None,
+        until_month_stamp: Optional[int] = None,
+        search_query: Optional[str] = None,
+        events_index_hint: str = "",
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[str, list]:
+        """
+        构建时间线分页 SQL：最新的在前，(month_stamp, rowid) 倒序，cursor 取更旧的一页。
+
+        带筛选时从关联表出发，沿 (id, [major_scope,] month_stamp DESC, event_rowid DESC) 索引顺序读取，
+        再按 rowid 回表取事件，不需要临时 B 树排序；CROSS JOIN 固定连接顺序，避免规划器改从 events 出发。
+        search_query 非空时追加全文检索条件（见 _search_clauses）；events_index_hint 只作用于不带筛选的情况。
+        """
+        params: list = []
+        where_clauses: list[str] = []
+        if avatar_id_pair or avatar_id or sect_id is not None:
+            if avatar_id_pair:
+                # Pair 查询：两个角色都相关的事件，由第一个角色的时间线驱动。
+                id1, id2 = avatar_id_pair
+                link, key_column, key = "event_avatars", "avatar_id", id1
+                join_pair = """
+                    CROSS JOIN event_avatars ea2
+                        ON ea2.event_id = l.event_id AND ea2.avatar_id = ?
+                """
+            elif avatar_id:
+                link, key_column, key, join_pair = "event_avatars", "avatar_id", avatar_id, ""
+            else:
+                link, key_column, key, join_pair = "event_sects", "sect_id", sect_id, ""
+            query = f"""
+                SELECT {_EVENT_COLUMNS_SQL}
+                FROM {link} l
+                {join_pair}
+                CROSS JOIN events e ON e.rowid = l.event_rowid
+            """
+            if avatar_id_pair:
+                params.append(id2)
+            where_clauses.append(f"l.{key_column} = ?")
+            params.append(key)
+            prefix = "l"
+            order_columns = ("l.month_stamp", "l.event_rowid")
+        else:
+            # 全部事件。
+            query = f"SELECT {_EVENT_COLUMNS_SQL} FROM events e {events_index_hint}"
+            prefix = "e"
+            order_columns = ("e.month_stamp", "e.rowid")
+
+        if major_scope in ("major", "minor"):
+            where_clauses.append(f"{prefix}.major_scope = ?")
+            params.append(1 if major_scope == "major" else 0)
+        if since_month_stamp is not None:
+            where_clauses.append(f"{order_columns[0]} >= ?")
+            params.append(int(since_month_stamp))
+        if until_month_stamp is not None:
+            where_clauses.append(f"{order_columns[0]} <= ?")
+            params.append(int(until_month_stamp))
+        if search_query:
+            search_clauses, search_params = self._search_clauses(search_query, order_columns[1])
+            where_clauses.extend(search_clauses)
+            params.extend(search_params)
+
+        # Cursor 条件（获取更旧的事件）；使用 rowid 保证同一 month_stamp 内的确定性顺序。
+        if cursor:
+            cursor_month, cursor_rowid = self._parse_cursor(cursor)
+            where_clauses.append(f"({order_columns[0]}, {order_columns[1]}) < (?, ?)")
+            params.extend([cursor_month, cursor_rowid])
+
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+        query += f" ORDER BY {order_columns[0]} DESC, {order_columns[1]} DESC LIMIT ?"
+        params.append(limit)
+        return query, params
+
     def get_events(
         self,
         avatar_id: Optional[str] = None,
@@ -441,72 +760,14 @@ class EventStorage:
         params: list = []
         try:
             with self._db_lock:
-                # 构建查询。
-                if avatar_id_pair:
-                    # Pair 查询：两个角色都相关的事件。
-                    id1, id2 = avatar_id_pair
-                    base_query = """
-                        SELECT DISTINCT
-                            e.rowid, e.id, e.month_stamp, e.content, e.is_major, e.is_story,
-                            e.event_type, e.render_key, e.render_params, e.subject_snapshots, e.created_at
-                        FROM events e
-                        JOIN event_avatars ea1 ON e.id = ea1.event_id AND ea1.avatar_id = ?
-                        JOIN event_avatars ea2 ON e.id = ea2.event_id AND ea2.avatar_id = ?
-                    """
-                    params.extend([id1, id2])
-                elif avatar_id:
-                    # 单角色查询。
-                    base_query = """
-                        SELECT DISTINCT
-                            e.rowid, e.id, e.month_stamp, e.content, e.is_major, e.is_story,
-                            e.event_type, e.render_key, e.render_params, e.subject_snapshots, e.created_at
-                        FROM events e
-                        JOIN event_avatars ea ON e.id = ea.event_id AND ea.avatar_id = ?
-                    """
-                    params.append(avatar_id)
-                elif sect_id is not None:
-                    # 宗门查询。
-                    base_query = """
-                        SELECT DISTINCT
-                            e.rowid, e.id, e.month_stamp, e.content, e.is_major, e.is_story,
-                            e.event_type, e.render_key, e.render_params, e.subject_snapshots, e.created_at
-                        FROM events e
-                        JOIN event_sects es ON e.id = es.event_id AND es.sect_id = ?
-                    """
-                    params.append(sect_id)
-                else:
-                    # 全部事件。
-                    base_query = """
-                        SELECT
-                            rowid, id, month_stamp, content, is_major, is_story,
-                            event_type, render_key, render_params, e.subject_snapshots, e.created_at
-                        FROM events e
-                    """
-
-                # Cursor 条件（获取更旧的事件）。
-                # 使用 rowid 保证同一 month_stamp 内的确定性顺序。
-                where_clauses = []
-                if major_scope == "major":
-                    where_clauses.append("e.is_major = TRUE AND e.is_story = FALSE")
-                elif major_scope == "minor":
-                    where_clauses.append("(e.is_major = FALSE OR e.is_story = TRUE)")
-
-                if cursor:
-                    cursor_month, cursor_rowid = self._parse_cursor(cursor)
-                    where_clauses.append(
-                        "(e.month_stamp < ? OR (e.month_stamp = ? AND e.rowid < ?))"
-                    )
-                    params.extend([cursor_month, cursor_month, cursor_rowid])
-
-                # 组装 WHERE。
-                if where_clauses:
-                    base_query += " WHERE " + " AND ".join(where_clauses)
-
-                # 排序和分页（最新的在前，向上加载更旧的）。
-                # 使用 rowid 保证同一 month_stamp 内的插入顺序。
-                base_query += " ORDER BY e.month_stamp DESC, e.rowid DESC LIMIT ?"
-                params.append(limit + 1)  # 多取一条判断是否有更多。
-
+                base_query, params = self._build_timeline_query(
+                    avatar_id=avatar_id,
+                    avatar_id_pair=avatar_id_pair,
+                    sect_id=sect_id,
+                    major_scope=major_scope,
+                    cursor=cursor,
+                    limit=limit + 1,  # 多取一条判断是否有更多。
+                )
                 rows = self._conn.execute(base_query, params).fetchall()
 
                 # 判断是否有更多。
@@ -542,6 +803,122 @@ class EventStorage:
             )
             return [], None
 
+    def _search_clauses(self, query: str, rowid_column: str) -> tuple[list[str], list]:
+        """全文检索条件：FTS5 命中集合（只物化 rowid，一次性建临时索引）；FTS5 不可用时逐词 LIKE。"""
+        if self._search_enabled:
+            return (
+                [f"{rowid_column} IN (SELECT rowid FROM events_fts WHERE events_fts MATCH ?)"],
+                [_build_match_expression(query)],
+            )
+        clauses, params = [], []
+        for term in query.split():
+            escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("e.content LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        return clauses, params
+
+    def _build_search_query(
+        self,
+        query: str,
+        *,
+        avatar_id: Optional[str] = None,
+        avatar_id_pair: Optional[tuple[str, str]] = None,
+        sect_id: Optional[int] = None,
+        major_scope: Optional[str] = None,
+        since_month_stamp: Optional[int] = None,
+        until_month_stamp: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[str, list]:
+        """
+        全文检索分页 SQL：时间线查询限定在命中集合内，排序与 cursor 与 get_events 完全一致。
+
+        带角色/宗门筛选时沿关联表时间线索引读取即可。不带筛选时按命中数二选一：
+        命中多时沿 events 时间线索引倒序走、凑满一页即停（约读 limit × 总数 / 命中数 行）；
+        命中少时直接按 rowid 取出全部命中再排序（约 命中数 行）。
+        """
+        events_index_hint = ""
+        if self._search_enabled and not (avatar_id_pair or avatar_id or sect_id is not None):
+            if self._is_sparse_match(query, limit):
+                events_index_hint = "NOT INDEXED"
+            elif major_scope in ("major", "minor"):
+                events_index_hint = "INDEXED BY idx_events_scope_timeline"
+            else:
+                events_index_hint = "INDEXED BY idx_events_timeline"
+        return self._build_timeline_query(
+            avatar_id=avatar_id,
+            avatar_id_pair=avatar_id_pair,
+            sect_id=sect_id,
+            major_scope=major_scope,
+            since_month_stamp=since_month_stamp,
+            until_month_stamp=until_month_stamp,
+            search_query=query,
+            events_index_hint=events_index_hint,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    def _is_sparse_match(self, query: str, limit: int) -> bool:
+        """命中数² ≤ limit × 事件总数（以最大 rowid 近似）时，先取命中再排序更省。"""
+        matches = self._conn.execute(
+            "SELECT count(*) FROM events_fts WHERE events_fts MATCH ?", (_build_match_expression(query),)
+        ).fetchone()[0]
+        total = self._conn.execute("SELECT max(rowid) FROM events").fetchone()[0] or 0
+        return matches * matches <= limit * total
+
+    def search_events(
+        self,
+        query: str,
+        avatar_id: Optional[str] = None,
+        avatar_id_pair: Optional[tuple[str, str]] = None,
+        sect_id: Optional[int] = None,
+        major_scope: Optional[str] = None,
+        since_month_stamp: Optional[int] = None,
+        until_month_stamp: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[list["Event"], Optional[str]]:
+        """
+        全文检索事件（正文与旁观者转述文本），最新的在前。
+
+        Args:
+            query: 检索词，空白分隔的多个词需同时命中；中文按任意连续片段匹配。
+            avatar_id / avatar_id_pair / sect_id / major_scope: 与 get_events 相同的筛选。
+            since_month_stamp / until_month_stamp: 月份范围（闭区间）。
+            cursor: 分页 cursor，格式与 get_events 相同。
+            limit: 每页数量。
+
+        Returns:
+            (events, next_cursor)，next_cursor 为 None 表示没有更多。
+        """
+        if self._conn is None or not _build_match_expression(query):
+            return [], None
+
+        sql = ""
+        params: list = []
+        try:
+            with self._db_lock:
+                sql, params = self._build_search_query(
+                    query,
+                    avatar_id=avatar_id,
+                    avatar_id_pair=avatar_id_pair,
+                    sect_id=sect_id,
+                    major_scope=major_scope,
+                    since_month_stamp=since_month_stamp,
+                    until_month_stamp=until_month_stamp,
+                    cursor=cursor,
+                    limit=limit + 1,
+                )
+                rows = self._conn.execute(sql, params).fetchall()
+                has_more = len(rows) > limit
+                rows = rows[:limit]
+                events = self._build_events_from_rows(rows)
+                next_cursor = self._make_cursor(rows[-1]["month_stamp"], rows[-1]["rowid"]) if has_more else None
+                return events, next_cursor
+        except Exception as e:
+            self._logger.exception("Failed to search events: %s | query=%r sql=%r params=%r", e, query, sql, params)
+            return [], None
+
     def get_events_by_avatar(self, avatar_id: str, limit: int = 50) -> list["Event"]:
         """
         后端用：获取角色相关事件（供 LLM prompt 使用）。
@@ -643,17 +1020,7 @@ class EventStorage:
         if self._conn is None:
             return []
 
-        query = """
-                SELECT DISTINCT e.id, e.month_stamp, e.content, e.is_major, e.is_story, e.event_type, e.created_at
-                , e.render_key, e.render_params, e.subject_snapshots
-                FROM events e
-                JOIN event_avatars ea1 ON e.id = ea1.event_id AND ea1.avatar_id = ?
-                JOIN event_avatars ea2 ON e.id = ea2.event_id AND ea2.avatar_id = ?
-                WHERE e.is_major = TRUE AND e.is_story = FALSE
-                ORDER BY e.month_stamp DESC
-                LIMIT ?
-                """
-        params = (id1, id2, limit)
+        query, params = self._build_timeline_query(avatar_id_pair=(id1, id2), major_scope="major", limit=limit)
         try:
             with self._db_lock:
                 rows = self._conn.execute(query, params).fetchall()
@@ -678,17 +1045,7 @@ class EventStorage:
         if self._conn is None:
             return []
 
-        query = """
-                SELECT DISTINCT e.id, e.month_stamp, e.content, e.is_major, e.is_story, e.event_type, e.created_at
-                , e.render_key, e.render_params, e.subject_snapshots
-                FROM events e
-                JOIN event_avatars ea1 ON e.id = ea1.event_id AND ea1.avatar_id = ?
-                JOIN event_avatars ea2 ON e.id = ea2.event_id AND ea2.avatar_id = ?
-                WHERE e.is_major = FALSE OR e.is_story = TRUE
-                ORDER BY e.month_stamp DESC
-                LIMIT ?
-                """
-        params = (id1, id2, limit)
+        query, params = self._build_timeline_query(avatar_id_pair=(id1, id2), major_scope="minor", limit=limit)
         try:
             with self._db_lock:
                 rows = self._conn.execute(query, params).fetchall()
@@ -744,8 +1101,8 @@ class EventStorage:
 
             where_clause = " AND ".join(conditions) if conditions else "1=1"
 
-            with self._transaction():
-                cursor = self._conn.execute(
+            with self._transaction() as conn:
+                cursor = conn.execute(
                     f"DELETE FROM events WHERE {where_clause}",
                     params
                 )
@@ -769,10 +1126,29 @@ class EventStorage:
         except Exception:
             return 0
 
+    def copy_to(self, dest_path: Path) -> None:
+        """
+        把当前数据库一致地复制到 dest_path（存档用）。
+
+        WAL 模式下最新数据可能还在 -wal 文件里，直接复制主文件会丢事件，因此走 SQLite 在线备份。
+        """
+        if self._conn is None:
+            raise RuntimeError("EventStorage not initialized")
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        dest = sqlite3.connect(str(dest_path))
+        try:
+            with self._db_lock:
+                self._conn.backup(dest)
+        finally:
+            dest.close()
+
     def close(self) -> None:
         """关闭数据库连接。"""
         if self._conn:
             try:
+                if self._write_conn is not None and self._write_conn is not self._conn:
+                    with self._write_lock:
+                        self._write_conn.close()
                 with self._db_lock:
                     self._conn.close()
                     self._logger.info("EventStorage closed")
@@ -780,3 +1156,4 @@ class EventStorage:
                 self._logger.error(f"Failed to close EventStorage: {e}")
             finally:
                 self._conn = None
+                self._write_conn = None
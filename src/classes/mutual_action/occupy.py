@@ -61,6 +61,15 @@ class Occupy(PressureAction):
             
         return region, region.host_avatar, ""
 
+    def get_conflict_keys(self, params: dict) -> set[tuple[str, str]]:
+        keys = super().get_conflict_keys(params)
+        region, host, _ = self._get_region_and_host(str(params.get("region_name") or ""))
+        if region is not None:
+            keys.add(("region", str(region.id)))
+        if host is not None:
+            keys.add(("avatar", str(host.id)))
+        return keys
+
     def can_start(self, region_name: str) -> tuple[bool, str]:
         region, host, err = self._get_region_and_host(region_name)
         if err:
@@ -68,11 +68,43 @@ class SectDecider:
         decision_context: "SectDecisionContext",
         world: "World",
     ) -> SectDecisionResult:
+        plan = await cls.plan(sect, decision_context, world)
+        return await cls.execute(sect, decision_context, world, plan)
+
+    @classmethod
+    async def plan(
+        cls,
+        sect: "Sect",
+        decision_context: "SectDecisionContext",
+        world: "World",
+        *,
+        world_info: dict[str, Any] | None = None,
+    ) -> SectDecisionPlan | None:
+        """只生成计划（LLM 调用），不修改世界状态；多个宗门可并发调用，再按顺序 execute"""
+        recruit_cost = int(getattr(CONFIG.sect, "recruit_cost", 500))
+        support_amount = int(getattr(CONFIG.sect, "support_amount", 300))
+        return await cls._plan(
+            sect,
+            decision_context,
+            world,
+            recruit_cost=recruit_cost,
+            support_amount=support_amount,
+            world_info=world_info,
+        )
+
+    @classmethod
+    async def execute(
+        cls,
+        sect: "Sect",
+        decision_context: "SectDecisionContext",
+        world: "World",
+        plan: SectDecisionPlan | None,
+    ) -> SectDecisionResult:
+        """按计划落地外交、招募与成员处置；plan 为 None 时走兜底规则"""
         result = SectDecisionResult()
 
         recruit_cost = int(getattr(CONFIG.sect, "recruit_cost", 500))
         support_amount = int(getattr(CONFIG.sect, "support_amount", 300))
-        plan = await cls._plan(sect, decision_context, world, recruit_cost=recruit_cost, support_amount=support_amount)
 
         cls._process_diplomacy(
             sect=sect,
@@ -114,14 +146,19 @@ class SectDecider:
         *,
         recruit_cost: int,
         support_amount: int,
+        world_info: dict[str, Any] | None = None,
     ) -> SectDecisionPlan | None:
         if not cls._llm_available():
             cls._warn_plan_skip(sect, "LLM runtime config unavailable")
             return None
 
+        if world_info is None:
+            from src.systems.sect_decision_context import serialize_world_info
+
+            world_info = serialize_world_info(world)
         infos = {
             "sect_name": sect.name,
-            "world_info": to_json_str_with_intent(cls._serialize_world_info(world)),
+            "world_info": to_json_str_with_intent(world_info),
             "world_lore": world.world_lore.text,
             "decision_context_info": to_json_str_with_intent(cls._serialize_context(decision_context)),
             "decision_interval_years": int(getattr(CONFIG.sect, "decision_interval_years", 5)),
@@ -161,16 +198,6 @@ class SectDecider:
             preferred_dir=CONFIG.paths.templates,
         )
 
-    @classmethod
-    def _serialize_world_info(cls, world: "World") -> dict[str, Any]:
-        try:
-            info = world.get_info(detailed=True)
-            if isinstance(info, dict):
-                return info
-        except Exception:
-            pass
-        return {}
-
     @classmethod
     def _serialize_context(cls, ctx: "SectDecisionContext") -> dict[str, Any]:
         return {
@@ -262,11 +289,18 @@ class SectDecider:
             if item.get("other_sect_id") is not None
         }
 
+        current_month = int(world.month_stamp)
+
+        def _live_status(target_id: int) -> str:
+            # 上下文在本轮开始时生成；同轮先落地的宗门可能已改变双方外交状态，以当前世界状态为准
+            state = world.get_sect_diplomacy_state(int(sect.id), int(target_id), current_month=current_month)
+            return str(state.get("status", "peace") or "peace")
+
         for target_id in declare_target_ids:
             target = target_by_id.get(int(target_id))
             if target is None:
                 continue
-            if str(target.get("status", "")) == "war":
+            if _live_status(target_id) == "war":
                 continue
             world.declare_sect_war(
                 sect_a_id=int(sect.id),
@@ -291,7 +325,7 @@ class SectDecider:
             target = target_by_id.get(int(target_id))
             if target is None:
                 continue
-            if str(target.get("status", "")) != "war":
+            if _live_status(target_id) != "war":
                 continue
             world.make_sect_peace(
                 sect_a_id=int(sect.id),
@@ -37,14 +37,19 @@ class SectThinker:
         world: "World",
         *,
         decision_summary: str = "",
+        world_info: dict[str, Any] | None = None,
     ) -> str:
         if not cls._llm_available():
             cls._warn_fallback(sect, "LLM runtime config unavailable")
             return cls._fallback(sect)
 
+        if world_info is None:
+            from src.systems.sect_decision_context import serialize_world_info
+
+            world_info = serialize_world_info(world)
         infos = {
             "sect_name": sect.name,
-            "world_info": to_json_str_with_intent(cls._serialize_world_info(world)),
+            "world_info": to_json_str_with_intent(world_info),
             "world_lore": world.world_lore.text,
             "current_phenomenon_info": cls._current_phenomenon_info(world),
             "decision_context_info": to_json_str_with_intent(
@@ -145,16 +150,6 @@ class SectThinker:
             preferred_dir=CONFIG.paths.templates,
         )
 
-    @classmethod
-    def _serialize_world_info(cls, world: "World") -> dict[str, Any]:
-        try:
-            info = world.get_info(detailed=True)
-            if isinstance(info, dict):
-                return info
-        except Exception:
-            pass
-        return {}
-
     @classmethod
     def _current_phenomenon_info(cls, world: "World") -> str:
         phenomenon = getattr(world, "current_phenomenon", None)
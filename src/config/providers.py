@@ -27,6 +27,9 @@ class StaticConfigProvider:
     def max_action_rounds_per_turn(self) -> int:
         return int(self.config.world.max_action_rounds_per_turn)
 
+    def concurrent_action_execution(self) -> bool:
+        return bool(getattr(self.config.world, "concurrent_action_execution", True))
+
     def can_interrupt_major_events(self) -> bool:
         return bool(getattr(self.config.world, "can_interrupt_major_events", False))
 
@@ -6,11 +6,12 @@ import shutil
 import threading
 import time
 from copy import deepcopy
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from pydantic import ValidationError
+from pydantic import ConfigDict, ValidationError
 
 from .data_paths import get_data_paths
 from .settings_schema import (
@@ -29,6 +30,31 @@ from src.i18n.locale_registry import get_default_locale
 
 _SETTINGS_WRITE_LOCK = threading.RLock()
 _REPLACE_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4)
+# 热路径上最多每隔这么久 stat 一次 settings.json / secrets.json，用于发现外部编辑
+_EXTERNAL_EDIT_CHECK_SECONDS = 1.0
+
+FileSignature = tuple[int, int] | None
+
+
+class _FrozenLLMProfile(LLMProfile):
+    """快照中使用的只读 LLMProfile：所有调用方共享同一实例，不允许就地修改"""
+    model_config = ConfigDict(frozen=True)
+
+
+@dataclass(frozen=True)
+class LLMRuntimeSnapshot:
+    """LLM 运行时配置的内存快照；profile 只读，设置变更时整体替换为新快照"""
+    profile: LLMProfile
+    api_key: str
+    version: int
+
+
+def _file_signature(path: Path) -> FileSignature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 def _model_to_dict(model: Any) -> dict[str, Any]:
@@ -37,6 +63,11 @@ def _model_to_dict(model: Any) -> dict[str, Any]:
     return model.dict()
 
 
+def _copy_model(model: Any) -> Any:
+    # 比 deepcopy 快数倍：pydantic 模型走 dump + 构造
+    return type(model)(**_model_to_dict(model))
+
+
 def _is_transient_replace_error(exc: OSError) -> bool:
     return isinstance(exc, PermissionError) or getattr(exc, "winerror", None) in {5, 32}
 
@@ -70,8 +101,24 @@ def _atomic_write_json(path: Path, payload: dict[str, Any]) -> None:
 
 
 class SettingsService:
+    """
+    用户设置读写。
+
+    已解析的 settings / secrets 按文件 (mtime, size) 缓存，未变化时不再读盘和校验；
+    LLM 运行时配置另存一份不可变快照（见 get_llm_runtime_snapshot），
+    通过本服务写入时立即替换，外部编辑最多延迟 _EXTERNAL_EDIT_CHECK_SECONDS 被发现，
+    快照替换后通知 add_change_listener 注册的回调。
+    """
+
     def __init__(self) -> None:
         self.paths = get_data_paths()
+        self._cache_lock = threading.RLock()
+        self._settings_entry: tuple[FileSignature, AppSettings] | None = None
+        self._secrets_entry: tuple[FileSignature, LLMSecrets] | None = None
+        self._llm_snapshot: LLMRuntimeSnapshot | None = None
+        self._llm_snapshot_signatures: tuple[FileSignature, FileSignature] | None = None
+        self._llm_snapshot_checked_at = 0.0
+        self._listeners: list[Callable[[LLMRuntimeSnapshot], None]] = []
 
     def build_default_new_game_defaults(self) -> NewGameDefaults:
         return NewGameDefaults(
@@ -150,24 +197,48 @@ class SettingsService:
                 pass
             return default_model, True
 
+    def _load_cached_model(self, path: Path, entry_name: str, model_cls, build_default):
+        """文件签名未变时直接返回缓存模型的副本；否则读盘解析并缓存"""
+        signature = _file_signature(path)
+        with self._cache_lock:
+            entry = getattr(self, entry_name)
+            if entry is not None and signature is not None and entry[0] == signature:
+                return _copy_model(entry[1]), False
+            model, should_persist = self._load_model(path, model_cls, build_default())
+            if not should_persist:
+                setattr(self, entry_name, (signature, _copy_model(model)))
+            return model, should_persist
+
     def _save_settings(self, settings: AppSettings) -> None:
         _atomic_write_json(self.paths.settings_file, _model_to_dict(settings))
+        with self._cache_lock:
+            self._settings_entry = (_file_signature(self.paths.settings_file), _copy_model(settings))
+            self._invalidate_llm_snapshot()
 
     def _save_secrets(self, secrets: LLMSecrets) -> None:
         _atomic_write_json(self.paths.secrets_file, _model_to_dict(secrets))
+        with self._cache_lock:
+            self._secrets_entry = (_file_signature(self.paths.secrets_file), _copy_model(secrets))
+            self._invalidate_llm_snapshot()
 
     def get_settings(self) -> AppSettings:
-        settings, should_persist = self._load_model(
+        settings, should_persist = self._load_cached_model(
             self.paths.settings_file,
+            "_settings_entry",
             AppSettings,
-            self.build_default_app_settings(),
+            self.build_default_app_settings,
         )
         if should_persist:
             self._save_settings(settings)
         return settings
 
     def get_secrets(self) -> LLMSecrets:
-        secrets, should_persist = self._load_model(self.paths.secrets_file, LLMSecrets, LLMSecrets())
+        secrets, should_persist = self._load_cached_model(
+            self.paths.secrets_file,
+            "_secrets_entry",
+            LLMSecrets,
+            LLMSecrets,
+        )
         if not should_persist:
             return secrets
         seed = self._build_default_llm_seed()
@@ -226,12 +297,14 @@ class SettingsService:
 
         updated = AppSettings(**payload)
         self._save_settings(updated)
+        self._refresh_llm_snapshot()
         return self.get_settings_view()
 
     def reset_settings(self) -> AppSettingsView:
         defaults = self.build_default_app_settings(apply_llm_seed=False)
         self._save_settings(defaults)
         self._save_secrets(LLMSecrets())
+        self._refresh_llm_snapshot()
         return self.get_settings_view()
 
     def get_llm_view(self) -> LLMConfigView:
@@ -278,12 +351,69 @@ class SettingsService:
 
         self._save_settings(settings)
         self._save_secrets(secrets)
+        self._refresh_llm_snapshot()
         return self.get_llm_view()
 
     def get_llm_runtime_config(self) -> tuple[LLMProfile, str]:
-        settings = self.get_settings()
-        secrets = self.get_secrets()
-        return settings.llm.profile, secrets.api_key
+        snapshot = self.get_llm_runtime_snapshot()
+        return snapshot.profile, snapshot.api_key
+
+    def get_llm_runtime_snapshot(self) -> LLMRuntimeSnapshot:
+        """LLM 调用热路径使用：通常只是一次属性读取，不读盘也不做 pydantic 校验"""
+        snapshot = self._llm_snapshot
+        if snapshot is not None and time.monotonic() - self._llm_snapshot_checked_at < _EXTERNAL_EDIT_CHECK_SECONDS:
+            return snapshot
+        return self._refresh_llm_snapshot()
+
+    def _current_signatures(self) -> tuple[FileSignature, FileSignature]:
+        return _file_signature(self.paths.settings_file), _file_signature(self.paths.secrets_file)
+
+    def _refresh_llm_snapshot(self) -> LLMRuntimeSnapshot:
+        with self._cache_lock:
+            previous = self._llm_snapshot
+            if previous is not None and self._current_signatures() == self._llm_snapshot_signatures:
+                self._llm_snapshot_checked_at = time.monotonic()
+                return previous
+
+            settings = self.get_settings()
+            secrets = self.get_secrets()
+            snapshot = LLMRuntimeSnapshot(
+                profile=_FrozenLLMProfile(**_model_to_dict(settings.llm.profile)),
+                api_key=secrets.api_key,
+                version=(previous.version + 1) if previous is not None else 1,
+            )
+            # get_settings / get_secrets 可能刚写入默认值，签名在读取之后再取
+            self._llm_snapshot_signatures = self._current_signatures()
+            self._llm_snapshot_checked_at = time.monotonic()
+            self._llm_snapshot = snapshot
+            changed = previous is not None and (previous.profile, previous.api_key) != (snapshot.profile, snapshot.api_key)
+        if changed:
+            self._notify_listeners(snapshot)
+        return snapshot
+
+    def _invalidate_llm_snapshot(self) -> None:
+        self._llm_snapshot_checked_at = 0.0
+        self._llm_snapshot_signatures = None
+
+    def add_change_listener(self, callback: Callable[[LLMRuntimeSnapshot], None]) -> None:
+        """注册 LLM 运行时配置变更回调（API 修改或外部编辑后，在下一次读取快照时触发）"""
+        with self._cache_lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def remove_change_listener(self, callback: Callable[[LLMRuntimeSnapshot], None]) -> None:
+        with self._cache_lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify_listeners(self, snapshot: LLMRuntimeSnapshot) -> None:
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception:
+                from src.run.log import get_logger
+
+                get_logger().logger.exception("LLM settings change listener %r failed", callback)
 
     def get_llm_test_payload(self, update: LLMSettingsUpdate) -> tuple[LLMProfile, str]:
         secrets = self.get_secrets()
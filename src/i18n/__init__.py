@@ -49,14 +49,14 @@ def _get_current_lang() -> str:
         return get_default_locale()
 
 
-def _get_translation() -> Optional[gettext.GNUTranslations]:
+def _get_translation(lang: Optional[str] = None) -> Optional[gettext.GNUTranslations]:
     """
     Get translation object for current language.
     
     Returns:
         GNUTranslations object or None if not found.
     """
-    lang = _get_current_lang()
+    lang = lang or _get_current_lang()
     
     if lang not in _translations:
         locale_dir = _get_locale_dir()
@@ -166,7 +166,8 @@ def t(message: str, **kwargs) -> str:
         # zh-CN: "Zhang San 战胜了 Li Si"
         # en-US: "Zhang San defeated Li Si"
     """
-    trans = _get_translation()
+    lang = _get_current_lang()
+    trans = _get_translation(lang)
     
     if trans:
         translated = trans.gettext(message)
@@ -177,7 +178,7 @@ def t(message: str, **kwargs) -> str:
     # Do not treat "translation equals source" as missing by itself because
     # some entries are intentionally identical across locales.
     if (
-        _get_current_lang() != get_fallback_locale()
+        lang != get_fallback_locale()
         and message.strip()
         and not _has_explicit_translation_entry(trans, message)
     ):
@@ -215,5 +216,9 @@ def reload_translations() -> None:
     """
     _translations.clear()
 
+    from src.utils.prompt_fragments import invalidate_prompt_fragments
+
+    invalidate_prompt_fragments()
+
 
 __all__ = ["t", "t_for_locale", "reload_translations"]
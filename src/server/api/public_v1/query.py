@@ -11,11 +11,13 @@ def create_public_query_router(
     *,
     query_service: Any | None = None,
     build_runtime_status: Callable[[], dict] | None = None,
+    build_phase_metrics: Callable[..., dict] | None = None,
     build_world_state: Callable[[], dict] | None = None,
     build_world_map: Callable[[], dict] | None = None,
     build_map_presets: Callable[..., dict] | None = None,
     build_current_run: Callable[[], dict] | None = None,
     build_events_page: Callable[..., dict] | None = None,
+    build_events_search: Callable[..., dict] | None = None,
     build_rankings: Callable[[], dict] | None = None,
     build_sect_relations: Callable[[], dict] | None = None,
     build_game_data: Callable[[], dict] | None = None,
@@ -43,6 +45,12 @@ def create_public_query_router(
             return ok_response(query_service.get_runtime_status())
         return ok_response(build_runtime_status())
 
+    @router.get("/api/v1/query/runtime/phase-metrics")
+    def get_phase_metrics_v1(limit: int = Query(20, ge=0)):
+        if query_service is not None:
+            return ok_response(query_service.get_phase_metrics(limit=limit))
+        return ok_response(build_phase_metrics(limit=limit))
+
     @router.get("/api/v1/query/world/state")
     def get_world_state_v1():
         if query_service is not None:
@@ -99,6 +107,35 @@ def create_public_query_router(
             )
         )
 
+    @router.get("/api/v1/query/events/search")
+    def search_events_v1(
+        q: str = Query(..., min_length=1, max_length=200),
+        avatar_id: str = None,
+        avatar_id_1: str = None,
+        avatar_id_2: str = None,
+        sect_id: int = None,
+        major_scope: str = Query("all", pattern="^(all|major|minor)$"),
+        since_month: int = None,
+        until_month: int = None,
+        cursor: str = None,
+        limit: int = Query(100, ge=1, le=500),
+    ):
+        params = dict(
+            query=q,
+            avatar_id=avatar_id,
+            avatar_id_1=avatar_id_1,
+            avatar_id_2=avatar_id_2,
+            sect_id=sect_id,
+            major_scope=major_scope,
+            since_month=since_month,
+            until_month=until_month,
+            cursor=cursor,
+            limit=limit,
+        )
+        if query_service is not None:
+            return ok_response(query_service.search_events_page(**params))
+        return ok_response(build_events_search(**params))
+
     @router.get("/api/v1/query/rankings")
     def get_rankings_v1():
         if query_service is not None:
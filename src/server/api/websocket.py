@@ -15,7 +15,8 @@ def create_websocket_router(
 
     @router.websocket("/ws")
     async def websocket_endpoint(websocket: WebSocket):
-        await manager.connect(websocket)
+        # 客户端可通过 /ws?format=msgpack 选择二进制帧；服务端未安装 msgpack 时回退为 JSON
+        await manager.connect(websocket, frame_format=websocket.query_params.get("format"))
 
         if game_instance.get("llm_check_failed", False):
             error_msg = game_instance.get("llm_error_message", t("LLM connection failed"))
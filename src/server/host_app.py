@@ -9,6 +9,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.server.mounts import mount_static_apps
+from src.utils.llm.transport import close_connection_pools
 
 
 def create_lifespan(
@@ -46,6 +47,7 @@ def create_lifespan(
         yield
 
         stop_frontend_dev_server(npm_process)
+        await close_connection_pools()
 
     return lifespan
 
@@ -103,11 +105,13 @@ def configure_routes_and_mounts(
     on_llm_updated,
     create_public_query_router,
     build_runtime_status=None,
+    build_phase_metrics=None,
     build_world_state=None,
     build_world_map=None,
     build_map_presets=None,
     build_current_run=None,
     build_events_page=None,
+    build_events_search=None,
     build_rankings=None,
     build_sect_relations=None,
     build_game_data=None,
@@ -195,11 +199,13 @@ def configure_routes_and_mounts(
         create_public_query_router(
             query_service=query_service,
             build_runtime_status=build_runtime_status,
+            build_phase_metrics=build_phase_metrics,
             build_world_state=build_world_state,
             build_world_map=build_world_map,
             build_map_presets=build_map_presets,
             build_current_run=build_current_run,
             build_events_page=build_events_page,
+            build_events_search=build_events_search,
             build_rankings=build_rankings,
             build_sect_relations=build_sect_relations,
             build_game_data=build_game_data,
@@ -307,4 +313,5 @@ def start_server(
         except Exception as exc:
             print(f"Failed to open browser: {exc}")
 
-    uvicorn_module.run(app, host=host, port=port, log_level="info")
+    # 显式开启 permessage-deflate，降低远程观战时 tick 帧的带宽占用
+    uvicorn_module.run(app, host=host, port=port, log_level="info", ws_per_message_deflate=True)
@@ -8,6 +8,8 @@ import threading
 import time
 from fastapi import WebSocket
 
+from src.server.ws_codec import WS_FORMAT_MSGPACK, encode_frames_off_loop, resolve_ws_format
+
 
 class EndpointFilter(logging.Filter):
     """
@@ -30,11 +32,14 @@ class ConnectionManager:
         self.runtime = runtime
         self.is_idle_shutdown_enabled = is_idle_shutdown_enabled or (lambda: False)
         self.active_connections: list[WebSocket] = []
+        # 每个连接协商的帧格式（json 文本帧 / msgpack 二进制帧），未登记的连接按 json 处理
+        self._frame_formats: dict[WebSocket, str] = {}
         self._shutdown_timer: threading.Timer | None = None
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, *, frame_format: str | None = None):
         await websocket.accept()
         self.active_connections.append(websocket)
+        self._frame_formats[websocket] = resolve_ws_format(frame_format)
 
         if self._shutdown_timer:
             self._shutdown_timer.cancel()
@@ -46,6 +51,7 @@ class ConnectionManager:
     def disconnect(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        self._frame_formats.pop(websocket, None)
 
         if len(self.active_connections) == 0:
             self._set_pause_state(True, "所有客户端已断开，自动暂停游戏以节省资源。")
@@ -79,16 +85,24 @@ class ConnectionManager:
             runtime.set_paused(should_pause)
             print(f"[Auto-Control] {log_msg}")
 
-    async def broadcast(self, message: dict):
-        import json
+    def get_frame_format(self, websocket: WebSocket) -> str:
+        return self._frame_formats.get(websocket, resolve_ws_format(None))
 
-        txt = json.dumps(message, default=str)
+    async def broadcast(self, message: dict):
         connections = list(self.active_connections)
+        if not connections:
+            return
+
+        # 每种帧格式只编码一次，并放到工作线程，避免大月份的 tick 阻塞事件循环
+        formats = {connection: self.get_frame_format(connection) for connection in connections}
+        frames = await encode_frames_off_loop(message, set(formats.values()))
 
         async def send(connection: WebSocket) -> WebSocket | None:
             try:
+                frame = frames[formats[connection]]
+                sender = connection.send_bytes if formats[connection] == WS_FORMAT_MSGPACK else connection.send_text
                 await asyncio.wait_for(
-                    connection.send_text(txt),
+                    sender(frame),
                     timeout=self.BROADCAST_SEND_TIMEOUT_SECONDS,
                 )
             except Exception as exc:
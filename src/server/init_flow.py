@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-import random
 from datetime import datetime
 from typing import Any, Callable
 
+from src.sim.world_setup import (
+    apply_world_lore_if_needed,
+    generate_initial_avatars,
+    prepare_initial_character_profiles,
+    resolve_initially_dead_avatars,
+    select_existed_sects,
+)
+
 
 def _create_save_slot(*, config, get_events_db_path) -> tuple[Any, Any]:
     timestamp = datetime.now().strftime("%Y%m%d_%H%M")
@@ -16,116 +23,6 @@ def _create_save_slot(*, config, get_events_db_path) -> tuple[Any, Any]:
     return save_path, events_db_path
 
 
-def _select_existed_sects(*, sects_by_id, needed_sects: int) -> list[Any]:
-    all_sects = list(sects_by_id.values())
-    if needed_sects <= 0 or not all_sects:
-        return []
-
-    pool = list(all_sects)
-    random.shuffle(pool)
-    return pool[:needed_sects]
-
-
-async def _apply_world_lore_if_needed(
-    *,
-    world,
-    run_config,
-    world_lore_manager_cls,
-    build_world_lore_snapshot,
-) -> None:
-    world_lore = run_config.world_lore
-    if not world_lore or not world_lore.strip():
-        return
-
-    world.set_world_lore(world_lore)
-    print(f"Reshaping world based on worldview and history: {world_lore[:50]}...")
-    try:
-        world_lore_mgr = world_lore_manager_cls(world)
-        await world_lore_mgr.apply_world_lore(world_lore)
-        if not getattr(world, "world_lore_snapshot", None):
-            world.world_lore_snapshot = build_world_lore_snapshot(world)
-        print("World lore applied")
-    except Exception as exc:
-        print(f"[Warning] Failed to apply world lore: {exc}")
-
-
-async def _generate_initial_avatars(
-    *,
-    world,
-    run_config,
-    existed_sects,
-    make_random_avatars,
-) -> dict[Any, Any]:
-    target_total_count = int(run_config.init_npc_num)
-    if target_total_count <= 0:
-        return {}
-
-    def _make_random_sync():
-        return make_random_avatars(
-            world,
-            count=target_total_count,
-            current_month_stamp=world.month_stamp,
-            existed_sects=existed_sects,
-        )
-
-    random_avatars = await asyncio.to_thread(_make_random_sync)
-    print(f"Generated {len(random_avatars)} random NPCs")
-    return random_avatars
-
-
-def _resolve_initially_dead_avatars(*, world, avatars: dict[Any, Any]) -> None:
-    """Move pre-generated dead avatars through the normal death pipeline.
-
-    Avatar generation can determine that an NPC's rolled lifespan is already
-    exhausted.  At this point the NPC has not yet been registered, so the
-    generator cannot create its world-facing death artifacts itself.
-    """
-    from src.classes.death import handle_death
-    from src.classes.death_reason import DeathReason, DeathType
-
-    for avatar in avatars.values():
-        if getattr(avatar, "is_dead", False):
-            handle_death(world, avatar, DeathReason(DeathType.OLD_AGE))
-
-
-async def _prepare_initial_character_profiles(*, world) -> None:
-    from src.sim.simulator_engine.phases import lifecycle
-
-    avatar_manager = getattr(world, "avatar_manager", None)
-    if avatar_manager is None:
-        return
-
-    if hasattr(avatar_manager, "get_living_avatars"):
-        living_avatars = list(avatar_manager.get_living_avatars())
-    else:
-        living_avatars = list(getattr(avatar_manager, "avatars", {}).values())
-    if not living_avatars:
-        return
-
-    print("Preparing initial character profiles...")
-    objective_results = await asyncio.gather(
-        *[lifecycle.process_avatar_long_term_objective(avatar) for avatar in living_avatars],
-        return_exceptions=True,
-    )
-    event_manager = getattr(world, "event_manager", None)
-    if event_manager is not None:
-        for result in objective_results:
-            if isinstance(result, Exception):
-                print(f"[Warning] Initial long-term objective generation failed: {result}")
-                continue
-            if result is not None:
-                event_manager.add_event(result)
-
-    backstory_results = await asyncio.gather(
-        *[lifecycle.process_avatar_backstory(avatar) for avatar in living_avatars],
-        return_exceptions=True,
-    )
-    for result in backstory_results:
-        if isinstance(result, Exception):
-            print(f"[Warning] Initial backstory generation failed: {result}")
-    print("Initial character profiles prepared")
-
-
 async def _run_llm_check_background(
     *,
     runtime,
@@ -262,7 +159,7 @@ async def perform_game_initialization(
         world.run_config_snapshot = model_to_dict(run_config)
 
         update_init_progress(2, "shaping_world_lore")
-        await _apply_world_lore_if_needed(
+        await apply_world_lore_if_needed(
             world=world,
             run_config=run_config,
             world_lore_manager_cls=world_lore_manager_cls,
@@ -270,13 +167,13 @@ async def perform_game_initialization(
         )
 
         update_init_progress(3, "initializing_sects")
-        existed_sects = _select_existed_sects(
+        existed_sects = select_existed_sects(
             sects_by_id=sects_by_id,
             needed_sects=int(run_config.sect_num or 0),
         )
 
         update_init_progress(4, "generating_avatars")
-        final_avatars = await _generate_initial_avatars(
+        final_avatars = await generate_initial_avatars(
             world=world,
             run_config=run_config,
             existed_sects=existed_sects,
@@ -284,7 +181,7 @@ async def perform_game_initialization(
         )
 
         world.avatar_manager.avatars.update(final_avatars)
-        _resolve_initially_dead_avatars(world=world, avatars=final_avatars)
+        resolve_initially_dead_avatars(world=world, avatars=final_avatars)
         world.existed_sects = existed_sects
         world.sect_context.from_existed_sects(existed_sects)
         from src.systems.world_secret import initialize_world_secret
@@ -292,7 +189,7 @@ async def perform_game_initialization(
         runtime.update({"world": world, "sim": sim})
 
         update_init_progress(5, "preparing_character_profiles")
-        await _prepare_initial_character_profiles(world=world)
+        await prepare_initial_character_profiles(world=world)
 
         update_init_progress(6, "generating_initial_events")
         runtime.set_paused(True)
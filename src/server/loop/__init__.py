@@ -1,4 +1,5 @@
+from .pacing import TickPacingPolicy
 from .runner import GameLoopRunner
 from .tick_payload import TickPayloadBuilder
 
-__all__ = ["GameLoopRunner", "TickPayloadBuilder"]
+__all__ = ["GameLoopRunner", "TickPacingPolicy", "TickPayloadBuilder"]
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+# Environment variable overrides for headless runs, e.g. CWS_TICK_PACING=max_speed.
+PACING_MODE_ENV = "CWS_TICK_PACING"
+BATCH_STEPS_ENV = "CWS_TICK_BATCH_STEPS"
+
+PACING_FIXED = "fixed"
+PACING_MAX_SPEED = "max_speed"
+PACING_TARGET_RATE = "target_rate"
+PACING_MIN_INTERVAL = "min_interval"
+PACING_MODES = (PACING_FIXED, PACING_MAX_SPEED, PACING_TARGET_RATE, PACING_MIN_INTERVAL)
+
+
+@dataclass(slots=True)
+class TickPacingPolicy:
+    """
+    Decide how long the game loop waits between ticks.
+
+    - fixed: always wait interval_seconds (the historical 1 second sleep).
+    - max_speed: never wait; only yield to the event loop.
+    - target_rate: keep a steady months_per_second schedule. Slow months use up
+      their own budget and are not made up later with a burst.
+    - min_interval: wait interval_seconds per month minus the time the step took.
+
+    batch_steps > 1 runs that many months per tick and broadcasts one coalesced
+    payload. When no step ran (paused, not initialized) the loop waits
+    idle_seconds so it does not spin.
+    """
+
+    mode: str = PACING_FIXED
+    interval_seconds: float = 1.0
+    months_per_second: float = 1.0
+    batch_steps: int = 1
+    idle_seconds: float = 0.5
+    clock: Callable[[], float] = time.monotonic
+    _deadline: float | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.mode not in PACING_MODES:
+            raise ValueError(f"Unknown tick pacing mode: {self.mode}")
+        self.interval_seconds = max(0.0, float(self.interval_seconds))
+        self.months_per_second = max(1e-6, float(self.months_per_second))
+        self.batch_steps = max(1, int(self.batch_steps))
+        self.idle_seconds = max(0.0, float(self.idle_seconds))
+
+    @classmethod
+    def from_config(cls, config: Any = None) -> "TickPacingPolicy":
+        if config is None:
+            from src.utils.config import CONFIG
+
+            config = CONFIG
+        conf = getattr(config, "game_loop", None)
+
+        def _get(name: str, default: Any) -> Any:
+            value = getattr(conf, name, None) if conf is not None else None
+            return default if value is None else value
+
+        mode = str(os.environ.get(PACING_MODE_ENV, _get("pacing", PACING_FIXED))).strip().lower()
+        if mode not in PACING_MODES:
+            print(f"[game_loop] Unknown tick pacing mode {mode!r}, falling back to {PACING_FIXED!r}.")
+            mode = PACING_FIXED
+        batch_steps = os.environ.get(BATCH_STEPS_ENV, _get("batch_steps", 1))
+        return cls(
+            mode=mode,
+            interval_seconds=float(_get("interval_seconds", 1.0)),
+            months_per_second=float(_get("months_per_second", 1.0)),
+            batch_steps=int(batch_steps),
+            idle_seconds=float(_get("idle_seconds", 0.5)),
+        )
+
+    def initial_delay(self) -> float:
+        return self.interval_seconds if self.mode == PACING_FIXED else 0.0
+
+    def delay_after(self, steps: int, elapsed: float) -> float:
+        """Seconds to wait after a tick that ran `steps` months in `elapsed` seconds."""
+        if steps <= 0:
+            self._deadline = None
+            return self.interval_seconds if self.mode == PACING_FIXED else self.idle_seconds
+
+        if self.mode == PACING_FIXED:
+            return self.interval_seconds
+        if self.mode == PACING_MAX_SPEED:
+            return 0.0
+        if self.mode == PACING_MIN_INTERVAL:
+            return max(0.0, self.interval_seconds * steps - elapsed)
+
+        period = 1.0 / self.months_per_second
+        now = self.clock()
+        if self._deadline is None:
+            self._deadline = now - elapsed
+        self._deadline += period * steps
+        if self._deadline < now:
+            # Behind schedule: restart from now instead of bursting to catch up.
+            self._deadline = now
+        return self._deadline - now
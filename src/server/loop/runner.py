@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from typing import Any, Callable
 
+from .pacing import TickPacingPolicy
 from .tick_payload import TickPayloadBuilder
 
 
@@ -18,6 +20,7 @@ class GameLoopRunner:
     build_auto_save_toast: Callable[[], dict[str, Any]]
     get_logger: Callable[[], Any]
     sleep: Callable[[float], Any] = asyncio.sleep
+    pacing: TickPacingPolicy = field(default_factory=TickPacingPolicy)
 
     async def wait_for_initialization(self) -> bool:
         print("Background game loop started, waiting for initialization...")
@@ -35,33 +38,63 @@ class GameLoopRunner:
         if not await self.wait_for_initialization():
             return
 
+        delay = self.pacing.initial_delay()
         while True:
-            await self.sleep(1.0)
-            await self.run_once()
+            await self.sleep(delay)
+            started = time.perf_counter()
+            steps = await self.run_once()
+            delay = self.pacing.delay_after(steps, time.perf_counter() - started)
 
-    async def run_once(self) -> None:
+    def _can_step(self) -> bool:
+        if self.runtime.is_effectively_paused():
+            return False
+        return self.runtime.get("init_status") == "ready"
+
+    async def run_once(self) -> int:
+        """Run one tick (pacing.batch_steps months) and return how many months were simulated."""
+        steps = 0
         try:
-            if self.runtime.is_effectively_paused():
-                return
-            if self.runtime.get("init_status") != "ready":
-                return
+            if not self._can_step():
+                return 0
 
             sim = self.runtime.get("sim")
             world = self.runtime.get("world")
             if not sim or not world:
-                return
+                return 0
 
-            events = await self.runtime.run_mutation(sim.step)
-            if getattr(self.runtime, "is_reset_requested", lambda: False)():
-                return
-            await self.manager.broadcast(self.tick_payload_builder.build(events=events, world=world))
+            # Catch-up batches coalesce the events of several months into one broadcast;
+            # the avatar delta tracker already diffs against the last payload sent.
+            events: list[Any] = []
+            saved_in_batch = False
+            save_after_broadcast = None
+            while True:
+                events.extend(await self.runtime.run_mutation(sim.step) or [])
+                steps += 1
+                if getattr(self.runtime, "is_reset_requested", lambda: False)():
+                    return steps
 
-            should_auto_save, year, _month = self.should_trigger_auto_save(world)
-            if should_auto_save:
-                print(f"[Auto-Save] Triggering auto save for year {year}...")
-                await asyncio.to_thread(self.trigger_auto_save, world, sim)
+                last_step = steps >= self.pacing.batch_steps or not self._can_step()
+                should_auto_save, year, _month = self.should_trigger_auto_save(world)
+                if should_auto_save and last_step:
+                    save_after_broadcast = year
+                elif should_auto_save:
+                    # Mid-batch saves must capture this month before the next step runs.
+                    await self._auto_save(world, sim, year)
+                    saved_in_batch = True
+                if last_step:
+                    break
+
+            await self.manager.broadcast(self.tick_payload_builder.build(events=events, world=world))
+            if save_after_broadcast is not None:
+                await self._auto_save(world, sim, save_after_broadcast)
+            if saved_in_batch or save_after_broadcast is not None:
                 await self.manager.broadcast(self.build_auto_save_toast())
-                print("[Auto-Save] Auto save completed.")
         except Exception as exc:
             print(f"Game loop error: {exc}")
             self.get_logger().logger.error(f"Game loop error: {exc}", exc_info=True)
+        return steps
+
+    async def _auto_save(self, world: Any, sim: Any, year: int) -> None:
+        print(f"[Auto-Save] Triggering auto save for year {year}...")
+        await asyncio.to_thread(self.trigger_auto_save, world, sim)
+        print("[Auto-Save] Auto save completed.")
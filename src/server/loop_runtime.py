@@ -6,10 +6,118 @@ from typing import Any, Callable
 from src.config import get_settings_service
 from src.config.providers import RuntimeConfigProvider
 from src.i18n import t
-from src.server.loop import GameLoopRunner, TickPayloadBuilder
-from src.systems.cultivation_display import build_avatar_cultivation_display
+from src.server.loop import GameLoopRunner, TickPacingPolicy, TickPayloadBuilder
+from src.systems.cultivation_display import (
+    build_avatar_cultivation_display,
+    resolve_cultivation_alias_profile,
+)
 
-AVATAR_POSITION_UPDATE_LIMIT = 50
+class AvatarBroadcastTracker:
+    """
+    Remember what was last broadcast for each living avatar so that tick
+    payloads only carry avatars (and fields) that actually changed.
+
+    The signature per avatar is (x, y, cultivation key, action name, emoji);
+    the cultivation display dict is only rebuilt when its key changes.
+    """
+
+    def __init__(self) -> None:
+        self._sent: dict[str, tuple[Any, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sent)
+
+    @staticmethod
+    def _signature(avatar, action_emoji: str) -> tuple[Any, ...]:
+        progress = getattr(avatar, "cultivation_progress", None)
+        cultivation_key = (
+            getattr(getattr(progress, "realm", None), "value", ""),
+            getattr(getattr(progress, "stage", None), "value", ""),
+            resolve_cultivation_alias_profile(avatar),
+        )
+        return (
+            int(getattr(avatar, "pos_x", 0)),
+            int(getattr(avatar, "pos_y", 0)),
+            cultivation_key,
+            getattr(avatar, "current_action_name", ""),
+            action_emoji,
+        )
+
+    def remember(self, avatar, action_emoji: str) -> None:
+        self._sent[str(avatar.id)] = self._signature(avatar, action_emoji)
+
+    def forget(self, avatar_id) -> None:
+        self._sent.pop(str(avatar_id), None)
+
+    def collect(
+        self,
+        avatars,
+        *,
+        skip_ids,
+        resolve_avatar_pic_id: Callable[[Any], int],
+        resolve_avatar_action_emoji: Callable[[Any], str],
+    ) -> list[dict[str, Any]]:
+        """Return delta entries for living avatars; stale ids are dropped along the way."""
+        updates: list[dict[str, Any]] = []
+        sent: dict[str, tuple[Any, ...]] = {}
+        for avatar in avatars:
+            avatar_id = str(avatar.id)
+            if avatar.id in skip_ids:
+                if avatar_id in self._sent:
+                    sent[avatar_id] = self._sent[avatar_id]
+                continue
+            action_emoji = resolve_avatar_action_emoji(avatar)
+            signature = self._signature(avatar, action_emoji)
+            sent[avatar_id] = signature
+            previous = self._sent.get(avatar_id)
+            if previous == signature:
+                continue
+            x, y, cultivation_key, action, _ = signature
+            if previous is None:
+                # 首次出现（新对局/读档后第一帧）：发送完整条目作为基线
+                entry = _avatar_realm_fields(avatar)
+                entry.update(
+                    id=avatar_id,
+                    x=x,
+                    y=y,
+                    gender=getattr(getattr(avatar, "gender", None), "value", "male"),
+                    pic_id=resolve_avatar_pic_id(avatar),
+                    action=action,
+                    action_emoji=action_emoji,
+                )
+                updates.append(entry)
+                continue
+            entry = {"id": avatar_id}
+            if (x, y) != previous[:2]:
+                entry["x"] = x
+                entry["y"] = y
+            if cultivation_key != previous[2]:
+                entry.update(_avatar_realm_fields(avatar))
+            if action != previous[3]:
+                entry["action"] = action
+            if action_emoji != previous[4]:
+                entry["action_emoji"] = action_emoji
+            updates.append(entry)
+        self._sent = sent
+        return updates
+
+
+def get_avatar_broadcast_tracker(world) -> AvatarBroadcastTracker:
+    """Trackers live on the world so loading a save starts from a fresh baseline."""
+    tracker = getattr(world, "_avatar_broadcast_tracker", None)
+    if not isinstance(tracker, AvatarBroadcastTracker):
+        tracker = AvatarBroadcastTracker()
+        world._avatar_broadcast_tracker = tracker
+    return tracker
+
+
+def _avatar_realm_fields(avatar) -> dict[str, Any]:
+    cultivation_display = build_avatar_cultivation_display(avatar)
+    return {
+        "realm": getattr(getattr(getattr(avatar, "cultivation_progress", None), "realm", None), "value", ""),
+        "cultivation": cultivation_display,
+        "cultivation_display": cultivation_display["display_full_name"],
+    }
 
 
 def build_avatar_updates(
@@ -18,9 +126,16 @@ def build_avatar_updates(
     resolve_avatar_pic_id: Callable[[Any], int],
     resolve_avatar_action_emoji: Callable[[Any], str],
 ) -> list[dict[str, Any]]:
-    """Build a compact avatar delta payload for websocket tick messages."""
+    """
+    Build a compact avatar delta payload for websocket tick messages.
+
+    Births and deaths are sent in full. Every other living avatar is only sent
+    when its position, realm, action or emoji changed since the last broadcast,
+    and then only with the changed fields (the client merges by id).
+    """
     newly_born_ids = world.avatar_manager.pop_newly_born()
     newly_dead_ids = world.avatar_manager.pop_newly_dead()
+    tracker = get_avatar_broadcast_tracker(world)
 
     avatar_updates: list[dict[str, Any]] = []
 
@@ -28,25 +143,26 @@ def build_avatar_updates(
         avatar = world.avatar_manager.avatars.get(avatar_id)
         if avatar is None:
             continue
-        cultivation_display = build_avatar_cultivation_display(avatar)
-        avatar_updates.append(
-            {
-                "id": str(avatar.id),
-                "name": avatar.name,
-                "x": int(getattr(avatar, "pos_x", 0)),
-                "y": int(getattr(avatar, "pos_y", 0)),
-                "gender": getattr(getattr(avatar, "gender", None), "value", "male"),
-                "pic_id": resolve_avatar_pic_id(avatar),
-                "realm": getattr(getattr(getattr(avatar, "cultivation_progress", None), "realm", None), "value", ""),
-                "cultivation": cultivation_display,
-                "cultivation_display": cultivation_display["display_full_name"],
-                "action": avatar.current_action_name,
-                "action_emoji": resolve_avatar_action_emoji(avatar),
-                "is_dead": False,
-            }
+        action_emoji = resolve_avatar_action_emoji(avatar)
+        entry = {
+            "id": str(avatar.id),
+            "name": avatar.name,
+            "x": int(getattr(avatar, "pos_x", 0)),
+            "y": int(getattr(avatar, "pos_y", 0)),
+            "gender": getattr(getattr(avatar, "gender", None), "value", "male"),
+            "pic_id": resolve_avatar_pic_id(avatar),
+        }
+        entry.update(_avatar_realm_fields(avatar))
+        entry.update(
+            action=avatar.current_action_name,
+            action_emoji=action_emoji,
+            is_dead=False,
         )
+        avatar_updates.append(entry)
+        tracker.remember(avatar, action_emoji)
 
     for avatar_id in newly_dead_ids:
+        tracker.forget(avatar_id)
         avatar = world.avatar_manager.get_avatar(avatar_id)
         if avatar is None:
             continue
@@ -59,28 +175,14 @@ def build_avatar_updates(
             }
         )
 
-    count = 0
-    for avatar in world.avatar_manager.get_living_avatars():
-        if avatar.id in newly_born_ids:
-            continue
-        if count >= AVATAR_POSITION_UPDATE_LIMIT:
-            break
-        cultivation_display = build_avatar_cultivation_display(avatar)
-        avatar_updates.append(
-            {
-                "id": str(avatar.id),
-                "x": int(getattr(avatar, "pos_x", 0)),
-                "y": int(getattr(avatar, "pos_y", 0)),
-                "gender": getattr(getattr(avatar, "gender", None), "value", "male"),
-                "pic_id": resolve_avatar_pic_id(avatar),
-                "realm": getattr(getattr(getattr(avatar, "cultivation_progress", None), "realm", None), "value", ""),
-                "cultivation": cultivation_display,
-                "cultivation_display": cultivation_display["display_full_name"],
-                "action_emoji": resolve_avatar_action_emoji(avatar),
-            }
+    avatar_updates.extend(
+        tracker.collect(
+            world.avatar_manager.get_living_avatars(),
+            skip_ids=set(newly_born_ids),
+            resolve_avatar_pic_id=resolve_avatar_pic_id,
+            resolve_avatar_action_emoji=resolve_avatar_action_emoji,
         )
-        count += 1
-
+    )
     return avatar_updates
 
 
@@ -155,5 +257,6 @@ async def run_game_loop_forever(
         trigger_auto_save=trigger_auto_save,
         build_auto_save_toast=build_auto_save_toast,
         get_logger=get_logger,
+        pacing=TickPacingPolicy.from_config(),
     )
     await runner.run_forever()
@@ -60,6 +60,8 @@ from src.server.services.game_queries import (
     get_avatar_overview as get_avatar_overview_query,
     get_world_secret_meta as get_world_secret_meta_query,
     get_world_secret_overview as get_world_secret_overview_query,
+    get_phase_metrics as get_phase_metrics_query,
+    search_events_page as search_events_page_query,
     get_world_map,
     get_world_state,
 )
@@ -303,6 +305,8 @@ query_dependencies = dict(
     get_roleplay_session_query=get_roleplay_session_query,
     get_world_secret_meta_query=get_world_secret_meta_query,
     get_world_secret_overview_query=get_world_secret_overview_query,
+    get_phase_metrics_query=get_phase_metrics_query,
+    search_events_page_query=search_events_page_query,
 )
 settings_service = SettingsServiceProxy(get_settings_service)
 
@@ -384,8 +388,10 @@ def _install_legacy_query_exports(service):
         build_public_world_map=builders.build_public_world_map,
         build_public_map_presets=builders.build_public_map_presets,
         build_public_runtime_status=builders.build_public_runtime_status,
+        build_public_phase_metrics=builders.build_public_phase_metrics,
         build_public_current_run=builders.build_public_current_run,
         build_public_events_page=builders.build_public_events_page,
+        build_public_events_search=builders.build_public_events_search,
         build_public_game_data=builders.build_public_game_data,
         build_public_detail=builders.build_public_detail,
         build_public_avatar_adjust_options=builders.build_public_avatar_adjust_options,
@@ -36,6 +36,14 @@ def get_runtime_status(runtime, version: str) -> dict[str, Any]:
     }
 
 
+def get_phase_metrics(runtime, *, limit: int | None = None) -> dict[str, Any]:
+    """返回最近若干个月的相位耗时统计；模拟器未启动时返回空结构。"""
+    recorder = getattr(runtime.get("sim"), "phase_metrics", None)
+    if recorder is None:
+        return {"history_size": 0, "profile_phase": "", "summary": [], "steps": []}
+    return recorder.to_dict(limit=limit)
+
+
 def get_rankings(runtime) -> dict[str, Any]:
     world = runtime.get("world")
     if not world or not hasattr(world, "ranking_manager"):
@@ -532,6 +540,49 @@ def get_events_page(
     }
 
 
+def search_events_page(
+    runtime,
+    *,
+    serialize_events_for_client: Callable[[list[Any]], list[dict[str, Any]]],
+    query: str,
+    avatar_id: str | None,
+    avatar_id_1: str | None,
+    avatar_id_2: str | None,
+    sect_id: int | None,
+    major_scope: str,
+    since_month: int | None,
+    until_month: int | None,
+    cursor: str | None,
+    limit: int,
+) -> dict[str, Any]:
+    world = _require_world(runtime)
+    event_manager = getattr(world, "event_manager", None)
+    if event_manager is None:
+        raise_public_error(
+            status_code=503,
+            code="EVENTS_NOT_READY",
+            message="Event manager not initialized",
+        )
+
+    avatar_id_pair = (avatar_id_1, avatar_id_2) if avatar_id_1 and avatar_id_2 else None
+    events, next_cursor, has_more = event_manager.search_events_paginated(
+        query,
+        avatar_id=avatar_id,
+        avatar_id_pair=avatar_id_pair,
+        sect_id=sect_id,
+        major_scope=major_scope,
+        since_month_stamp=since_month,
+        until_month_stamp=until_month,
+        cursor=cursor,
+        limit=limit,
+    )
+    return {
+        "events": serialize_events_for_client(events, world=world),
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
 def get_detail(
     runtime,
     *,
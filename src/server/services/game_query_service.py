@@ -50,6 +50,8 @@ class GameQueryDependencies:
     get_roleplay_session_query: Any
     get_world_secret_meta_query: Any
     get_world_secret_overview_query: Any
+    get_phase_metrics_query: Any = None
+    search_events_page_query: Any = None
 
 
 class GameQueryService:
@@ -73,8 +75,10 @@ class GameQueryService:
             build_public_world_map=self.get_world_map,
             build_public_map_presets=self.get_map_presets,
             build_public_runtime_status=self.get_runtime_status,
+            build_public_phase_metrics=self.get_phase_metrics,
             build_public_current_run=self.get_current_run,
             build_public_events_page=self.get_events_page,
+            build_public_events_search=self.search_events_page,
             build_public_game_data=self.get_game_data,
             build_public_detail=self.get_detail,
             build_public_avatar_adjust_options=self.get_avatar_adjust_options,
@@ -107,6 +111,9 @@ class GameQueryService:
             getattr(getattr(self._deps.config, "meta", None), "version", ""),
         )
 
+    def get_phase_metrics(self, *, limit: int | None = None) -> dict:
+        return self._deps.get_phase_metrics_query(self._deps.runtime, limit=limit)
+
     def get_world_state(self) -> dict:
         return self._deps.get_world_state(
             self._deps.runtime,
@@ -153,6 +160,35 @@ class GameQueryService:
             limit=limit,
         )
 
+    def search_events_page(
+        self,
+        *,
+        query: str,
+        avatar_id: str | None,
+        avatar_id_1: str | None,
+        avatar_id_2: str | None,
+        sect_id: int | None,
+        major_scope: str,
+        since_month: int | None,
+        until_month: int | None,
+        cursor: str | None,
+        limit: int,
+    ) -> dict:
+        return self._deps.search_events_page_query(
+            self._deps.runtime,
+            serialize_events_for_client=self._deps.serialize_events_for_client,
+            query=query,
+            avatar_id=avatar_id,
+            avatar_id_1=avatar_id_1,
+            avatar_id_2=avatar_id_2,
+            sect_id=sect_id,
+            major_scope=major_scope,
+            since_month=since_month,
+            until_month=until_month,
+            cursor=cursor,
+            limit=limit,
+        )
+
     def get_rankings(self) -> dict:
         return self._deps.get_rankings_query(self._deps.runtime)
 
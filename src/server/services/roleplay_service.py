@@ -6,7 +6,7 @@ from typing import Any
 
 from fastapi import HTTPException
 
-from src.classes.emotions import EmotionType
+from src.classes.emotions import parse_emotion
 from src.i18n import t
 from src.server.services.roleplay_action_display import build_roleplay_action_chain_display
 from src.server.services.roleplay_conversation_service import (
@@ -368,11 +368,9 @@ async def submit_roleplay_decision(runtime, *, avatar_id: str, request_id: str,
 
     avatar_thinking = str(payload.get("avatar_thinking", payload.get("thinking", "")) or command_text)
     short_term_objective = str(payload.get("short_term_objective", "") or command_text)
-    raw_emotion = str(payload.get("current_emotion", "") or "")
-    try:
-        avatar.emotion = EmotionType(raw_emotion)
-    except ValueError:
-        pass
+    emotion = parse_emotion(payload.get("current_emotion"))
+    if emotion is not None:
+        avatar.emotion = emotion
 
     avatar.load_decide_result_chain(pairs, avatar_thinking, short_term_objective)
     _append_interaction_history(
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Iterable
+
+try:  # Optional fast path; the stdlib encoder is always available.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:  # Optional binary frame format for clients that opt in via ?format=msgpack.
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+WS_FORMAT_JSON = "json"
+WS_FORMAT_MSGPACK = "msgpack"
+
+
+def is_msgpack_available() -> bool:
+    return msgpack is not None
+
+
+def resolve_ws_format(requested: str | None) -> str:
+    """Map a client-requested frame format to one this server can actually produce."""
+    if (requested or "").strip().lower() == WS_FORMAT_MSGPACK and is_msgpack_available():
+        return WS_FORMAT_MSGPACK
+    return WS_FORMAT_JSON
+
+
+def encode_json(message: Any) -> str:
+    """Encode a websocket message as JSON text, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. integers beyond 64 bits: fall back to the stdlib encoder
+            pass
+    return json.dumps(message, default=str)
+
+
+def encode_msgpack(message: Any) -> bytes:
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(message, default=str, use_bin_type=True)
+
+
+def encode_frames(message: Any, formats: Iterable[str]) -> dict[str, str | bytes]:
+    """Encode the message once per requested frame format."""
+    frames: dict[str, str | bytes] = {}
+    for frame_format in formats:
+        if frame_format in frames:
+            continue
+        if frame_format == WS_FORMAT_MSGPACK:
+            frames[frame_format] = encode_msgpack(message)
+        else:
+            frames[frame_format] = encode_json(message)
+    return frames
+
+
+async def encode_frames_off_loop(message: Any, formats: Iterable[str]) -> dict[str, str | bytes]:
+    """Run encoding in a worker thread so large tick payloads do not stall the event loop."""
+    return await asyncio.to_thread(encode_frames, message, tuple(formats))
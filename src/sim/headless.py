@@ -0,0 +1,389 @@
+"""
+无头批量模拟
+
+不启动 FastAPI 服务，直接按地图预设 + 开局配置（RunConfig）构建 World 与 Simulator，
+连续推进 N 个月，并把每个世界的事件库与汇总统计写到输出目录。
+多个种子可以分片到进程池中并行运行，用于平衡性测试和批量内容生成。
+
+用法：
+    python -m src.sim.headless --seeds 1 2 3 --months 24
+    python -m src.sim.headless --count 16 --workers 8 --months 120 --npc 30 --out runs/balance
+    python -m src.sim.headless --count 4 --offline      # 不请求 LLM，所有决策返回空结果
+    python -m src.sim.headless --seeds 7 --record       # 录制 LLM 响应到 world_<seed>/llm_recording.jsonl
+    python -m src.sim.headless --seeds 7 --replay runs/base   # 离线回放上次录制，事件输出与耗时可复现
+
+输出目录结构：
+    <out>/world_<seed>/events.db      每个世界独立的事件库
+    <out>/world_<seed>/summary.json   该世界的汇总统计
+    <out>/world_<seed>/llm_recording.jsonl   --record 时录制的 LLM 响应
+    <out>/summary.jsonl               本批次所有世界的汇总（按种子排序）
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.config import RunConfig, get_settings_service
+from src.utils.rng import derive_seed
+from src.utils.llm.replay import (
+    REPLAY_OFF,
+    REPLAY_RECORD,
+    REPLAY_REPLAY,
+    LLMReplaySettings,
+    LLMReplayTransport,
+    reset_llm_replay,
+)
+
+SUMMARY_FILE = "summary.json"
+BATCH_SUMMARY_FILE = "summary.jsonl"
+EVENTS_DB_FILE = "events.db"
+LLM_RECORDING_FILE = "llm_recording.jsonl"
+
+
+@dataclass(slots=True)
+class HeadlessWorldSpec:
+    """单个无头世界的运行参数；需能被 pickle 以便发送到子进程。"""
+
+    seed: int
+    months: int
+    output_dir: str
+    # 覆盖默认开局配置（get_default_run_config）的字段，如 map_id / init_npc_num / sect_num
+    run_config: dict[str, Any] = field(default_factory=dict)
+    # 与正式开局一致：为初始角色生成长期目标与背景故事（需要 LLM）
+    prepare_profiles: bool = True
+    # LLM 录制 / 回放：off 正常请求；record 录制到 llm_recording（默认 world_<seed>/llm_recording.jsonl）；
+    # replay 从 llm_recording 回放，文件为空时即离线模式（所有调用返回空 JSON）
+    llm_replay: str = REPLAY_OFF
+    llm_recording: str = ""
+    # 结束后额外写一份完整存档（JSON + 事件库）
+    save_final: bool = False
+
+    @property
+    def world_dir(self) -> Path:
+        return Path(self.output_dir) / f"world_{self.seed}"
+
+    def replay_settings(self) -> LLMReplaySettings:
+        path = self.llm_recording
+        if self.llm_replay == REPLAY_RECORD and not path:
+            path = str(self.world_dir / LLM_RECORDING_FILE)
+        return LLMReplaySettings(mode=self.llm_replay, path=path)
+
+
+def resolve_run_config(overrides: dict[str, Any] | None = None) -> RunConfig:
+    """以设置中的新游戏默认值为基础，叠加覆盖字段。"""
+    base = get_settings_service().get_default_run_config()
+    data = base.model_dump() if hasattr(base, "model_dump") else base.dict()
+    data.update({key: value for key, value in (overrides or {}).items() if value is not None})
+    return RunConfig(**data)
+
+
+def _apply_content_locale(lang_code: str) -> None:
+    from src.classes.language import language_manager
+
+    # set_language 会同时刷新翻译、路径与游戏配置
+    if lang_code and language_manager.current != lang_code:
+        language_manager.set_language(lang_code)
+
+
+async def build_headless_world(
+    run_config: RunConfig,
+    *,
+    events_db_path: Path,
+    prepare_profiles: bool = True,
+    reload_static_data: bool = True,
+    seed: int | None = None,
+):
+    """
+    按 init_flow 的开局顺序构建世界（不含资源扫描、存档槽位与运行时状态）。
+    传入 seed 时开局本身与之后的每个月都由该种子驱动。
+    """
+
+    from src.classes.core.sect import sects_by_id
+    from src.classes.core.world import World
+    from src.classes.custom_content import CustomContentRegistry
+    from src.classes.event import Event
+    from src.classes.world_lore import WorldLoreManager
+    from src.classes.world_lore_snapshot import build_world_lore_snapshot
+    from src.i18n import t
+    from src.run.data_loader import reload_all_static_data
+    from src.run.load_map import load_cultivation_world_map
+    from src.sim.avatar_init import make_avatars
+    from src.sim.simulator import Simulator
+    from src.sim.world_setup import (
+        apply_world_lore_if_needed,
+        generate_initial_avatars,
+        prepare_initial_character_profiles,
+        resolve_initially_dead_avatars,
+        select_existed_sects,
+    )
+    from src.systems.dynasty_generator import generate_dynasty, generate_emperor
+    from src.systems.time import Month, Year, create_month_stamp
+    from src.systems.world_secret import initialize_world_secret
+    from src.utils.config import CONFIG
+
+    if seed is not None:
+        random.seed(derive_seed(seed, "init"))
+    _apply_content_locale(run_config.content_locale)
+    if reload_static_data:
+        CustomContentRegistry.reset()
+        reload_all_static_data()
+
+    game_map = load_cultivation_world_map(run_config.map_id)
+    start_year = getattr(CONFIG.world, "start_year", 100)
+    world = World.create_with_db(
+        map=game_map,
+        month_stamp=create_month_stamp(Year(start_year), Month.JANUARY),
+        events_db_path=events_db_path,
+        start_year=start_year,
+    )
+    world.seed = seed
+    world.dynasty = generate_dynasty()
+    world.dynasty.current_emperor = generate_emperor(world.dynasty, int(world.month_stamp))
+    world.event_manager.add_event(
+        Event(
+            month_stamp=world.month_stamp,
+            content=t(
+                "{dynasty_title} has enthroned a new ruler, and {emperor_name} ascends as emperor.",
+                dynasty_title=world.dynasty.title,
+                emperor_name=world.dynasty.current_emperor.name,
+            ),
+            is_major=True,
+        )
+    )
+
+    sim = Simulator(world)
+    sim.awakening_rate = run_config.npc_awakening_rate_per_month
+    world.run_config_snapshot = run_config.model_dump()
+
+    await apply_world_lore_if_needed(
+        world=world,
+        run_config=run_config,
+        world_lore_manager_cls=WorldLoreManager,
+        build_world_lore_snapshot=build_world_lore_snapshot,
+    )
+    existed_sects = select_existed_sects(sects_by_id=sects_by_id, needed_sects=int(run_config.sect_num or 0))
+    avatars = await generate_initial_avatars(
+        world=world,
+        run_config=run_config,
+        existed_sects=existed_sects,
+        make_random_avatars=make_avatars,
+    )
+    world.avatar_manager.avatars.update(avatars)
+    resolve_initially_dead_avatars(world=world, avatars=avatars)
+    world.existed_sects = existed_sects
+    world.sect_context.from_existed_sects(existed_sects)
+    initialize_world_secret(world, run_config.world_secret_id)
+
+    if prepare_profiles:
+        await prepare_initial_character_profiles(world=world)
+    return world, sim
+
+
+async def run_headless_world(spec: HeadlessWorldSpec, *, reload_static_data: bool = True) -> dict[str, Any]:
+    """构建并推进一个世界，返回汇总统计（同时写入 world_<seed>/summary.json）。"""
+    world_dir = spec.world_dir
+    world_dir.mkdir(parents=True, exist_ok=True)
+    run_config = resolve_run_config(spec.run_config)
+
+    # 只替换网络传输层：并发控制、JSON 解析与调用计数照常执行
+    replay = LLMReplayTransport(spec.replay_settings())
+    reset_llm_replay(replay if replay.enabled else None)
+    try:
+        build_start = time.perf_counter()
+        world, sim = await build_headless_world(
+            run_config,
+            events_db_path=world_dir / EVENTS_DB_FILE,
+            prepare_profiles=spec.prepare_profiles,
+            reload_static_data=reload_static_data,
+            seed=spec.seed,
+        )
+        build_seconds = time.perf_counter() - build_start
+        initial_avatars = len(world.avatar_manager.avatars)
+        start_month_stamp = int(world.month_stamp)
+
+        step_seconds: list[float] = []
+        llm_calls = 0
+        try:
+            for _ in range(max(0, int(spec.months))):
+                started_at = time.perf_counter()
+                await sim.step()
+                step_seconds.append(time.perf_counter() - started_at)
+                # phase_metrics 只保留最近若干步，调用次数按步累加
+                recorded = sim.phase_metrics.steps()
+                if recorded:
+                    llm_calls += sum(phase.llm_calls for phase in recorded[-1].phases)
+
+            save_path = None
+            if spec.save_final:
+                from src.sim.save.save_game import save_game
+
+                success, _ = save_game(world, sim, world.existed_sects, save_path=world_dir / "final_save.json")
+                save_path = str(world_dir / "final_save.json") if success else None
+
+            phase_summary = sim.phase_metrics.summary()
+            living = len(world.avatar_manager.get_living_avatars())
+            summary = {
+                "seed": spec.seed,
+                "map_id": run_config.map_id,
+                "months": len(step_seconds),
+                "start_month_stamp": start_month_stamp,
+                "end_month_stamp": int(world.month_stamp),
+                "initial_avatars": initial_avatars,
+                "total_avatars": len(world.avatar_manager.avatars),
+                "living_avatars": living,
+                "events": world.event_manager.count(),
+                "build_seconds": round(build_seconds, 3),
+                "run_seconds": round(sum(step_seconds), 3),
+                "step_seconds_mean": round(statistics.mean(step_seconds), 4) if step_seconds else 0.0,
+                "step_seconds_max": round(max(step_seconds), 4) if step_seconds else 0.0,
+                "llm_calls": llm_calls,
+                "events_db": str(world_dir / EVENTS_DB_FILE),
+                "save_path": save_path,
+                "llm_replay": replay.get_stats() if replay.enabled else None,
+                "phases": phase_summary,
+            }
+        finally:
+            world.event_manager.close()
+    finally:
+        reset_llm_replay(None)
+
+    (world_dir / SUMMARY_FILE).write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    return summary
+
+
+def run_headless_world_sync(spec: HeadlessWorldSpec) -> dict[str, Any]:
+    """进程池入口：每个子进程各自一个事件循环；异常转成带 error 字段的汇总，不影响其他世界。"""
+    try:
+        return asyncio.run(run_headless_world(spec))
+    except Exception as exc:
+        traceback.print_exc()
+        return {"seed": spec.seed, "error": f"{type(exc).__name__}: {exc}"}
+
+
+def run_headless_batch(specs: Iterable[HeadlessWorldSpec], *, workers: int = 1) -> list[dict[str, Any]]:
+    """
+    按种子分片运行多个世界。workers <= 1 时在当前进程内依次运行；
+    否则使用 spawn 进程池，每个世界独占一个子进程内的事件循环与全局静态数据。
+    """
+    specs = list(specs)
+    if not specs:
+        return []
+
+    results: list[dict[str, Any]] = []
+    if workers <= 1 or len(specs) == 1:
+        results = [run_headless_world_sync(spec) for spec in specs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(specs)), mp_context=get_context("spawn")) as pool:
+            futures = {pool.submit(run_headless_world_sync, spec): spec for spec in specs}
+            for future in as_completed(futures):
+                try:
+                    results.append(future.result())
+                except Exception as exc:
+                    # 子进程崩溃（BrokenProcessPool 等）也记录为该种子的失败
+                    results.append({"seed": futures[future].seed, "error": f"{type(exc).__name__}: {exc}"})
+
+    results.sort(key=lambda item: item["seed"])
+    output_by_seed = {spec.seed: Path(spec.output_dir) for spec in specs}
+    rows_by_dir: dict[Path, list[dict[str, Any]]] = {}
+    for row in results:
+        rows_by_dir.setdefault(output_by_seed[row["seed"]], []).append(row)
+    for output_dir, rows in rows_by_dir.items():
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with (output_dir / BATCH_SUMMARY_FILE).open("w", encoding="utf-8") as fp:
+            for row in rows:
+                fp.write(json.dumps(row, ensure_ascii=False) + "\n")
+    return results
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="无头批量推进多个世界")
+    seeds = parser.add_mutually_exclusive_group()
+    seeds.add_argument("--seeds", type=int, nargs="+", help="显式指定种子列表")
+    seeds.add_argument("--count", type=int, default=1, help="从 --seed-start 开始连续生成的种子数量")
+    parser.add_argument("--seed-start", type=int, default=0)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=1, help="并行进程数（默认 1，即当前进程内依次运行）")
+    parser.add_argument("--out", default="headless_runs", help="输出目录")
+    parser.add_argument("--map", dest="map_id", help="地图预设，默认取新游戏设置")
+    parser.add_argument("--npc", dest="init_npc_num", type=int)
+    parser.add_argument("--sects", dest="sect_num", type=int)
+    parser.add_argument("--locale", dest="content_locale")
+    parser.add_argument("--world-secret", dest="world_secret_id")
+    llm = parser.add_mutually_exclusive_group()
+    llm.add_argument("--offline", action="store_true", help="不请求 LLM，所有调用返回空 JSON")
+    llm.add_argument("--record", action="store_true", help="录制 LLM 响应到 world_<seed>/llm_recording.jsonl")
+    llm.add_argument("--replay", metavar="DIR", help="从 DIR/world_<seed>/llm_recording.jsonl 离线回放 LLM 响应")
+    parser.add_argument("--no-profiles", action="store_true", help="跳过初始角色长期目标/背景故事生成")
+    parser.add_argument("--save", action="store_true", help="结束后为每个世界写一份完整存档")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    seed_list = args.seeds or list(range(args.seed_start, args.seed_start + max(1, args.count)))
+    overrides = {
+        "map_id": args.map_id,
+        "init_npc_num": args.init_npc_num,
+        "sect_num": args.sect_num,
+        "content_locale": args.content_locale,
+        "world_secret_id": args.world_secret_id,
+    }
+    output_dir = str(Path(args.out).resolve())
+    llm_replay = REPLAY_OFF
+    if args.offline or args.replay:
+        llm_replay = REPLAY_REPLAY
+    elif args.record:
+        llm_replay = REPLAY_RECORD
+    # 子进程继承环境变量；固定字符串哈希，使集合迭代顺序（进而随机抽取顺序）跨进程一致
+    os.environ.setdefault("PYTHONHASHSEED", "0")
+    specs = [
+        HeadlessWorldSpec(
+            seed=seed,
+            months=args.months,
+            output_dir=output_dir,
+            run_config={key: value for key, value in overrides.items() if value is not None},
+            prepare_profiles=not args.no_profiles,
+            llm_replay=llm_replay,
+            llm_recording=str(Path(args.replay) / f"world_{seed}" / LLM_RECORDING_FILE) if args.replay else "",
+            save_final=args.save,
+        )
+        for seed in seed_list
+    ]
+
+    started_at = time.perf_counter()
+    results = run_headless_batch(specs, workers=args.workers)
+    elapsed = time.perf_counter() - started_at
+
+    print(f"{'seed':>6} {'months':>7} {'living':>7} {'events':>8} {'step mean(s)':>13} {'llm calls':>10}")
+    failed = 0
+    for row in results:
+        if "error" in row:
+            failed += 1
+            print(f"{row['seed']:>6}  ERROR {row['error']}")
+            continue
+        print(
+            f"{row['seed']:>6} {row['months']:>7} {row['living_avatars']:>7} {row['events']:>8} "
+            f"{row['step_seconds_mean']:>13.3f} {row['llm_calls']:>10}"
+        )
+    total_months = sum(row.get("months", 0) for row in results)
+    print(
+        f"{len(results)} worlds, {total_months} months in {elapsed:.1f}s "
+        f"({total_months / elapsed if elapsed > 0 else 0.0:.2f} months/s), output: {output_dir}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
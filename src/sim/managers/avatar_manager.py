@@ -6,7 +6,8 @@ import itertools
 if TYPE_CHECKING:
     from src.classes.core.avatar import Avatar
 
-from src.classes.observe import get_observable_avatars
+from src.classes.observe import get_avatar_observation_radius
+from src.sim.managers.spatial_index import AvatarSpatialIndex
 
 @dataclass
 class AvatarManager:
@@ -20,6 +21,11 @@ class AvatarManager:
     _newly_born_buffer: List[str] = field(default_factory=list, init=False)
     _removed_buffer: List[str] = field(default_factory=list, init=False)
 
+    # --- 空间索引 (不参与序列化) ---
+    _spatial_index: AvatarSpatialIndex = field(default_factory=AvatarSpatialIndex, init=False, repr=False)
+    # 索引对应的 avatars 字典；字典被整体替换（如读档）时据此触发重建
+    _indexed_avatars: Dict[str, "Avatar"] | None = field(default=None, init=False, repr=False)
+
     def register_avatar(self, avatar: "Avatar", is_newly_born: bool = False) -> None:
         """
         注册一个角色到管理器中。
@@ -46,6 +52,7 @@ class AvatarManager:
             return
 
         self.avatars[aid] = avatar
+        self._get_spatial_index().add(avatar)
         if is_newly_born:
             self._newly_born_buffer.append(aid)
 
@@ -82,6 +89,7 @@ class AvatarManager:
         if aid in self.avatars:
             avatar = self.avatars.pop(aid)
             self.dead_avatars[aid] = avatar
+            self._spatial_index.remove(aid)
             # 断开地图连接，确保不出现在地图网格上
             if hasattr(avatar, "tile"):
                 avatar.tile = None
@@ -89,6 +97,33 @@ class AvatarManager:
             # 记录变更
             self._newly_dead_buffer.append(aid)
 
+    def _get_spatial_index(self) -> AvatarSpatialIndex:
+        """
+        获取与 avatars 同步的空间索引。
+        avatars 字典被整体替换或绕过 register_avatar 直接增删时，数量/身份对不上，自动重建。
+        """
+        index = self._spatial_index
+        if self._indexed_avatars is not self.avatars or len(index) != len(self.avatars):
+            index.rebuild(self.avatars.values())
+            self._indexed_avatars = self.avatars
+        return index
+
+    def rebuild_spatial_index(self) -> None:
+        """强制按当前 avatars 重建空间索引（每月开始时调用，兜底未经 update 的位置写入）"""
+        self._spatial_index.rebuild(self.avatars.values())
+        self._indexed_avatars = self.avatars
+
+    def update_avatar_position(self, avatar: "Avatar") -> None:
+        """
+        角色位置 / tile 改变后调用，同步空间索引。
+        所有修改存活角色 pos_x/pos_y/tile 的地方都应调用此方法。
+        """
+        self._get_spatial_index().update(avatar)
+
+    def find_avatar_by_name(self, name: str) -> "Avatar | None":
+        """按（已规范化的）名字查找存活角色"""
+        return self._get_spatial_index().find_by_name(name)
+
     def get_avatars_in_same_region(self, avatar: "Avatar") -> List["Avatar"]:
         """
         返回与给定 avatar 处于同一区域的其他【存活】角色列表（不含自己）。
@@ -96,14 +131,10 @@ class AvatarManager:
         if avatar is None or getattr(avatar, "tile", None) is None or avatar.tile.region is None:
             return []
         region = avatar.tile.region
-        same_region: list["Avatar"] = []
-        # 只遍历活人
-        for other in self.avatars.values():
-            if other is avatar or getattr(other, "tile", None) is None:
-                continue
-            if other.tile.region == region:
-                same_region.append(other)
-        return same_region
+        return [
+            other for other in self._get_spatial_index().in_region(region)
+            if other is not avatar
+        ]
 
     def get_living_avatars(self) -> List["Avatar"]:
         """
@@ -116,7 +147,11 @@ class AvatarManager:
         """
         返回处于 avatar 交互范围内的其他【存活】角色列表（不含自己）。
         """
-        return get_observable_avatars(avatar, self.avatars.values())
+        radius = get_avatar_observation_radius(avatar)
+        return [
+            other for other in self._get_spatial_index().query_radius(avatar.pos_x, avatar.pos_y, radius)
+            if other is not avatar
+        ]
     
     def _iter_all_avatars(self) -> Iterable["Avatar"]:
         """辅助方法：遍历所有角色（活人+死者）"""
@@ -203,6 +238,7 @@ class AvatarManager:
 
         # 5. 移除自身
         self.avatars.pop(aid, None)
+        self._spatial_index.remove(aid)
         self.dead_avatars.pop(aid, None)
         self._newly_born_buffer = [item for item in self._newly_born_buffer if item != aid]
         self._newly_dead_buffer = [item for item in self._newly_dead_buffer if item != aid]
@@ -19,6 +19,7 @@ class EventManager:
 
     对外提供统一事件接口：
     - add_event: 添加事件
+    - add_events: 批量添加事件（单事务）
     - get_recent_events: 获取最近事件
     - get_events_by_avatar: 按角色查询
     - get_events_between: 按角色对查询
@@ -102,6 +103,25 @@ class EventManager:
             # 内存后备模式。
             self._memory_events.append(event)
 
+    def add_events(self, events: List["Event"]) -> None:
+        """
+        批量添加事件（如一个月的全部事件）。
+
+        有 SQLite 存储时在一个事务内写入，顺序与传入顺序一致。
+        """
+        from src.classes.event import is_null_event
+        batch = [event for event in events if not is_null_event(event)]
+        if not batch:
+            return
+
+        for event in batch:
+            self._capture_subject_snapshots(event)
+
+        if self._storage:
+            self._storage.add_events(batch)
+        else:
+            self._memory_events.extend(batch)
+
     @staticmethod
     def _is_observed_by(event: "Event", avatar_id: str) -> bool:
         avatar_id = str(avatar_id)
@@ -273,33 +293,93 @@ class EventManager:
             return events, next_cursor, next_cursor is not None
         else:
             # 内存模式不支持完整分页，做轻量过滤后返回最近的。
-            filtered_events = self._memory_events
-            if avatar_id_pair:
-                id1, id2 = avatar_id_pair
-                filtered_events = [
-                    e for e in filtered_events
-                    if e.related_avatars and id1 in e.related_avatars and id2 in e.related_avatars
-                ]
-            elif avatar_id:
-                filtered_events = [
-                    e for e in filtered_events
-                    if e.related_avatars and avatar_id in e.related_avatars
-                ]
-
-            if sect_id is not None:
-                filtered_events = [
-                    e for e in filtered_events
-                    if getattr(e, "related_sects", None) and sect_id in (e.related_sects or [])
-                ]
-
-            if major_scope == "major":
-                filtered_events = [e for e in filtered_events if e.is_major and not e.is_story]
-            elif major_scope == "minor":
-                filtered_events = [e for e in filtered_events if (not e.is_major) or e.is_story]
-
+            filtered_events = [
+                e for e in self._memory_events
+                if self._memory_event_matches(e, avatar_id, avatar_id_pair, sect_id, major_scope)
+            ]
             events = filtered_events[-limit:]
             return list(reversed(events)), None, False
 
+    @staticmethod
+    def _memory_event_matches(
+        event: "Event",
+        avatar_id: Optional[str],
+        avatar_id_pair: Optional[tuple[str, str]],
+        sect_id: Optional[int],
+        major_scope: Optional[str],
+    ) -> bool:
+        related = event.related_avatars or []
+        if avatar_id_pair:
+            if avatar_id_pair[0] not in related or avatar_id_pair[1] not in related:
+                return False
+        elif avatar_id and avatar_id not in related:
+            return False
+        if sect_id is not None and sect_id not in (getattr(event, "related_sects", None) or []):
+            return False
+        if major_scope == "major":
+            return bool(event.is_major and not event.is_story)
+        if major_scope == "minor":
+            return bool((not event.is_major) or event.is_story)
+        return True
+
+    def search_events_paginated(
+        self,
+        query: str,
+        avatar_id: Optional[str] = None,
+        avatar_id_pair: Optional[tuple[str, str]] = None,
+        sect_id: Optional[int] = None,
+        major_scope: Optional[str] = None,
+        since_month_stamp: Optional[int] = None,
+        until_month_stamp: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> tuple[List["Event"], Optional[str], bool]:
+        """
+        全文检索事件，筛选条件与 get_events_paginated 相同，另支持月份范围（闭区间）。
+
+        Returns:
+            (events, next_cursor, has_more)，事件最新在前。
+        """
+        if self._storage:
+            events, next_cursor = self._storage.search_events(
+                query,
+                avatar_id=avatar_id,
+                avatar_id_pair=avatar_id_pair,
+                sect_id=sect_id,
+                major_scope=major_scope,
+                since_month_stamp=since_month_stamp,
+                until_month_stamp=until_month_stamp,
+                cursor=cursor,
+                limit=limit,
+            )
+            return events, next_cursor, next_cursor is not None
+
+        # 内存模式：按子串匹配正文；cursor 为 {month_stamp}_{写入序号}，与 SQLite 的时间线顺序一致。
+        terms = [term.lower() for term in (query or "").split()]
+        if not terms:
+            return [], None, False
+        after = None
+        if cursor:
+            month_part, position_part = cursor.split("_", 1)
+            after = (int(month_part), int(position_part))
+        ranked = sorted(
+            (
+                (int(e.month_stamp), position, e)
+                for position, e in enumerate(self._memory_events, 1)
+                if all(term in (e.content or "").lower() for term in terms)
+                and (since_month_stamp is None or int(e.month_stamp) >= since_month_stamp)
+                and (until_month_stamp is None or int(e.month_stamp) <= until_month_stamp)
+                and (after is None or (int(e.month_stamp), position) < after)
+                and self._memory_event_matches(e, avatar_id, avatar_id_pair, sect_id, major_scope)
+            ),
+            key=lambda item: (item[0], item[1]),
+            reverse=True,
+        )
+        page = ranked[:limit]
+        has_more = len(ranked) > limit
+        next_cursor = f"{page[-1][0]}_{page[-1][1]}" if has_more else None
+        return [e for _, _, e in page], next_cursor, has_more
+
     # --- 清理接口 ---
 
     def cleanup(self, keep_major: bool = True, before_month_stamp: Optional[int] = None) -> int:
@@ -15,7 +15,10 @@ if TYPE_CHECKING:
 
 @dataclass
 class SectTerritorySnapshot:
-    """宗门势力范围快照，用于在多个系统之间复用计算结果。"""
+    """
+    宗门势力范围快照，用于在多个系统之间复用计算结果。
+    快照会被同一个月内的相位与 API 请求共享，调用方只读，不要原地修改。
+    """
 
     active_sects: List["Sect"]
     sect_centers: Dict[int, Tuple[int, int]]
@@ -26,6 +29,43 @@ class SectTerritorySnapshot:
     boundary_edges_by_sect: Dict[int, List[dict[str, int | str]]]
 
 
+def _territory_noise(sect_id: int, tile_x: int, tile_y: int) -> float:
+    """势力边界的确定性噪声，取值 [-0.5, 0.5]。"""
+    digest = md5(f"{sect_id}:{tile_x}:{tile_y}".encode("utf-8")).digest()
+    return (int.from_bytes(digest[:4], "big") / 0xFFFFFFFF) - 0.5
+
+
+class _TerritoryCache:
+    """
+    挂在 World 上的势力范围缓存（每次请求都会新建 SectManager，因此缓存不能放在实例上）。
+    - noise_fields: 每个宗门在当前地图上的噪声场，(x, y) -> noise，按需填充
+    - snapshot: 最近一次的快照及其输入签名
+    """
+
+    def __init__(self, game_map: "Map"):
+        self.game_map = game_map
+        self.noise_fields: Dict[int, Dict[Tuple[int, int], float]] = {}
+        self.snapshot_key: tuple | None = None
+        self.snapshot: SectTerritorySnapshot | None = None
+
+    def noise_field(self, sect_id: int) -> Dict[Tuple[int, int], float]:
+        field = self.noise_fields.get(sect_id)
+        if field is None:
+            field = self.noise_fields[sect_id] = {}
+        return field
+
+
+def _territory_weights() -> Tuple[float, float, float]:
+    sect_conf = getattr(CONFIG, "sect", None)
+    if not sect_conf:
+        return 100.0, 12.0, 6.0
+    return (
+        float(getattr(sect_conf, "territory_distance_weight", 100.0)),
+        float(getattr(sect_conf, "territory_strength_weight", 12.0)),
+        float(getattr(sect_conf, "territory_noise_weight", 6.0)),
+    )
+
+
 class SectManager:
     """
     宗门管理器。
@@ -133,16 +173,11 @@ class SectManager:
         if distance > radius:
             return float("-inf")
 
-        sect_conf = getattr(CONFIG, "sect", None)
-        distance_weight = float(getattr(sect_conf, "territory_distance_weight", 100.0)) if sect_conf else 100.0
-        strength_weight = float(getattr(sect_conf, "territory_strength_weight", 12.0)) if sect_conf else 12.0
-        noise_weight = float(getattr(sect_conf, "territory_noise_weight", 6.0)) if sect_conf else 6.0
+        distance_weight, strength_weight, noise_weight = _territory_weights()
 
         proximity_score = float(radius - distance + 1)
         strength_score = math.log1p(max(0.0, float(total_battle_strength)))
-
-        digest = md5(f"{sect_id}:{tile_x}:{tile_y}".encode("utf-8")).digest()
-        noise = (int.from_bytes(digest[:4], "big") / 0xFFFFFFFF) - 0.5
+        noise = _territory_noise(sect_id, tile_x, tile_y)
 
         return (
             proximity_score * distance_weight
@@ -248,6 +283,25 @@ class SectManager:
             )
 
         # 3. 以“唯一归属”的方式为每个有效格子选出一个最强势力拥有者
+        cache = self._get_territory_cache(game_map)
+        weights = _territory_weights()
+        snapshot_key = (
+            int(self.world.month_stamp),
+            len(game_map.tiles),
+            weights,
+            tuple(
+                (
+                    int(sect.id),
+                    float(getattr(sect, "total_battle_strength", 0.0)),
+                    int(getattr(sect, "influence_radius", 0) or 0),
+                    sect_centers.get(sect.id),
+                )
+                for sect in active_sects
+            ),
+        )
+        if cache.snapshot is not None and cache.snapshot_key == snapshot_key:
+            return cache.snapshot
+
         sect_candidates = []
         for sect in active_sects:
             center = sect_centers.get(sect.id)
@@ -264,26 +318,14 @@ class SectManager:
                 )
             )
 
-        for x, y in game_map.tiles.keys():
-            best_owner: int | None = None
-            best_score = float("-inf")
-            for sect_id, center_x, center_y, radius, total_battle_strength in sect_candidates:
-                score = self._get_claim_score(
-                    sect_id=sect_id,
-                    tile_x=x,
-                    tile_y=y,
-                    center_x=center_x,
-                    center_y=center_y,
-                    radius=radius,
-                    total_battle_strength=total_battle_strength,
-                )
-                if score > best_score:
-                    best_score = score
-                    best_owner = sect_id
-            if best_owner is None or best_score == float("-inf"):
+        best_claims = self._compute_best_claims(sect_candidates, game_map, cache, weights)
+        for pos in game_map.tiles.keys():
+            claim = best_claims.get(pos)
+            if claim is None:
                 continue
-            tile_owners[(x, y)] = [best_owner]
-            owned_tiles_by_sect.setdefault(best_owner, []).append((x, y))
+            best_owner = claim[1]
+            tile_owners[pos] = [best_owner]
+            owned_tiles_by_sect.setdefault(best_owner, []).append(pos)
 
         border_contact_counts, border_tiles_by_sect, boundary_edges_by_sect = (
             self._build_boundary_and_contact_stats(
@@ -292,7 +334,7 @@ class SectManager:
             )
         )
 
-        return SectTerritorySnapshot(
+        snapshot = SectTerritorySnapshot(
             active_sects=active_sects,
             sect_centers=sect_centers,
             tile_owners=tile_owners,
@@ -301,13 +343,67 @@ class SectManager:
             border_tiles_by_sect=border_tiles_by_sect,
             boundary_edges_by_sect=boundary_edges_by_sect,
         )
+        cache.snapshot_key = snapshot_key
+        cache.snapshot = snapshot
+        return snapshot
+
+    def _get_territory_cache(self, game_map: "Map") -> _TerritoryCache:
+        cache = getattr(self.world, "_sect_territory_cache", None)
+        if not isinstance(cache, _TerritoryCache) or cache.game_map is not game_map:
+            cache = _TerritoryCache(game_map)
+            try:
+                self.world._sect_territory_cache = cache
+            except AttributeError:
+                pass
+        return cache
+
+    @staticmethod
+    def _compute_best_claims(
+        sect_candidates: List[Tuple[int, int, int, int, float]],
+        game_map: "Map",
+        cache: _TerritoryCache,
+        weights: Tuple[float, float, float],
+    ) -> Dict[Tuple[int, int], Tuple[float, int]]:
+        """
+        对每个宗门只枚举其势力菱形内的格子（而不是全图 × 全部宗门），
+        返回 (x, y) -> (最高分, 宗门 id)。分数与 _get_claim_score 逐格计算完全一致；
+        按宗门顺序比较且只在严格更高时替换，平分时与旧逻辑一样先到者胜。
+        """
+        distance_weight, strength_weight, noise_weight = weights
+        tiles = game_map.tiles
+        best: Dict[Tuple[int, int], Tuple[float, int]] = {}
+        for sect_id, center_x, center_y, radius, total_battle_strength in sect_candidates:
+            strength_term = math.log1p(max(0.0, float(total_battle_strength))) * strength_weight
+            noise_field = cache.noise_field(sect_id)
+            for dx in range(-radius, radius + 1):
+                x = center_x + dx
+                span = radius - abs(dx)
+                for dy in range(-span, span + 1):
+                    y = center_y + dy
+                    pos = (x, y)
+                    if pos not in tiles:
+                        continue
+                    noise = noise_field.get(pos)
+                    if noise is None:
+                        noise = noise_field[pos] = _territory_noise(sect_id, x, y)
+                    distance = abs(dx) + abs(dy)
+                    score = (
+                        float(radius - distance + 1) * distance_weight
+                        + strength_term
+                        + noise * noise_weight
+                    )
+                    current = best.get(pos)
+                    if current is None or score > current[0]:
+                        best[pos] = (score, sect_id)
+        return best
 
     def get_snapshot(self) -> SectTerritorySnapshot:
         """
         返回当前世界下宗门势力范围的快照。
 
         - 统一封装 _compute_sect_centers / _iter_influence_tiles 等内部细节；
-        - 供其他系统（关系计算、决策上下文等）复用，避免在多处重复实现相同逻辑。
+        - 供其他系统（关系计算、决策上下文等）复用，避免在多处重复实现相同逻辑；
+        - 同一月份、宗门战力/半径/总部不变时直接复用上次结果。
         """
         return self._compute_snapshot()
 
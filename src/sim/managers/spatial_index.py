@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+    from src.classes.environment.region import Region
+
+Cell = Tuple[int, int]
+
+DEFAULT_CELL_SIZE = 8
+
+
+def _region_of(avatar: "Avatar") -> Optional["Region"]:
+    tile = getattr(avatar, "tile", None)
+    return getattr(tile, "region", None) if tile is not None else None
+
+
+class AvatarSpatialIndex:
+    """
+    存活角色的空间索引：均匀网格 + 区域成员表 + 名字表。
+
+    - 网格按 cell_size 划分地图，曼哈顿半径查询只需检查覆盖半径的若干格子
+    - 区域表按 Region 聚合，用于“同区域角色”查询
+    - 名字表用于按名字解析角色
+    索引只记录“登记时”的位置/区域/名字，查询结果仍以角色当前属性复核，
+    因此位置变化后需调用 update() 同步（Move 等写入点已接入）。
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE):
+        self.cell_size = max(1, int(cell_size))
+        self._cells: Dict[Cell, Dict[str, "Avatar"]] = {}
+        self._regions: Dict["Region", Dict[str, "Avatar"]] = {}
+        self._names: Dict[str, Dict[str, "Avatar"]] = {}
+        # aid -> (cell, region, name)
+        self._entries: Dict[str, Tuple[Cell, Optional["Region"], str]] = {}
+        # aid -> 登记序号，用于让查询结果保持与 avatars 字典一致的顺序
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, avatar_id: str) -> bool:
+        return str(avatar_id) in self._entries
+
+    def _cell_of(self, x: int, y: int) -> Cell:
+        return (int(x) // self.cell_size, int(y) // self.cell_size)
+
+    def rebuild(self, avatars: Iterable["Avatar"]) -> None:
+        """按给定顺序重建整个索引"""
+        self._cells.clear()
+        self._regions.clear()
+        self._names.clear()
+        self._entries.clear()
+        self._order.clear()
+        self._next_order = 0
+        for avatar in avatars:
+            self.add(avatar)
+
+    def add(self, avatar: "Avatar") -> None:
+        aid = str(avatar.id)
+        if aid in self._entries:
+            self.update(avatar)
+            return
+        self._order[aid] = self._next_order
+        self._next_order += 1
+        self._insert(aid, avatar)
+
+    def remove(self, avatar_id: str) -> None:
+        aid = str(avatar_id)
+        entry = self._entries.pop(aid, None)
+        self._order.pop(aid, None)
+        if entry is None:
+            return
+        cell, region, name = entry
+        self._discard(self._cells, cell, aid)
+        if region is not None:
+            self._discard(self._regions, region, aid)
+        self._discard(self._names, name, aid)
+
+    def update(self, avatar: "Avatar") -> None:
+        """角色位置/区域/名字变化后同步索引；未登记的角色忽略"""
+        aid = str(avatar.id)
+        entry = self._entries.get(aid)
+        if entry is None:
+            return
+        cell = self._cell_of(avatar.pos_x, avatar.pos_y)
+        region = _region_of(avatar)
+        name = avatar.name
+        if entry == (cell, region, name):
+            return
+        old_cell, old_region, old_name = entry
+        self._discard(self._cells, old_cell, aid)
+        if old_region is not None:
+            self._discard(self._regions, old_region, aid)
+        self._discard(self._names, old_name, aid)
+        self._insert(aid, avatar)
+
+    def _insert(self, aid: str, avatar: "Avatar") -> None:
+        cell = self._cell_of(avatar.pos_x, avatar.pos_y)
+        region = _region_of(avatar)
+        name = avatar.name
+        self._cells.setdefault(cell, {})[aid] = avatar
+        if region is not None:
+            self._regions.setdefault(region, {})[aid] = avatar
+        self._names.setdefault(name, {})[aid] = avatar
+        self._entries[aid] = (cell, region, name)
+
+    @staticmethod
+    def _discard(table: dict, key, aid: str) -> None:
+        bucket = table.get(key)
+        if bucket is None:
+            return
+        bucket.pop(aid, None)
+        if not bucket:
+            del table[key]
+
+    def _sorted(self, avatars: List["Avatar"]) -> List["Avatar"]:
+        order = self._order
+        avatars.sort(key=lambda a: order.get(str(a.id), 0))
+        return avatars
+
+    def query_radius(self, x: int, y: int, radius: int) -> List["Avatar"]:
+        """返回当前位置与 (x, y) 曼哈顿距离不超过 radius 的角色"""
+        if radius < 0:
+            return []
+        size = self.cell_size
+        min_cx, max_cx = (x - radius) // size, (x + radius) // size
+        min_cy, max_cy = (y - radius) // size, (y + radius) // size
+        cells = self._cells
+        result: List["Avatar"] = []
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for avatar in bucket.values():
+                    if abs(avatar.pos_x - x) + abs(avatar.pos_y - y) <= radius:
+                        result.append(avatar)
+        return self._sorted(result)
+
+    def in_region(self, region: "Region") -> List["Avatar"]:
+        """返回当前处于 region 的角色"""
+        bucket = self._regions.get(region)
+        if not bucket:
+            return []
+        result = [a for a in bucket.values() if _region_of(a) == region]
+        return self._sorted(result)
+
+    def find_by_name(self, name: str) -> Optional["Avatar"]:
+        """按名字查找；同名时返回最早登记者"""
+        bucket = self._names.get(name)
+        if not bucket:
+            return None
+        matches = [a for a in bucket.values() if a.name == name]
+        if not matches:
+            return None
+        return self._sorted(matches)[0]
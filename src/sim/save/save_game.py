@@ -69,11 +69,8 @@ def _copy_events_database_if_needed(world: "World", events_db_path: Path) -> Non
     if current_db_path == events_db_path:
         return
 
-    import shutil
-
     if current_db_path.exists():
-        events_db_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(current_db_path, events_db_path)
+        storage.copy_to(events_db_path)
         print(f"Copied events database: {current_db_path} -> {events_db_path}")
     else:
         print(f"Warning: Current events database not found: {current_db_path}")
@@ -36,6 +36,7 @@ class WorldCoreLoadSection:
             start_year=world_data.get("start_year", 100),
         )
         context.world = world
+        world.seed = world_data.get("seed")
 
         CustomContentRegistry.load_from_dict(context.save_data.get("custom_content"))
         dynasty_data = world_data.get("dynasty")
@@ -103,6 +103,7 @@ class WorldSection:
         return {
             "month_stamp": int(world.month_stamp),
             "start_year": world.start_year,
+            "seed": getattr(world, "seed", None),
             "map_snapshot": serialize_map_snapshot(world.map),
             "existed_sect_ids": [sect.id for sect in context.existed_sects],
             "dynasty": world.dynasty.to_dict() if getattr(world, "dynasty", None) is not None else None,
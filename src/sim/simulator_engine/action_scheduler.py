@@ -0,0 +1,72 @@
+"""
+同一轮动作执行的冲突分组
+
+把本轮要 tick 的角色按“会读写的共享对象”合并成若干条 lane：
+- 每个角色至少占用自己 ("avatar", id)；
+- 动作通过 Action.get_conflict_keys 声明目标角色、洞府、宗门等共享对象；
+- 共享任意一个 key 的角色落在同一条 lane，lane 内按原顺序串行，lane 之间并发。
+
+lane 与 lane 内的顺序都只取决于输入顺序，不取决于 LLM 返回的先后。
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.run.log import get_logger
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+
+ConflictKey = tuple[str, str]
+
+
+def get_avatar_conflict_keys(avatar: "Avatar") -> set[ConflictKey]:
+    keys: set[ConflictKey] = {("avatar", str(avatar.id))}
+    action_instance = getattr(avatar, "current_action", None)
+    if action_instance is None:
+        return keys
+
+    action = action_instance.action
+    get_conflict_keys = getattr(action, "get_conflict_keys", None)
+    if not callable(get_conflict_keys):
+        return keys
+    try:
+        keys.update(get_conflict_keys(dict(action_instance.params or {})))
+    except Exception as exc:
+        # 推断失败时只占用自身；动作本身在 tick 中会给出真正的失败原因
+        get_logger().logger.warning(
+            "Avatar %s(%s) conflict key resolution failed for %s: %s",
+            avatar.name,
+            avatar.id,
+            action.__class__.__name__,
+            exc,
+        )
+    return keys
+
+
+def build_action_lanes(avatars: list["Avatar"]) -> list[list["Avatar"]]:
+    """按冲突 key 做并查集分组；lane 按其首个角色在输入中的位置排序。"""
+    parent = list(range(len(avatars)))
+
+    def find(index: int) -> int:
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    key_owner: dict[ConflictKey, int] = {}
+    for index, avatar in enumerate(avatars):
+        for key in get_avatar_conflict_keys(avatar):
+            owner = key_owner.setdefault(key, index)
+            if owner == index:
+                continue
+            root_a, root_b = find(owner), find(index)
+            if root_a != root_b:
+                # 始终以更靠前的下标为根，保证分组结果稳定
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    lanes: dict[int, list["Avatar"]] = {}
+    for index, avatar in enumerate(avatars):
+        lanes.setdefault(find(index), []).append(avatar)
+    return list(lanes.values())
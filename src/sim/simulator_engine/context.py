@@ -23,6 +23,8 @@ class SimulationStepContext:
     def create(cls, world: World) -> "SimulationStepContext":
         # 每轮开始时抓取一次在世角色快照，后续只允许通过 phase
         # 明确地修改这份列表，例如死亡结算阶段会原地移除死者。
+        # 同时重建一次空间索引，兜底上个月未经 update_avatar_position 的位置写入。
+        world.avatar_manager.rebuild_spatial_index()
         return cls(
             world=world,
             living_avatars=world.avatar_manager.get_living_avatars(),
@@ -47,8 +47,7 @@ def finalize_step(ctx: SimulationStepContext) -> list[Event]:
             )
 
     if ctx.world.event_manager:
-        for event in final_events:
-            ctx.world.event_manager.add_event(event)
+        ctx.world.event_manager.add_events(final_events)
 
     log_events(final_events)
     ctx.world.month_stamp = ctx.world.month_stamp + 1
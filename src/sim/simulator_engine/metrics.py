@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.utils.config import CONFIG
+
+
+# 环境变量优先于 config.yml 中的 simulation_metrics.profile_phase
+PROFILE_PHASE_ENV = "CWS_PROFILE_PHASE"
+_DEFAULT_HISTORY_SIZE = 120
+_PROFILE_STATS_LIMIT = 40
+
+
+@dataclass(slots=True)
+class PhaseMetrics:
+    name: str
+    index: int
+    wall_seconds: float = 0.0
+    # 该相位内 LLM 调用的累计等待时间（并发调用相加，可能大于墙钟时间）
+    llm_wait_seconds: float = 0.0
+    llm_calls: int = 0
+    events: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "index": self.index,
+            "wall_ms": round(self.wall_seconds * 1000, 3),
+            "llm_wait_ms": round(self.llm_wait_seconds * 1000, 3),
+            "llm_calls": self.llm_calls,
+            "events": self.events,
+        }
+
+
+@dataclass(slots=True)
+class StepMetrics:
+    month_stamp: int | None
+    started_at: float
+    wall_seconds: float = 0.0
+    aborted: bool = False
+    phases: list[PhaseMetrics] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "month_stamp": self.month_stamp,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall_seconds * 1000, 3),
+            "aborted": self.aborted,
+            "phases": [phase.to_dict() for phase in self.phases],
+        }
+
+
+class PhaseMetricsRecorder:
+    """
+    按步记录各相位耗时的环形缓冲区。
+    只保留最近 history_size 个 step，供 /api/v1/query/runtime/phase-metrics 查询。
+    """
+
+    def __init__(self, history_size: int = _DEFAULT_HISTORY_SIZE, profile_phase: str = ""):
+        self.history_size = max(1, int(history_size))
+        self.profile_phase = (profile_phase or "").strip()
+        self._steps: deque[StepMetrics] = deque(maxlen=self.history_size)
+
+    @classmethod
+    def from_config(cls) -> "PhaseMetricsRecorder":
+        conf = getattr(CONFIG, "simulation_metrics", None)
+        history_size = int(getattr(conf, "history_size", _DEFAULT_HISTORY_SIZE)) if conf else _DEFAULT_HISTORY_SIZE
+        profile_phase = str(getattr(conf, "profile_phase", "") or "") if conf else ""
+        profile_phase = os.environ.get(PROFILE_PHASE_ENV, profile_phase)
+        return cls(history_size=history_size, profile_phase=profile_phase)
+
+    def begin_step(self, month_stamp: Any) -> StepMetrics:
+        step = StepMetrics(
+            month_stamp=int(month_stamp) if month_stamp is not None else None,
+            started_at=time.time(),
+        )
+        self._steps.append(step)
+        return step
+
+    def should_profile(self, phase_name: str) -> bool:
+        return bool(self.profile_phase) and self.profile_phase == phase_name
+
+    def steps(self) -> list[StepMetrics]:
+        return list(self._steps)
+
+    def clear(self) -> None:
+        self._steps.clear()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """按相位汇总缓冲区内所有 step 的平均/最大耗时。"""
+        totals: dict[str, dict[str, Any]] = {}
+        for step in self._steps:
+            for phase in step.phases:
+                row = totals.setdefault(
+                    phase.name,
+                    {
+                        "name": phase.name,
+                        "index": phase.index,
+                        "samples": 0,
+                        "wall_ms_total": 0.0,
+                        "wall_ms_max": 0.0,
+                        "llm_wait_ms_total": 0.0,
+                        "llm_calls": 0,
+                        "events": 0,
+                    },
+                )
+                wall_ms = phase.wall_seconds * 1000
+                row["samples"] += 1
+                row["wall_ms_total"] += wall_ms
+                row["wall_ms_max"] = max(row["wall_ms_max"], wall_ms)
+                row["llm_wait_ms_total"] += phase.llm_wait_seconds * 1000
+                row["llm_calls"] += phase.llm_calls
+                row["events"] += phase.events
+
+        rows = []
+        for row in sorted(totals.values(), key=lambda item: item["index"]):
+            samples = row.pop("samples")
+            wall_ms_total = row.pop("wall_ms_total")
+            llm_wait_ms_total = row.pop("llm_wait_ms_total")
+            row["samples"] = samples
+            row["wall_ms_avg"] = round(wall_ms_total / samples, 3)
+            row["wall_ms_max"] = round(row["wall_ms_max"], 3)
+            row["llm_wait_ms_avg"] = round(llm_wait_ms_total / samples, 3)
+            rows.append(row)
+        return rows
+
+    def to_dict(self, limit: int | None = None) -> dict[str, Any]:
+        steps = self.steps()
+        if limit is not None and limit >= 0:
+            steps = steps[-limit:] if limit else []
+        return {
+            "history_size": self.history_size,
+            "profile_phase": self.profile_phase,
+            "summary": self.summary(),
+            "steps": [step.to_dict() for step in steps],
+        }
+
+
+class PhaseProfiler:
+    """在指定相位外层包一层 cProfile，结束后把统计写入 logs/profiles/。"""
+
+    def __init__(self, phase_name: str, month_stamp: Any):
+        self.phase_name = phase_name
+        self.month_stamp = month_stamp
+        self._profile = cProfile.Profile()
+        self.output_path: Path | None = None
+
+    def __enter__(self) -> "PhaseProfiler":
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self._profile.disable()
+        try:
+            self.output_path = self._dump()
+        except OSError as exc:
+            print(f"[PhaseProfiler] Failed to write profile for {self.phase_name}: {exc}")
+
+    def _dump(self) -> Path:
+        from src.config.data_paths import get_data_paths
+
+        profile_dir = get_data_paths().logs_dir / "profiles"
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        stamp = "na" if self.month_stamp is None else int(self.month_stamp)
+        base = profile_dir / f"{self.phase_name}_{stamp}_{time.strftime('%Y%m%d_%H%M%S')}"
+
+        self._profile.dump_stats(str(base.with_suffix(".prof")))
+        with base.with_suffix(".txt").open("w", encoding="utf-8") as fp:
+            stats = pstats.Stats(self._profile, stream=fp)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(_PROFILE_STATS_LIMIT)
+        return base.with_suffix(".prof")
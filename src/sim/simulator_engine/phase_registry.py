@@ -10,6 +10,25 @@ from .phases import actions, annual, lifecycle, poi, sect_war, social, world as
 PhaseHandler = Callable[[Any, Any], Any]
 
 
+# 相位读写的世界状态标签，供 SimulationPhaseRunner 构建依赖图。
+# 只声明会影响规则结算的读写；LLM 提示词里作为背景信息读到的角色资料不计入
+# （并发时可能读到本月稍早的值）。
+AVATARS = "avatars"                      # 在世角色名单（ctx.living_avatars、出生与死亡）
+AVATAR_STATE = "avatar.state"            # 修为、气血、效果、位置等角色自身数值
+AVATAR_ACTION = "avatar.action"          # 当前动作与行动计划
+AVATAR_INVENTORY = "avatar.inventory"    # 物品、装备、灵石
+AVATAR_RELATIONS = "avatar.relations"
+AVATAR_OBJECTIVE = "avatar.objective"
+AVATAR_BACKSTORY = "avatar.backstory"
+AVATAR_NICKNAME = "avatar.nickname"
+SECTS = "sects"
+WORLD_MAP = "world.map"                  # 区域、洞府归属、城市、POI
+WORLD_PHENOMENON = "world.phenomenon"
+WORLD_DYNASTY = "world.dynasty"
+WORLD_CONTENT = "world.content"          # 自定义物品/功法等内容登记
+EVENT_HISTORY = "event_history"          # 已落库的事件历史（finalize_step 写入）
+
+
 @dataclass(frozen=True, slots=True)
 class SimulationPhase:
     name: str
@@ -17,6 +36,26 @@ class SimulationPhase:
     handler_name: str
     handler: PhaseHandler
     reset_check_after: bool = True
+    # reads / writes 为 None 表示未声明，按屏障处理：等待之前所有相位，之后的相位也都等它。
+    # 读取 ctx.events 或直接改写 ctx 的相位必须保持未声明。
+    reads: frozenset[str] | None = None
+    writes: frozenset[str] | None = None
+
+    @property
+    def is_barrier(self) -> bool:
+        return self.reads is None or self.writes is None
+
+    def conflicts_with(self, other: "SimulationPhase") -> bool:
+        if self.is_barrier or other.is_barrier:
+            return True
+        return bool(
+            self.writes & (other.reads | other.writes)
+            or other.writes & self.reads
+        )
+
+
+def _access(*tags: str) -> frozenset[str]:
+    return frozenset(tags)
 
 
 def update_perception_and_knowledge(simulator, ctx):
@@ -129,9 +168,21 @@ def finalize_step_phase(_simulator, ctx):
 
 
 SIMULATION_PHASES: tuple[SimulationPhase, ...] = (
-    SimulationPhase("update_perception_and_knowledge", 1, "update_perception_and_knowledge", update_perception_and_knowledge),
-    SimulationPhase("long_term_objective_thinking", 2, "long_term_objective_thinking", long_term_objective_thinking),
-    SimulationPhase("process_gatherings", 3, "process_gatherings", process_gatherings),
+    SimulationPhase(
+        "update_perception_and_knowledge", 1, "update_perception_and_knowledge", update_perception_and_knowledge,
+        reads=_access(AVATARS, AVATAR_STATE, WORLD_MAP),
+        writes=_access(AVATAR_STATE, WORLD_MAP),
+    ),
+    SimulationPhase(
+        "long_term_objective_thinking", 2, "long_term_objective_thinking", long_term_objective_thinking,
+        reads=_access(AVATARS, AVATAR_OBJECTIVE),
+        writes=_access(AVATAR_OBJECTIVE),
+    ),
+    SimulationPhase(
+        "process_gatherings", 3, "process_gatherings", process_gatherings,
+        reads=_access(AVATARS, AVATAR_STATE, AVATAR_ACTION, AVATAR_INVENTORY, AVATAR_RELATIONS, SECTS, WORLD_MAP),
+        writes=_access(AVATAR_STATE, AVATAR_INVENTORY, AVATAR_RELATIONS, SECTS, WORLD_MAP),
+    ),
     SimulationPhase("decide_actions", 4, "decide_actions", decide_actions),
     SimulationPhase("commit_next_plans", 5, "commit_next_plans", commit_next_plans),
     SimulationPhase("execute_actions", 6, "execute_actions", execute_actions),
@@ -142,17 +193,57 @@ SIMULATION_PHASES: tuple[SimulationPhase, ...] = (
     SimulationPhase("resolve_death", 11, "resolve_death", resolve_death),
     SimulationPhase("discover_pois", 12, "discover_pois", discover_pois),
     SimulationPhase("update_age_and_birth", 13, "update_age_and_birth", update_age_and_birth),
-    SimulationPhase("backstory_generation", 14, "backstory_generation", backstory_generation),
-    SimulationPhase("passive_effects", 15, "passive_effects", passive_effects),
-    SimulationPhase("autonomous_custom_creation", 16, "autonomous_custom_creation", autonomous_custom_creation),
-    SimulationPhase("random_minor_events", 17, "random_minor_events", random_minor_events),
-    SimulationPhase("background_npc_events", 18, "background_npc_events", background_npc_events),
-    SimulationPhase("sect_random_event", 19, "sect_random_event", sect_random_event),
+    SimulationPhase(
+        "backstory_generation", 14, "backstory_generation", backstory_generation,
+        reads=_access(AVATARS, AVATAR_BACKSTORY),
+        writes=_access(AVATAR_BACKSTORY),
+    ),
+    SimulationPhase(
+        "passive_effects", 15, "passive_effects", passive_effects,
+        reads=_access(AVATARS, AVATAR_STATE, AVATAR_ACTION, AVATAR_INVENTORY, AVATAR_RELATIONS, SECTS, WORLD_MAP, WORLD_PHENOMENON),
+        writes=_access(AVATAR_STATE, AVATAR_INVENTORY, AVATAR_RELATIONS, WORLD_MAP),
+    ),
+    SimulationPhase(
+        "autonomous_custom_creation", 16, "autonomous_custom_creation", autonomous_custom_creation,
+        reads=_access(AVATARS, AVATAR_STATE, AVATAR_ACTION, AVATAR_INVENTORY, WORLD_CONTENT),
+        writes=_access(AVATAR_INVENTORY, WORLD_CONTENT),
+    ),
+    SimulationPhase(
+        "random_minor_events", 17, "random_minor_events", random_minor_events,
+        reads=_access(AVATARS, AVATAR_ACTION, AVATAR_RELATIONS, WORLD_PHENOMENON),
+        writes=_access(AVATAR_RELATIONS),
+    ),
+    SimulationPhase(
+        "background_npc_events", 18, "background_npc_events", background_npc_events,
+        reads=_access(AVATARS, AVATAR_ACTION, WORLD_MAP),
+        writes=_access(),
+    ),
+    SimulationPhase(
+        "sect_random_event", 19, "sect_random_event", sect_random_event,
+        reads=_access(SECTS),
+        writes=_access(SECTS),
+    ),
     SimulationPhase("sect_wars", 20, "sect_wars", sect_wars),
-    SimulationPhase("nickname_generation", 21, "nickname_generation", nickname_generation),
-    SimulationPhase("update_celestial_phenomenon", 22, "update_celestial_phenomenon", update_celestial_phenomenon),
-    SimulationPhase("update_city_population", 23, "update_city_population", update_city_population),
-    SimulationPhase("update_dynasty_and_officials", 24, "update_dynasty_and_officials", update_dynasty_and_officials),
+    SimulationPhase(
+        "nickname_generation", 21, "nickname_generation", nickname_generation,
+        reads=_access(AVATARS, AVATAR_NICKNAME, EVENT_HISTORY),
+        writes=_access(AVATAR_NICKNAME),
+    ),
+    SimulationPhase(
+        "update_celestial_phenomenon", 22, "update_celestial_phenomenon", update_celestial_phenomenon,
+        reads=_access(WORLD_PHENOMENON),
+        writes=_access(WORLD_PHENOMENON),
+    ),
+    SimulationPhase(
+        "update_city_population", 23, "update_city_population", update_city_population,
+        reads=_access(WORLD_MAP),
+        writes=_access(WORLD_MAP),
+    ),
+    SimulationPhase(
+        "update_dynasty_and_officials", 24, "update_dynasty_and_officials", update_dynasty_and_officials,
+        reads=_access(AVATARS, AVATAR_STATE, WORLD_DYNASTY, WORLD_MAP),
+        writes=_access(AVATAR_STATE, WORLD_DYNASTY),
+    ),
     SimulationPhase("handle_interactions_second", 25, "handle_interactions", handle_interactions),
     SimulationPhase("update_calculated_relations", 26, "update_calculated_relations", update_calculated_relations),
     SimulationPhase("annual_maintenance", 27, "annual_maintenance", annual_maintenance),
@@ -1,18 +1,57 @@
 from __future__ import annotations
 
+import asyncio
+import dataclasses
 import inspect
+import os
+import time
+from contextlib import nullcontext
 from typing import Any
 
+from src.utils.config import CONFIG
+from src.utils.llm.timing import track_llm_wait
+
 from .context import SimulationStepContext
+from .metrics import PhaseMetrics, PhaseMetricsRecorder, PhaseProfiler, StepMetrics
 from .phase_registry import SimulationPhase, get_simulation_phases
 
 
+# 环境变量优先于 config.yml 中的 simulation_phases.mode
+PHASE_MODE_ENV = "CWS_PHASE_MODE"
+PHASE_MODE_DAG = "dag"
+PHASE_MODE_SEQUENTIAL = "sequential"
+
+
 class SimulationStepAborted(Exception):
     """Raised internally when a lifecycle command supersedes the current step."""
 
 
+def resolve_phase_mode() -> str:
+    conf = getattr(CONFIG, "simulation_phases", None)
+    mode = str(getattr(conf, "mode", PHASE_MODE_DAG) or PHASE_MODE_DAG) if conf else PHASE_MODE_DAG
+    mode = os.environ.get(PHASE_MODE_ENV, mode).strip().lower()
+    return PHASE_MODE_SEQUENTIAL if mode == PHASE_MODE_SEQUENTIAL else PHASE_MODE_DAG
+
+
+def build_phase_dependencies(phases: tuple[SimulationPhase, ...]) -> list[frozenset[int]]:
+    """每个相位依赖于它之前、与之读写冲突的所有相位（按在 phases 中的下标）。"""
+    return [
+        frozenset(
+            earlier
+            for earlier in range(position)
+            if phases[earlier].conflicts_with(phase)
+        )
+        for position, phase in enumerate(phases)
+    ]
+
+
 class SimulationPhaseRunner:
-    def __init__(self, simulator: Any, phases: tuple[SimulationPhase, ...] | None = None):
+    def __init__(
+        self,
+        simulator: Any,
+        phases: tuple[SimulationPhase, ...] | None = None,
+        mode: str | None = None,
+    ):
         self.simulator = simulator
         self.world = simulator.world
         self.phases = phases or get_simulation_phases()
@@ -20,6 +59,8 @@ class SimulationPhaseRunner:
             phase.handler_name: phase.handler
             for phase in self.phases
         }
+        self.mode = mode or resolve_phase_mode()
+        self.dependencies = build_phase_dependencies(self.phases)
 
     def raise_if_reset_requested(self) -> None:
         runtime = getattr(self.world, "runtime", None)
@@ -28,16 +69,131 @@ class SimulationPhaseRunner:
 
     async def run(self) -> list[Any]:
         ctx = SimulationStepContext.create(self.world)
+        recorder: PhaseMetricsRecorder | None = getattr(self.simulator, "phase_metrics", None)
+        step = recorder.begin_step(ctx.month_stamp) if recorder is not None else None
+        step_started = time.perf_counter()
+        # cProfile 无法区分同时运行的相位，开启相位剖析时退回顺序执行
+        sequential = self.mode == PHASE_MODE_SEQUENTIAL or (recorder is not None and bool(recorder.profile_phase))
         try:
             self.raise_if_reset_requested()
-            for phase in self.phases:
+            if sequential:
+                return await self._run_sequential(ctx, recorder, step)
+            return await self._run_graph(ctx, recorder, step)
+        except SimulationStepAborted:
+            if step is not None:
+                step.aborted = True
+            return []
+        finally:
+            if step is not None:
+                step.wall_seconds = time.perf_counter() - step_started
+
+    async def _run_sequential(
+        self,
+        ctx: SimulationStepContext,
+        recorder: PhaseMetricsRecorder | None,
+        step: StepMetrics | None,
+    ) -> list[Any]:
+        for phase in self.phases:
+            result = await self._run_phase(phase, ctx, recorder, step)
+            if phase.reset_check_after:
+                self.raise_if_reset_requested()
+            if phase.name == "finalize_step":
+                return result or []
+        return []
+
+    async def _run_graph(
+        self,
+        ctx: SimulationStepContext,
+        recorder: PhaseMetricsRecorder | None,
+        step: StepMetrics | None,
+    ) -> list[Any]:
+        """
+        依赖满足即启动相位，互不冲突的相位并发运行。
+        已声明读写的相位把事件写进各自的缓冲，按相位顺序并入 ctx.events，
+        因此事件顺序与顺序执行一致；屏障相位直接使用 ctx，且运行时没有其他相位。
+        """
+        pending = list(range(len(self.phases)))
+        running: dict[asyncio.Task, int] = {}
+        completed: set[int] = set()
+        buffers: dict[int, SimulationStepContext] = {}
+        results: dict[int, Any] = {}
+        next_merge = 0
+        try:
+            while pending or running:
+                for position in [p for p in pending if self.dependencies[p] <= completed]:
+                    pending.remove(position)
+                    phase = self.phases[position]
+                    phase_ctx = ctx
+                    if not phase.is_barrier:
+                        phase_ctx = buffers[position] = dataclasses.replace(ctx, events=[])
+                    running[asyncio.create_task(self._run_graph_phase(phase, phase_ctx, recorder, step))] = position
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.__getitem__):
+                    position = running.pop(task)
+                    results[position] = task.result()
+                    completed.add(position)
+
+                while next_merge in completed:
+                    buffered = buffers.pop(next_merge, None)
+                    if buffered is not None:
+                        ctx.add_events(buffered.events)
+                    next_merge += 1
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        for position, phase in enumerate(self.phases):
+            if phase.name == "finalize_step":
+                return results.get(position) or []
+        return []
+
+    async def _run_graph_phase(
+        self,
+        phase: SimulationPhase,
+        ctx: SimulationStepContext,
+        recorder: PhaseMetricsRecorder | None,
+        step: StepMetrics | None,
+    ) -> Any:
+        # 并发相位可能在别的相位请求重置之后才开始，开始前也检查一次
+        self.raise_if_reset_requested()
+        result = await self._run_phase(phase, ctx, recorder, step)
+        if phase.reset_check_after:
+            self.raise_if_reset_requested()
+        return result
+
+    async def _run_phase(
+        self,
+        phase: SimulationPhase,
+        ctx: SimulationStepContext,
+        recorder: PhaseMetricsRecorder | None,
+        step: StepMetrics | None,
+    ) -> Any:
+        if step is None:
+            result = phase.handler(self.simulator, ctx)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+
+        metrics = PhaseMetrics(name=phase.name, index=phase.index)
+        step.phases.append(metrics)
+        events_before = len(ctx.events)
+        profiler = (
+            PhaseProfiler(phase.name, ctx.month_stamp)
+            if recorder is not None and recorder.should_profile(phase.name)
+            else nullcontext()
+        )
+        started = time.perf_counter()
+        try:
+            with track_llm_wait() as llm_wait, profiler:
                 result = phase.handler(self.simulator, ctx)
                 if inspect.isawaitable(result):
                     result = await result
-                if phase.reset_check_after:
-                    self.raise_if_reset_requested()
-                if phase.name == "finalize_step":
-                    return result or []
-            return []
-        except SimulationStepAborted:
-            return []
+        finally:
+            metrics.wall_seconds = time.perf_counter() - started
+            metrics.llm_wait_seconds = llm_wait.seconds
+            metrics.llm_calls = llm_wait.calls
+            metrics.events = max(0, len(ctx.events) - events_before)
+        return result
@@ -1,43 +1,65 @@
 from __future__ import annotations
 
+import asyncio
+
 from src.classes.ai import llm_ai
 from src.classes.core.avatar import Avatar
 from src.classes.event import Event, is_null_event
 from src.config.providers import StaticConfigProvider
 from src.run.log import get_logger
+from src.sim.simulator_engine.action_scheduler import build_action_lanes
 from src.server.runtime.capabilities import get_roleplay_gateway_from_world
 
 
-async def phase_decide_actions(world, living_avatars: list[Avatar]) -> None:
-    try:
-        from src.server.services.roleplay_service import maybe_request_roleplay_decision
-
-        maybe_request_roleplay_decision(world)
-    except Exception:
-        pass
-
+def select_avatars_to_decide(world, living_avatars: list[Avatar]) -> list[Avatar]:
     gateway = get_roleplay_gateway_from_world(world)
     controlled_avatar_id = gateway.get_controlled_avatar_id() if gateway is not None else ""
 
     # 只给“既没在执行动作，也没有待执行计划”的角色补决策，
     # 避免 LLM 覆盖已经排好的行动链。
-    avatars_to_decide = [
+    return [
         avatar
         for avatar in living_avatars
         if avatar.current_action is None and not avatar.has_plans()
         and str(getattr(avatar, "id", "")) != controlled_avatar_id
     ]
-    if not avatars_to_decide:
-        return
-
-    decide_results = await llm_ai.decide(world, avatars_to_decide)
-    for avatar, result in decide_results.items():
-        action_name_params_pairs, avatar_thinking, short_term_objective, _event = result
-        avatar.load_decide_result_chain(
-            action_name_params_pairs,
-            avatar_thinking,
-            short_term_objective,
-        )
+
+
+async def phase_decide_actions(world, living_avatars: list[Avatar]) -> None:
+    try:
+        from src.server.services.roleplay_service import maybe_request_roleplay_decision
+
+        maybe_request_roleplay_decision(world)
+    except Exception:
+        pass
+
+    avatars_to_decide = select_avatars_to_decide(world, living_avatars)
+    try:
+        if not avatars_to_decide:
+            return
+
+        decide_results = await llm_ai.decide(world, avatars_to_decide)
+        for avatar, result in decide_results.items():
+            action_name_params_pairs, avatar_thinking, short_term_objective, _event = result
+            avatar.load_decide_result_chain(
+                action_name_params_pairs,
+                avatar_thinking,
+                short_term_objective,
+            )
+    finally:
+        # 本月没有用上的预取请求都已过期
+        prefetcher = getattr(world, "_decision_prefetcher", None)
+        if prefetcher is not None:
+            prefetcher.discard_all()
+
+
+def prefetch_next_decisions(world) -> int:
+    """月末结算后，为当前空闲的角色预取下个月的决策（需开启 decision_prefetch）。"""
+    living_avatars = world.avatar_manager.get_living_avatars()
+    avatars = select_avatars_to_decide(world, living_avatars)
+    if not avatars:
+        return 0
+    return llm_ai.prefetch(world, avatars)
 
 
 def phase_commit_next_plans(living_avatars: list[Avatar]) -> list[Event]:
@@ -52,32 +74,57 @@ def phase_commit_next_plans(living_avatars: list[Avatar]) -> list[Event]:
     return events
 
 
-async def _tick_action_round(avatars: list[Avatar], log_label: str) -> tuple[list[Event], set[Avatar]]:
+async def _tick_avatar_action(avatar: Avatar, log_label: str) -> tuple[list[Event], bool]:
+    # 单个角色执行一次 tick_action，返回 (事件, 是否需要同月补跑)。
+    try:
+        new_events = await avatar.tick_action()
+        return list(new_events or []), bool(getattr(avatar, "_new_action_set_this_step", False))
+    except Exception as exc:
+        get_logger().logger.error(
+            "Avatar %s(%s) %s failed: %s",
+            avatar.name,
+            avatar.id,
+            log_label,
+            exc,
+            exc_info=True,
+        )
+        if hasattr(avatar, "_new_action_set_this_step"):
+            avatar._new_action_set_this_step = False
+        return [], False
+
+
+async def _tick_action_lane(
+    lane: list[Avatar],
+    log_label: str,
+    results: dict[Avatar, tuple[list[Event], bool]],
+) -> None:
+    for avatar in lane:
+        results[avatar] = await _tick_avatar_action(avatar, log_label)
+
+
+async def _tick_action_round(avatars: list[Avatar], log_label: str) -> tuple[list[Event], list[Avatar]]:
     # 单轮动作执行。返回本轮事件，以及需要在同月继续补跑的角色。
     # 之所以要单独拆出来，是为了把“首轮执行”和“后续重试轮”复用同一套异常处理。
-    events: list[Event] = []
-    avatars_needing_retry: set[Avatar] = set()
+    # 互不冲突的角色并发执行（finish 里的 LLM 调用不再互相阻塞），
+    # 事件与补跑名单仍按输入顺序汇总，与各 lane 的完成先后无关。
+    results: dict[Avatar, tuple[list[Event], bool]] = {}
+    if StaticConfigProvider.current().concurrent_action_execution():
+        lanes = build_action_lanes(avatars)
+    else:
+        lanes = [list(avatars)]
+
+    if len(lanes) == 1:
+        await _tick_action_lane(lanes[0], log_label, results)
+    else:
+        await asyncio.gather(*(_tick_action_lane(lane, log_label, results) for lane in lanes))
 
+    events: list[Event] = []
+    avatars_needing_retry: list[Avatar] = []
     for avatar in avatars:
-        try:
-            new_events = await avatar.tick_action()
-            if new_events:
-                events.extend(new_events)
-
-            if getattr(avatar, "_new_action_set_this_step", False):
-                avatars_needing_retry.add(avatar)
-        except Exception as exc:
-            get_logger().logger.error(
-                "Avatar %s(%s) %s failed: %s",
-                avatar.name,
-                avatar.id,
-                log_label,
-                exc,
-                exc_info=True,
-            )
-            if hasattr(avatar, "_new_action_set_this_step"):
-                avatar._new_action_set_this_step = False
-
+        avatar_events, needs_retry = results.get(avatar, ([], False))
+        events.extend(avatar_events)
+        if needs_retry:
+            avatars_needing_retry.append(avatar)
     return events, avatars_needing_retry
 
 
@@ -96,9 +143,8 @@ async def phase_execute_actions(living_avatars: list[Avatar]) -> list[Event]:
     # 某些动作会在 tick 内无缝接上新的 current_action。
     # 这类角色会在同一个月内继续补跑，但要受全局上限保护，避免死循环。
     while avatars_needing_retry and round_count < max_local_rounds:
-        current_avatars = list(avatars_needing_retry)
         round_events, avatars_needing_retry = await _tick_action_round(
-            current_avatars,
+            avatars_needing_retry,
             "retry tick_action",
         )
         events.extend(round_events)
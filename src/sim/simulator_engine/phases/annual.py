@@ -10,6 +10,9 @@ from src.run.log import get_logger
 from src.systems.time import Month
 from src.utils.config import CONFIG
 
+# 规划阶段异常（区别于 plan 为 None 的兜底执行），该宗门本轮跳过
+_PLAN_FAILED = object()
+
 
 def _should_run_sect_decision_cycle(world) -> bool:
     current_year = int(world.month_stamp.get_year())
@@ -71,6 +74,51 @@ async def run_annual_maintenance(simulator, ctx) -> None:
             get_logger().logger.info("Cleaned up %s expired POIs.", cleaned_pois)
 
 
+def _get_active_sects(world) -> list:
+    sect_context = getattr(world, "sect_context", None)
+    return (
+        sect_context.get_active_sects()
+        if sect_context is not None
+        else (getattr(world, "existed_sects", []) or [])
+    )
+
+
+def _log_sect_failure(stage: str, sect, exc: Exception) -> None:
+    get_logger().logger.error(
+        "Sect periodic %s failed for %s(%s): %s",
+        stage,
+        getattr(sect, "name", "unknown"),
+        getattr(sect, "id", "unknown"),
+        exc,
+        exc_info=True,
+    )
+
+
+def _build_sect_contexts(world, active_sects, event_storage, stage: str):
+    """
+    在同一份世界快照上为各宗门构建决策上下文（势力快照、关系、散修信息只算一次）。
+    返回 (shared, [(sect, ctx), ...])，构建失败的宗门记录日志后跳过。
+    """
+    from src.classes.core.sect import get_sect_decision_context
+    from src.systems.sect_decision_context import SectDecisionSharedContext
+
+    shared = SectDecisionSharedContext(world)
+    contexts = []
+    for sect in active_sects:
+        try:
+            ctx = get_sect_decision_context(
+                sect=sect,
+                world=world,
+                event_storage=event_storage,
+                shared=shared,
+            )
+        except Exception as exc:
+            _log_sect_failure(stage, sect, exc)
+            continue
+        contexts.append((sect, ctx))
+    return shared, contexts
+
+
 async def phase_sect_periodic_decision(simulator) -> list[Event]:
     world = simulator.world
     if world.month_stamp.get_month() != Month.JANUARY:
@@ -78,12 +126,7 @@ async def phase_sect_periodic_decision(simulator) -> list[Event]:
     if not _should_run_sect_decision_cycle(world):
         return []
 
-    sect_context = getattr(world, "sect_context", None)
-    active_sects = (
-        sect_context.get_active_sects()
-        if sect_context is not None
-        else (getattr(world, "existed_sects", []) or [])
-    )
+    active_sects = _get_active_sects(world)
     if not active_sects:
         return []
 
@@ -91,17 +134,25 @@ async def phase_sect_periodic_decision(simulator) -> list[Event]:
     if event_storage is None:
         return []
 
-    from src.classes.core.sect import get_sect_decision_context
+    shared, contexts = _build_sect_contexts(world, active_sects, event_storage, "decision")
+
+    # 1. 各宗门的 LLM 规划并发进行（并发上限由 LLM 客户端的全局信号量控制），不修改世界状态
+    async def _plan_one(sect, ctx):
+        try:
+            return await SectDecider.plan(sect, ctx, world, world_info=shared.world_info)
+        except Exception as exc:
+            _log_sect_failure("decision", sect, exc)
+            return _PLAN_FAILED
 
+    plans = await asyncio.gather(*[_plan_one(sect, ctx) for sect, ctx in contexts])
+
+    # 2. 按宗门顺序依次落地，保证结果与事件顺序确定
     events: list[Event] = []
-    for sect in active_sects:
+    for (sect, ctx), plan in zip(contexts, plans):
+        if plan is _PLAN_FAILED:
+            continue
         try:
-            ctx = get_sect_decision_context(
-                sect=sect,
-                world=world,
-                event_storage=event_storage,
-            )
-            result = await SectDecider.decide(sect, ctx, world)
+            result = await SectDecider.execute(sect, ctx, world, plan)
             sect.last_decision_summary = result.summary_text
             events.extend(result.events)
             events.append(
@@ -113,13 +164,7 @@ async def phase_sect_periodic_decision(simulator) -> list[Event]:
                 )
             )
         except Exception as exc:
-            get_logger().logger.error(
-                "Sect periodic decision failed for %s(%s): %s",
-                getattr(sect, "name", "unknown"),
-                getattr(sect, "id", "unknown"),
-                exc,
-                exc_info=True,
-            )
+            _log_sect_failure("decision", sect, exc)
     return events
 
 
@@ -130,12 +175,7 @@ async def phase_sect_periodic_thinking(simulator) -> list[Event]:
     if not _should_run_sect_thinking_cycle(world):
         return []
 
-    sect_context = getattr(world, "sect_context", None)
-    active_sects = (
-        sect_context.get_active_sects()
-        if sect_context is not None
-        else (getattr(world, "existed_sects", []) or [])
-    )
+    active_sects = _get_active_sects(world)
     if not active_sects:
         return []
 
@@ -143,43 +183,31 @@ async def phase_sect_periodic_thinking(simulator) -> list[Event]:
     if event_storage is None:
         return []
 
-    from src.classes.core.sect import get_sect_decision_context
-
-    events: list[Event] = []
+    # 决策已落地，这里重新取一份快照，所有宗门共用
+    shared, contexts = _build_sect_contexts(world, active_sects, event_storage, "thinking")
 
-    async def _decide_one(sect):
+    async def _think_one(sect, ctx) -> Event | None:
         try:
-            # 每个宗门单独构造决策上下文，并行生成 periodic_thinking。
-            ctx = get_sect_decision_context(
-                sect=sect,
-                world=world,
-                event_storage=event_storage,
-            )
             sect.periodic_thinking = await SectThinker.think(
                 sect,
                 ctx,
                 world,
                 decision_summary=str(getattr(sect, "last_decision_summary", "") or ""),
+                world_info=shared.world_info,
             )
-            events.append(
-                Event(
-                    world.month_stamp,
-                    t(
-                        "game.sect_thinking_event",
-                        sect_name=sect.name,
-                        thinking=sect.periodic_thinking,
-                    ),
-                    related_sects=[int(sect.id)],
-                )
+            return Event(
+                world.month_stamp,
+                t(
+                    "game.sect_thinking_event",
+                    sect_name=sect.name,
+                    thinking=sect.periodic_thinking,
+                ),
+                related_sects=[int(sect.id)],
             )
         except Exception as exc:
-            get_logger().logger.error(
-                "Sect periodic thinking failed for %s(%s): %s",
-                getattr(sect, "name", "unknown"),
-                getattr(sect, "id", "unknown"),
-                exc,
-                exc_info=True,
-            )
+            _log_sect_failure("thinking", sect, exc)
+            return None
 
-    await asyncio.gather(*[_decide_one(sect) for sect in active_sects])
-    return events
+    results = await asyncio.gather(*[_think_one(sect, ctx) for sect, ctx in contexts])
+    # gather 按传入顺序返回，事件顺序与宗门顺序一致
+    return [event for event in results if event is not None]
@@ -27,6 +27,7 @@ def _teleport_avatar_to_sect_headquarter(avatar, sect_manager) -> bool:
     avatar.pos_x = x
     avatar.pos_y = y
     avatar.tile = world.map.get_tile(x, y)
+    world.avatar_manager.update_avatar_position(avatar)
     return avatar.tile is not None
 
 
@@ -8,12 +8,21 @@ from src.classes.environment.region import CityRegion, CultivateRegion
 from src.classes.event import Event
 from src.classes.observe import get_avatar_observation_radius
 from src.i18n import t
-from src.systems.autonomous_custom_content_service import try_trigger_autonomous_custom_creation
-from src.systems.fortune import try_trigger_fortune, try_trigger_misfortune
-from src.systems.opportunity import phase_check_opportunities, phase_generate_opportunities
+from src.systems.autonomous_custom_content_service import AutonomousCustomContentService
+from src.systems.fortune import apply_fortune, apply_misfortune
+from src.systems.opportunity import create_opportunity, phase_check_opportunities
 from src.systems.world_secret import phase_world_secret_discovery
-from src.systems.fate_revelation import try_trigger_fate_revelation
-from src.systems.random_minor_event import try_trigger_random_minor_event
+from src.systems.fate_revelation import apply_fate_revelation
+from src.systems.random_minor_event_service import RandomMinorEventService
+from src.systems.trigger_screening import (
+    TRIGGER_AUTONOMOUS_CREATION,
+    TRIGGER_FATE_REVELATION,
+    TRIGGER_FORTUNE,
+    TRIGGER_MISFORTUNE,
+    TRIGGER_OPPORTUNITY,
+    TRIGGER_RANDOM_MINOR_EVENT,
+    screen_world_triggers,
+)
 from src.systems.background_npc import try_trigger_background_npc_events
 from src.systems.sect_random_event import try_trigger_sect_random_event
 from src.systems.time import Month
@@ -99,22 +108,31 @@ async def phase_passive_effects(world, living_avatars: list[Avatar]) -> list[Eve
         events.extend(process_avatar_gu_effects(avatar, int(world.month_stamp)))
         avatar.update_time_effect()
 
+    # 先统一做概率初筛，只为命中的角色创建协程。
     target_avatars = [avatar for avatar in living_avatars if avatar.can_trigger_world_event]
+    hits = screen_world_triggers(
+        world,
+        target_avatars,
+        (TRIGGER_FORTUNE, TRIGGER_MISFORTUNE, TRIGGER_FATE_REVELATION, TRIGGER_OPPORTUNITY),
+    )
     results = await asyncio.gather(
-        *[try_trigger_fortune(avatar) for avatar in target_avatars],
-        *[try_trigger_misfortune(avatar) for avatar in target_avatars],
-        *[try_trigger_fate_revelation(avatar, world) for avatar in target_avatars],
+        *[apply_fortune(avatar) for avatar in hits[TRIGGER_FORTUNE]],
+        *[apply_misfortune(avatar) for avatar in hits[TRIGGER_MISFORTUNE]],
+        *[apply_fate_revelation(avatar, world) for avatar in hits[TRIGGER_FATE_REVELATION]],
     )
     events.extend([event for result in results if result for event in result])
-    events.extend(await phase_generate_opportunities(world, target_avatars))
+    # 机缘线索逐个生成，与 phase_generate_opportunities 一致。
+    for avatar in hits[TRIGGER_OPPORTUNITY]:
+        events.extend(await create_opportunity(avatar, world))
     return events
 
 
 async def phase_random_minor_events(world, living_avatars: list[Avatar]) -> list[Event]:
     # 小随机事件和 fortune/misfortune 分开，便于分别控制概率与测试。
     target_avatars = [avatar for avatar in living_avatars if avatar.can_trigger_world_event]
+    hits = screen_world_triggers(world, target_avatars, (TRIGGER_RANDOM_MINOR_EVENT,))
     results = await asyncio.gather(
-        *[try_trigger_random_minor_event(avatar, world) for avatar in target_avatars]
+        *[RandomMinorEventService.try_create_events(avatar, world) for avatar in hits[TRIGGER_RANDOM_MINOR_EVENT]]
     )
     return [event for result in results for event in result]
 
@@ -125,8 +143,9 @@ def phase_background_npc_events(world, living_avatars: list[Avatar]) -> list[Eve
 
 async def phase_autonomous_custom_creation(world, living_avatars: list[Avatar]) -> list[Event]:
     target_avatars = [avatar for avatar in living_avatars if avatar.can_trigger_world_event]
+    hits = screen_world_triggers(world, target_avatars, (TRIGGER_AUTONOMOUS_CREATION,))
     results = await asyncio.gather(
-        *[try_trigger_autonomous_custom_creation(avatar, world) for avatar in target_avatars]
+        *[AutonomousCustomContentService.try_create_events(avatar, world) for avatar in hits[TRIGGER_AUTONOMOUS_CREATION]]
     )
     return [event for result in results for event in result]
 
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 from src.classes.event import Event
 from src.classes.core.world import World
+from src.classes.decision_prefetch import is_decision_prefetch_enabled
 from src.config.providers import StaticConfigProvider
+from src.utils.rng import seed_world_random
 
+from .metrics import PhaseMetricsRecorder
 from .phase_runner import SimulationPhaseRunner
 
 
@@ -18,6 +21,10 @@ class Simulator:
         from src.sim.managers.sect_manager import SectManager
 
         self.sect_manager = SectManager(world)
+        # 最近若干个月各相位的耗时 / LLM 等待 / 事件数
+        self.phase_metrics = PhaseMetricsRecorder.from_config()
+        # 月末为空闲角色预取下个月的 AI 决策，见 src/classes/decision_prefetch.py
+        self.decision_prefetch = is_decision_prefetch_enabled()
 
     async def step(self) -> list[Event]:
         """
@@ -45,4 +52,14 @@ class Simulator:
         19. 每年一月：世界年度维护
         20. 最终整理事件、入库、写日志并推进月份
         """
-        return await SimulationPhaseRunner(self).run()
+        seed_world_random(self.world)
+        events = await SimulationPhaseRunner(self).run()
+        if self.decision_prefetch and not self._is_reset_requested():
+            from .phases.actions import prefetch_next_decisions
+
+            prefetch_next_decisions(self.world)
+        return events
+
+    def _is_reset_requested(self) -> bool:
+        runtime = getattr(self.world, "runtime", None)
+        return runtime is not None and bool(getattr(runtime, "is_reset_requested", lambda: False)())
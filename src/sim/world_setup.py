@@ -0,0 +1,122 @@
+"""
+开局建世界步骤
+
+Web 开局流程（src.server.init_flow）与无头批量模拟（src.sim.headless）共用的世界构建步骤：
+选择开局宗门、应用世界观、生成初始 NPC、处理开局即死亡的角色、准备初始人物档案。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any
+
+
+def select_existed_sects(*, sects_by_id, needed_sects: int) -> list[Any]:
+    all_sects = list(sects_by_id.values())
+    if needed_sects <= 0 or not all_sects:
+        return []
+
+    pool = list(all_sects)
+    random.shuffle(pool)
+    return pool[:needed_sects]
+
+
+async def apply_world_lore_if_needed(
+    *,
+    world,
+    run_config,
+    world_lore_manager_cls,
+    build_world_lore_snapshot,
+) -> None:
+    world_lore = run_config.world_lore
+    if not world_lore or not world_lore.strip():
+        return
+
+    world.set_world_lore(world_lore)
+    print(f"Reshaping world based on worldview and history: {world_lore[:50]}...")
+    try:
+        world_lore_mgr = world_lore_manager_cls(world)
+        await world_lore_mgr.apply_world_lore(world_lore)
+        if not getattr(world, "world_lore_snapshot", None):
+            world.world_lore_snapshot = build_world_lore_snapshot(world)
+        print("World lore applied")
+    except Exception as exc:
+        print(f"[Warning] Failed to apply world lore: {exc}")
+
+
+async def generate_initial_avatars(
+    *,
+    world,
+    run_config,
+    existed_sects,
+    make_random_avatars,
+) -> dict[Any, Any]:
+    target_total_count = int(run_config.init_npc_num)
+    if target_total_count <= 0:
+        return {}
+
+    def _make_random_sync():
+        return make_random_avatars(
+            world,
+            count=target_total_count,
+            current_month_stamp=world.month_stamp,
+            existed_sects=existed_sects,
+        )
+
+    random_avatars = await asyncio.to_thread(_make_random_sync)
+    print(f"Generated {len(random_avatars)} random NPCs")
+    return random_avatars
+
+
+def resolve_initially_dead_avatars(*, world, avatars: dict[Any, Any]) -> None:
+    """Move pre-generated dead avatars through the normal death pipeline.
+
+    Avatar generation can determine that an NPC's rolled lifespan is already
+    exhausted.  At this point the NPC has not yet been registered, so the
+    generator cannot create its world-facing death artifacts itself.
+    """
+    from src.classes.death import handle_death
+    from src.classes.death_reason import DeathReason, DeathType
+
+    for avatar in avatars.values():
+        if getattr(avatar, "is_dead", False):
+            handle_death(world, avatar, DeathReason(DeathType.OLD_AGE))
+
+
+async def prepare_initial_character_profiles(*, world) -> None:
+    from src.sim.simulator_engine.phases import lifecycle
+
+    avatar_manager = getattr(world, "avatar_manager", None)
+    if avatar_manager is None:
+        return
+
+    if hasattr(avatar_manager, "get_living_avatars"):
+        living_avatars = list(avatar_manager.get_living_avatars())
+    else:
+        living_avatars = list(getattr(avatar_manager, "avatars", {}).values())
+    if not living_avatars:
+        return
+
+    print("Preparing initial character profiles...")
+    objective_results = await asyncio.gather(
+        *[lifecycle.process_avatar_long_term_objective(avatar) for avatar in living_avatars],
+        return_exceptions=True,
+    )
+    event_manager = getattr(world, "event_manager", None)
+    if event_manager is not None:
+        for result in objective_results:
+            if isinstance(result, Exception):
+                print(f"[Warning] Initial long-term objective generation failed: {result}")
+                continue
+            if result is not None:
+                event_manager.add_event(result)
+
+    backstory_results = await asyncio.gather(
+        *[lifecycle.process_avatar_backstory(avatar) for avatar in living_avatars],
+        return_exceptions=True,
+    )
+    for result in backstory_results:
+        if isinstance(result, Exception):
+            print(f"[Warning] Initial backstory generation failed: {result}")
+    print("Initial character profiles prepared")
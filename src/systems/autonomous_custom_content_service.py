@@ -22,9 +22,13 @@ AUTONOMOUS_CREATION_CATEGORIES = ("technique", "weapon", "auxiliary")
 
 
 class AutonomousCustomContentService:
+    @classmethod
+    def get_base_probability(cls) -> float:
+        return max(0.0, float(getattr(CONFIG.world, "autonomous_creation_probability", 0.0)))
+
     @classmethod
     def should_trigger(cls, avatar: Avatar) -> bool:
-        base_prob = float(getattr(CONFIG.world, "autonomous_creation_probability", 0.0))
+        base_prob = cls.get_base_probability()
         if base_prob <= 0.0:
             return False
         if not avatar.can_trigger_world_event:
@@ -43,9 +43,19 @@ def _load_alias_entries() -> dict[tuple[str, str, str], CultivationAliasEntry]:
     return entries
 
 
+_ALIAS_CACHE: tuple[Any, dict[tuple[str, str, str], CultivationAliasEntry]] | None = None
+
+
 def _alias_entries() -> dict[tuple[str, str, str], CultivationAliasEntry]:
     # Read from game_configs at call time so tests and config reloads can patch it.
-    return _load_alias_entries()
+    # The parsed table is reused while game_configs still holds the same rows object.
+    global _ALIAS_CACHE
+    rows = game_configs.get("cultivation_alias")
+    if _ALIAS_CACHE is not None and _ALIAS_CACHE[0] is rows:
+        return _ALIAS_CACHE[1]
+    entries = _load_alias_entries()
+    _ALIAS_CACHE = (rows, entries)
+    return entries
 
 
 def _translate_or_empty(msgid: str) -> str:
@@ -124,13 +124,24 @@ async def _generate_fate_revelation(avatar: Avatar, world: World) -> dict | None
     }
 
 
+def get_fate_revelation_base_probability() -> float:
+    return max(0.0, float(getattr(CONFIG.world, "fate_revelation_probability", 0.0005)))
+
+
+def get_fate_revelation_probability(avatar: Avatar, base_prob: float | None = None) -> float:
+    """命格只显现一次，已显现的角色概率为 0"""
+    if getattr(avatar, "fate_revelation", None) is not None:
+        return 0.0
+    return get_fate_revelation_base_probability() if base_prob is None else base_prob
+
+
 def should_trigger_fate_revelation(avatar: Avatar) -> bool:
     if getattr(avatar, "fate_revelation", None) is not None:
         return False
     if not avatar.can_trigger_world_event:
         return False
 
-    base_prob = float(getattr(CONFIG.world, "fate_revelation_probability", 0.0005))
+    base_prob = get_fate_revelation_probability(avatar)
     if base_prob <= 0.0:
         return False
     return random.random() < base_prob
@@ -139,7 +150,11 @@ def should_trigger_fate_revelation(avatar: Avatar) -> bool:
 async def try_trigger_fate_revelation(avatar: Avatar, world: World) -> list[Event]:
     if not should_trigger_fate_revelation(avatar):
         return []
+    return await apply_fate_revelation(avatar, world)
+
 
+async def apply_fate_revelation(avatar: Avatar, world: World) -> list[Event]:
+    """跳过概率判定，直接生成命格显现"""
     revelation = await _generate_fate_revelation(avatar, world)
     if revelation is None:
         return []
@@ -165,6 +180,9 @@ async def try_trigger_fate_revelation(avatar: Avatar, world: World) -> list[Even
 
 __all__ = [
     "FATE_REVELATION_EVENT_TYPE",
+    "apply_fate_revelation",
+    "get_fate_revelation_base_probability",
+    "get_fate_revelation_probability",
     "is_valid_oracle_text",
     "should_trigger_fate_revelation",
     "try_trigger_fate_revelation",
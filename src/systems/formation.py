@@ -97,10 +97,23 @@ DEFAULT_FORMATION_TYPES: dict[str, FormationTypeConfig] = {
 }
 
 
+_FORMATION_TYPES_CACHE: tuple[Any, dict[str, FormationTypeConfig]] | None = None
+
+
 def get_formation_types() -> dict[str, FormationTypeConfig]:
+    # 解析结果随 game_configs 中的行对象缓存，重载配置后自动失效
+    global _FORMATION_TYPES_CACHE
     rows = game_configs.get("formation", []) or []
     if not rows:
         return DEFAULT_FORMATION_TYPES
+    if _FORMATION_TYPES_CACHE is not None and _FORMATION_TYPES_CACHE[0] is rows:
+        return _FORMATION_TYPES_CACHE[1]
+    configs = _parse_formation_types(rows)
+    _FORMATION_TYPES_CACHE = (rows, configs)
+    return configs
+
+
+def _parse_formation_types(rows) -> dict[str, FormationTypeConfig]:
 
     configs: dict[str, FormationTypeConfig] = {}
     for row in rows:
@@ -332,9 +332,7 @@ async def try_trigger_fortune(avatar: Avatar) -> list[Event]:
       * 修为：根据境界增加修为经验（相当于一年修炼收益）
     - 故事：仅给出主旨主题，由 LLM 自由发挥生成短故事。
     """
-    base_prob = float(getattr(CONFIG.world, "fortune_probability", 0.0))
-    extra_prob = float(avatar.effects.get("extra_fortune_probability", 0.0))
-    prob = max(0.0, base_prob + extra_prob)
+    prob = get_fortune_probability(avatar)
     if prob <= 0.0:
         return []
 
@@ -345,6 +343,23 @@ async def try_trigger_fortune(avatar: Avatar) -> list[Event]:
     if random.random() >= prob:
         return []
 
+    return await apply_fortune(avatar)
+
+
+def get_fortune_base_probability() -> float:
+    return float(getattr(CONFIG.world, "fortune_probability", 0.0))
+
+
+def get_fortune_probability(avatar: Avatar, base_prob: Optional[float] = None) -> float:
+    """本月奇遇概率：config + effects；批量初筛时由调用方传入 base_prob，避免逐个读配置"""
+    if base_prob is None:
+        base_prob = get_fortune_base_probability()
+    extra_prob = float(avatar.effects.get("extra_fortune_probability", 0.0))
+    return max(0.0, base_prob + extra_prob)
+
+
+async def apply_fortune(avatar: Avatar) -> list[Event]:
+    """跳过概率判定，直接结算一次奇遇（概率已由 try_trigger_fortune 或月度初筛判定）"""
     # 从所有可能的奇遇中选择
     record = _choose_fortune_record(avatar)
     if not record:
@@ -592,9 +607,7 @@ async def try_trigger_misfortune(avatar: Avatar) -> list[Event]:
     - 受伤：扣减HP，可能致死（由simulator结算）
     - 修为倒退：扣减经验，不降级（经验值可为负？）-> 此处逻辑：扣减当前经验，最小为0
     """
-    base_prob = float(getattr(CONFIG.world, "misfortune_probability", 0.0))
-    extra_prob = float(avatar.effects.get("extra_misfortune_probability", 0.0))
-    prob = max(0.0, base_prob + extra_prob)
+    prob = get_misfortune_probability(avatar)
     if prob <= 0.0:
         return []
 
@@ -604,7 +617,24 @@ async def try_trigger_misfortune(avatar: Avatar) -> list[Event]:
     
     if random.random() >= prob:
         return []
-        
+
+    return await apply_misfortune(avatar)
+
+
+def get_misfortune_base_probability() -> float:
+    return float(getattr(CONFIG.world, "misfortune_probability", 0.0))
+
+
+def get_misfortune_probability(avatar: Avatar, base_prob: Optional[float] = None) -> float:
+    """本月霉运概率：config + effects"""
+    if base_prob is None:
+        base_prob = get_misfortune_base_probability()
+    extra_prob = float(avatar.effects.get("extra_misfortune_probability", 0.0))
+    return max(0.0, base_prob + extra_prob)
+
+
+async def apply_misfortune(avatar: Avatar) -> list[Event]:
+    """跳过概率判定，直接结算一次霉运"""
     record = _choose_misfortune_record(avatar)
     if not record:
         return []
@@ -688,6 +718,12 @@ async def try_trigger_misfortune(avatar: Avatar) -> list[Event]:
 
 __all__ = [
     "try_trigger_fortune",
+    "get_fortune_base_probability",
+    "get_fortune_probability",
+    "apply_fortune",
     "get_cultivation_exp_reward",
     "try_trigger_misfortune",
+    "get_misfortune_base_probability",
+    "get_misfortune_probability",
+    "apply_misfortune",
 ]
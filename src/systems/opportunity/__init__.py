@@ -158,8 +158,15 @@ def _duration_months() -> int:
     return int(_get_cfg_value("duration_months", 60) or 60)
 
 
+def get_opportunity_base_probability() -> float:
+    return float(_get_cfg_value("probability", 0.0) or 0.0)
+
+
 def _opportunity_probability(avatar: "Avatar") -> float:
-    base = float(_get_cfg_value("probability", 0.0) or 0.0)
+    return _opportunity_probability_with_base(avatar, get_opportunity_base_probability())
+
+
+def _opportunity_probability_with_base(avatar: "Avatar", base: float) -> float:
     extra = float(getattr(avatar, "effects", {}).get("extra_opportunity_probability", 0.0) or 0.0)
     return max(0.0, min(1.0, base + extra))
 
@@ -327,19 +334,30 @@ def _event(owner: "Avatar", content: str, *, related_avatars: list[str] | None =
     )
 
 
-async def try_generate_opportunity(avatar: "Avatar", world: "World") -> list[Event]:
+def get_opportunity_probability(avatar: "Avatar", world: "World", base_prob: float | None = None) -> float:
+    """已有机缘或仍在冷却中的角色本月概率为 0"""
     manager = _get_manager(world)
-    current_month = int(world.month_stamp)
     if manager.has_active(avatar.id):
-        return []
-    if manager.is_in_cooldown(avatar.id, current_month):
-        return []
+        return 0.0
+    if manager.is_in_cooldown(avatar.id, int(world.month_stamp)):
+        return 0.0
+    if base_prob is None:
+        return _opportunity_probability(avatar)
+    return _opportunity_probability_with_base(avatar, base_prob)
+
+
+async def try_generate_opportunity(avatar: "Avatar", world: "World") -> list[Event]:
     if not getattr(avatar, "can_trigger_world_event", True):
         return []
-    prob = _opportunity_probability(avatar)
+    prob = get_opportunity_probability(avatar, world)
     if prob <= 0.0 or random.random() >= prob:
         return []
+    return await create_opportunity(avatar, world)
+
 
+async def create_opportunity(avatar: "Avatar", world: "World") -> list[Event]:
+    """跳过概率判定，直接为角色生成一条机缘线索"""
+    manager = _get_manager(world)
     record = _build_record(avatar, world)
     if record is None:
         return []
@@ -640,6 +658,9 @@ __all__ = [
     "OpportunityTargetType",
     "phase_generate_opportunities",
     "phase_check_opportunities",
+    "get_opportunity_base_probability",
+    "get_opportunity_probability",
+    "create_opportunity",
     "get_opportunity_context_text",
     "serialize_opportunities",
     "load_opportunities",
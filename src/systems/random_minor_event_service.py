@@ -29,9 +29,13 @@ class RandomMinorEventService:
     SOLO_TEMPLATE_NAME = "random_minor_event_solo.txt"
     PAIR_TEMPLATE_NAME = "random_minor_event_pair.txt"
 
+    @classmethod
+    def get_base_probability(cls) -> float:
+        return max(0.0, float(getattr(CONFIG.world, "random_minor_event_prob", 0.05)))
+
     @classmethod
     def should_trigger(cls, avatar: Avatar) -> bool:
-        base_prob = float(getattr(CONFIG.world, "random_minor_event_prob", 0.05))
+        base_prob = cls.get_base_probability()
         if base_prob <= 0.0:
             return False
         if not avatar.can_trigger_world_event:
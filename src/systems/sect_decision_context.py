@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import cached_property
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from src.sim.managers.sect_manager import SectManager
@@ -57,29 +58,124 @@ class SectDecisionContext:
     member_candidates: List[Dict[str, Any]] = field(default_factory=list)
 
 
+class SectDecisionSharedContext:
+    """
+    一轮宗门决策 / 思考中所有宗门共用的世界级数据。
+
+    势力快照、收入估算、宗门关系、世界信息以及散修/成员的详细信息与宗门无关，
+    按需计算且每轮只算一次；各宗门的上下文在同一份快照上构建。
+    """
+
+    def __init__(self, world: "World"):
+        self.world = world
+        self.sect_manager = SectManager(world)
+        self.current_month = int(getattr(world, "month_stamp", 0))
+        self._avatar_details: Dict[str, str] = {}
+        self._governance_summaries: Dict[str, Dict[str, Any]] = {}
+
+    @cached_property
+    def snapshot(self):
+        # 通过公共接口获取 snapshot，避免在多处重复势力范围逻辑
+        return self.sect_manager.get_snapshot()
+
+    @cached_property
+    def income_by_sect(self) -> Dict[int, float]:
+        return self.sect_manager.calculate_income_by_sect(self.snapshot)
+
+    @cached_property
+    def relations_raw(self) -> List[Dict[str, Any]]:
+        # 统一使用 SectManager + compute_sect_relations 计算关系数值与理由
+        world = self.world
+        snapshot = self.snapshot
+        extra_breakdown_by_pair = world.get_active_sect_relation_breakdown(self.current_month)
+        diplomacy_by_pair = world.get_active_sect_diplomacy_breakdown(
+            self.current_month,
+            sect_ids=[int(s.id) for s in snapshot.active_sects],
+        )
+        return compute_sect_relations(
+            snapshot.active_sects,
+            snapshot.tile_owners,
+            border_contact_counts=snapshot.border_contact_counts,
+            extra_breakdown_by_pair=extra_breakdown_by_pair,
+            diplomacy_by_pair=diplomacy_by_pair,
+        )
+
+    @cached_property
+    def world_info(self) -> Dict[str, Any]:
+        return serialize_world_info(self.world)
+
+    def avatar_detailed_info(self, avatar) -> str:
+        key = str(getattr(avatar, "id", ""))
+        if key not in self._avatar_details:
+            self._avatar_details[key] = avatar.get_info(detailed=True)
+        return self._avatar_details[key]
+
+    def governance_summary(self, avatar) -> Dict[str, Any]:
+        key = str(getattr(avatar, "id", ""))
+        if key not in self._governance_summaries:
+            self._governance_summaries[key] = _build_governance_summary(self.world, avatar)
+        return self._governance_summaries[key]
+
+
+def serialize_world_info(world: "World") -> Dict[str, Any]:
+    """宗门决策 / 宗门思考提示词使用的世界信息；获取失败时返回空字典"""
+    try:
+        info = world.get_info(detailed=True)
+        if isinstance(info, dict):
+            return info
+    except Exception:
+        pass
+    return {}
+
+
+def _build_governance_summary(world: "World", avatar) -> Dict[str, Any]:
+    recent_events = []
+    try:
+        recent_events = world.event_manager.get_major_events_by_avatar(
+            str(getattr(avatar, "id", "")),
+            limit=3,
+        )
+    except Exception:
+        recent_events = []
+    return {
+        "realm": str(getattr(getattr(avatar, "cultivation_progress", None), "realm", "") or ""),
+        "alignment": str(getattr(avatar, "alignment", "") or ""),
+        "sect": str(getattr(getattr(avatar, "sect", None), "name", "") or ""),
+        "root": str(getattr(avatar, "root", "") or ""),
+        "orthodoxy": str(getattr(getattr(avatar, "orthodoxy", None), "name", "") or ""),
+        "recent_events": [
+            str(getattr(ev, "content", ""))
+            for ev in recent_events
+            if getattr(ev, "content", "")
+        ][:3],
+    }
+
+
 def build_sect_decision_context(
     sect: "Sect",
     world: "World",
     event_storage: "EventStorage",
     *,
     history_limit: int = 50,
+    shared: Optional[SectDecisionSharedContext] = None,
 ) -> SectDecisionContext:
     """
     构建给“宗门自身决策”使用的只读上下文。
 
     - 所有数值（战力、势力、关系、收入能力）均基于“当前世界状态”的一次性快照；
-    - 仅历史事件部分会回溯最近 N 条与本宗相关的事件。
+    - 仅历史事件部分会回溯最近 N 条与本宗相关的事件；
+    - 批量为多个宗门构建时传入同一个 shared，共用快照与角色信息。
     """
+    if shared is None:
+        shared = SectDecisionSharedContext(world)
+
     # 1. 基础信息（与现有 UI/详情保持一致）
     basic_structured = sect.get_structured_info()
     basic_text = sect.get_detailed_info()
 
     # 2. 使用 SectManager 计算当前势力快照（战力 / 半径 / 势力格 / 冲突）
-    sect_manager = SectManager(world)
-    # 通过公共接口获取 snapshot，避免在多处重复势力范围逻辑
-    snapshot = sect_manager.get_snapshot()
+    snapshot = shared.snapshot
     active_sects = snapshot.active_sects
-    tile_owners = snapshot.tile_owners
     sect_centers = snapshot.sect_centers
 
     # 统计当前本宗占据的格子数与冲突格子数
@@ -110,7 +206,7 @@ def build_sect_decision_context(
     extra_income = float(sect.get_extra_income_per_tile(current_month))
     effective_income_per_tile = max(0.0, base_income + extra_income)
     controlled_tile_income = float(tile_count) * effective_income_per_tile
-    estimated_income_by_sect = sect_manager.calculate_income_by_sect(snapshot)
+    estimated_income_by_sect = shared.income_by_sect
     estimated_shared_income = int(estimated_income_by_sect.get(int(sect.id), 0.0))
     estimated_member_upkeep, upkeep_breakdown = sect.estimate_yearly_member_upkeep()
     estimated_net_annual_balance = estimated_shared_income - estimated_member_upkeep
@@ -205,28 +301,6 @@ def build_sect_decision_context(
         grade = getattr(technique, "grade", None)
         return str(grade) if grade is not None else ""
 
-    def _build_governance_summary(avatar) -> Dict[str, Any]:
-        recent_events = []
-        try:
-            recent_events = world.event_manager.get_major_events_by_avatar(
-                str(getattr(avatar, "id", "")),
-                limit=3,
-            )
-        except Exception:
-            recent_events = []
-        return {
-            "realm": str(getattr(getattr(avatar, "cultivation_progress", None), "realm", "") or ""),
-            "alignment": str(getattr(avatar, "alignment", "") or ""),
-            "sect": str(getattr(getattr(avatar, "sect", None), "name", "") or ""),
-            "root": str(getattr(avatar, "root", "") or ""),
-            "orthodoxy": str(getattr(getattr(avatar, "orthodoxy", None), "name", "") or ""),
-            "recent_events": [
-                str(getattr(ev, "content", ""))
-                for ev in recent_events
-                if getattr(ev, "content", "")
-            ][:3],
-        }
-
     recruitment_candidates: List[Dict[str, Any]] = []
     member_candidates: List[Dict[str, Any]] = []
     all_avatars = getattr(getattr(world, "avatar_manager", None), "avatars", {}) or {}
@@ -249,8 +323,8 @@ def build_sect_decision_context(
                     "technique_grade_rank": _technique_grade_rank(avatar),
                     "alignment_recruitable": bool(sect.is_alignment_recruitable(getattr(avatar, "alignment", None))),
                     "race_recruitable": race_recruitable,
-                    "detailed_info": avatar.get_info(detailed=True),
-                    "governance_summary": _build_governance_summary(avatar),
+                    "detailed_info": shared.avatar_detailed_info(avatar),
+                    "governance_summary": shared.governance_summary(avatar),
                 }
             )
             continue
@@ -271,8 +345,8 @@ def build_sect_decision_context(
                 "technique_grade_rank": _technique_grade_rank(avatar),
                 "is_rule_breaker": bool(sect.is_member_rule_breaker(avatar)),
                 **sect.get_member_status_snapshot(avatar),
-                "detailed_info": avatar.get_info(detailed=True),
-                "governance_summary": _build_governance_summary(avatar),
+                "detailed_info": shared.avatar_detailed_info(avatar),
+                "governance_summary": shared.governance_summary(avatar),
             }
         )
 
@@ -296,19 +370,7 @@ def build_sect_decision_context(
     )
 
     # 4. 当前宗门关系快照
-    # 统一使用 SectManager + compute_sect_relations 计算关系数值与理由
-    extra_breakdown_by_pair = world.get_active_sect_relation_breakdown(current_month)
-    diplomacy_by_pair = world.get_active_sect_diplomacy_breakdown(
-        current_month,
-        sect_ids=[int(s.id) for s in active_sects],
-    )
-    relations_raw = compute_sect_relations(
-        active_sects,
-        tile_owners,
-        border_contact_counts=snapshot.border_contact_counts,
-        extra_breakdown_by_pair=extra_breakdown_by_pair,
-        diplomacy_by_pair=diplomacy_by_pair,
-    )
+    relations_raw = shared.relations_raw
 
     relations: List[Dict[str, Any]] = []
     diplomacy_targets: List[Dict[str, Any]] = []
@@ -0,0 +1,106 @@
+"""
+月度世界触发的概率初筛
+
+奇遇、霉运、命格显现、小随机事件、自主创作、机缘线索都是"每个角色每月按概率触发"。
+过去每种触发对每个角色各建一个协程、各自读取 effects 并掷骰；绝大多数协程什么也不做。
+
+这里先把所有 (角色, 触发类型) 的概率收集成一张平铺表，一次性完成全部伯努利抽样，
+phase 只为命中的角色创建协程（调用各模块的 apply_* / create_*），开销从 O(角色 × 触发类型) 降到 O(命中数)。
+
+- 概率函数与各模块自身的 try_trigger_* 共用，判定口径一致
+- 概率为 0 的组合不掷骰，与 try_trigger_* 提前返回的行为一致
+- 世界秘闻碎片的发现依赖角色所处位置与碎片绑定，且该 phase 需要逐个同步公开知识，不在此初筛
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from src.systems.autonomous_custom_content_service import AutonomousCustomContentService
+from src.systems.fate_revelation import get_fate_revelation_base_probability, get_fate_revelation_probability
+from src.systems.fortune import (
+    get_fortune_base_probability,
+    get_fortune_probability,
+    get_misfortune_base_probability,
+    get_misfortune_probability,
+)
+from src.systems.opportunity import get_opportunity_base_probability, get_opportunity_probability
+from src.systems.random_minor_event_service import RandomMinorEventService
+
+if TYPE_CHECKING:
+    from src.classes.core.avatar import Avatar
+    from src.classes.core.world import World
+
+TRIGGER_FORTUNE = "fortune"
+TRIGGER_MISFORTUNE = "misfortune"
+TRIGGER_FATE_REVELATION = "fate_revelation"
+TRIGGER_OPPORTUNITY = "opportunity"
+TRIGGER_RANDOM_MINOR_EVENT = "random_minor_event"
+TRIGGER_AUTONOMOUS_CREATION = "autonomous_custom_creation"
+
+BaseProbability = Callable[[], float]
+# (角色, 世界, 基础概率) -> 该角色本月概率；为 None 表示只有基础概率，与角色无关
+AvatarProbability = Optional[Callable[["Avatar", "World", float], float]]
+
+_TRIGGER_PROBABILITIES: dict[str, tuple[BaseProbability, AvatarProbability]] = {
+    TRIGGER_FORTUNE: (
+        get_fortune_base_probability,
+        lambda avatar, _world, base: get_fortune_probability(avatar, base),
+    ),
+    TRIGGER_MISFORTUNE: (
+        get_misfortune_base_probability,
+        lambda avatar, _world, base: get_misfortune_probability(avatar, base),
+    ),
+    TRIGGER_FATE_REVELATION: (
+        get_fate_revelation_base_probability,
+        lambda avatar, _world, base: get_fate_revelation_probability(avatar, base),
+    ),
+    TRIGGER_OPPORTUNITY: (get_opportunity_base_probability, get_opportunity_probability),
+    TRIGGER_RANDOM_MINOR_EVENT: (RandomMinorEventService.get_base_probability, None),
+    TRIGGER_AUTONOMOUS_CREATION: (AutonomousCustomContentService.get_base_probability, None),
+}
+
+
+def screen_world_triggers(
+    world: "World",
+    avatars: Iterable["Avatar"],
+    kinds: Iterable[str],
+) -> dict[str, list["Avatar"]]:
+    """
+    对传入角色（调用方已按 can_trigger_world_event 过滤）做一次性抽样。
+    返回 {触发类型: 命中角色列表}，列表保持 avatars 的原有顺序；每个请求的类型都有对应键。
+    """
+    kinds = list(kinds)
+    hits: dict[str, list["Avatar"]] = {kind: [] for kind in kinds}
+    # 基础概率每种触发只读一次配置
+    screens = []
+    for kind in kinds:
+        base_probability, avatar_probability = _TRIGGER_PROBABILITIES[kind]
+        screens.append((kind, base_probability(), avatar_probability))
+
+    probabilities: list[float] = []
+    owners: list[tuple[str, "Avatar"]] = []
+    for avatar in avatars:
+        for kind, base, avatar_probability in screens:
+            prob = base if avatar_probability is None else avatar_probability(avatar, world, base)
+            if prob > 0.0:
+                probabilities.append(prob)
+                owners.append((kind, avatar))
+
+    draws = [random.random() for _ in probabilities]
+    for (kind, avatar), prob, draw in zip(owners, probabilities, draws):
+        if draw < prob:
+            hits[kind].append(avatar)
+    return hits
+
+
+__all__ = [
+    "TRIGGER_AUTONOMOUS_CREATION",
+    "TRIGGER_FATE_REVELATION",
+    "TRIGGER_FORTUNE",
+    "TRIGGER_MISFORTUNE",
+    "TRIGGER_OPPORTUNITY",
+    "TRIGGER_RANDOM_MINOR_EVENT",
+    "screen_world_triggers",
+]
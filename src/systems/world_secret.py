@@ -42,7 +42,37 @@ CITY_DISCOVERY_PROBABILITY = 0.05
 INSIGHT_DISCOVERY_PROBABILITY = 0.003
 
 
+_DEFINITIONS_CACHE: tuple[tuple[Any, ...], dict[str, WorldSecretDefinition]] | None = None
+
+
 def load_world_secret_definitions() -> dict[str, WorldSecretDefinition]:
+    """
+    读取世界秘闻定义。
+    解析结果按 (配置行对象, 当前语言) 缓存，配置重载或切换语言后自动重新解析；
+    返回新的 dict，但其中的定义对象是共享的，调用方不要修改。
+    """
+    global _DEFINITIONS_CACHE
+    from src.classes.language import language_manager
+
+    cache_key = (
+        game_configs.get("world_secret"),
+        game_configs.get("world_secret_fragment"),
+        str(language_manager),
+    )
+    cached = _DEFINITIONS_CACHE
+    if (
+        cached is not None
+        and cached[0][0] is cache_key[0]
+        and cached[0][1] is cache_key[1]
+        and cached[0][2] == cache_key[2]
+    ):
+        return dict(cached[1])
+    secrets = _parse_world_secret_definitions()
+    _DEFINITIONS_CACHE = (cache_key, secrets)
+    return dict(secrets)
+
+
+def _parse_world_secret_definitions() -> dict[str, WorldSecretDefinition]:
     secrets: dict[str, WorldSecretDefinition] = {}
     for row in game_configs.get("world_secret", []):
         secret_id = get_str(row, "id")
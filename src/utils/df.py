@@ -116,6 +116,10 @@ def reload_game_configs():
     new_data = load_game_configs()
     game_configs.clear()
     game_configs.update(new_data)
+
+    from src.utils.prompt_fragments import invalidate_prompt_fragments
+
+    invalidate_prompt_fragments()
     print(f"[DF] Loaded {len(game_configs)} config files.")
 
 
@@ -0,0 +1,250 @@
+"""
+LLM 响应缓存（按需开启）
+
+以 (model, task_name, prompt 哈希) 为键缓存已解析的 JSON 结果：
+- 内存层：有上限的 LRU
+- 磁盘层：数据目录 cache/ 下的 SQLite，重开游戏/读档后依然命中
+- 每个任务单独配置 TTL，未配置（或 TTL 为 0）的任务不缓存
+
+开启方式：config.yml 中 llm.cache.enabled，或环境变量 CWS_LLM_CACHE=1。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.config.data_paths import get_data_paths
+from src.utils.config import CONFIG
+
+CACHE_DB_NAME = "llm_responses.sqlite3"
+_ENV_SWITCH = "CWS_LLM_CACHE"
+# 每写入这么多条，清理一次磁盘层的过期/超量数据
+_DISK_PRUNE_INTERVAL = 200
+
+
+@dataclass(frozen=True)
+class LLMCacheSettings:
+    enabled: bool = False
+    memory_max_entries: int = 2048
+    persist_to_disk: bool = True
+    disk_max_entries: int = 50000
+    task_ttl_seconds: dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls) -> "LLMCacheSettings":
+        defaults = cls()
+        raw = getattr(getattr(CONFIG, "llm", None), "cache", None)
+        enabled = bool(getattr(raw, "enabled", defaults.enabled)) if raw is not None else defaults.enabled
+
+        env_value = os.environ.get(_ENV_SWITCH)
+        if env_value is not None:
+            enabled = env_value.strip().lower() in ("1", "true", "yes", "on")
+
+        if raw is None:
+            return cls(enabled=enabled)
+
+        ttl_raw = getattr(raw, "task_ttl_seconds", None) or {}
+        return cls(
+            enabled=enabled,
+            memory_max_entries=int(getattr(raw, "memory_max_entries", defaults.memory_max_entries)),
+            persist_to_disk=bool(getattr(raw, "persist_to_disk", defaults.persist_to_disk)),
+            disk_max_entries=int(getattr(raw, "disk_max_entries", defaults.disk_max_entries)),
+            task_ttl_seconds={str(k): float(v) for k, v in dict(ttl_raw).items()},
+        )
+
+
+def make_cache_key(model_name: str, task_name: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model_name, task_name, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class LLMResponseCache:
+    """两级（内存 LRU + SQLite）LLM 响应缓存"""
+
+    def __init__(self, settings: LLMCacheSettings, db_path: Optional[Path] = None):
+        self.settings = settings
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._puts_since_prune = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if settings.enabled and settings.persist_to_disk and db_path is not None:
+            self._open_disk(db_path)
+
+    def _open_disk(self, db_path: Path) -> None:
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(db_path), check_same_thread=False)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model_name TEXT NOT NULL,
+                    task_name TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache(last_access)")
+            conn.commit()
+            self._conn = conn
+            self._prune_disk()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] 磁盘缓存不可用，仅使用内存缓存: {e}")
+            self._conn = None
+
+    def ttl_for(self, task_name: str) -> float:
+        return self.settings.task_ttl_seconds.get(task_name, 0.0)
+
+    def is_enabled_for(self, task_name: str | None) -> bool:
+        return bool(self.settings.enabled and task_name and self.ttl_for(task_name) > 0)
+
+    def get(self, model_name: str, task_name: str, prompt: str) -> Optional[dict]:
+        if not self.is_enabled_for(task_name):
+            return None
+        key = make_cache_key(model_name, task_name, prompt)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, payload = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT response, expires_at FROM llm_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is not None:
+                    payload, expires_at = row
+                    if expires_at > now:
+                        self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                        self._conn.commit()
+                        self._remember(key, expires_at, payload)
+                        self.disk_hits += 1
+                        return json.loads(payload)
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+
+            self.misses += 1
+            return None
+
+    def put(self, model_name: str, task_name: str, prompt: str, result: dict) -> None:
+        if not self.is_enabled_for(task_name):
+            return
+        try:
+            payload = json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return
+        key = make_cache_key(model_name, task_name, prompt)
+        now = time.time()
+        expires_at = now + self.ttl_for(task_name)
+        with self._lock:
+            self._remember(key, expires_at, payload)
+            self.stores += 1
+            if self._conn is not None:
+                self._conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_cache
+                        (key, model_name, task_name, response, created_at, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, model_name, task_name, payload, now, expires_at, now),
+                )
+                self._conn.commit()
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= _DISK_PRUNE_INTERVAL:
+                    self._prune_disk()
+
+    def _remember(self, key: str, expires_at: float, payload: str) -> None:
+        self._memory[key] = (expires_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.settings.memory_max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_disk(self) -> None:
+        if self._conn is None:
+            return
+        self._puts_since_prune = 0
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        self._conn.execute(
+            """
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.settings.disk_max_entries,),
+        )
+        self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        hits = self.memory_hits + self.disk_hits
+        return {
+            "enabled": self.settings.enabled,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+            "hit_rate": (hits / lookups) if lookups else 0.0,
+        }
+
+
+_CACHE: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """获取进程级 LLM 缓存实例（懒加载）"""
+    global _CACHE
+    if _CACHE is None:
+        settings = LLMCacheSettings.from_config()
+        _CACHE = LLMResponseCache(settings, get_data_paths().cache_dir / CACHE_DB_NAME)
+    return _CACHE
+
+
+def reset_llm_cache(cache: Optional[LLMResponseCache] = None) -> None:
+    """替换或重置缓存实例（主要用于测试和配置变更）"""
+    global _CACHE
+    if _CACHE is not None and _CACHE is not cache:
+        _CACHE.close()
+    _CACHE = cache
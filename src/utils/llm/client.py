@@ -4,9 +4,11 @@ import json
 import urllib.request
 import urllib.error
 import asyncio
+import time
 from pathlib import Path
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from typing import Awaitable, Callable, Optional
 
 from src.config import get_settings_service
@@ -16,10 +18,17 @@ from .config import LLMMode, LLMConfig, get_task_mode
 from .parser import parse_json
 from .prompt import build_prompt, load_template
 from .exceptions import LLMError, ParseError
+from .transport import post_json, retire_connection_pools, uses_system_proxy
+from .cache import get_llm_cache
+from .replay import get_llm_replay
+from .schema import ResponseSchema, get_task_response_schema, normalize_task_response, validate_json_schema
+from .timing import record_llm_wait
 
 # 模块级信号量，懒加载
 _SEMAPHORE: Optional[asyncio.Semaphore] = None
 _SEMAPHORE_LIMIT: Optional[int] = None
+# 已注册变更回调的 SettingsService（服务实例被重建后需要重新订阅）
+_SUBSCRIBED_SETTINGS_SERVICE = None
 _LLM_FAILURE_HANDLER: Optional[Callable[[str], Awaitable[None] | None]] = None
 
 _QUOTA_ERROR_CODES = {
@@ -51,6 +60,8 @@ _BILLING_KEYWORDS = (
     "额度不够",
 )
 _BILLING_KEYWORD_HTTP_STATUSES = {400, 402, 403, 429}
+# 修复请求只携带这么多原始输出，过长的输出直接走完整重试
+_JSON_REPAIR_MAX_CHARS = 8000
 
 
 class LLMFailureKind(str, Enum):
@@ -253,23 +264,35 @@ def classify_llm_error(error_raw: str, *, base_url: str = "") -> LLMFailureInfo:
     )
 
 
+def _on_llm_settings_changed(snapshot) -> None:
+    """LLM 设置变更：并发上限变化时重建信号量，base_url 变化时丢弃旧连接池"""
+    global _SEMAPHORE
+    if snapshot.profile.max_concurrent_requests != _SEMAPHORE_LIMIT:
+        _SEMAPHORE = None
+    retire_connection_pools(snapshot.profile.base_url)
+
+
 def _get_semaphore() -> asyncio.Semaphore:
-    global _SEMAPHORE, _SEMAPHORE_LIMIT
+    global _SEMAPHORE, _SEMAPHORE_LIMIT, _SUBSCRIBED_SETTINGS_SERVICE
+    service = get_settings_service()
+    if _SUBSCRIBED_SETTINGS_SERVICE is not service:
+        service.add_change_listener(_on_llm_settings_changed)
+        _SUBSCRIBED_SETTINGS_SERVICE = service
+        _SEMAPHORE = None
+    # 读取快照同时负责发现外部编辑并触发上面的回调
+    limit = service.get_llm_runtime_snapshot().profile.max_concurrent_requests
     if _SEMAPHORE is None:
-        limit = get_settings_service().get_llm_runtime_config()[0].max_concurrent_requests
-        _SEMAPHORE = asyncio.Semaphore(limit)
-        _SEMAPHORE_LIMIT = limit
-        return _SEMAPHORE
-
-    limit = get_settings_service().get_llm_runtime_config()[0].max_concurrent_requests
-    if _SEMAPHORE_LIMIT != limit:
         _SEMAPHORE = asyncio.Semaphore(limit)
         _SEMAPHORE_LIMIT = limit
     return _SEMAPHORE
 
 
-def _call_openai(config: LLMConfig, prompt: str) -> str:
-    """使用原生 urllib 调用 (OpenAI 兼容接口)"""
+def _build_openai_request(
+    config: LLMConfig,
+    prompt: str,
+    response_schema: Optional[ResponseSchema] = None,
+) -> tuple[str, dict, dict]:
+    """构造 OpenAI 兼容接口的 (url, headers, body)"""
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {config.api_key}",
@@ -279,6 +302,14 @@ def _call_openai(config: LLMConfig, prompt: str) -> str:
         "model": config.model_name,
         "messages": [{"role": "user", "content": prompt}]
     }
+    if response_schema is not None:
+        if response_schema.mode == "json_schema":
+            data["response_format"] = {
+                "type": "json_schema",
+                "json_schema": {"name": response_schema.name, "schema": response_schema.schema, "strict": False},
+            }
+        else:
+            data["response_format"] = {"type": "json_object"}
 
     url = config.base_url
     if not url:
@@ -288,32 +319,19 @@ def _call_openai(config: LLMConfig, prompt: str) -> str:
     if "chat/completions" not in url:
         url = url.rstrip("/")
         url = f"{url}/chat/completions"
+    return url, headers, data
 
-    req = urllib.request.Request(
-        url,
-        data=json.dumps(data).encode("utf-8"),
-        headers=headers,
-        method="POST"
-    )
 
-    try:
-        with urllib.request.urlopen(req, timeout=120) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            return result["choices"][0]["message"]["content"]
-    except urllib.error.HTTPError as e:
-        error_body = e.read().decode("utf-8")
-        raise Exception(f"HTTP_{e.code}::{error_body}")
-    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
-        reason = getattr(e, "reason", str(e))
-        raise Exception(f"NETWORK_ERROR::{reason}")
-    except Exception as e:
-        if str(e).startswith(("HTTP_", "NETWORK_ERROR::")):
-            raise
-        raise Exception(f"UNKNOWN_ERROR::{str(e)}")
+def _extract_openai_text(result: dict) -> str:
+    return result["choices"][0]["message"]["content"]
 
 
-def _call_anthropic(config: LLMConfig, prompt: str) -> str:
-    """使用原生 urllib 调用 (Anthropic 原生接口)"""
+def _build_anthropic_request(
+    config: LLMConfig,
+    prompt: str,
+    response_schema: Optional[ResponseSchema] = None,
+) -> tuple[str, dict, dict]:
+    """构造 Anthropic 原生接口的 (url, headers, body)"""
     headers = {
         "Content-Type": "application/json",
         "x-api-key": config.api_key,
@@ -325,6 +343,14 @@ def _call_anthropic(config: LLMConfig, prompt: str) -> str:
         "max_tokens": 4096,
         "messages": [{"role": "user", "content": prompt}]
     }
+    if response_schema is not None:
+        # Anthropic 没有 response_format，用强制调用单个工具的方式约束输出
+        data["tools"] = [{
+            "name": response_schema.name,
+            "description": "Return the result as the tool input.",
+            "input_schema": response_schema.schema,
+        }]
+        data["tool_choice"] = {"type": "tool", "name": response_schema.name}
 
     url = config.base_url
     if not url:
@@ -336,6 +362,40 @@ def _call_anthropic(config: LLMConfig, prompt: str) -> str:
         if not url.endswith("/v1"):
             url = f"{url}/v1"
         url = f"{url}/messages"
+    return url, headers, data
+
+
+def _extract_anthropic_text(result: dict) -> str:
+    # Anthropic 响应格式: {"content": [{"type": "text", "text": "..."}]}
+    # 结构化输出时为 {"type": "tool_use", "input": {...}}，转回 JSON 文本交给统一的解析流程
+    for block in result.get("content", []):
+        if block.get("type") == "tool_use":
+            return json.dumps(block.get("input", {}), ensure_ascii=False)
+    for block in result.get("content", []):
+        if block.get("type") == "text":
+            return block["text"]
+    raise Exception("UNKNOWN_ERROR::Anthropic 响应中未找到 text 内容")
+
+
+def _build_request(
+    config: LLMConfig,
+    prompt: str,
+    response_schema: Optional[ResponseSchema] = None,
+) -> tuple[str, dict, dict]:
+    if config.api_format == "anthropic":
+        return _build_anthropic_request(config, prompt, response_schema)
+    return _build_openai_request(config, prompt, response_schema)
+
+
+def _extract_text(config: LLMConfig, result: dict) -> str:
+    if config.api_format == "anthropic":
+        return _extract_anthropic_text(result)
+    return _extract_openai_text(result)
+
+
+def _call_openai(config: LLMConfig, prompt: str, response_schema: Optional[ResponseSchema] = None) -> str:
+    """使用原生 urllib 调用 (OpenAI 兼容接口)"""
+    url, headers, data = _build_openai_request(config, prompt, response_schema)
 
     req = urllib.request.Request(
         url,
@@ -347,11 +407,34 @@ def _call_anthropic(config: LLMConfig, prompt: str) -> str:
     try:
         with urllib.request.urlopen(req, timeout=120) as response:
             result = json.loads(response.read().decode("utf-8"))
-        # Anthropic 响应格式: {"content": [{"type": "text", "text": "..."}]}
-        for block in result.get("content", []):
-            if block.get("type") == "text":
-                return block["text"]
-        raise Exception("UNKNOWN_ERROR::Anthropic 响应中未找到 text 内容")
+            return _extract_openai_text(result)
+    except urllib.error.HTTPError as e:
+        error_body = e.read().decode("utf-8")
+        raise Exception(f"HTTP_{e.code}::{error_body}")
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        reason = getattr(e, "reason", str(e))
+        raise Exception(f"NETWORK_ERROR::{reason}")
+    except Exception as e:
+        if str(e).startswith(("HTTP_", "NETWORK_ERROR::")):
+            raise
+        raise Exception(f"UNKNOWN_ERROR::{str(e)}")
+
+
+def _call_anthropic(config: LLMConfig, prompt: str, response_schema: Optional[ResponseSchema] = None) -> str:
+    """使用原生 urllib 调用 (Anthropic 原生接口)"""
+    url, headers, data = _build_anthropic_request(config, prompt, response_schema)
+
+    req = urllib.request.Request(
+        url,
+        data=json.dumps(data).encode("utf-8"),
+        headers=headers,
+        method="POST"
+    )
+
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            result = json.loads(response.read().decode("utf-8"))
+        return _extract_anthropic_text(result)
     except urllib.error.HTTPError as e:
         error_body = e.read().decode("utf-8")
         raise Exception(f"HTTP_{e.code}::{error_body}")
@@ -364,29 +447,79 @@ def _call_anthropic(config: LLMConfig, prompt: str) -> str:
         raise Exception(f"UNKNOWN_ERROR::{str(e)}")
 
 
-def _call_with_requests(config: LLMConfig, prompt: str) -> str:
-    """根据 api_format 分发到对应的调用实现"""
+def _call_with_requests(config: LLMConfig, prompt: str, response_schema: Optional[ResponseSchema] = None) -> str:
+    """根据 api_format 分发到对应的调用实现（同步 urllib，用于连通性测试和代理场景）"""
     if config.api_format == "anthropic":
-        return _call_anthropic(config, prompt)
-    return _call_openai(config, prompt)
+        return _call_anthropic(config, prompt, response_schema)
+    return _call_openai(config, prompt, response_schema)
+
+
+async def _call_with_transport(
+    config: LLMConfig,
+    prompt: str,
+    response_schema: Optional[ResponseSchema] = None,
+) -> str:
+    """通过 asyncio 长连接池调用；需要走系统代理时退回 urllib 线程调用"""
+    url, headers, data = _build_request(config, prompt, response_schema)
+    if uses_system_proxy(url):
+        return await asyncio.to_thread(_call_with_requests, config, prompt, response_schema)
+
+    try:
+        response = await post_json(
+            url,
+            headers,
+            json.dumps(data).encode("utf-8"),
+            pool_key=(config.base_url, config.api_format),
+        )
+    except (asyncio.TimeoutError, TimeoutError):
+        raise Exception("NETWORK_ERROR::timed out")
+    except (OSError, asyncio.IncompleteReadError) as e:
+        raise Exception(f"NETWORK_ERROR::{e}")
 
+    if response.status >= 400:
+        raise Exception(f"HTTP_{response.status}::{response.text()}")
+    try:
+        return _extract_text(config, json.loads(response.text()))
+    except Exception as e:
+        if str(e).startswith("UNKNOWN_ERROR::"):
+            raise
+        raise Exception(f"UNKNOWN_ERROR::{str(e)}")
 
-async def call_llm(prompt: str, mode: LLMMode = LLMMode.NORMAL) -> str:
+
+async def call_llm(
+    prompt: str,
+    mode: LLMMode = LLMMode.NORMAL,
+    *,
+    response_schema: Optional[ResponseSchema] = None,
+) -> str:
     """
     基础 LLM 调用，自动控制并发
-    使用 urllib 直接调用 OpenAI 兼容接口
+    使用 asyncio 长连接池直接调用 OpenAI 兼容 / Anthropic 接口，
+    并发上限只由信号量控制，不占用线程池
+
+    传入 response_schema 时通过服务商的结构化输出机制约束返回格式（见 schema.py）
     """
     config = LLMConfig.from_mode(mode)
     semaphore = _get_semaphore()
     
+    started_at = time.perf_counter()
     try:
         async with semaphore:
-            result = await asyncio.to_thread(_call_with_requests, config, prompt)
+            replay = get_llm_replay()
+            transport = _call_with_transport
+            if response_schema is not None:
+                transport = partial(_call_with_transport, response_schema=response_schema)
+            if replay.enabled:
+                result = await replay.call(config, prompt, transport)
+            else:
+                result = await transport(config, prompt)
     except Exception as exc:
         failure = classify_llm_error(str(exc), base_url=config.base_url)
         if failure.is_config_required:
             await _notify_config_required(failure.user_message)
         raise
+    finally:
+        record_llm_wait(time.perf_counter() - started_at)
     
     log_llm_call(config.model_name, prompt, result)
     return result
@@ -395,37 +528,93 @@ async def call_llm(prompt: str, mode: LLMMode = LLMMode.NORMAL) -> str:
 async def call_llm_json(
     prompt: str,
     mode: LLMMode = LLMMode.NORMAL,
-    max_retries: int | None = None
+    max_retries: int | None = None,
+    *,
+    task_name: str | None = None,
+    response_schema: ResponseSchema | None = None,
 ) -> dict:
-    """调用 LLM 并解析为 JSON，带重试"""
+    """
+    调用 LLM 并解析为 JSON，带重试
+
+    传入 task_name 且该任务开启了响应缓存时，相同 (模型, 任务, 提示词) 直接返回缓存结果。
+    服务商拿到完整 response_schema 时，结果还要通过本地 schema 校验，不合格按解析失败重试。
+    """
+    cache = get_llm_cache()
+    model_name = ""
+    if cache.is_enabled_for(task_name):
+        model_name = LLMConfig.from_mode(mode).model_name
+        cached = cache.get(model_name, task_name, prompt)
+        if cached is not None:
+            return cached
+
     if max_retries is None:
         max_retries = int(getattr(CONFIG.ai, "max_parse_retries", 0))
+    repair_followup = bool(getattr(CONFIG.ai, "json_repair_followup", False))
+    call_kwargs = {}
+    validate_schema = False
+    if response_schema is not None:
+        call_kwargs["response_schema"] = response_schema
+        validate_schema = response_schema.is_enforced(LLMConfig.from_mode(mode).api_format)
     
     last_error: ParseError | None = None
     for attempt in range(max_retries + 1):
-        response = await call_llm(prompt, mode)
+        response = await call_llm(prompt, mode, **call_kwargs)
         try:
-            return parse_json(response)
+            result = parse_json(response)
+            if response_schema is not None:
+                result = normalize_task_response(response_schema.name, result)
+            if validate_schema:
+                _check_response_schema(result, response_schema, response)
         except ParseError as e:
             last_error = e
-            if attempt < max_retries:
-                continue
-            raise LLMError(f"解析失败（重试 {max_retries} 次后）", cause=last_error) from last_error
+            result = await _repair_json_with_followup(response) if repair_followup else None
+            if result is None:
+                if attempt < max_retries:
+                    continue
+                raise LLMError(f"解析失败（重试 {max_retries} 次后）", cause=last_error) from last_error
+        if model_name:
+            cache.put(model_name, task_name, prompt, result)
+        return result
     
     # This should never be reached, but satisfies type checker.
     raise LLMError("未知错误")
 
 
+def _check_response_schema(result: dict, response_schema: ResponseSchema, response: str) -> None:
+    errors = validate_json_schema(result, response_schema.schema)
+    if errors:
+        raise ParseError(f"响应不符合 {response_schema.name} 的 schema: " + "; ".join(errors[:3]), raw_text=response[:500])
+
+
+async def _repair_json_with_followup(response: str) -> dict | None:
+    """
+    解析失败时先发一个便宜的“修正这段 JSON”请求（只带原始输出，走 json_repair 任务模式），
+    修复失败再回到完整重试，省掉大部分重新生成整段内容的开销。
+    """
+    if not response or len(response) > _JSON_REPAIR_MAX_CHARS:
+        return None
+    try:
+        template = load_template(CONFIG.paths.templates / "json_repair.txt")
+        repair_prompt = build_prompt(template, {"text": response})
+        return parse_json(await call_llm(repair_prompt, get_task_mode("json_repair")))
+    except Exception:
+        return None
+
+
 async def call_llm_with_template(
     template_path: Path | str,
     infos: dict,
     mode: LLMMode = LLMMode.NORMAL,
-    max_retries: int | None = None
+    max_retries: int | None = None,
+    *,
+    task_name: str | None = None,
+    response_schema: ResponseSchema | None = None,
 ) -> dict:
     """使用模板调用 LLM"""
     template = load_template(template_path)
     prompt = build_prompt(template, infos)
-    return await call_llm_json(prompt, mode, max_retries)
+    kwargs = {"response_schema": response_schema} if response_schema is not None else {}
+    return await call_llm_json(prompt, mode, max_retries, task_name=task_name, **kwargs)
 
 
 async def call_llm_with_task_name(
@@ -438,7 +627,7 @@ async def call_llm_with_task_name(
     根据任务名称自动选择 LLM 模式并调用
     
     Args:
-        task_name: 任务名称，用于在 config.yml 中查找对应的模式
+        task_name: 任务名称，用于在 config.yml 中查找对应的模式和缓存 TTL，以及结构化输出 schema
         template_path: 模板路径
         infos: 模板参数
         max_retries: 最大重试次数
@@ -447,8 +636,12 @@ async def call_llm_with_task_name(
         dict: LLM 返回的 JSON 数据
     """
     mode = get_task_mode(task_name)
+    kwargs = {}
+    response_schema = get_task_response_schema(task_name, infos)
+    if response_schema is not None:
+        kwargs["response_schema"] = response_schema
     
-    return await call_llm_with_template(template_path, infos, mode, max_retries)
+    return await call_llm_with_template(template_path, infos, mode, max_retries, task_name=task_name, **kwargs)
 
 
 def test_connectivity(mode: LLMMode = LLMMode.NORMAL, config: Optional[LLMConfig] = None) -> tuple[bool, str]:
@@ -1,9 +1,24 @@
-"""JSON 解析逻辑"""
+"""JSON 解析逻辑
 
+分三级尝试，命中即返回：
+1. 标准库 json（C 加速）严格解析
+2. 轻量修复后再用 json 解析：去注释、去尾逗号、单引号转双引号、
+   Python 常量（True/False/None）转 JSON、补齐被截断的括号
+3. 最后才用纯 Python 的 json5 兜底
+
+候选文本依次为：json/json5/无语言标记的代码块、整段文本、首个 "{" 到末个 "}" 之间的片段。
+"""
+
+import json
 import re
+from typing import Iterator, Optional
+
 import json5
+
 from .exceptions import ParseError
 
+_PYTHON_CONSTANTS = {"True": "true", "False": "false", "None": "null"}
+
 
 def parse_json(text: str) -> dict:
     """
@@ -12,28 +27,14 @@ def parse_json(text: str) -> dict:
     text = (text or '').strip()
     if not text:
         return {}
-    
-    # 策略1: 尝试从 Markdown 代码块提取
-    # 优先匹配 json/json5 块，如果没有指定语言的块也尝试
-    blocks = _extract_code_blocks(text)
-    for lang, content in blocks:
-        if not lang or lang in ("json", "json5"):
-            try:
-                obj = json5.loads(content)
-                if isinstance(obj, dict):
-                    return obj
-            except Exception:
-                continue
-    
-    # 策略2: 尝试整体解析
-    # 有时候 LLM 不会输出 markdown，直接输出 json
-    try:
-        obj = json5.loads(text)
-        if isinstance(obj, dict):
-            return obj
-    except Exception:
-        pass
-    
+
+    candidates = list(_iter_candidates(text))
+    for loads in (_loads_strict, _loads_repaired, _loads_json5):
+        for candidate in candidates:
+            obj = loads(candidate)
+            if isinstance(obj, dict):
+                return obj
+
     # 失败
     raise ParseError(
         "无法解析 JSON: 未找到有效的 JSON 对象或代码块",
@@ -41,6 +42,151 @@ def parse_json(text: str) -> dict:
     )
 
 
+def _iter_candidates(text: str) -> Iterator[str]:
+    seen: set[str] = set()
+
+    def _once(candidate: str) -> Iterator[str]:
+        if candidate and candidate not in seen:
+            seen.add(candidate)
+            yield candidate
+
+    # 策略1: 优先 markdown 代码块（json/json5 或未标注语言）
+    for lang, content in _extract_code_blocks(text):
+        if not lang or lang in ("json", "json5"):
+            yield from _once(content)
+    # 策略2: 整体解析，有时候 LLM 不会输出 markdown，直接输出 json
+    yield from _once(text)
+    # 策略3: 前后夹杂说明文字时，截取最外层花括号
+    start = text.find("{")
+    if start >= 0:
+        end = text.rfind("}")
+        yield from _once(text[start:end + 1] if end > start else text[start:])
+
+
+def _loads_strict(candidate: str):
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        return None
+
+
+def _loads_repaired(candidate: str):
+    repaired = repair_json_text(candidate)
+    if repaired is None or repaired == candidate:
+        return None
+    return _loads_strict(repaired)
+
+
+def _loads_json5(candidate: str):
+    try:
+        return json5.loads(candidate)
+    except Exception:
+        return None
+
+
+def repair_json_text(text: str) -> Optional[str]:
+    """
+    修复常见的 LLM 输出瑕疵，返回标准 JSON 文本；无法安全修复时返回 None。
+
+    截断只补齐缺失的 } / ]：字符串或键值对本身被截断（如缺少值）时不做猜测，
+    避免把半句话当成有效结果。
+    """
+    out: list[str] = []
+    closers: list[str] = []
+    i, n = 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in "\"'":
+            end, value = _read_string(text, i)
+            if end is None:
+                return None
+            out.append(json.dumps(value, ensure_ascii=False))
+            i = end
+            continue
+        if ch == "/" and i + 1 < n and text[i + 1] in "/*":
+            if text[i + 1] == "/":
+                newline = text.find("\n", i)
+                i = n if newline < 0 else newline
+            else:
+                close = text.find("*/", i + 2)
+                if close < 0:
+                    return None
+                i = close + 2
+            continue
+        if ch in "{[":
+            closers.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            if not closers or closers.pop() != ch:
+                return None
+            _strip_trailing_comma(out)
+            out.append(ch)
+        elif ch.isalpha() or ch == "_":
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_PYTHON_CONSTANTS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if closers:
+        _strip_trailing_comma(out)
+        last = _last_significant(out)
+        if last in (":", None):
+            return None
+        out.extend(reversed(closers))
+    return "".join(out)
+
+
+def _read_string(text: str, start: int) -> tuple[Optional[int], str]:
+    """读取以 text[start] 为引号的字符串，返回 (结束位置, 解码后的值)；未闭合时结束位置为 None。"""
+    quote = text[start]
+    chars: list[str] = []
+    i, n = start + 1, len(text)
+    while i < n:
+        ch = text[i]
+        if ch == "\\" and i + 1 < n:
+            nxt = text[i + 1]
+            if nxt == quote or nxt == "'":
+                chars.append(nxt)
+                i += 2
+                continue
+            try:
+                # 其余转义（\n、\uXXXX 等）交给 json 解码
+                length = 6 if nxt == "u" else 2
+                chars.append(json.loads(f'"{text[i:i + length]}"'))
+                i += length
+                continue
+            except ValueError:
+                chars.append(nxt)
+                i += 2
+                continue
+        if ch == quote:
+            return i + 1, "".join(chars)
+        chars.append(ch)
+        i += 1
+    return None, ""
+
+
+def _strip_trailing_comma(out: list[str]) -> None:
+    index = len(out) - 1
+    while index >= 0 and out[index].isspace():
+        index -= 1
+    if index >= 0 and out[index] == ",":
+        del out[index]
+
+
+def _last_significant(out: list[str]) -> Optional[str]:
+    for token in reversed(out):
+        if not token.isspace():
+            return token[-1]
+    return None
+
+
 def _extract_code_blocks(text: str) -> list[tuple[str, str]]:
     """提取 markdown 代码块"""
     pattern = re.compile(r"```([^\n`]*)\n([\s\S]*?)```", re.DOTALL)
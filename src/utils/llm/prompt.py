@@ -3,6 +3,9 @@
 from pathlib import Path
 from src.utils.strings import intentify_prompt_infos
 
+# path -> (mtime_ns, size, 内容)；模板文件改动后按 mtime/size 自动失效
+_TEMPLATE_CACHE: dict[Path, tuple[int, int, str]] = {}
+
 
 def build_prompt(template: str, infos: dict) -> str:
     """
@@ -30,5 +33,11 @@ def load_template(path: Path | str) -> str:
         str: 模板内容
     """
     path = Path(path)
-    return path.read_text(encoding="utf-8")
+    stat = path.stat()
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    content = path.read_text(encoding="utf-8")
+    _TEMPLATE_CACHE[path] = (stat.st_mtime_ns, stat.st_size, content)
+    return content
 
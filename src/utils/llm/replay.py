@@ -0,0 +1,159 @@
+"""
+LLM 录制 / 回放传输层（用于基准测试与可复现运行）
+
+- record：照常请求服务商，同时把 (模型, 提示词) -> 原始响应文本 追加写入 JSONL 文件
+- replay：不发出网络请求，按 (模型, 提示词) 从 JSONL 文件中取回录制的响应
+  同一提示词被请求多次时按录制顺序依次返回，用完后重复最后一条；
+  未录制的提示词按 on_miss 处理：empty 返回 "{}"，error 抛出与网络错误同格式的异常
+
+配合 World.seed（见 src/utils/rng.py）可以让同一个世界的两次运行得到相同的事件输出，
+月度耗时也不再受网络波动影响。
+
+开启方式：config.yml 中 llm.replay，或环境变量 CWS_LLM_REPLAY=record|replay 与 CWS_LLM_REPLAY_FILE=路径。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from src.utils.config import CONFIG
+
+REPLAY_OFF = "off"
+REPLAY_RECORD = "record"
+REPLAY_REPLAY = "replay"
+REPLAY_MODES = (REPLAY_OFF, REPLAY_RECORD, REPLAY_REPLAY)
+
+MISS_EMPTY = "empty"
+MISS_ERROR = "error"
+
+_MODE_ENV = "CWS_LLM_REPLAY"
+_FILE_ENV = "CWS_LLM_REPLAY_FILE"
+
+
+@dataclass(frozen=True)
+class LLMReplaySettings:
+    mode: str = REPLAY_OFF
+    path: str = ""
+    on_miss: str = MISS_EMPTY
+
+    @classmethod
+    def from_config(cls) -> "LLMReplaySettings":
+        raw = getattr(getattr(CONFIG, "llm", None), "replay", None)
+        mode = str(getattr(raw, "mode", REPLAY_OFF) or REPLAY_OFF) if raw is not None else REPLAY_OFF
+        path = str(getattr(raw, "path", "") or "") if raw is not None else ""
+        on_miss = str(getattr(raw, "on_miss", MISS_EMPTY) or MISS_EMPTY) if raw is not None else MISS_EMPTY
+
+        mode = os.environ.get(_MODE_ENV, mode).strip().lower()
+        path = os.environ.get(_FILE_ENV, path)
+        if mode not in REPLAY_MODES:
+            print(f"[LLMReplay] Unknown mode {mode!r}, replay disabled.")
+            mode = REPLAY_OFF
+        if mode == REPLAY_RECORD and not path:
+            print("[LLMReplay] Record mode needs a file path, replay disabled.")
+            mode = REPLAY_OFF
+        return cls(mode=mode, path=path, on_miss=on_miss)
+
+
+def make_replay_key(model_name: str, prompt: str) -> str:
+    digest = hashlib.sha256()
+    for part in (model_name, prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+Transport = Callable[[object, str], Awaitable[str]]
+
+
+class LLMReplayTransport:
+    """包在真实传输层外面的录制 / 回放器；replay 模式下 path 为空即离线运行（全部未命中）"""
+
+    def __init__(self, settings: LLMReplaySettings):
+        self.settings = settings
+        self._responses: dict[str, list[str]] = {}
+        self._cursors: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+        if settings.mode == REPLAY_REPLAY and settings.path:
+            self._load(Path(settings.path))
+
+    @property
+    def enabled(self) -> bool:
+        return self.settings.mode != REPLAY_OFF
+
+    def _load(self, path: Path) -> None:
+        if not path.exists():
+            print(f"[LLMReplay] Recording not found: {path}")
+            return
+        with path.open("r", encoding="utf-8") as fp:
+            for line in fp:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                self._responses.setdefault(row["key"], []).append(row["response"])
+
+    async def call(self, config, prompt: str, transport: Transport) -> str:
+        key = make_replay_key(config.model_name, prompt)
+        if self.settings.mode == REPLAY_REPLAY:
+            return self._replay(key)
+
+        response = await transport(config, prompt)
+        self._record(key, config.model_name, response)
+        return response
+
+    def _replay(self, key: str) -> str:
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                self.misses += 1
+                if self.settings.on_miss == MISS_ERROR:
+                    raise Exception(f"NETWORK_ERROR::no recorded response for prompt {key[:12]}")
+                return "{}"
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.hits += 1
+            return responses[min(cursor, len(responses) - 1)]
+
+    def _record(self, key: str, model_name: str, response: str) -> None:
+        line = json.dumps({"key": key, "model": model_name, "response": response}, ensure_ascii=False)
+        with self._lock:
+            path = Path(self.settings.path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as fp:
+                fp.write(line + "\n")
+            self.recorded += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "mode": self.settings.mode,
+            "path": self.settings.path,
+            "recorded": self.recorded,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_REPLAY: Optional[LLMReplayTransport] = None
+
+
+def get_llm_replay() -> LLMReplayTransport:
+    """获取进程级录制 / 回放器（懒加载）"""
+    global _REPLAY
+    if _REPLAY is None:
+        _REPLAY = LLMReplayTransport(LLMReplaySettings.from_config())
+    return _REPLAY
+
+
+def reset_llm_replay(replay: Optional[LLMReplayTransport] = None) -> None:
+    """替换（或清空以便下次按配置重建）进程级录制 / 回放器"""
+    global _REPLAY
+    _REPLAY = replay
@@ -0,0 +1,277 @@
+"""
+结构化输出：按任务生成 JSON Schema，交给服务商做约束解码，并在本地校验
+
+- 任务 schema 由 build_task_schema(task_name, infos) 生成；未登记的任务返回 None，保持自由文本
+- action_decision(_batch) 的动作名与参数来自 ActionRegistry，键名（角色名）来自模板参数
+- 发送方式见 get_structured_output_mode：
+  off 关闭；json_object 只要求返回 JSON 对象；json_schema 发送完整 schema。
+  Anthropic 接口在非 off 时统一走强制 tool use（input_schema 即任务 schema）
+- 服务商拿到完整 schema 时（json_schema / Anthropic），解析后再按同一 schema 本地校验，
+  不合格按解析失败处理并重试；校验只覆盖这里用到的 schema 子集，不依赖 jsonschema
+- 校验前先经 normalize_task_response 归一化：prompt 允许的写法（如本地化情绪词）不应被判为不合格
+
+开启方式：config.yml 中 llm.structured_output，或环境变量 CWS_LLM_STRUCTURED_OUTPUT。
+"""
+
+from __future__ import annotations
+
+import inspect
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from src.utils.config import CONFIG
+
+STRUCTURED_OFF = "off"
+STRUCTURED_JSON_OBJECT = "json_object"
+STRUCTURED_JSON_SCHEMA = "json_schema"
+STRUCTURED_MODES = (STRUCTURED_OFF, STRUCTURED_JSON_OBJECT, STRUCTURED_JSON_SCHEMA)
+
+_MODE_ENV = "CWS_LLM_STRUCTURED_OUTPUT"
+
+# 动作 PARAMS 中声明为 int 的参数，其余一律按字符串处理
+_INTEGER_PARAM_TYPES = {"int"}
+
+
+@dataclass(frozen=True)
+class ResponseSchema:
+    """随请求下发的结构化输出约束；name 用作 OpenAI json_schema 名称与 Anthropic 工具名"""
+    name: str
+    schema: dict
+    mode: str = STRUCTURED_JSON_SCHEMA
+
+    def is_enforced(self, api_format: str) -> bool:
+        """服务商是否拿到了完整 schema（此时才需要本地校验）"""
+        return self.mode == STRUCTURED_JSON_SCHEMA or api_format == "anthropic"
+
+
+def get_structured_output_mode() -> str:
+    raw = getattr(getattr(CONFIG, "llm", None), "structured_output", STRUCTURED_OFF)
+    mode = os.environ.get(_MODE_ENV, raw if isinstance(raw, str) else STRUCTURED_OFF)
+    mode = (mode or STRUCTURED_OFF).strip().lower()
+    return mode if mode in STRUCTURED_MODES else STRUCTURED_OFF
+
+
+def _string() -> dict:
+    return {"type": "string"}
+
+
+def _nullable(schema: dict) -> dict:
+    return {"anyOf": [schema, {"type": "null"}]}
+
+
+def _object(properties: dict[str, dict], required: Optional[list[str]] = None) -> dict:
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties) if required is None else required,
+        "additionalProperties": False,
+    }
+
+
+@lru_cache(maxsize=1)
+def _action_pair_schemas() -> tuple[dict, ...]:
+    """每个可执行动作一个 {action_name, action_params} 分支"""
+    from src.classes.actions import ALL_ACTUAL_ACTION_CLASSES
+
+    branches = []
+    for action_cls in ALL_ACTUAL_ACTION_CLASSES:
+        params = getattr(action_cls, "PARAMS", None) or {}
+        param_properties = {
+            name: {"type": "integer"} if str(kind) in _INTEGER_PARAM_TYPES else _string()
+            for name, kind in params.items()
+        }
+        branches.append(_object({
+            "action_name": {"type": "string", "enum": [action_cls.__name__]},
+            "action_params": _object(param_properties, _required_params(action_cls, params)),
+        }))
+    return tuple(branches)
+
+
+def _required_params(action_cls: type, params: dict) -> list[str]:
+    """start() 中带默认值的参数（如 Gift.amount）可以省略"""
+    try:
+        signature = inspect.signature(action_cls.start)
+    except (TypeError, ValueError):
+        return list(params)
+    return [
+        name for name in params
+        if name not in signature.parameters or signature.parameters[name].default is inspect.Parameter.empty
+    ]
+
+
+def _decision_object() -> dict:
+    from src.classes.emotions import EmotionType
+
+    return _object({
+        "avatar_thinking": _string(),
+        "current_emotion": {"type": "string", "enum": [emotion.value for emotion in EmotionType]},
+        "short_term_objective": _string(),
+        "action_name_params_pairs": {
+            "type": "array",
+            "minItems": 1,
+            "items": {"anyOf": list(_action_pair_schemas())},
+        },
+    })
+
+
+def _action_decision_schema(infos: dict) -> Optional[dict]:
+    avatar_name = infos.get("avatar_name")
+    if not avatar_name:
+        return None
+    return _object({str(avatar_name): _decision_object()})
+
+
+def _action_decision_batch_schema(infos: dict) -> Optional[dict]:
+    # 缺失的角色会回退到单人请求，因此不强制每个角色都出现
+    names = [str(name) for name in infos.get("avatar_infos") or {}]
+    if not names:
+        return None
+    decision = _decision_object()
+    return _object({name: decision for name in names}, required=[])
+
+
+def _interaction_feedback_schema(infos: dict) -> Optional[dict]:
+    avatar_name = infos.get("avatar_name_2")
+    response_actions = [str(name) for name in infos.get("response_actions") or []]
+    if not avatar_name or not response_actions:
+        return None
+    return _object({str(avatar_name): _object({"response": {"type": "string", "enum": response_actions}})})
+
+
+def _relation_delta_schema(_infos: dict) -> dict:
+    # 取值范围由 RelationDeltaService 截断，这里不做限制，避免越界触发整段重试
+    return _object({"delta_a_to_b": {"type": "integer"}, "delta_b_to_a": {"type": "integer"}})
+
+
+def _relation_resolver_schema(_infos: dict) -> dict:
+    return _object(
+        {
+            "analysis": _string(),
+            "changed": {"type": "boolean"},
+            # changed 为 false 时模板允许忽略这三项，模型常返回 null 或空串
+            "change_type": _nullable({"type": "string", "enum": ["ADD", "REMOVE", ""]}),
+            "relation": _nullable(_string()),
+            "reason": _nullable(_string()),
+        },
+        required=["analysis", "changed"],
+    )
+
+
+def _nickname_schema(_infos: dict) -> dict:
+    return _object({"thinking": _string(), "nickname": _string(), "reason": _string()})
+
+
+def _long_term_objective_schema(_infos: dict) -> dict:
+    return _object({"thinking": _string(), "long_term_objective": _string()})
+
+
+_TASK_SCHEMAS: dict[str, Callable[[dict], Optional[dict]]] = {
+    "action_decision": _action_decision_schema,
+    "action_decision_batch": _action_decision_batch_schema,
+    "interaction_feedback": _interaction_feedback_schema,
+    "relation_delta": _relation_delta_schema,
+    "relation_resolver": _relation_resolver_schema,
+    "nickname": _nickname_schema,
+    "long_term_objective": _long_term_objective_schema,
+}
+
+
+def _normalize_decisions(result: dict) -> dict:
+    """prompt 让模型用本地化词汇回答情绪，这里换成 EmotionType 的取值；无法识别的保持原样交给校验"""
+    from src.classes.emotions import parse_emotion
+
+    for decision in result.values():
+        if isinstance(decision, dict) and "current_emotion" in decision:
+            emotion = parse_emotion(decision["current_emotion"])
+            if emotion is not None:
+                decision["current_emotion"] = emotion.value
+    return result
+
+
+_TASK_NORMALIZERS: dict[str, Callable[[dict], dict]] = {
+    "action_decision": _normalize_decisions,
+    "action_decision_batch": _normalize_decisions,
+}
+
+
+def normalize_task_response(task_name: Optional[str], result: dict) -> dict:
+    """按任务把 prompt 允许、但与 schema 写法不同的取值归一化（原地修改并返回）"""
+    normalizer = _TASK_NORMALIZERS.get(task_name or "")
+    if normalizer is None or not isinstance(result, dict):
+        return result
+    return normalizer(result)
+
+
+def build_task_schema(task_name: Optional[str], infos: Optional[dict] = None) -> Optional[dict]:
+    """返回任务的 JSON Schema；任务未登记或缺少必要的模板参数时返回 None"""
+    builder = _TASK_SCHEMAS.get(task_name or "")
+    if builder is None:
+        return None
+    return builder(infos or {})
+
+
+def get_task_response_schema(task_name: Optional[str], infos: Optional[dict] = None) -> Optional[ResponseSchema]:
+    """结构化输出开启且任务已登记时返回 ResponseSchema，否则返回 None"""
+    if (task_name or "") not in _TASK_SCHEMAS:
+        return None
+    mode = get_structured_output_mode()
+    if mode == STRUCTURED_OFF:
+        return None
+    schema = build_task_schema(task_name, infos)
+    if schema is None:
+        return None
+    return ResponseSchema(name=str(task_name), schema=schema, mode=mode)
+
+
+def validate_json_schema(value: Any, schema: dict, path: str = "$") -> list[str]:
+    """按 schema 子集（type/enum/properties/required/additionalProperties/items/minItems/anyOf）校验，返回错误列表"""
+    if "anyOf" in schema:
+        if any(not validate_json_schema(value, branch, path) for branch in schema["anyOf"]):
+            return []
+        return [f"{path}: no matching schema"]
+
+    expected = schema.get("type")
+    if expected and not _matches_type(value, expected):
+        return [f"{path}: expected {expected}"]
+    if "enum" in schema and value not in schema["enum"]:
+        return [f"{path}: {value!r} not in enum"]
+
+    errors: list[str] = []
+    if expected == "object":
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: missing")
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(validate_json_schema(item, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}.{key}: unexpected")
+    elif expected == "array":
+        if len(value) < schema.get("minItems", 0):
+            errors.append(f"{path}: expected at least {schema['minItems']} items")
+        item_schema = schema.get("items")
+        if item_schema:
+            for index, item in enumerate(value):
+                errors.extend(validate_json_schema(item, item_schema, f"{path}[{index}]"))
+    return errors
+
+
+def _matches_type(value: Any, expected: str) -> bool:
+    if expected == "object":
+        return isinstance(value, dict)
+    if expected == "array":
+        return isinstance(value, list)
+    if expected == "string":
+        return isinstance(value, str)
+    if expected == "boolean":
+        return isinstance(value, bool)
+    if expected == "integer":
+        return isinstance(value, int) and not isinstance(value, bool)
+    if expected == "null":
+        return value is None
+    if expected == "number":
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return True
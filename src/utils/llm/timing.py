@@ -0,0 +1,41 @@
+"""
+LLM 等待时间统计
+
+通过 contextvar 把 call_llm 的等待时间（含信号量排队）累加到当前作用域的计数器上。
+asyncio.gather / create_task 会复制上下文，子任务里的调用同样计入外层计数器。
+并发调用的等待时间是累加值，可能大于外层的墙钟时间。
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass(slots=True)
+class LLMWaitCounter:
+    calls: int = 0
+    seconds: float = 0.0
+
+
+_CURRENT_COUNTER: ContextVar[Optional[LLMWaitCounter]] = ContextVar("llm_wait_counter", default=None)
+
+
+@contextmanager
+def track_llm_wait() -> Iterator[LLMWaitCounter]:
+    """在 with 作用域内统计 LLM 调用次数与等待秒数"""
+    counter = LLMWaitCounter()
+    token = _CURRENT_COUNTER.set(counter)
+    try:
+        yield counter
+    finally:
+        _CURRENT_COUNTER.reset(token)
+
+
+def record_llm_wait(seconds: float) -> None:
+    counter = _CURRENT_COUNTER.get()
+    if counter is not None:
+        counter.calls += 1
+        counter.seconds += seconds
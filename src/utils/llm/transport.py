@@ -0,0 +1,342 @@
+"""
+LLM 原生 asyncio HTTP 传输层
+
+为每个 LLMConfig（base_url + api_format）维护一个长连接池：
+- HTTP/1.1 keep-alive，连接复用，避免每次请求都做 TCP/TLS 握手
+- 连接超时与读取超时分开配置
+- 不占用线程池，并发上限只由 client 中的信号量决定
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ssl
+import time
+import urllib.request
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+
+from src.utils.config import CONFIG
+
+_USER_AGENT = "CultivationWorldSimulator/1.0"
+
+
+@dataclass(frozen=True)
+class TransportSettings:
+    """传输层参数，读取自 config.yml 的 llm.transport"""
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    max_idle_connections: int = 64
+    idle_timeout: float = 60.0
+
+    @classmethod
+    def from_config(cls) -> "TransportSettings":
+        transport = getattr(getattr(CONFIG, "llm", None), "transport", None)
+        if transport is None:
+            return cls()
+        defaults = cls()
+        return cls(
+            connect_timeout=float(getattr(transport, "connect_timeout_seconds", defaults.connect_timeout)),
+            read_timeout=float(getattr(transport, "read_timeout_seconds", defaults.read_timeout)),
+            max_idle_connections=int(getattr(transport, "max_idle_connections", defaults.max_idle_connections)),
+            idle_timeout=float(getattr(transport, "idle_timeout_seconds", defaults.idle_timeout)),
+        )
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    body: bytes
+
+    def text(self) -> str:
+        return self.body.decode("utf-8", errors="replace")
+
+
+class _Connection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.last_used = time.monotonic()
+
+    def is_usable(self, idle_timeout: float) -> bool:
+        if self.writer.is_closing() or self.reader.at_eof():
+            return False
+        return time.monotonic() - self.last_used < idle_timeout
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class _StaleConnectionError(ConnectionError):
+    """复用的空闲连接已被服务端关闭，且尚未收到任何响应字节"""
+
+
+class ConnectionPool:
+    """单个 (scheme, host, port) 的 keep-alive 连接池"""
+
+    def __init__(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        settings: TransportSettings,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.settings = settings
+        self._ssl_context = ssl_context
+        self._idle: deque[_Connection] = deque()
+        self._loop = asyncio.get_running_loop()
+        self.connections_opened = 0
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    async def request(self, method: str, path: str, headers: dict[str, str], body: bytes) -> HTTPResponse:
+        """发送请求；复用的连接若已失效，则换新连接重试一次"""
+        conn, reused = await self._acquire()
+        try:
+            return await self._send(conn, method, path, headers, body)
+        except _StaleConnectionError:
+            if not reused:
+                raise ConnectionError("connection closed by server before response")
+        conn = await self._open()
+        try:
+            return await self._send(conn, method, path, headers, body)
+        except _StaleConnectionError:
+            raise ConnectionError("connection closed by server before response")
+
+    def discard(self) -> None:
+        """不等待地丢弃所有空闲连接（用于事件循环已切换的情形）"""
+        while self._idle:
+            self._idle.pop().close()
+
+    async def close(self) -> None:
+        while self._idle:
+            conn = self._idle.pop()
+            conn.close()
+            try:
+                await conn.writer.wait_closed()
+            except Exception:
+                pass
+
+    async def _acquire(self) -> tuple[_Connection, bool]:
+        while self._idle:
+            conn = self._idle.pop()
+            if conn.is_usable(self.settings.idle_timeout):
+                return conn, True
+            conn.close()
+        return await self._open(), False
+
+    async def _open(self) -> _Connection:
+        ssl_arg = None
+        if self.scheme == "https":
+            ssl_arg = self._ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host,
+                self.port,
+                ssl=ssl_arg,
+                server_hostname=self.host if ssl_arg else None,
+            ),
+            timeout=self.settings.connect_timeout,
+        )
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, conn: _Connection) -> None:
+        conn.last_used = time.monotonic()
+        if len(self._idle) >= self.settings.max_idle_connections:
+            conn.close()
+            return
+        self._idle.append(conn)
+
+    async def _send(
+        self,
+        conn: _Connection,
+        method: str,
+        path: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> HTTPResponse:
+        host_header = self.host
+        default_port = 443 if self.scheme == "https" else 80
+        if self.port != default_port:
+            host_header = f"{self.host}:{self.port}"
+
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {host_header}"]
+        for key, value in headers.items():
+            lines.append(f"{key}: {value}")
+        lines.append(f"Content-Length: {len(body)}")
+        lines.append("Connection: keep-alive")
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8")
+
+        try:
+            conn.writer.write(head + body)
+            await conn.writer.drain()
+            status_line = await self._read(conn.reader.readline())
+        except (ConnectionError, asyncio.IncompleteReadError) as exc:
+            conn.close()
+            raise _StaleConnectionError(str(exc)) from exc
+        except BaseException:
+            conn.close()
+            raise
+        if not status_line:
+            conn.close()
+            raise _StaleConnectionError("empty status line")
+
+        try:
+            status, keep_alive, payload = await self._read_response(conn, status_line)
+        except BaseException:
+            conn.close()
+            raise
+
+        if keep_alive:
+            self._release(conn)
+        else:
+            conn.close()
+        return HTTPResponse(status=status, body=payload)
+
+    async def _read(self, awaitable):
+        return await asyncio.wait_for(awaitable, timeout=self.settings.read_timeout)
+
+    async def _read_response(self, conn: _Connection, status_line: bytes) -> tuple[int, bool, bytes]:
+        parts = status_line.decode("latin-1").strip().split(" ", 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise ConnectionError(f"malformed status line: {status_line[:100]!r}")
+        version = parts[0]
+        status = int(parts[1])
+
+        response_headers: dict[str, str] = {}
+        while True:
+            line = await self._read(conn.reader.readline())
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            response_headers[key.strip().lower()] = value.strip()
+
+        connection_header = response_headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection_header == "keep-alive"
+        else:
+            keep_alive = connection_header != "close"
+
+        if "chunked" in response_headers.get("transfer-encoding", "").lower():
+            payload = await self._read_chunked(conn.reader)
+        elif "content-length" in response_headers:
+            payload = await self._read(conn.reader.readexactly(int(response_headers["content-length"])))
+        elif status in (204, 304) or 100 <= status < 200:
+            payload = b""
+        else:
+            payload = await self._read(conn.reader.read())
+            keep_alive = False
+        return status, keep_alive, payload
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            size_line = await self._read(reader.readline())
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                # 跳过 trailer，直到空行
+                while True:
+                    trailer = await self._read(reader.readline())
+                    if trailer in (b"\r\n", b"\n", b""):
+                        break
+                break
+            chunks.append(await self._read(reader.readexactly(size)))
+            await self._read(reader.readexactly(2))
+        return b"".join(chunks)
+
+
+_POOLS: dict[tuple[str, str], ConnectionPool] = {}
+
+
+def uses_system_proxy(url: str) -> bool:
+    """目标地址是否需要经过系统/环境代理（代理场景仍走 urllib）"""
+    parts = urlsplit(url)
+    proxies = urllib.request.getproxies()
+    if parts.scheme not in proxies:
+        return False
+    return not urllib.request.proxy_bypass(parts.hostname or "")
+
+
+def get_connection_pool(url: str, *, pool_key: tuple[str, str]) -> ConnectionPool:
+    """
+    获取（或创建）某个 LLM 配置的连接池
+
+    Args:
+        url: 完整请求地址，用于确定 scheme/host/port
+        pool_key: (base_url, api_format)，同一配置共享一个池
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"Unsupported LLM URL: {url}")
+    port = parts.port or (443 if scheme == "https" else 80)
+    loop = asyncio.get_running_loop()
+
+    pool = _POOLS.get(pool_key)
+    if pool is not None and (
+        pool.loop is not loop
+        or (pool.scheme, pool.host, pool.port) != (scheme, parts.hostname, port)
+    ):
+        # 连接绑定在创建它的事件循环上，循环或目标变化后旧池不可再用
+        pool.discard()
+        pool = None
+    if pool is None:
+        pool = ConnectionPool(scheme, parts.hostname, port, TransportSettings.from_config())
+        _POOLS[pool_key] = pool
+    return pool
+
+
+def retire_connection_pools(base_url: str) -> None:
+    """
+    丢弃不属于当前 base_url 的连接池（LLM 设置变更回调中调用）
+
+    回调可能运行在 FastAPI 的工作线程里，连接的关闭交给池所属的事件循环执行。
+    """
+    for pool_key in [key for key in _POOLS if key[0] != base_url]:
+        pool = _POOLS.pop(pool_key, None)
+        if pool is None:
+            continue
+        try:
+            pool.loop.call_soon_threadsafe(pool.discard)
+        except RuntimeError:
+            # 事件循环已关闭，直接丢弃
+            pool.discard()
+
+
+async def post_json(url: str, headers: dict[str, str], payload: bytes, *, pool_key: tuple[str, str]) -> HTTPResponse:
+    """通过连接池 POST 一个 JSON 请求体"""
+    pool = get_connection_pool(url, pool_key=pool_key)
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    merged = {"User-Agent": _USER_AGENT, **headers}
+    return await pool.request("POST", path, merged, payload)
+
+
+async def close_connection_pools() -> None:
+    """关闭所有连接池中的空闲连接（服务退出时调用）"""
+    pools = list(_POOLS.values())
+    _POOLS.clear()
+    loop = asyncio.get_running_loop()
+    for pool in pools:
+        if pool.loop is loop:
+            await pool.close()
+        else:
+            pool.discard()
@@ -0,0 +1,42 @@
+"""
+提示词片段缓存
+
+缓存只依赖“当前语言 + 静态配置”的提示词片段（如动作描述的翻译与 JSON 片段），
+避免每个角色每次决策都重新翻译、重新序列化。
+
+- 缓存键自动带上当前语言，切换语言后不会串用旧语言的片段；
+- reload_game_configs / reload_translations 会调用 invalidate_prompt_fragments 清空缓存。
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+_FRAGMENTS: dict[tuple[str, str, Hashable], Any] = {}
+
+
+def _current_language() -> str:
+    from src.classes.language import language_manager
+
+    return str(language_manager)
+
+
+def get_prompt_fragment(namespace: str, key: Hashable, builder: Callable[[], T]) -> T:
+    """按 (语言, 命名空间, key) 取缓存片段，不存在时调用 builder 构建。返回值应视为只读。"""
+    cache_key = (_current_language(), namespace, key)
+    try:
+        return _FRAGMENTS[cache_key]
+    except KeyError:
+        value = builder()
+        _FRAGMENTS[cache_key] = value
+        return value
+
+
+def invalidate_prompt_fragments() -> None:
+    _FRAGMENTS.clear()
+
+
+def prompt_fragment_count() -> int:
+    return len(_FRAGMENTS)
@@ -211,8 +211,10 @@ def _resolve_avatar(name: str, world: Any) -> Any | None:
         
     norm = normalize_avatar_name(name)
     
-    # 遍历查找 (性能注意：如果角色极多可能需要优化为字典查找)
-    # 假设 avatar_manager.avatars 是 dict[id, Avatar]
+    # 优先走管理器的名字索引
+    if hasattr(manager, "find_avatar_by_name"):
+        return manager.find_avatar_by_name(norm)
+
     for avatar in manager.avatars.values():
         if avatar.name == norm:
             return avatar
@@ -0,0 +1,38 @@
+"""
+世界级随机种子
+
+模拟中的随机抽取统一使用模块级 random（测试大量依赖 patch 各模块的 random.xxx），
+因此这里不替换调用点，而是由 World.seed 驱动这条随机流：
+每个月开始时用 (seed, month_stamp) 派生的种子重置 random，
+同一个种子的世界在相同的 LLM 响应下（见 src/utils/llm/replay.py）逐月得到相同的抽取序列，
+读档后从任意月份继续也能复现，不需要保存随机数生成器内部状态。
+
+World.seed 为 None（默认）时不做任何事，保持原有的非确定性行为。
+注意：random 是进程级状态，同一进程内并行推进多个带种子的世界会互相干扰；
+集合迭代顺序还受 PYTHONHASHSEED 影响，跨进程复现需固定该环境变量。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from typing import Any
+
+
+def derive_seed(seed: int, *parts: Any) -> int:
+    """由基础种子与若干标签派生出稳定的 64 位子种子（跨进程、跨平台一致）。"""
+    digest = hashlib.sha256(str(int(seed)).encode("utf-8"))
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode("utf-8"))
+    return int.from_bytes(digest.digest()[:8], "big")
+
+
+def seed_world_random(world: Any, *parts: Any) -> bool:
+    """按世界种子与当前月份重置模块级 random；世界未设置种子时返回 False。"""
+    seed = getattr(world, "seed", None)
+    if seed is None:
+        return False
+    random.seed(derive_seed(seed, int(world.month_stamp), *parts))
+    return True
+
@@ -0,0 +1,338 @@
+"""
+模拟热点路径的性能基准（默认跳过）
+
+运行：
+    CWS_BENCHMARK=1 pytest tests/benchmarks -q
+
+环境变量：
+- CWS_BENCHMARK=1                开启基准（否则整个目录跳过，不影响常规 pytest）
+- CWS_BENCHMARK_REPORT=路径       JSON 报告位置，默认 tests/benchmarks/reports/latest.json
+- CWS_BENCHMARK_THRESHOLD=1.5    回归阈值（相对基线的倍数），优先级低于基线条目自带的 threshold
+- CWS_BENCHMARK_UPDATE=1         把本次结果写回 baselines.json，不做回归比较
+- CWS_BENCHMARK_MAP=classic      合成世界使用的地图预设
+
+报告中每项包含耗时（mean/min/max/stdev）、相对耗时与 tracemalloc 统计的内存分配峰值。
+相对耗时 = mean / 参照负载耗时：参照负载是一段固定的纯 Python 计算，在本次运行开始时测量，
+用来抵消机器快慢，因此 baselines.json 只保存相对耗时，不保存秒数。
+与同名基线相比，相对耗时或分配峰值超过 基线 × 阈值（另加少量绝对容差）即判定回归失败。
+"""
+
+from __future__ import annotations
+
+import gc
+import inspect
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+BASELINES_PATH = BENCHMARK_DIR / "baselines.json"
+DEFAULT_REPORT_PATH = BENCHMARK_DIR / "reports" / "latest.json"
+DEFAULT_THRESHOLD = 1.5
+# 绝对容差：亚毫秒级耗时与几 KB 的分配按倍数比较噪声太大
+TIME_SLACK_S = 0.002
+ALLOC_SLACK_KB = 64.0
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def pytest_collection_modifyitems(config, items):
+    if _env_flag("CWS_BENCHMARK"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks are opt-in: set CWS_BENCHMARK=1")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def _reference_workload() -> float:
+    """参照负载：固定种子的排序与浮点累加，约几十毫秒"""
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(200_000)]
+    values.sort()
+    return sum(value * value for value in values)
+
+
+def measure_reference_seconds(rounds: int = 5) -> float:
+    """参照负载耗时，取最小值以减少调度噪声"""
+    samples = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        _reference_workload()
+        samples.append(time.perf_counter() - started_at)
+    return min(samples)
+
+
+@dataclass(slots=True)
+class BenchmarkResult:
+    name: str
+    rounds: int
+    samples: list[float]
+    peak_alloc_kb: float | None
+    reference_s: float
+    params: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def mean_s(self) -> float:
+        return statistics.mean(self.samples)
+
+    @property
+    def relative(self) -> float:
+        return self.mean_s / self.reference_s
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "params": self.params,
+            "rounds": self.rounds,
+            "relative": round(self.relative, 4),
+            "mean_s": round(self.mean_s, 6),
+            "min_s": round(min(self.samples), 6),
+            "max_s": round(max(self.samples), 6),
+            "stdev_s": round(statistics.stdev(self.samples), 6) if len(self.samples) > 1 else 0.0,
+            "peak_alloc_kb": round(self.peak_alloc_kb, 1) if self.peak_alloc_kb is not None else None,
+        }
+
+
+class BenchmarkSession:
+    """收集本次运行的基准结果，与基线比较，结束时写出报告。"""
+
+    def __init__(self, *, baselines_path: Path, report_path: Path, threshold: float | None, update: bool):
+        self.baselines_path = baselines_path
+        self.report_path = report_path
+        self.update = update
+        self.baselines = self._load_baselines()
+        self.threshold = threshold if threshold is not None else float(
+            self.baselines.get("default_threshold", DEFAULT_THRESHOLD)
+        )
+        self.results: list[BenchmarkResult] = []
+        self.regressions: list[str] = []
+        self.reference_s = measure_reference_seconds()
+
+    def _load_baselines(self) -> dict[str, Any]:
+        if not self.baselines_path.exists():
+            return {"default_threshold": DEFAULT_THRESHOLD, "benchmarks": {}}
+        return json.loads(self.baselines_path.read_text(encoding="utf-8"))
+
+    async def measure(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        *,
+        rounds: int = 5,
+        warmup: int = 1,
+        params: dict[str, Any] | None = None,
+        setup: Callable[[], Any] | None = None,
+        teardown: Callable[[Any], Any] | None = None,
+        trace_alloc: bool = True,
+    ) -> BenchmarkResult:
+        """
+        执行 warmup + rounds 次计时，再单独执行一次统计分配峰值（tracemalloc 会拖慢计时）。
+
+        传入 setup 时，每次调用前先执行 setup（不计时）并把返回值传给 func，
+        用于会改变状态的基准（如 Simulator.step），保证每轮都从同一初始状态开始；
+        teardown 在每次调用后（不计时）接收同一个返回值，用于释放这一轮的状态。
+        单次耗时以分钟计的大规模基准可传 trace_alloc=False，跳过分配统计那一轮。
+        """
+
+        async def _resolve(value):
+            if inspect.isawaitable(value):
+                value = await value
+            return value
+
+        async def _finish(args: tuple) -> None:
+            if teardown is not None and args:
+                await _resolve(teardown(*args))
+
+        async def _call() -> float:
+            args = () if setup is None else (await _resolve(setup()),)
+            started_at = time.perf_counter()
+            await _resolve(func(*args))
+            elapsed = time.perf_counter() - started_at
+            await _finish(args)
+            return elapsed
+
+        for _ in range(warmup):
+            await _call()
+        samples = [await _call() for _ in range(rounds)]
+
+        peak_alloc_kb = None
+        if trace_alloc:
+            args = () if setup is None else (await _resolve(setup()),)
+            tracemalloc.start()
+            try:
+                await _resolve(func(*args))
+                _current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            await _finish(args)
+            peak_alloc_kb = peak / 1024
+
+        result = BenchmarkResult(
+            name=name,
+            rounds=rounds,
+            samples=samples,
+            peak_alloc_kb=peak_alloc_kb,
+            reference_s=self.reference_s,
+            params=params or {},
+        )
+        self.results.append(result)
+        self._check(result)
+        return result
+
+    def _check(self, result: BenchmarkResult) -> None:
+        if self.update:
+            return
+        baseline = self.baselines.get("benchmarks", {}).get(result.name)
+        if not baseline:
+            return
+        threshold = float(baseline.get("threshold", self.threshold))
+        failures = []
+        baseline_relative = baseline.get("relative")
+        time_slack = TIME_SLACK_S / self.reference_s
+        if baseline_relative and result.relative > float(baseline_relative) * threshold + time_slack:
+            failures.append(f"relative time {result.relative:.3f} > baseline {baseline_relative:.3f} x {threshold}")
+        baseline_alloc = baseline.get("peak_alloc_kb")
+        peak_alloc_kb = result.peak_alloc_kb
+        if baseline_alloc and peak_alloc_kb is not None and peak_alloc_kb > float(baseline_alloc) * threshold + ALLOC_SLACK_KB:
+            failures.append(f"peak alloc {peak_alloc_kb:.0f}KB > baseline {baseline_alloc:.0f}KB x {threshold}")
+        if failures:
+            message = f"{result.name}: " + "; ".join(failures)
+            self.regressions.append(message)
+            pytest.fail(f"Benchmark regression: {message}")
+
+    def finish(self) -> None:
+        if not self.results:
+            return
+        report = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "reference_s": round(self.reference_s, 6),
+            "threshold": self.threshold,
+            "regressions": self.regressions,
+            "benchmarks": [result.to_dict() for result in self.results],
+        }
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        self.report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        if self.update:
+            benchmarks = self.baselines.setdefault("benchmarks", {})
+            for result in self.results:
+                entry = benchmarks.setdefault(result.name, {})
+                entry.pop("mean_s", None)
+                row = result.to_dict()
+                entry.update(relative=row["relative"], params=row["params"])
+                if row["peak_alloc_kb"] is not None:
+                    entry["peak_alloc_kb"] = row["peak_alloc_kb"]
+            self.baselines.setdefault("default_threshold", DEFAULT_THRESHOLD)
+            self.baselines_path.write_text(
+                json.dumps(self.baselines, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+                encoding="utf-8",
+            )
+
+
+@pytest.fixture(scope="session")
+def bench():
+    threshold = os.environ.get("CWS_BENCHMARK_THRESHOLD")
+    session = BenchmarkSession(
+        baselines_path=BASELINES_PATH,
+        report_path=Path(os.environ.get("CWS_BENCHMARK_REPORT") or DEFAULT_REPORT_PATH),
+        threshold=float(threshold) if threshold else None,
+        update=_env_flag("CWS_BENCHMARK_UPDATE"),
+    )
+    yield session
+    session.finish()
+
+
+@pytest.fixture(autouse=True)
+def mock_llm_managers():
+    """
+    覆盖根目录的同名 fixture：基准需要完整执行 prompt 组装等 CPU 工作，
+    因此只把 LLM 网络传输换成离线回放（所有调用返回空 JSON）。
+    """
+    from src.utils.llm.replay import LLMReplaySettings, LLMReplayTransport, reset_llm_replay
+
+    reset_llm_replay(LLMReplayTransport(LLMReplaySettings(mode="replay")))
+    yield
+    reset_llm_replay()
+
+
+@pytest.fixture(autouse=True)
+def keep_app_log_out_of_pytest():
+    """
+    pytest 会把日志捕获 handler 挂到所有已注册的不传播 logger 上；src.run.log 每次 LLM 交互都记下完整 prompt，
+    大规模世界推进一个月就能在捕获里攒下数 GB。基准期间换成未注册的同名 logger，只保留日志文件 handler，与正式运行一致。
+    """
+    from src.run.log import get_logger
+
+    app_log = get_logger()
+    original = app_log.logger
+    isolated = logging.Logger(original.name, original.level)
+    isolated.propagate = False
+    for handler in original.handlers:
+        if isinstance(handler, logging.FileHandler):
+            isolated.addHandler(handler)
+    app_log.logger = isolated
+    yield
+    app_log.logger = original
+
+
+@pytest.fixture
+def synthetic_world(tmp_path):
+    """
+    合成世界工厂：await synthetic_world(avatars=N, sects=M, map_id=...) -> (world, simulator)。
+    与正式开局同一流程（见 src.sim.headless），固定种子，跳过静态数据重载与初始 LLM 档案生成。
+    每轮新建世界的大规模基准用 synthetic_world.release(world) 及时释放，避免多个世界同时驻留内存。
+    """
+    from src.classes.language import language_manager
+    from src.sim.headless import build_headless_world, resolve_run_config
+
+    worlds = []
+    built_count = 0
+
+    async def _build(avatars: int = 100, sects: int = 3, map_id: str | None = None, seed: int = 20240601):
+        nonlocal built_count
+        built_count += 1
+        # 已释放世界之间的循环引用要等完整回收才会真正腾出内存
+        gc.collect()
+        run_config = resolve_run_config(
+            {
+                "init_npc_num": avatars,
+                "sect_num": sects,
+                "map_id": map_id or os.environ.get("CWS_BENCHMARK_MAP") or "classic",
+                "world_lore": "",
+                "content_locale": language_manager.current,
+            }
+        )
+        world, sim = await build_headless_world(
+            run_config,
+            events_db_path=tmp_path / f"bench_{built_count}.db",
+            prepare_profiles=False,
+            reload_static_data=False,
+            seed=seed,
+        )
+        worlds.append(world)
+        return world, sim
+
+    def _release(world) -> None:
+        if world in worlds:
+            worlds.remove(world)
+            world.event_manager.close()
+
+    _build.release = _release
+    yield _build
+    for world in worlds:
+        world.event_manager.close()
@@ -0,0 +1,207 @@
+"""
+Benchmarks for the simulation hot paths. Opt-in: CWS_BENCHMARK=1 (see conftest.py).
+"""
+
+from contextlib import contextmanager
+from unittest.mock import patch
+
+import pytest
+
+from src.classes.event import Event
+
+pytestmark = pytest.mark.benchmark
+
+
+@contextmanager
+def _linear_avatar_queries():
+    """对照组：把空间索引查询换回逐个角色的线性扫描"""
+    from src.classes.observe import get_observable_avatars
+    from src.sim.managers.avatar_manager import AvatarManager
+
+    def linear_observable(self, avatar):
+        return get_observable_avatars(avatar, self.avatars.values())
+
+    def linear_same_region(self, avatar):
+        if avatar is None or getattr(avatar, "tile", None) is None or avatar.tile.region is None:
+            return []
+        region = avatar.tile.region
+        return [
+            other for other in self.avatars.values()
+            if other is not avatar and other.tile is not None and other.tile.region == region
+        ]
+
+    with patch.object(AvatarManager, "get_observable_avatars", linear_observable), \
+         patch.object(AvatarManager, "get_avatars_in_same_region", linear_same_region):
+        yield
+
+
+# 大规模世界单月即以分钟计：不预热、少轮次、跳过分配统计那一轮
+_STEP_OPTIONS = {
+    200: {"rounds": 3, "warmup": 1},
+    1000: {"rounds": 2, "warmup": 0, "trace_alloc": False},
+    5000: {"rounds": 1, "warmup": 0, "trace_alloc": False},
+}
+# 角色数较少时线性扫描只比索引慢一成左右，低于这个规模只记录对照结果，不做断言
+_STEP_SPEEDUP_MIN_AVATARS = 1000
+
+
+@pytest.mark.parametrize("avatars", [200, 1000, 5000])
+async def test_simulator_step(bench, synthetic_world, avatars):
+    # 每轮都从同一种子新建的世界推进第一个月，轮与轮之间模拟的是同一段内容；
+    # 再用线性扫描对照组推进同一个月，在同一次运行内比较空间索引的收益
+    options = _STEP_OPTIONS[avatars]
+    params = {"avatars": avatars}
+
+    def _fresh_world():
+        return synthetic_world(avatars=avatars, sects=3)
+
+    def _release(built):
+        synthetic_world.release(built[0])
+
+    indexed = await bench.measure(
+        f"simulator_step[{avatars}]",
+        lambda built: built[1].step(),
+        setup=_fresh_world,
+        teardown=_release,
+        params=params,
+        **options,
+    )
+    with _linear_avatar_queries():
+        linear = await bench.measure(
+            f"simulator_step_linear[{avatars}]",
+            lambda built: built[1].step(),
+            setup=_fresh_world,
+            teardown=_release,
+            params=params,
+            **options,
+        )
+
+    if avatars >= _STEP_SPEEDUP_MIN_AVATARS:
+        assert indexed.mean_s < linear.mean_s
+
+
+async def test_spatial_index_against_linear_scan(bench, synthetic_world):
+    world, _sim = await synthetic_world(avatars=1000, sects=3)
+    manager = world.avatar_manager
+    living = manager.get_living_avatars()
+
+    def _query_all():
+        for avatar in living:
+            manager.get_observable_avatars(avatar)
+            manager.get_avatars_in_same_region(avatar)
+
+    params = {"avatars": 1000}
+    indexed = await bench.measure("avatar_queries_indexed[1000]", _query_all, rounds=3, params=params)
+    with _linear_avatar_queries():
+        linear = await bench.measure("avatar_queries_linear[1000]", _query_all, rounds=3, params=params)
+
+    # 同一次运行内的相对比较，与机器快慢无关
+    assert indexed.mean_s < linear.mean_s
+
+
+@pytest.mark.parametrize("avatars", [200, 1000])
+async def test_phase_update_perception_and_knowledge(bench, synthetic_world, avatars):
+    from src.sim.simulator_engine.phases.world import phase_update_perception_and_knowledge
+
+    world, _sim = await synthetic_world(avatars=avatars, sects=3)
+    living = world.avatar_manager.get_living_avatars()
+
+    await bench.measure(
+        f"phase_update_perception_and_knowledge[{avatars}]",
+        lambda: phase_update_perception_and_knowledge(world, living),
+        params={"avatars": avatars},
+    )
+
+
+@pytest.mark.parametrize("sects", [3, 8])
+async def test_sect_territory_snapshot(bench, synthetic_world, sects):
+    world, sim = await synthetic_world(avatars=100, sects=sects)
+
+    await bench.measure(
+        f"sect_compute_snapshot[{sects}]",
+        sim.sect_manager._compute_snapshot,
+        params={"sects": sects, "avatars": 100},
+    )
+
+
+async def test_event_storage_pagination(bench, synthetic_world):
+    world, _sim = await synthetic_world(avatars=50, sects=3)
+    avatar_ids = [str(avatar.id) for avatar in world.avatar_manager.get_living_avatars()]
+    events = [
+        Event(
+            month_stamp=world.month_stamp,
+            content=f"bench event {index}",
+            related_avatars=[avatar_ids[index % len(avatar_ids)], avatar_ids[(index + 1) % len(avatar_ids)]],
+            is_major=index % 10 == 0,
+        )
+        for index in range(5000)
+    ]
+    world.event_manager.add_events(events)
+    storage = world.event_manager._storage
+
+    def _page_through(**filters):
+        cursor, pages = None, 0
+        while True:
+            page, cursor = storage.get_events(cursor=cursor, limit=100, **filters)
+            pages += 1
+            if cursor is None or not page:
+                return pages
+
+    await bench.measure("event_storage_get_events_all_pages", _page_through, params={"events": 5000, "limit": 100})
+    await bench.measure(
+        "event_storage_get_events_avatar_pages",
+        lambda: _page_through(avatar_id=avatar_ids[0]),
+        params={"events": 5000, "limit": 100},
+    )
+
+
+async def test_save_and_load_game(bench, synthetic_world, tmp_path):
+    from src.sim.load.load_game import load_game
+    from src.sim.save.save_game import save_game
+
+    world, sim = await synthetic_world(avatars=200, sects=3)
+    await sim.step()
+    save_path = tmp_path / "bench_save.json"
+
+    def _save():
+        success, _ = save_game(world, sim, world.existed_sects, save_path=save_path)
+        assert success
+
+    def _load():
+        loaded_world, _loaded_sim, _sects = load_game(save_path)
+        loaded_world.event_manager.close()
+
+    await bench.measure("save_game[200]", _save, rounds=3, params={"avatars": 200})
+    await bench.measure("load_game[200]", _load, rounds=3, params={"avatars": 200})
+
+
+async def test_build_tick_state(bench, synthetic_world):
+    from src.server.loop_runtime import build_avatar_updates, build_tick_state
+    from src.server.public_helpers import resolve_avatar_action_emoji
+    from src.server.serialization import (
+        serialize_active_domains,
+        serialize_events_for_client,
+        serialize_phenomenon,
+    )
+
+    world, sim = await synthetic_world(avatars=500, sects=3)
+    events = await sim.step()
+
+    def _build():
+        # 每轮都从空基线开始，相当于一次完整广播
+        world._avatar_broadcast_tracker = None
+        updates = build_avatar_updates(
+            world=world,
+            resolve_avatar_pic_id=lambda _avatar: 1,
+            resolve_avatar_action_emoji=resolve_avatar_action_emoji,
+        )
+        return build_tick_state(
+            world=world,
+            events=events,
+            avatar_updates=updates,
+            serialize_events_for_client=serialize_events_for_client,
+            serialize_phenomenon=serialize_phenomenon,
+            serialize_active_domains=serialize_active_domains,
+        )
+
+    await bench.measure("build_tick_state[500]", _build, params={"avatars": 500, "events": len(events)})
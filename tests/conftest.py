@@ -15,16 +15,32 @@ def isolate_settings_data_root(monkeypatch, tmp_path):
     Redirect app settings/secrets data root to a per-test temp dir.
     """
     from src.config import reset_data_paths_cache, reset_settings_service_cache
+    from src.utils.llm.cache import reset_llm_cache
+    from src.utils.llm.replay import reset_llm_replay
 
     data_root = tmp_path / "appdata"
     monkeypatch.setenv("CWS_DATA_DIR", str(data_root))
+    monkeypatch.delenv("CWS_LLM_CACHE", raising=False)
+    monkeypatch.delenv("CWS_PROFILE_PHASE", raising=False)
+    monkeypatch.delenv("CWS_PHASE_MODE", raising=False)
+    monkeypatch.delenv("CWS_DECISION_PREFETCH", raising=False)
+    monkeypatch.delenv("CWS_TICK_PACING", raising=False)
+    monkeypatch.delenv("CWS_TICK_BATCH_STEPS", raising=False)
+    monkeypatch.delenv("CWS_LLM_REPLAY", raising=False)
+    monkeypatch.delenv("CWS_LLM_REPLAY_FILE", raising=False)
+    monkeypatch.delenv("CWS_LLM_STRUCTURED_OUTPUT", raising=False)
+    monkeypatch.delenv("CWS_DECISION_BATCH_SIZE", raising=False)
     reset_settings_service_cache()
     reset_data_paths_cache()
+    reset_llm_cache()
+    reset_llm_replay()
 
     yield data_root
 
     reset_settings_service_cache()
     reset_data_paths_cache()
+    reset_llm_cache()
+    reset_llm_replay()
 
 
 @pytest.fixture(scope="session", autouse=True)
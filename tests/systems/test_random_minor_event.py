@@ -217,7 +217,10 @@ async def test_phase_random_minor_events_flattens_event_lists(base_world, dummy_
         Event(base_world.month_stamp, "乙的小事", related_avatars=[dummy_avatar.id]),
     ]
     with patch(
-        "src.sim.simulator_engine.phases.world.try_trigger_random_minor_event",
+        "src.sim.simulator_engine.phases.world.screen_world_triggers",
+        return_value={"random_minor_event": [dummy_avatar]},
+    ), patch(
+        "src.sim.simulator_engine.phases.world.RandomMinorEventService.try_create_events",
         new_callable=AsyncMock,
         return_value=events_to_return,
     ):
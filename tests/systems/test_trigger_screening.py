@@ -0,0 +1,44 @@
+"""
+Tests for the monthly world-trigger screening pass (src/systems/trigger_screening.py).
+"""
+
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from src.systems.trigger_screening import (
+    TRIGGER_FATE_REVELATION,
+    TRIGGER_FORTUNE,
+    TRIGGER_MISFORTUNE,
+    screen_world_triggers,
+)
+from src.utils.config import CONFIG
+
+
+def test_screening_draws_once_per_positive_probability(base_world, dummy_avatar):
+    dummy_avatar.fate_revelation = {"oracle_text": "..."}  # 已显现：概率为 0，不掷骰
+    draws = iter([0.0, 0.99])
+
+    with patch.object(CONFIG.world, "fortune_probability", 0.5), \
+         patch.object(CONFIG.world, "misfortune_probability", 0.5), \
+         patch("src.systems.trigger_screening.random.random", side_effect=lambda: next(draws)) as mock_random:
+        hits = screen_world_triggers(
+            base_world,
+            [dummy_avatar],
+            (TRIGGER_FORTUNE, TRIGGER_MISFORTUNE, TRIGGER_FATE_REVELATION),
+        )
+
+    assert hits == {TRIGGER_FORTUNE: [dummy_avatar], TRIGGER_MISFORTUNE: [], TRIGGER_FATE_REVELATION: []}
+    assert mock_random.call_count == 2
+
+
+def test_screening_uses_effect_bonuses_and_keeps_avatar_order(base_world):
+    lucky = SimpleNamespace(effects={"extra_fortune_probability": 1.0})
+    plain = SimpleNamespace(effects={})
+    also_lucky = SimpleNamespace(effects={"extra_fortune_probability": 1.0})
+
+    with patch.object(CONFIG.world, "fortune_probability", 0.0), \
+         patch("src.systems.trigger_screening.random.random", return_value=0.5) as mock_random:
+        hits = screen_world_triggers(base_world, [also_lucky, plain, lucky], (TRIGGER_FORTUNE,))
+
+    assert hits[TRIGGER_FORTUNE] == [also_lucky, lucky]
+    assert mock_random.call_count == 2
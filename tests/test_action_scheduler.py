@@ -0,0 +1,173 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.classes.action_runtime import ActionInstance
+from src.classes.core.avatar import Avatar
+from src.classes.event import Event
+from src.classes.mutual_action.talk import Talk
+from src.config.providers import StaticConfigProvider
+from src.sim.simulator_engine.action_scheduler import build_action_lanes, get_avatar_conflict_keys
+from src.sim.simulator_engine.phases import actions as action_phases
+
+
+class _FakeAction:
+    def __init__(self, keys=()):
+        self._keys = set(keys)
+
+    def get_conflict_keys(self, params):
+        return set(self._keys)
+
+
+class _FakeAvatar:
+    def __init__(self, avatar_id: str, *, delay: float = 0.0, keys=(), tracker=None, retry: bool = False):
+        self.id = avatar_id
+        self.name = avatar_id
+        self.delay = delay
+        self.retry = retry
+        self.tracker = tracker
+        self.current_action = SimpleNamespace(action=_FakeAction(keys), params={})
+        self._new_action_set_this_step = False
+
+    async def tick_action(self):
+        tracker = self.tracker
+        tracker["running"] += 1
+        tracker["max_running"] = max(tracker["max_running"], tracker["running"])
+        tracker["log"].append(("start", self.id))
+        await asyncio.sleep(self.delay)
+        tracker["log"].append(("end", self.id))
+        tracker["running"] -= 1
+        self._new_action_set_this_step = self.retry
+        return [Event(0, f"{self.id} done", related_avatars=[self.id])]
+
+
+@pytest.fixture
+def tracker():
+    return {"running": 0, "max_running": 0, "log": []}
+
+
+def test_build_action_lanes_groups_shared_targets_in_input_order():
+    a = _FakeAvatar("a", keys=[("avatar", "c")])
+    b = _FakeAvatar("b")
+    c = _FakeAvatar("c")
+    d = _FakeAvatar("d", keys=[("region", "1")])
+    e = _FakeAvatar("e", keys=[("region", "1")])
+
+    lanes = build_action_lanes([a, b, c, d, e])
+
+    assert [[avatar.id for avatar in lane] for lane in lanes] == [["a", "c"], ["b"], ["d", "e"]]
+
+
+def test_mutual_action_conflict_keys_include_target(base_world, dummy_avatar):
+    target = Avatar(
+        world=base_world,
+        name="SchedTarget",
+        id="sched-target",
+        birth_month_stamp=dummy_avatar.birth_month_stamp,
+        age=dummy_avatar.age,
+        gender=dummy_avatar.gender,
+        pos_x=0,
+        pos_y=0,
+    )
+    base_world.avatar_manager.avatars[target.id] = target
+    base_world.avatar_manager.avatars[dummy_avatar.id] = dummy_avatar
+    action = Talk(dummy_avatar, base_world)
+    dummy_avatar.current_action = ActionInstance(action=action, params={"target_avatar": "SchedTarget"})
+
+    keys = get_avatar_conflict_keys(dummy_avatar)
+
+    assert ("avatar", str(dummy_avatar.id)) in keys
+    assert ("avatar", "sched-target") in keys
+
+
+@pytest.mark.asyncio
+async def test_tick_round_runs_independent_avatars_concurrently_with_stable_order(tracker):
+    slow = _FakeAvatar("slow", delay=0.05, tracker=tracker, retry=True)
+    fast = _FakeAvatar("fast", delay=0.0, tracker=tracker)
+    follower = _FakeAvatar("follower", delay=0.0, keys=[("avatar", "slow")], tracker=tracker, retry=True)
+
+    events, retry = await action_phases._tick_action_round([slow, fast, follower], "tick_action")
+
+    assert tracker["max_running"] == 2
+    # fast 先完成，但事件仍按输入顺序汇总
+    assert tracker["log"].index(("end", "fast")) < tracker["log"].index(("end", "slow"))
+    assert [event.content for event in events] == ["slow done", "fast done", "follower done"]
+    # 与 slow 冲突的 follower 必须等 slow 结束后才开始
+    assert tracker["log"].index(("end", "slow")) < tracker["log"].index(("start", "follower"))
+    assert [avatar.id for avatar in retry] == ["slow", "follower"]
+
+
+@pytest.mark.asyncio
+async def test_tick_round_is_serial_when_concurrency_disabled(monkeypatch, tracker):
+    monkeypatch.setattr(StaticConfigProvider, "concurrent_action_execution", lambda self: False)
+    avatars = [_FakeAvatar(str(i), delay=0.01, tracker=tracker) for i in range(3)]
+
+    events, retry = await action_phases._tick_action_round(avatars, "tick_action")
+
+    assert tracker["max_running"] == 1
+    assert [event.content for event in events] == ["0 done", "1 done", "2 done"]
+    assert retry == []
+
+
+@pytest.mark.asyncio
+async def test_tick_round_isolates_failures(tracker):
+    class _Broken(_FakeAvatar):
+        async def tick_action(self):
+            self._new_action_set_this_step = True
+            raise RuntimeError("boom")
+
+    ok = _FakeAvatar("ok", tracker=tracker)
+    broken = _Broken("broken", tracker=tracker)
+
+    events, retry = await action_phases._tick_action_round([broken, ok], "tick_action")
+
+    assert [event.content for event in events] == ["ok done"]
+    assert retry == []
+    assert broken._new_action_set_this_step is False
+
+
+class _CityActor:
+    """Minimal actor that devours people in a shared city after an LLM-like delay."""
+
+    def __init__(self, actor_id: str, tile, *, delay: float):
+        from src.classes.action.devour_people import DevourPeople
+        from src.classes.items.auxiliary import Auxiliary
+
+        self.id = actor_id
+        self.name = actor_id
+        self.tile = tile
+        self.delay = delay
+        self.auxiliary = Auxiliary(id=999, name="万魂幡", realm=None, desc="Test")
+        self.auxiliary.special_data = {"devoured_souls": 0}
+        self.current_action = SimpleNamespace(action=DevourPeople(self, None), params={})
+        self._new_action_set_this_step = False
+
+    def add_persistent_effect(self, *_args, **_kwargs):
+        pass
+
+    async def tick_action(self):
+        await asyncio.sleep(self.delay)
+        return await self.current_action.action.finish()
+
+
+@pytest.mark.parametrize("delays", [(0.03, 0.0), (0.0, 0.03)])
+@pytest.mark.asyncio
+async def test_region_actions_share_a_lane_and_ignore_completion_order(delays):
+    from src.classes.environment.region import CityRegion
+    from src.classes.environment.tile import Tile, TileType
+
+    tile = Tile(0, 0, TileType.CITY)
+    tile.region = CityRegion(id=1, name="TestCity", desc="Test")
+    first = _CityActor("first", tile, delay=delays[0])
+    second = _CityActor("second", tile, delay=delays[1])
+
+    assert ("region", "1") in get_avatar_conflict_keys(first)
+    assert len(build_action_lanes([first, second])) == 1
+
+    await action_phases._tick_action_round([first, second], "tick_action")
+
+    # 无论哪个先返回，都按输入顺序结算：first 吞噬 80 万的 1%，second 吞噬剩余的 1%
+    assert first.auxiliary.special_data["devoured_souls"] == 8000
+    assert second.auxiliary.special_data["devoured_souls"] == 7920
+    assert tile.region.population == pytest.approx(80.0 * 0.99 * 0.99)
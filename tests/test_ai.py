@@ -31,6 +31,8 @@ Testing Strategy:
         - BUT whether ai.py correctly parses LLM responses and handles edge cases.
 """
 
+import json
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -288,6 +290,11 @@ class TestLLMAIEmotionUpdate:
             ("emotion_disgusted", EmotionType.DISGUSTED),
             ("emotion_confused", EmotionType.CONFUSED),
             ("emotion_tired", EmotionType.TIRED),
+            # prompt 中的本地化词汇
+            ("疲惫", EmotionType.TIRED),
+            ("開心", EmotionType.HAPPY),
+            ("Expectant", EmotionType.ANTICIPATING),
+            ("Bình thản", EmotionType.CALM),
         ]
 
         ai = LLMAI()
@@ -627,3 +634,174 @@ class TestLLMAIModuleLevelInstance:
     def test_llm_ai_is_ai_subclass(self):
         """Test that LLMAI is a subclass of AI."""
         assert issubclass(LLMAI, AI)
+
+
+class TestLLMAIDecisionPrefetch:
+    """Tests for speculative next-month decision prefetching."""
+
+    @pytest.fixture
+    def mock_world(self, base_world):
+        base_world.get_info = MagicMock(return_value="world info")
+        base_world.get_observable_avatars = MagicMock(return_value=[])
+        return base_world
+
+    @pytest.fixture
+    def test_avatar(self, dummy_avatar):
+        dummy_avatar.get_expanded_info = MagicMock(return_value="avatar info")
+        return dummy_avatar
+
+    def _response(self, avatar, action_name):
+        return {
+            avatar.name: {
+                "action_name_params_pairs": [[action_name, {}]],
+                "avatar_thinking": "",
+                "current_emotion": "emotion_calm",
+            }
+        }
+
+    @pytest.mark.asyncio
+    async def test_prefetched_result_is_used_when_prompt_is_unchanged(self, mock_world, test_avatar):
+        from src.classes.decision_prefetch import get_decision_prefetcher
+
+        ai = LLMAI()
+        with patch("src.classes.ai.call_llm_with_task_name", new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = self._response(test_avatar, "Meditate")
+            assert ai.prefetch(mock_world, [test_avatar]) == 1
+            results = await ai._decide(mock_world, [test_avatar])
+
+        assert mock_llm.await_count == 1
+        assert results[test_avatar][0] == [("Meditate", {})]
+        assert get_decision_prefetcher(mock_world).stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetched_result_is_discarded_when_state_changes(self, mock_world, test_avatar):
+        from src.classes.decision_prefetch import get_decision_prefetcher
+
+        ai = LLMAI()
+        with patch("src.classes.ai.call_llm_with_task_name", new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = self._response(test_avatar, "Meditate")
+            ai.prefetch(mock_world, [test_avatar])
+            test_avatar.get_expanded_info.return_value = "avatar info (injured)"
+            mock_llm.return_value = self._response(test_avatar, "SelfHeal")
+            results = await ai._decide(mock_world, [test_avatar])
+
+        assert mock_llm.await_count == 2
+        assert results[test_avatar][0] == [("SelfHeal", {})]
+        assert get_decision_prefetcher(mock_world).stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_prefetch_from_previous_month_is_not_reused(self, mock_world, test_avatar):
+        ai = LLMAI()
+        with patch("src.classes.ai.call_llm_with_task_name", new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = self._response(test_avatar, "Meditate")
+            ai.prefetch(mock_world, [test_avatar])
+            mock_world.month_stamp = mock_world.month_stamp + 1
+            await ai._decide(mock_world, [test_avatar])
+
+        assert mock_llm.await_count == 2
+
+    def test_decision_infos_are_stable_for_unchanged_state(self, avatar_in_city, base_world):
+        base_world.avatar_manager.avatars[avatar_in_city.id] = avatar_in_city
+
+        first = LLMAI.build_decision_infos(base_world, avatar_in_city)
+        second = LLMAI.build_decision_infos(base_world, avatar_in_city)
+
+        assert first == second
+
+
+class TestLLMAIBatchedDecisions:
+    """Tests for packing several avatars into one action_decision_batch request."""
+
+    def _make_avatar(self, world, name, pos_x=0, pos_y=0):
+        from src.classes.core.avatar import Avatar, Gender
+        from src.classes.age import Age
+        from src.systems.cultivation import Realm
+        from src.systems.time import Year, Month, create_month_stamp
+        from src.classes.root import Root
+        from src.classes.alignment import Alignment
+        from src.utils.id_generator import get_avatar_id
+
+        av = Avatar(
+            world=world,
+            name=name,
+            id=get_avatar_id(),
+            birth_month_stamp=create_month_stamp(Year(2000), Month.JANUARY),
+            age=Age(20, Realm.Qi_Refinement),
+            gender=Gender.MALE,
+            pos_x=pos_x,
+            pos_y=pos_y,
+            root=Root.GOLD,
+            personas=[],
+            alignment=Alignment.RIGHTEOUS,
+        )
+        av.weapon = MagicMock()
+        av.weapon.get_detailed_info.return_value = "Test Weapon"
+        av.technique = None
+        world.avatar_manager.avatars[av.id] = av
+        return av
+
+    def _decision(self, action_name):
+        return {
+            "action_name_params_pairs": [[action_name, {}]],
+            "avatar_thinking": "",
+            "current_emotion": "emotion_happy",
+        }
+
+    def test_group_for_batch_splits_by_sect_region_size_and_name(self, base_world):
+        sect = MagicMock(id=7)
+        members = [self._make_avatar(base_world, f"S{i}") for i in range(3)]
+        for avatar in members:
+            avatar.sect = sect
+        rogue = self._make_avatar(base_world, "Rogue")
+        twin = self._make_avatar(base_world, "S0")
+        twin.sect = sect
+
+        batches = LLMAI.group_for_batch([*members, rogue, twin], batch_size=2)
+
+        assert [[avatar.name for avatar in batch] for batch in batches] == [["S0", "S1"], ["S2", "S0"], ["Rogue"]]
+
+    def test_batch_infos_share_world_context_and_render_with_template(self, base_world):
+        from src.utils.config import CONFIG
+        from src.utils.llm.prompt import build_prompt, load_template
+
+        avatars = [self._make_avatar(base_world, "Alpha"), self._make_avatar(base_world, "Beta", 1, 1)]
+
+        infos = LLMAI.build_batch_decision_infos(base_world, avatars)
+
+        assert set(infos["avatar_infos"]) == {"Alpha", "Beta"}
+        for name, section in infos["avatar_infos"].items():
+            assert "world_info" not in section
+            assert section["available_actions"]
+            assert all(action in infos["action_catalogue"] for action in section["available_actions"])
+        # 两人相同的候选列表（如方向）只在共享表中出现一次
+        shared = json.loads(infos["param_option_lists"])
+        direction_ref = infos["avatar_infos"]["Alpha"]["available_actions"]["MoveToDirection"]["direction"]
+        assert direction_ref in shared
+        assert infos["avatar_infos"]["Beta"]["available_actions"]["MoveToDirection"]["direction"] == direction_ref
+        prompt = build_prompt(load_template(CONFIG.paths.templates / "ai_batch.txt"), infos)
+        assert infos["action_catalogue"] in prompt
+        assert prompt.count('"available_actions"') == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_results_are_demultiplexed_and_missing_avatars_fall_back(self, base_world, monkeypatch):
+        monkeypatch.setenv("CWS_DECISION_BATCH_SIZE", "4")
+        avatars = [self._make_avatar(base_world, name) for name in ("Alpha", "Beta", "Gamma")]
+        solo = self._make_avatar(base_world, "Solo")
+        solo.sect = MagicMock(id=1)
+
+        async def fake_llm(task_name, template_path, info):
+            if task_name == "action_decision_batch":
+                assert set(info["avatar_infos"]) == {"Alpha", "Beta", "Gamma"}
+                return {"Alpha": self._decision("Respire"), "Beta": self._decision("Meditate"), "Gamma": {}}
+            return {info["avatar_name"]: self._decision("SelfHeal")}
+
+        with patch("src.classes.ai.call_llm_with_task_name", new=AsyncMock(side_effect=fake_llm)) as mock_llm:
+            results = await LLMAI()._decide(base_world, [*avatars, solo])
+
+        task_names = sorted(call.args[0] for call in mock_llm.await_args_list)
+        assert task_names == ["action_decision", "action_decision", "action_decision_batch"]
+        assert results[avatars[0]][0] == [("Respire", {})]
+        assert results[avatars[1]][0] == [("Meditate", {})]
+        assert results[avatars[2]][0] == [("SelfHeal", {})]
+        assert results[solo][0] == [("SelfHeal", {})]
+        assert avatars[0].emotion == EmotionType.HAPPY
@@ -3,6 +3,7 @@ Tests for the public v1 Events API endpoints.
 
 Covers:
 - GET /api/v1/query/events - pagination and filtering
+- GET /api/v1/query/events/search - full-text search
 - DELETE /api/v1/command/events/cleanup - event cleanup
 
 Uses FastAPI TestClient to test the API directly.
@@ -214,6 +215,42 @@ class TestGetEventsAPI:
             main.game_instance.update(original)
 
 
+class TestSearchEventsAPI:
+    """Tests for GET /api/v1/query/events/search endpoint."""
+
+    def test_search_matches_content_with_filters(self, client_with_world):
+        response = client_with_world.get("/api/v1/query/events/search?q=event&avatar_id=a1&major_scope=minor")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert [event["content"] for event in data["events"]] == ["Story event", "Event between", "Event 1"]
+        assert data["has_more"] is False
+
+    def test_search_paginates_with_cursor(self, client_with_world):
+        data1 = client_with_world.get("/api/v1/query/events/search?q=event&limit=3").json()["data"]
+        assert data1["has_more"] is True
+
+        cursor = data1["next_cursor"]
+        data2 = client_with_world.get(f"/api/v1/query/events/search?q=event&limit=3&cursor={cursor}").json()["data"]
+
+        contents = [event["content"] for event in data1["events"] + data2["events"]]
+        assert contents == ["Story event", "Major event", "Event between", "Event 2", "Event 1"]
+        assert data2["next_cursor"] is None
+
+    def test_search_month_range(self, client_with_world):
+        since = create_month_stamp(Year(100), Month(2))
+        until = create_month_stamp(Year(100), Month(3))
+        response = client_with_world.get(
+            f"/api/v1/query/events/search?q=event&since_month={int(since)}&until_month={int(until)}"
+        )
+
+        assert [event["content"] for event in response.json()["data"]["events"]] == ["Event between", "Event 2"]
+
+    def test_search_requires_query(self, client_with_world):
+        assert client_with_world.get("/api/v1/query/events/search").status_code == 422
+        assert client_with_world.get("/api/v1/query/events/search?q=").status_code == 422
+
+
 class TestCleanupEventsAPI:
     """Tests for DELETE /api/v1/command/events/cleanup endpoint."""
 
@@ -0,0 +1,124 @@
+"""
+Tests for the per-avatar effect cache and precompiled effect expressions.
+"""
+
+from unittest.mock import patch
+
+from src.classes.effect.process import (
+    build_effect_eval_context,
+    compile_effect_expression,
+    evaluate_effect_values,
+    load_effect_from_str,
+    _evaluate_conditional_effect,
+)
+from src.systems.cultivation import Realm
+from src.systems.time import MonthStamp
+from tests.conftest import create_test_elixir, create_test_weapon
+
+
+def _count_recomputes(avatar):
+    return patch.object(
+        type(avatar),
+        "_compute_raw_effect_breakdown",
+        autospec=True,
+        side_effect=type(avatar)._compute_raw_effect_breakdown,
+    )
+
+
+def test_repeated_reads_within_month_hit_cache(dummy_avatar):
+    with _count_recomputes(dummy_avatar) as mock_compute:
+        first = dummy_avatar.effects
+        for _ in range(5):
+            assert dummy_avatar.effects is first
+        dummy_avatar.get_effect_breakdown()
+        _ = dummy_avatar.luck
+
+    assert mock_compute.call_count <= 1
+
+
+def test_month_change_invalidates_cache(dummy_avatar):
+    dummy_avatar.effects
+    with _count_recomputes(dummy_avatar) as mock_compute:
+        dummy_avatar.world.month_stamp = MonthStamp(int(dummy_avatar.world.month_stamp) + 1)
+        dummy_avatar.effects
+
+    assert mock_compute.call_count == 1
+
+
+def test_weapon_swap_invalidates_cache(dummy_avatar):
+    weapon = create_test_weapon("测试剑", Realm.Qi_Refinement)
+    weapon.effects = {"extra_battle_strength_points": 7}
+
+    before = dummy_avatar.effects.get("extra_battle_strength_points", 0)
+    dummy_avatar.weapon = weapon
+
+    assert dummy_avatar.effects["extra_battle_strength_points"] == before + 7
+
+
+def test_temporary_effect_append_invalidates_cache(dummy_avatar):
+    dummy_avatar.effects
+    dummy_avatar.temporary_effects.append({
+        "source": "test",
+        "effects": {"extra_move_step": 2},
+        "start_month": int(dummy_avatar.world.month_stamp),
+        "duration": 3,
+    })
+
+    assert dummy_avatar.effects["extra_move_step"] == 2
+
+
+def test_consumed_elixir_invalidates_cache(dummy_avatar):
+    dummy_avatar.effects
+    elixir = create_test_elixir("测试丹", Realm.Qi_Refinement, effects={"extra_max_lifespan": 5})
+    dummy_avatar.consume_elixir(elixir)
+
+    assert dummy_avatar.effects["extra_max_lifespan"] == 5
+
+
+def test_recalc_effects_picks_up_in_place_mutation(dummy_avatar):
+    weapon = create_test_weapon("测试剑", Realm.Qi_Refinement)
+    weapon.effects = {"extra_battle_strength_points": 1}
+    dummy_avatar.weapon = weapon
+    assert dummy_avatar.effects["extra_battle_strength_points"] >= 1
+
+    base = dummy_avatar.effects["extra_battle_strength_points"]
+    weapon.effects["extra_battle_strength_points"] = 4
+    dummy_avatar.recalc_effects()
+
+    assert dummy_avatar.effects["extra_battle_strength_points"] == base + 3
+
+
+def test_load_effect_from_str_precompiles_expressions():
+    expr = "avatar.weapon_proficiency * 0.5 + 1234.5"
+    compile_effect_expression.cache_clear()
+
+    load_effect_from_str(f"[{{when: 'avatar.weapon is None', extra_battle_strength_points: 'eval({expr})'}}]")
+    info_after_load = compile_effect_expression.cache_info()
+    compile_effect_expression(expr)
+    compile_effect_expression("avatar.weapon is None")
+
+    assert info_after_load.currsize == 2
+    assert compile_effect_expression.cache_info().hits == info_after_load.hits + 2
+
+
+def test_compiled_expressions_keep_eval_semantics(dummy_avatar):
+    dummy_avatar.weapon = None
+    dummy_avatar.weapon_proficiency = 10.0
+    context = build_effect_eval_context(dummy_avatar)
+
+    evaluated = _evaluate_conditional_effect(
+        [
+            {"when": "avatar.weapon is None", "extra_battle_strength_points": 5},
+            {"when": "any(p is None for p in [avatar.weapon])", "extra_move_step": 1},
+            {"when": "syntax error (", "extra_max_hp": 99},
+        ],
+        dummy_avatar,
+        context,
+    )
+    values = evaluate_effect_values(
+        {"a": "eval(avatar.weapon_proficiency * 2)", "b": "avatar.missing_attr", "c": "plain"},
+        context,
+    )
+
+    assert evaluated == {"extra_battle_strength_points": 5, "extra_move_step": 1}
+    assert values == {"a": 20.0, "b": "avatar.missing_attr", "c": "plain"}
@@ -2,8 +2,8 @@
 Tests for EventStorage and EventManager.
 
 Covers:
-- EventStorage: add_event, get_events, pagination, cursor handling, cleanup
-- EventManager: all query methods, get_events_paginated
+- EventStorage: add_event, add_events, get_events, pagination, cursor handling, cleanup, WAL readers, full-text search
+- EventManager: all query methods, get_events_paginated, search_events_paginated
 - Memory fallback mode
 """
 
@@ -546,6 +546,229 @@ class TestEventStorageCursorParsing:
         assert cursor == "1200_42"
 
 
+class TestEventStorageTimelineIndexes:
+    """Timeline pages should walk the covering indexes instead of sorting."""
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {"major_scope": "major"},
+            {"major_scope": "minor", "cursor": "1200_5"},
+            {"avatar_id": "a1"},
+            {"avatar_id": "a1", "major_scope": "major", "cursor": "1200_5"},
+            {"avatar_id": "a1", "major_scope": "minor"},
+            {"avatar_id_pair": ("a1", "a2")},
+            {"avatar_id_pair": ("a1", "a2"), "major_scope": "major", "cursor": "1200_5"},
+            {"sect_id": 1},
+            {"sect_id": 1, "major_scope": "minor", "cursor": "1200_5"},
+        ],
+    )
+    def test_timeline_queries_never_use_temp_btree(self, event_storage, filters):
+        for i in range(20):
+            event = make_event(100, i % 12 + 1, f"Event {i}", ["a1", "a2"], is_major=i % 3 == 0)
+            event.related_sects = [1]
+            event_storage.add_event(event)
+        event_storage._conn.execute("ANALYZE")
+
+        query, params = event_storage._build_timeline_query(limit=10, **filters)
+        plan = [row["detail"] for row in event_storage._conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+
+        assert not any("TEMP B-TREE" in detail for detail in plan), plan
+        if filters.keys() & {"avatar_id", "avatar_id_pair", "sect_id"}:
+            assert "COVERING INDEX idx_event_" in plan[0], plan
+
+    def test_same_month_pages_follow_rowid_order(self, event_storage):
+        for i in range(7):
+            event = make_event(100, 1, f"Event {i}", ["a1"], is_major=i % 2 == 0)
+            event.related_sects = [3]
+            event_storage.add_event(event)
+
+        for filters, expected in (
+            ({}, 7),
+            ({"avatar_id": "a1"}, 7),
+            ({"sect_id": 3, "major_scope": "major"}, 4),
+            ({"avatar_id": "a1", "major_scope": "minor"}, 3),
+        ):
+            contents, cursor = [], None
+            while True:
+                page, cursor = event_storage.get_events(limit=2, cursor=cursor, **filters)
+                contents.extend(event.content for event in page)
+                if cursor is None:
+                    break
+            assert len(contents) == expected, filters
+            assert contents == sorted(contents, reverse=True), filters
+
+    def test_existing_database_is_migrated(self, temp_db_path):
+        import sqlite3
+
+        conn = sqlite3.connect(str(temp_db_path))
+        conn.executescript("""
+            CREATE TABLE events (
+                id TEXT PRIMARY KEY, month_stamp INTEGER NOT NULL, content TEXT NOT NULL,
+                is_major BOOLEAN DEFAULT FALSE, is_story BOOLEAN DEFAULT FALSE, event_type TEXT DEFAULT '',
+                render_key TEXT, render_params TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE event_avatars (event_id TEXT NOT NULL, avatar_id TEXT NOT NULL, PRIMARY KEY (event_id, avatar_id));
+            CREATE INDEX idx_event_avatars_avatar_id ON event_avatars(avatar_id);
+            CREATE TABLE event_sects (event_id TEXT NOT NULL, sect_id INTEGER NOT NULL, PRIMARY KEY (event_id, sect_id));
+            INSERT INTO events (id, month_stamp, content, is_major, is_story) VALUES
+                ('e1', 10, 'old minor', 0, 0), ('e2', 20, 'old major', 1, 0), ('e3', 30, 'old story', 1, 1);
+            INSERT INTO event_avatars VALUES ('e1', 'a1'), ('e2', 'a1'), ('e3', 'a1'), ('e2', 'a2');
+            INSERT INTO event_sects VALUES ('e2', 7);
+        """)
+        conn.commit()
+        conn.close()
+
+        storage = EventStorage(temp_db_path)
+        try:
+            events, _ = storage.get_events(avatar_id="a1")
+            major, _ = storage.get_events(avatar_id="a1", major_scope="major")
+            minor, _ = storage.get_events(avatar_id="a1", major_scope="minor")
+            pair, _ = storage.get_events(avatar_id_pair=("a1", "a2"))
+            sect, _ = storage.get_events(sect_id=7)
+            indexes = {row[0] for row in storage._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        finally:
+            storage.close()
+
+        assert [event.content for event in events] == ["old story", "old major", "old minor"]
+        assert [event.content for event in major] == ["old major"]
+        assert [event.content for event in minor] == ["old story", "old minor"]
+        assert [event.content for event in pair] == ["old major"]
+        assert [event.content for event in sect] == ["old major"]
+        assert "idx_event_avatars_timeline" in indexes
+        assert "idx_event_avatars_avatar_id" not in indexes
+
+
+class TestEventStorageSearch:
+    """Full-text search over event content and observation text."""
+
+    def _contents(self, storage, query, **filters):
+        events, _ = storage.search_events(query, **filters)
+        return [event.content for event in events]
+
+    def test_matches_cjk_fragments_and_words(self, event_storage):
+        event_storage.add_event(make_event(100, 1, "林动渡过天劫，突破元婴", ["a1"]))
+        event_storage.add_event(make_event(100, 2, "天劫降临，李四陨落", ["a2"], is_major=True))
+        event_storage.add_event(make_event(100, 3, "Zhang met a fox spirit", ["a1", "a2"]))
+
+        assert self._contents(event_storage, "天劫") == ["天劫降临，李四陨落", "林动渡过天劫，突破元婴"]
+        assert self._contents(event_storage, "劫") == ["天劫降临，李四陨落", "林动渡过天劫，突破元婴"]
+        assert self._contents(event_storage, "天劫 陨落") == ["天劫降临，李四陨落"]
+        assert self._contents(event_storage, "劫天") == []
+        assert self._contents(event_storage, "FOX spirit") == ["Zhang met a fox spirit"]
+        # FTS 语法字符按普通文本处理
+        assert self._contents(event_storage, 'fox" OR "天劫') == []
+        assert self._contents(event_storage, "*") == []
+
+    def test_filters_combine_with_match(self, event_storage):
+        for i in range(6):
+            event = make_event(100 + i, 1, f"天劫 {i}", ["a1", "a2"] if i % 2 else ["a1"], is_major=i >= 3)
+            event.related_sects = [7] if i < 2 else None
+            event_storage.add_event(event)
+        since = create_month_stamp(Year(102), Month.JANUARY)
+        until = create_month_stamp(Year(104), Month.JANUARY)
+
+        assert self._contents(event_storage, "天劫", avatar_id_pair=("a1", "a2")) == ["天劫 5", "天劫 3", "天劫 1"]
+        assert self._contents(event_storage, "天劫", sect_id=7) == ["天劫 1", "天劫 0"]
+        assert self._contents(event_storage, "天劫", major_scope="minor") == ["天劫 2", "天劫 1", "天劫 0"]
+        assert self._contents(
+            event_storage, "天劫", since_month_stamp=since, until_month_stamp=until
+        ) == ["天劫 4", "天劫 3", "天劫 2"]
+
+        contents, cursor = [], None
+        while True:
+            page, cursor = event_storage.search_events("天劫", avatar_id="a1", cursor=cursor, limit=4)
+            contents.extend(event.content for event in page)
+            if cursor is None:
+                break
+        assert contents == [f"天劫 {i}" for i in range(5, -1, -1)]
+
+    def test_observation_text_is_searchable(self, event_storage):
+        from src.classes.event_observation import EventObservation
+
+        event = make_event(100, 1, "决战落幕", ["killer"])
+        event.render_params = {"victim_name": "王五", "killer_name": "赵六"}
+        event.observations = [
+            EventObservation(observer_avatar_id="friend", subject_avatar_id="victim", propagation_kind="close_relation_killed")
+        ]
+        event_storage.add_event(event)
+
+        assert self._contents(event_storage, "王五") == ["决战落幕"]
+
+    def _plan(self, storage, query, **filters):
+        sql, params = storage._build_search_query(query, cursor="1_5", limit=10, **filters)
+        return " | ".join(row["detail"] for row in storage._conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+    @pytest.mark.parametrize("filters", [
+        {"avatar_id": "a1", "major_scope": "major"},
+        {"avatar_id_pair": ("a1", "a2")},
+        {"sect_id": 3, "until_month_stamp": 2000},
+    ])
+    def test_filtered_search_plan_has_no_sort(self, event_storage, filters):
+        event_storage.add_event(make_event(100, 1, "天劫", ["a1"]))
+        plan = self._plan(event_storage, "天劫", **filters)
+
+        assert "VIRTUAL TABLE" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_unfiltered_search_plan_depends_on_match_count(self, event_storage):
+        event_storage.add_events([make_event(100, 1, "天劫" if i % 2 else f"闭关 {i}") for i in range(200)])
+        event_storage.add_event(make_event(100, 2, "九霄雷劫"))
+
+        # 命中多：沿时间线索引走，不排序
+        dense = self._plan(event_storage, "天劫")
+        assert "idx_events_timeline" in dense and "TEMP B-TREE" not in dense
+        dense_major = self._plan(event_storage, "天劫", major_scope="major")
+        assert "idx_events_scope_timeline" in dense_major and "TEMP B-TREE" not in dense_major
+        # 命中少：直接取命中再排序
+        assert "TEMP B-TREE" in self._plan(event_storage, "九霄")
+
+    def test_results_follow_timeline_when_written_out_of_order(self, event_storage):
+        event_storage.add_event(make_event(200, 1, "天劫 later", ["a1"]))
+        event_storage.add_event(make_event(100, 1, "天劫 earlier", ["a1"]))
+        event_storage.add_events([make_event(150, 1, f"闭关 {i}", ["a1"]) for i in range(40)])
+
+        expected = ["天劫 later", "天劫 earlier"]
+        assert self._contents(event_storage, "天劫") == expected
+        assert self._contents(event_storage, "天劫", avatar_id="a1") == expected
+        assert self._contents(event_storage, "天劫", major_scope="minor") == expected
+        timeline, _ = event_storage.get_events(avatar_id="a1", limit=1)
+        assert timeline[0].content == "天劫 later"
+
+        page, cursor = event_storage.search_events("天劫", limit=1)
+        rest, _ = event_storage.search_events("天劫", cursor=cursor, limit=1)
+        assert [event.content for event in page + rest] == expected
+
+    def test_cleanup_removes_events_from_index(self, event_storage):
+        event_storage.add_event(make_event(100, 1, "天劫 minor", ["a1"]))
+        event_storage.add_event(make_event(100, 2, "天劫 major", ["a1"], is_major=True))
+
+        event_storage.cleanup(keep_major=True)
+
+        assert self._contents(event_storage, "天劫") == ["天劫 major"]
+        assert event_storage._conn.execute("SELECT COUNT(*) FROM events_fts").fetchone()[0] == 1
+
+    def test_duplicate_writes_are_indexed_once(self, event_storage):
+        event = make_event(100, 1, "天劫", ["a1"], event_id="dup")
+        event_storage.add_event(event)
+        event_storage.add_events([event])
+
+        assert event_storage._conn.execute("SELECT COUNT(*) FROM events_fts").fetchone()[0] == 1
+
+    def test_existing_database_is_backfilled(self, temp_db_path):
+        storage = EventStorage(temp_db_path)
+        storage.add_event(make_event(100, 1, "旧存档里的天劫", ["a1"]))
+        storage._conn.executescript("DROP TRIGGER events_fts_delete; DROP TABLE events_fts;")
+        storage.close()
+
+        storage = EventStorage(temp_db_path)
+        try:
+            assert self._contents(storage, "天劫") == ["旧存档里的天劫"]
+        finally:
+            storage.close()
+
+
 # --- EventManager Tests ---
 
 class TestEventManagerWithStorage:
@@ -766,6 +989,33 @@ class TestEventManagerMemoryMode:
         assert cursor is None
         assert has_more is False
 
+    def test_search_memory_mode(self, memory_event_manager):
+        """Test that search in memory mode falls back to substring matching."""
+        memory_event_manager.add_event(make_event(100, 1, "林动渡过天劫", ["a1"]))
+        memory_event_manager.add_event(make_event(100, 2, "天劫降临", ["a2"]))
+        memory_event_manager.add_event(make_event(100, 3, "闭关修炼", ["a1"]))
+
+        events, cursor, has_more = memory_event_manager.search_events_paginated("天劫", avatar_id="a1")
+
+        assert [e.content for e in events] == ["林动渡过天劫"]
+        assert cursor is None
+        assert has_more is False
+
+    def test_search_memory_mode_pages_in_timeline_order(self, memory_event_manager):
+        memory_event_manager.add_event(make_event(200, 1, "天劫 later"))
+        memory_event_manager.add_event(make_event(100, 1, "天劫 earlier"))
+        memory_event_manager.add_event(make_event(150, 1, "天劫 middle"))
+
+        contents, cursor = [], None
+        while True:
+            events, cursor, has_more = memory_event_manager.search_events_paginated("天劫", cursor=cursor, limit=1)
+            contents.extend(e.content for e in events)
+            assert has_more is (cursor is not None)
+            if cursor is None:
+                break
+
+        assert contents == ["天劫 later", "天劫 middle", "天劫 earlier"]
+
     def test_cleanup_memory_mode(self, memory_event_manager):
         """Test cleanup in memory mode clears all events."""
         memory_event_manager.add_event(make_event(100, 1, "Event 1"))
@@ -935,3 +1185,74 @@ class TestEventStorageThreadSafety:
 
         final_events, _ = event_storage.get_events(limit=expected_total + 5)
         assert len(final_events) == expected_total
+
+
+class TestEventStorageBatchWrites:
+    """Batched month writes and WAL-mode reader isolation."""
+
+    def test_database_runs_in_wal_mode(self, event_storage):
+        mode = event_storage._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+        assert event_storage._write_conn is not event_storage._conn
+
+    def test_add_events_writes_batch_in_single_transaction(self, event_storage):
+        events = []
+        for i in range(20):
+            event = make_event(100, 1, f"Batch {i}", [f"a{i}", "shared"], is_major=i % 2 == 0)
+            event.related_sects = [1, 2]
+            events.append(event)
+
+        statements: list[str] = []
+        event_storage._write_conn.set_trace_callback(statements.append)
+        try:
+            written = event_storage.add_events(events)
+        finally:
+            event_storage._write_conn.set_trace_callback(None)
+
+        assert written == 20
+        assert sum(1 for sql in statements if sql.strip().upper().startswith("BEGIN")) == 1
+        assert event_storage.count() == 20
+
+        loaded, _ = event_storage.get_events(limit=50)
+        assert [e.content for e in reversed(loaded)] == [f"Batch {i}" for i in range(20)]
+        assert set(loaded[0].related_avatars) == {"a19", "shared"}
+        assert set(loaded[0].related_sects) == {1, 2}
+        assert len(event_storage.get_minor_events_by_avatar("shared", limit=50)) == 10
+
+    def test_add_events_falls_back_to_single_writes_on_bad_event(self, event_storage):
+        good = make_event(100, 1, "Good", ["a1"])
+        bad = make_event(100, 1, "Bad", ["a1"])
+        bad.related_sects = ["not-an-int"]
+
+        assert event_storage.add_events([good, bad]) == 1
+        assert [e.content for e in event_storage.get_recent_events()] == ["Good"]
+
+    def test_reads_do_not_wait_for_write_lock(self, event_storage):
+        event_storage.add_event(make_event(100, 1, "Existing", ["a1"]))
+
+        with event_storage._write_lock:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(event_storage.get_events_by_avatar, "a1")
+                events = future.result(timeout=5)
+
+        assert [e.content for e in events] == ["Existing"]
+
+    def test_copy_to_includes_uncheckpointed_writes(self, event_storage, temp_db_path):
+        event_storage.add_events([make_event(100, i + 1, f"E{i}") for i in range(5)])
+        copy_path = temp_db_path.with_name("copy_events.db")
+
+        event_storage.copy_to(copy_path)
+
+        copied = EventStorage(copy_path)
+        try:
+            assert copied.count() == 5
+        finally:
+            copied.close()
+
+    def test_manager_add_events_skips_null_and_keeps_memory_order(self, memory_event_manager):
+        first = make_event(100, 1, "First")
+        second = make_event(100, 2, "Second")
+
+        memory_event_manager.add_events([first, NULL_EVENT, second])
+
+        assert [e.content for e in memory_event_manager.get_recent_events()] == ["First", "Second"]
@@ -0,0 +1,150 @@
+"""
+Tests for game loop tick pacing and catch-up batches.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.server.loop import GameLoopRunner, TickPacingPolicy, TickPayloadBuilder
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_fixed_pacing_keeps_historical_one_second_sleep():
+    policy = TickPacingPolicy()
+
+    assert policy.initial_delay() == 1.0
+    assert policy.delay_after(1, 0.3) == 1.0
+    assert policy.delay_after(0, 0.0) == 1.0
+
+
+def test_max_speed_and_min_interval_pacing():
+    fast = TickPacingPolicy(mode="max_speed", idle_seconds=0.25)
+    assert fast.initial_delay() == 0.0
+    assert fast.delay_after(1, 0.3) == 0.0
+    assert fast.delay_after(0, 0.0) == 0.25
+
+    paced = TickPacingPolicy(mode="min_interval", interval_seconds=2.0)
+    assert paced.delay_after(1, 0.5) == pytest.approx(1.5)
+    assert paced.delay_after(1, 3.0) == 0.0
+    assert paced.delay_after(3, 4.0) == pytest.approx(2.0)
+
+
+def test_target_rate_keeps_schedule_without_bursting():
+    clock = _FakeClock()
+    policy = TickPacingPolicy(mode="target_rate", months_per_second=2.0, clock=clock)
+
+    clock.now += 0.1
+    assert policy.delay_after(1, 0.1) == pytest.approx(0.4)
+    clock.now += 0.4 + 0.2
+    assert policy.delay_after(1, 0.2) == pytest.approx(0.3)
+    # 一个慢月份（超出预算）之后不补跑，从当前时刻重新计时
+    clock.now += 0.3 + 2.0
+    assert policy.delay_after(1, 2.0) == 0.0
+    clock.now += 0.1
+    assert policy.delay_after(1, 0.1) == pytest.approx(0.4)
+
+
+def test_pacing_from_config_and_env(monkeypatch):
+    config = SimpleNamespace(game_loop=SimpleNamespace(pacing="min_interval", interval_seconds=0.5, batch_steps=2))
+    policy = TickPacingPolicy.from_config(config)
+    assert (policy.mode, policy.interval_seconds, policy.batch_steps) == ("min_interval", 0.5, 2)
+
+    monkeypatch.setenv("CWS_TICK_PACING", "max_speed")
+    monkeypatch.setenv("CWS_TICK_BATCH_STEPS", "12")
+    policy = TickPacingPolicy.from_config(config)
+    assert (policy.mode, policy.batch_steps) == ("max_speed", 12)
+
+    monkeypatch.setenv("CWS_TICK_PACING", "warp")
+    assert TickPacingPolicy.from_config(config).mode == "fixed"
+
+
+class _FakeRuntime:
+    def __init__(self, sim, world):
+        self.state = {"init_status": "ready", "sim": sim, "world": world}
+        self.paused = False
+
+    def get(self, key):
+        return self.state.get(key)
+
+    def is_effectively_paused(self):
+        return self.paused
+
+    def is_reset_requested(self):
+        return False
+
+    async def run_mutation(self, func):
+        return await func()
+
+
+class _FakeSim:
+    def __init__(self, world):
+        self.world = world
+
+    async def step(self):
+        self.world.month += 1
+        return [f"event-{self.world.month}"]
+
+
+class _FakeManager:
+    def __init__(self):
+        self.messages = []
+
+    async def broadcast(self, message):
+        self.messages.append(message)
+
+
+def _make_runner(batch_steps=1, save_months=()):
+    world = SimpleNamespace(month=0)
+    sim = _FakeSim(world)
+    runtime = _FakeRuntime(sim, world)
+    manager = _FakeManager()
+    saves = []
+    runner = GameLoopRunner(
+        game_instance={},
+        runtime=runtime,
+        manager=manager,
+        tick_payload_builder=TickPayloadBuilder(
+            build_avatar_updates=lambda: [],
+            build_tick_state=lambda _updates, events, w: {"type": "tick", "month": w.month, "events": list(events)},
+        ),
+        should_trigger_auto_save=lambda w: (w.month in save_months, 10, w.month),
+        trigger_auto_save=lambda w, _sim: saves.append(w.month),
+        build_auto_save_toast=lambda: {"type": "toast"},
+        get_logger=lambda: SimpleNamespace(logger=SimpleNamespace(error=lambda *a, **k: None)),
+        pacing=TickPacingPolicy(mode="max_speed", batch_steps=batch_steps),
+    )
+    return runner, runtime, manager, saves
+
+
+async def test_catch_up_batch_coalesces_months_into_one_broadcast():
+    runner, _runtime, manager, saves = _make_runner(batch_steps=3, save_months=(2,))
+
+    steps = await runner.run_once()
+
+    assert steps == 3
+    # 批内第 2 个月的自动存档在下一步之前完成，toast 跟在合并后的 tick 之后
+    assert saves == [2]
+    assert manager.messages == [
+        {"type": "tick", "month": 3, "events": ["event-1", "event-2", "event-3"]},
+        {"type": "toast"},
+    ]
+
+
+async def test_single_step_tick_saves_after_broadcast_and_paused_loop_reports_idle():
+    runner, runtime, manager, saves = _make_runner(batch_steps=1, save_months=(1,))
+
+    assert await runner.run_once() == 1
+    assert saves == [1]
+    assert [message["type"] for message in manager.messages] == ["tick", "toast"]
+
+    runtime.paused = True
+    assert await runner.run_once() == 0
+    assert len(manager.messages) == 2
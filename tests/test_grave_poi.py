@@ -3,7 +3,7 @@ from __future__ import annotations
 from src.classes.death import handle_death
 from src.classes.death_reason import DeathReason, DeathType
 from src.classes.poi import GravePOI
-from src.server.init_flow import _resolve_initially_dead_avatars
+from src.sim.world_setup import resolve_initially_dead_avatars
 from src.systems.time import Month, Year, create_month_stamp
 
 
@@ -40,7 +40,7 @@ def test_initially_expired_avatar_is_archived_as_a_grave(base_world, dummy_avata
     dummy_avatar.set_dead(str(DeathReason(DeathType.OLD_AGE)), base_world.month_stamp)
     base_world.avatar_manager.avatars[dummy_avatar.id] = dummy_avatar
 
-    _resolve_initially_dead_avatars(
+    resolve_initially_dead_avatars(
         world=base_world,
         avatars={dummy_avatar.id: dummy_avatar},
     )
@@ -0,0 +1,67 @@
+"""
+Tests for the headless batch simulation runner.
+"""
+
+import json
+
+from src.classes.language import language_manager
+from src.sim.headless import BATCH_SUMMARY_FILE, HeadlessWorldSpec, main, run_headless_batch
+
+
+def _spec(tmp_path, seed, **run_config):
+    return HeadlessWorldSpec(
+        seed=seed,
+        months=2,
+        output_dir=str(tmp_path),
+        run_config={"init_npc_num": 4, "sect_num": 1, "content_locale": language_manager.current, **run_config},
+        prepare_profiles=False,
+        llm_replay="replay",
+    )
+
+
+def test_batch_runs_worlds_in_process_and_writes_per_world_outputs(tmp_path):
+    results = run_headless_batch([_spec(tmp_path, 2), _spec(tmp_path, 1)], workers=1)
+
+    assert [row["seed"] for row in results] == [1, 2]
+    for row in results:
+        assert row["months"] == 2
+        assert row["end_month_stamp"] == row["start_month_stamp"] + 2
+        assert row["initial_avatars"] == 4
+        assert row["events"] > 0
+        world_dir = tmp_path / f"world_{row['seed']}"
+        assert (world_dir / "events.db").exists()
+        assert json.loads((world_dir / "summary.json").read_text(encoding="utf-8"))["seed"] == row["seed"]
+
+    lines = (tmp_path / BATCH_SUMMARY_FILE).read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["seed"] for line in lines] == [1, 2]
+
+
+def test_failed_world_is_reported_without_stopping_the_batch(tmp_path):
+    results = run_headless_batch(
+        [_spec(tmp_path, 1, map_id="no_such_map"), _spec(tmp_path, 2)],
+        workers=1,
+    )
+
+    assert "error" in results[0]
+    assert "error" not in results[1]
+    assert main([
+        "--seeds", "3", "--months", "1", "--npc", "2", "--sects", "0",
+        "--locale", language_manager.current, "--map", "no_such_map",
+        "--offline", "--no-profiles", "--out", str(tmp_path / "cli"),
+    ]) == 1
+
+
+def test_same_seed_replays_identical_event_history(tmp_path):
+    import sqlite3
+
+    def _contents(output_dir):
+        run_headless_batch([_spec(output_dir, 11)], workers=1)
+        conn = sqlite3.connect(output_dir / "world_11" / "events.db")
+        try:
+            return [row for row in conn.execute("SELECT month_stamp, content FROM events ORDER BY rowid")]
+        finally:
+            conn.close()
+
+    first = _contents(tmp_path / "a")
+    assert first
+    assert _contents(tmp_path / "b") == first
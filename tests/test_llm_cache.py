@@ -0,0 +1,159 @@
+"""
+Tests for the opt-in LLM response cache.
+
+- Memory LRU tier and SQLite tier (survives a new cache instance)
+- Per-task TTL (unlisted tasks are never cached, expired entries miss)
+- call_llm_with_task_name integration and hit/miss stats
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.utils.llm.cache import (
+    CACHE_DB_NAME,
+    LLMCacheSettings,
+    LLMResponseCache,
+    get_llm_cache,
+    reset_llm_cache,
+)
+from src.utils.llm.client import call_llm_with_task_name
+from src.utils.llm.config import LLMConfig, LLMMode
+
+
+def make_settings(**overrides) -> LLMCacheSettings:
+    values = {
+        "enabled": True,
+        "memory_max_entries": 8,
+        "persist_to_disk": True,
+        "disk_max_entries": 100,
+        "task_ttl_seconds": {"nickname": 3600, "backstory": 3600},
+    }
+    values.update(overrides)
+    return LLMCacheSettings(**values)
+
+
+def test_memory_hit_returns_independent_copy(tmp_path):
+    cache = LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME)
+    cache.put("m", "nickname", "prompt", {"nickname": "剑痴"})
+
+    first = cache.get("m", "nickname", "prompt")
+    first["nickname"] = "changed"
+
+    assert cache.get("m", "nickname", "prompt") == {"nickname": "剑痴"}
+    assert cache.memory_hits == 2
+
+
+def test_key_includes_model_task_and_prompt(tmp_path):
+    cache = LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME)
+    cache.put("m", "nickname", "prompt", {"v": 1})
+
+    assert cache.get("other-model", "nickname", "prompt") is None
+    assert cache.get("m", "backstory", "prompt") is None
+    assert cache.get("m", "nickname", "prompt ") is None
+    assert cache.misses == 3
+
+
+def test_unlisted_task_is_not_cached(tmp_path):
+    cache = LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME)
+    cache.put("m", "action_decision", "prompt", {"v": 1})
+
+    assert cache.is_enabled_for("action_decision") is False
+    assert cache.get("m", "action_decision", "prompt") is None
+    assert cache.stores == 0
+
+
+def test_disabled_cache_is_noop(tmp_path):
+    cache = LLMResponseCache(make_settings(enabled=False), tmp_path / CACHE_DB_NAME)
+    cache.put("m", "nickname", "prompt", {"v": 1})
+
+    assert cache.get("m", "nickname", "prompt") is None
+    assert not (tmp_path / CACHE_DB_NAME).exists()
+
+
+def test_memory_lru_evicts_oldest_but_disk_tier_still_hits(tmp_path):
+    cache = LLMResponseCache(make_settings(memory_max_entries=2), tmp_path / CACHE_DB_NAME)
+    for i in range(3):
+        cache.put("m", "nickname", f"p{i}", {"i": i})
+
+    assert cache.evictions == 1
+    assert cache.get("m", "nickname", "p0") == {"i": 0}
+    assert cache.disk_hits == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    db_path = tmp_path / CACHE_DB_NAME
+    first = LLMResponseCache(make_settings(), db_path)
+    first.put("m", "backstory", "prompt", {"backstory": "出身寒门"})
+    first.close()
+
+    second = LLMResponseCache(make_settings(), db_path)
+    assert second.get("m", "backstory", "prompt") == {"backstory": "出身寒门"}
+    assert second.get_stats()["disk_hits"] == 1
+
+
+def test_expired_entry_misses(tmp_path):
+    cache = LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME)
+    cache.put("m", "nickname", "prompt", {"v": 1})
+
+    with patch("src.utils.llm.cache.time.time", return_value=time.time() + 7200):
+        assert cache.get("m", "nickname", "prompt") is None
+    assert cache.misses == 1
+
+
+def test_settings_env_switch_overrides_config(monkeypatch):
+    monkeypatch.setenv("CWS_LLM_CACHE", "1")
+    assert LLMCacheSettings.from_config().enabled is True
+
+    monkeypatch.setenv("CWS_LLM_CACHE", "0")
+    assert LLMCacheSettings.from_config().enabled is False
+
+
+def test_default_cache_lives_in_data_cache_dir(monkeypatch, isolate_settings_data_root):
+    monkeypatch.setenv("CWS_LLM_CACHE", "1")
+    reset_llm_cache()
+
+    cache = get_llm_cache()
+    cache.put("m", "nickname", "prompt", {"v": 1})
+
+    assert (isolate_settings_data_root / "cache" / CACHE_DB_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_call_llm_with_task_name_serves_repeat_prompt_from_cache(tmp_path):
+    reset_llm_cache(LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME))
+    config = LLMConfig(model_name="test-model", api_key="k", base_url="http://test.api/v1")
+
+    with patch("src.utils.llm.client.load_template", return_value="给 {name} 起个绰号"), \
+         patch("src.utils.llm.client.get_task_mode", return_value=LLMMode.NORMAL), \
+         patch("src.utils.llm.client.LLMConfig.from_mode", return_value=config), \
+         patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = '{"nickname": "剑痴"}'
+
+        first = await call_llm_with_task_name("nickname", "nickname.txt", {"name": "张三"})
+        second = await call_llm_with_task_name("nickname", "nickname.txt", {"name": "张三"})
+        third = await call_llm_with_task_name("nickname", "nickname.txt", {"name": "李四"})
+
+    assert first == second == third == {"nickname": "剑痴"}
+    assert mock_call.await_count == 2
+    stats = get_llm_cache().get_stats()
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["stores"] == 2
+
+
+@pytest.mark.asyncio
+async def test_call_llm_with_task_name_bypasses_cache_for_uncached_task(tmp_path):
+    reset_llm_cache(LLMResponseCache(make_settings(), tmp_path / CACHE_DB_NAME))
+
+    with patch("src.utils.llm.client.load_template", return_value="decide"), \
+         patch("src.utils.llm.client.get_task_mode", return_value=LLMMode.NORMAL), \
+         patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = '{"ok": true}'
+
+        await call_llm_with_task_name("action_decision", "ai.txt", {})
+        await call_llm_with_task_name("action_decision", "ai.txt", {})
+
+    assert mock_call.await_count == 2
+    assert get_llm_cache().get_stats()["misses"] == 0
@@ -20,6 +20,7 @@ LLM calls are critical to the game's AI decision making. When LLM fails:
 import pytest
 import json
 import urllib.error
+from contextlib import ExitStack
 from unittest.mock import patch, MagicMock, AsyncMock
 from io import BytesIO
 
@@ -37,9 +38,24 @@ from src.utils.llm.client import (
 )
 from src.utils.llm.config import LLMConfig
 from src.utils.llm.parser import parse_json
+from src.utils.llm.transport import HTTPResponse
 from src.utils.llm.exceptions import LLMError, ParseError
 
 
+def patch_transport(*, status: int = 200, body: bytes = b""):
+    """Patch the pooled asyncio transport used by call_llm."""
+    stack = ExitStack()
+    stack.enter_context(patch("src.utils.llm.client.uses_system_proxy", return_value=False))
+    stack.enter_context(
+        patch(
+            "src.utils.llm.client.post_json",
+            new_callable=AsyncMock,
+            return_value=HTTPResponse(status=status, body=body),
+        )
+    )
+    return stack
+
+
 def make_http_error(url: str, code: int, msg: str, body: bytes) -> urllib.error.HTTPError:
     """Create an HTTPError for testing. The hdrs param type is incorrectly typed in stubs."""
     return urllib.error.HTTPError(
@@ -264,6 +280,38 @@ class TestRetryLogic:
             # Should only try once.
             assert mock_call.call_count == 1
 
+    @pytest.mark.asyncio
+    async def test_repair_followup_replaces_full_retry(self, monkeypatch):
+        """With json_repair_followup on, a cheap fix request is tried before regenerating."""
+        from src.utils.llm import client
+
+        monkeypatch.setattr(client.CONFIG.ai, "json_repair_followup", True)
+        with patch("src.utils.llm.client.load_template", return_value="fix this JSON: {text}"), \
+             patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+            mock_call.side_effect = ["Action: {broken", '{"action": "Move"}']
+
+            result = await call_llm_json("original prompt", max_retries=2)
+
+        assert result == {"action": "Move"}
+        assert mock_call.call_count == 2
+        repair_prompt = mock_call.call_args_list[1].args[0]
+        assert "Action: {broken" in repair_prompt
+        assert "original prompt" not in repair_prompt
+
+    @pytest.mark.asyncio
+    async def test_failed_repair_followup_falls_back_to_full_retry(self, monkeypatch):
+        from src.utils.llm import client
+
+        monkeypatch.setattr(client.CONFIG.ai, "json_repair_followup", True)
+        with patch("src.utils.llm.client.load_template", return_value="fix this JSON: {text}"), \
+             patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+            mock_call.side_effect = ["broken", "still broken", '{"ok": true}']
+
+            result = await call_llm_json("original prompt", max_retries=1)
+
+        assert result == {"ok": True}
+        assert [call.args[0] for call in mock_call.call_args_list][2] == "original prompt"
+
     @pytest.mark.asyncio
     async def test_retry_preserves_mode(self):
         """Test that retry uses the same LLM mode."""
@@ -527,16 +575,10 @@ class TestLLMFailureClassification:
             api_key="bad-key",
             base_url="http://test.api/v1",
         )
-        http_error = make_http_error(
-            url="http://test.api/v1/chat/completions",
-            code=401,
-            msg="Unauthorized",
-            body=b'{"error": {"message": "Invalid API key"}}',
-        )
 
         try:
             with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
-                 patch("urllib.request.urlopen", side_effect=http_error):
+                 patch_transport(status=401, body=b'{"error": {"message": "Invalid API key"}}'):
                 with pytest.raises(Exception):
                     await call_llm("test prompt")
         finally:
@@ -558,16 +600,10 @@ class TestLLMFailureClassification:
             api_key="quota-limited-key",
             base_url="https://api.longcat.chat/openai/v1",
         )
-        http_error = make_http_error(
-            url="https://api.longcat.chat/openai/v1/chat/completions",
-            code=403,
-            msg="Forbidden",
-            body=b'{"error": {"code": "insufficient_quota", "message": "API Key quota is insufficient"}}',
-        )
 
         try:
             with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
-                 patch("urllib.request.urlopen", side_effect=http_error):
+                 patch_transport(status=403, body=b'{"error": {"code": "insufficient_quota", "message": "API Key quota is insufficient"}}'):
                 with pytest.raises(Exception):
                     await call_llm("test prompt")
         finally:
@@ -589,16 +625,10 @@ class TestLLMFailureClassification:
             api_key="test-key",
             base_url="http://test.api/v1",
         )
-        http_error = make_http_error(
-            url="http://test.api/v1/chat/completions",
-            code=500,
-            msg="Internal Server Error",
-            body=b'{"error": {"message": "Server error"}}',
-        )
 
         try:
             with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
-                 patch("urllib.request.urlopen", side_effect=http_error):
+                 patch_transport(status=500, body=b'{"error": {"message": "Server error"}}'):
                 with pytest.raises(Exception):
                     await call_llm("test prompt")
         finally:
@@ -746,10 +776,6 @@ class TestAsyncCallLLM:
             "choices": [{"message": {"content": "Hello from LLM"}}]
         }).encode('utf-8')
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = mock_response_content
-        mock_response.__enter__.return_value = mock_response
-
         mock_config = LLMConfig(
             model_name="test-model",
             api_key="test-key",
@@ -757,29 +783,22 @@ class TestAsyncCallLLM:
         )
 
         with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
-             patch("urllib.request.urlopen", return_value=mock_response):
+             patch_transport(body=mock_response_content):
             result = await call_llm("test prompt")
 
         assert result == "Hello from LLM"
 
     @pytest.mark.asyncio
     async def test_call_llm_propagates_error(self):
-        """Test that errors from _call_with_requests propagate."""
+        """Test that HTTP errors from the pooled transport propagate."""
         mock_config = LLMConfig(
             model_name="test-model",
             api_key="test-key",
             base_url="http://test.api/v1"
         )
 
-        http_error = make_http_error(
-            url="http://test.api/v1/chat/completions",
-            code=500,
-            msg="Internal Server Error",
-            body=b'{"error": "Server error"}'
-        )
-
         with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=mock_config), \
-             patch("urllib.request.urlopen", side_effect=http_error):
+             patch_transport(status=500, body=b'{"error": "Server error"}'):
             with pytest.raises(Exception) as exc_info:
                 await call_llm("test prompt")
 
@@ -0,0 +1,109 @@
+"""
+Tests for the LLM record/replay transport and world-seeded randomness.
+"""
+
+import random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.llm.client import call_llm_json
+from src.utils.llm.config import LLMConfig
+from src.utils.llm.replay import (
+    MISS_ERROR,
+    LLMReplaySettings,
+    LLMReplayTransport,
+    get_llm_replay,
+    reset_llm_replay,
+)
+from src.utils.rng import derive_seed, seed_world_random
+
+CONFIG = LLMConfig(model_name="test-model", api_key="k", base_url="http://test.api/v1")
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay_returns_responses_in_recorded_order(tmp_path):
+    path = tmp_path / "rec.jsonl"
+    responses = iter(['{"n": 1}', '{"n": 2}', '{"other": true}'])
+
+    async def _network(_config, _prompt):
+        return next(responses)
+
+    recorder = LLMReplayTransport(LLMReplaySettings(mode="record", path=str(path)))
+    assert [await recorder.call(CONFIG, prompt, _network) for prompt in ("p", "p", "q")] == [
+        '{"n": 1}', '{"n": 2}', '{"other": true}',
+    ]
+    assert recorder.get_stats()["recorded"] == 3
+
+    async def _no_network(_config, _prompt):
+        raise AssertionError("replay must not hit the network")
+
+    player = LLMReplayTransport(LLMReplaySettings(mode="replay", path=str(path)))
+    assert await player.call(CONFIG, "q", _no_network) == '{"other": true}'
+    # 同一提示词按录制顺序返回，用完后重复最后一条
+    assert [await player.call(CONFIG, "p", _no_network) for _ in range(3)] == ['{"n": 1}', '{"n": 2}', '{"n": 2}']
+    # 模型名属于键的一部分
+    other_model = LLMConfig(model_name="other", api_key="k", base_url="http://test.api/v1")
+    assert await player.call(other_model, "p", _no_network) == "{}"
+    stats = player.get_stats()
+    assert (stats["hits"], stats["misses"], stats["recorded"]) == (4, 1, 0)
+
+
+@pytest.mark.asyncio
+async def test_replay_miss_can_raise_network_error():
+    player = LLMReplayTransport(LLMReplaySettings(mode="replay", on_miss=MISS_ERROR))
+
+    with pytest.raises(Exception, match="NETWORK_ERROR::"):
+        await player.call(CONFIG, "unknown", None)
+
+
+@pytest.mark.asyncio
+async def test_call_llm_json_uses_replay_transport_instead_of_network(tmp_path):
+    reset_llm_replay(LLMReplayTransport(LLMReplaySettings(mode="replay")))
+
+    with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=CONFIG), \
+         patch("src.utils.llm.client._call_with_transport", side_effect=AssertionError("network")):
+        assert await call_llm_json("prompt") == {}
+
+    assert get_llm_replay().get_stats()["misses"] == 1
+
+
+def test_settings_env_override_and_record_requires_path(monkeypatch):
+    assert LLMReplaySettings.from_config().mode == "off"
+
+    monkeypatch.setenv("CWS_LLM_REPLAY", "record")
+    assert LLMReplaySettings.from_config().mode == "off"
+
+    monkeypatch.setenv("CWS_LLM_REPLAY_FILE", "rec.jsonl")
+    assert LLMReplaySettings.from_config() == LLMReplaySettings(mode="record", path="rec.jsonl")
+
+
+def test_world_seed_makes_monthly_random_stream_reproducible():
+    world = SimpleNamespace(seed=7, month_stamp=1205)
+
+    assert seed_world_random(world)
+    first = [random.random() for _ in range(3)]
+    assert seed_world_random(world)
+    assert [random.random() for _ in range(3)] == first
+
+    world.month_stamp = 1206
+    seed_world_random(world)
+    assert [random.random() for _ in range(3)] != first
+    assert derive_seed(7, 1205) == derive_seed(7, "1205")
+    assert not seed_world_random(SimpleNamespace(seed=None, month_stamp=1205))
+
+
+def test_world_seed_survives_save_and_load(base_world, tmp_path):
+    from src.sim.load.load_game import load_game
+    from src.sim.save.save_game import save_game
+    from src.sim.simulator import Simulator
+
+    base_world.seed = 42
+    save_path = tmp_path / "seeded_save.json"
+    success, _ = save_game(base_world, Simulator(base_world), [], save_path=save_path)
+    assert success
+
+    loaded_world, _, _ = load_game(save_path)
+
+    assert loaded_world.seed == 42
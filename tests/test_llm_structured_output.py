@@ -0,0 +1,137 @@
+"""
+Tests for schema-constrained structured output (src/utils/llm/schema.py).
+"""
+
+import json
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from src.classes.actions import ALL_ACTUAL_ACTION_NAMES
+from src.utils.llm.client import (
+    _build_anthropic_request,
+    _build_openai_request,
+    _extract_anthropic_text,
+    call_llm_with_task_name,
+)
+from src.utils.llm.config import LLMConfig
+from src.utils.llm.schema import (
+    ResponseSchema,
+    build_task_schema,
+    get_task_response_schema,
+    validate_json_schema,
+)
+
+OPENAI = LLMConfig(model_name="m", api_key="k", base_url="http://test.api/v1")
+ANTHROPIC = LLMConfig(model_name="m", api_key="k", base_url="http://test.api", api_format="anthropic")
+
+
+def _decision(*pairs, emotion="emotion_calm"):
+    return {
+        "avatar_thinking": "...",
+        "current_emotion": emotion,
+        "short_term_objective": "...",
+        "action_name_params_pairs": list(pairs),
+    }
+
+
+def test_action_decision_schema_is_derived_from_action_registry():
+    schema = build_task_schema("action_decision", {"avatar_name": "Lin"})
+
+    assert schema["required"] == ["Lin"]
+    branches = schema["properties"]["Lin"]["properties"]["action_name_params_pairs"]["items"]["anyOf"]
+    assert [branch["properties"]["action_name"]["enum"][0] for branch in branches] == ALL_ACTUAL_ACTION_NAMES
+    gift = next(branch for branch in branches if branch["properties"]["action_name"]["enum"] == ["Gift"])
+    gift_params = gift["properties"]["action_params"]
+    assert gift_params["properties"]["amount"] == {"type": "integer"}
+    # 带默认值的参数可以省略
+    assert gift_params["required"] == ["target_avatar"]
+
+    good = {"Lin": _decision(
+        {"action_name": "Gift", "action_params": {"target_avatar": "Su", "amount": 10}},
+        {"action_name": "Respire", "action_params": {}},
+    )}
+    assert validate_json_schema(good, schema) == []
+    assert validate_json_schema({"Lin": _decision({"action_name": "Fly", "action_params": {}})}, schema)
+    assert validate_json_schema({"Lin": _decision({"action_name": "Gift", "action_params": {"target_avatar": "Su", "amount": "10"}})}, schema)
+    assert validate_json_schema({"Lin": _decision({"action_name": "Gift", "action_params": {}})}, schema)
+    assert validate_json_schema({"Lin": _decision()}, schema)
+    assert validate_json_schema({"Lin": _decision(emotion="平静")}, schema)
+    assert validate_json_schema({"Other": good["Lin"]}, schema)
+
+
+def test_task_response_schema_is_opt_in(monkeypatch):
+    infos = {"avatar_name_2": "B", "response_actions": ["Accept", "Reject"]}
+    assert get_task_response_schema("interaction_feedback", infos) is None
+
+    monkeypatch.setenv("CWS_LLM_STRUCTURED_OUTPUT", "json_schema")
+    response_schema = get_task_response_schema("interaction_feedback", infos)
+    assert response_schema.name == "interaction_feedback"
+    assert response_schema.schema["properties"]["B"]["properties"]["response"]["enum"] == ["Accept", "Reject"]
+    assert get_task_response_schema("story_teller", {}) is None
+    # 缺少生成 schema 所需的模板参数时退回自由文本
+    assert get_task_response_schema("action_decision", {}) is None
+
+    monkeypatch.setenv("CWS_LLM_STRUCTURED_OUTPUT", "bogus")
+    assert get_task_response_schema("nickname", {}) is None
+
+
+def test_request_builders_attach_provider_specific_constraints():
+    schema = build_task_schema("relation_delta", {})
+
+    _url, _headers, body = _build_openai_request(OPENAI, "p", ResponseSchema("relation_delta", schema))
+    assert body["response_format"]["type"] == "json_schema"
+    assert body["response_format"]["json_schema"]["schema"] == schema
+
+    _url, _headers, body = _build_openai_request(OPENAI, "p", ResponseSchema("relation_delta", schema, mode="json_object"))
+    assert body["response_format"] == {"type": "json_object"}
+    assert "response_format" not in _build_openai_request(OPENAI, "p")[2]
+
+    _url, _headers, body = _build_anthropic_request(ANTHROPIC, "p", ResponseSchema("relation_delta", schema, mode="json_object"))
+    assert body["tools"][0]["input_schema"] == schema
+    assert body["tool_choice"] == {"type": "tool", "name": "relation_delta"}
+    text = _extract_anthropic_text({"content": [{"type": "tool_use", "name": "relation_delta", "input": {"delta_a_to_b": 2}}]})
+    assert json.loads(text) == {"delta_a_to_b": 2}
+
+
+@pytest.mark.asyncio
+async def test_schema_violations_are_retried_like_parse_errors(monkeypatch, tmp_path):
+    monkeypatch.setenv("CWS_LLM_STRUCTURED_OUTPUT", "json_schema")
+    template = tmp_path / "delta.txt"
+    template.write_text("{event_text}", encoding="utf-8")
+
+    with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=OPENAI), \
+         patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+        mock_call.side_effect = ['{"delta_a_to_b": "a lot"}', '{"delta_a_to_b": 1, "delta_b_to_a": -1}']
+
+        result = await call_llm_with_task_name("relation_delta", template, {"event_text": "x"}, max_retries=1)
+
+    assert result == {"delta_a_to_b": 1, "delta_b_to_a": -1}
+    assert mock_call.call_count == 2
+    assert mock_call.call_args.kwargs["response_schema"].name == "relation_delta"
+
+
+def test_relation_resolver_allows_ignored_fields_when_unchanged():
+    schema = build_task_schema("relation_resolver", {})
+
+    assert validate_json_schema({"analysis": "...", "changed": False, "change_type": None, "relation": None, "reason": ""}, schema) == []
+    assert validate_json_schema({"analysis": "...", "changed": False, "change_type": ""}, schema) == []
+    assert validate_json_schema({"analysis": "...", "changed": True, "change_type": "ADD", "relation": "FRIEND"}, schema) == []
+    assert validate_json_schema({"analysis": "...", "changed": True, "change_type": "UPGRADE"}, schema)
+
+
+@pytest.mark.asyncio
+async def test_localized_emotions_are_normalized_before_validation(monkeypatch, tmp_path):
+    monkeypatch.setenv("CWS_LLM_STRUCTURED_OUTPUT", "json_schema")
+    template = tmp_path / "ai.txt"
+    template.write_text("{avatar_name}", encoding="utf-8")
+    reply = {"Lin": _decision({"action_name": "Respire", "action_params": {}}, emotion="疲惫")}
+
+    with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=OPENAI), \
+         patch("src.utils.llm.client.call_llm", new_callable=AsyncMock) as mock_call:
+        mock_call.return_value = json.dumps(reply, ensure_ascii=False)
+
+        result = await call_llm_with_task_name("action_decision", template, {"avatar_name": "Lin"}, max_retries=0)
+
+    assert result["Lin"]["current_emotion"] == "emotion_tired"
+    assert mock_call.call_count == 1
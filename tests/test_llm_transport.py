@@ -0,0 +1,243 @@
+"""
+Tests for the pooled asyncio LLM transport.
+
+A tiny local HTTP/1.1 server is used so the real socket path is exercised:
+keep-alive reuse, chunked bodies, server-side close and call_llm integration.
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.utils.llm import transport as transport_module
+from src.utils.llm.client import call_llm
+from src.utils.llm.config import LLMConfig
+from src.config import LLMSettingsUpdate, get_settings_service
+from src.utils.llm import client as client_module
+from src.utils.llm.transport import (
+    close_connection_pools,
+    get_connection_pool,
+    post_json,
+    uses_system_proxy,
+)
+
+
+class LocalLLMServer:
+    def __init__(
+        self,
+        *,
+        chunked: bool = False,
+        close_after_response: bool = False,
+        silent_close: bool = False,
+        status: int = 200,
+    ):
+        self.chunked = chunked
+        self.close_after_response = close_after_response
+        self.silent_close = silent_close
+        self.status = status
+        self.connections = 0
+        self.requests: list[dict] = []
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}/v1"
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests.append(
+                    {"line": request_line.decode().strip(), "headers": headers, "body": json.loads(body)}
+                )
+
+                payload = json.dumps(
+                    {"choices": [{"message": {"content": f"reply-{len(self.requests)}"}}]}
+                ).encode("utf-8")
+                head = [f"HTTP/1.1 {self.status} OK", "Content-Type: application/json"]
+                if self.close_after_response:
+                    head.append("Connection: close")
+                if self.chunked:
+                    head.append("Transfer-Encoding: chunked")
+                    half = len(payload) // 2
+                    chunks = [payload[:half], payload[half:]]
+                    data = b"".join(f"{len(c):x}\r\n".encode() + c + b"\r\n" for c in chunks) + b"0\r\n\r\n"
+                else:
+                    head.append(f"Content-Length: {len(payload)}")
+                    data = payload
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + data)
+                await writer.drain()
+                if self.close_after_response or self.silent_close:
+                    break
+        finally:
+            writer.close()
+
+
+@pytest.fixture(autouse=True)
+async def _reset_pools():
+    yield
+    await close_connection_pools()
+
+
+def _body(prompt: str = "hi") -> bytes:
+    return json.dumps({"model": "m", "messages": [{"role": "user", "content": prompt}]}).encode()
+
+
+@pytest.mark.asyncio
+async def test_keep_alive_reuses_single_connection():
+    async with LocalLLMServer() as server:
+        url = f"{server.base_url}/chat/completions"
+        key = (server.base_url, "openai")
+        first = await post_json(url, {"Content-Type": "application/json"}, _body(), pool_key=key)
+        second = await post_json(url, {"Content-Type": "application/json"}, _body(), pool_key=key)
+
+        assert first.status == 200
+        assert json.loads(second.text())["choices"][0]["message"]["content"] == "reply-2"
+        assert server.connections == 1
+        assert get_connection_pool(url, pool_key=key).connections_opened == 1
+        assert server.requests[0]["line"] == "POST /v1/chat/completions HTTP/1.1"
+
+
+@pytest.mark.asyncio
+async def test_chunked_response_is_decoded():
+    async with LocalLLMServer(chunked=True) as server:
+        url = f"{server.base_url}/chat/completions"
+        response = await post_json(url, {}, _body(), pool_key=(server.base_url, "openai"))
+
+        assert json.loads(response.text())["choices"][0]["message"]["content"] == "reply-1"
+
+
+@pytest.mark.asyncio
+async def test_connection_close_is_not_pooled():
+    async with LocalLLMServer(close_after_response=True) as server:
+        url = f"{server.base_url}/chat/completions"
+        key = (server.base_url, "openai")
+        await post_json(url, {}, _body(), pool_key=key)
+        assert get_connection_pool(url, pool_key=key).idle_count == 0
+
+        await post_json(url, {}, _body(), pool_key=key)
+        assert server.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_pooled_connection_is_retried_transparently():
+    # 服务端未声明 Connection: close 却在响应后断开，模拟 keep-alive 超时被对端回收
+    async with LocalLLMServer(silent_close=True) as server:
+        url = f"{server.base_url}/chat/completions"
+        key = (server.base_url, "openai")
+        await post_json(url, {}, _body(), pool_key=key)
+        assert get_connection_pool(url, pool_key=key).idle_count == 1
+
+        with patch.object(transport_module._Connection, "is_usable", return_value=True):
+            response = await post_json(url, {}, _body(), pool_key=key)
+
+        assert response.status == 200
+        assert server.connections == 2
+        assert len(server.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_call_llm_uses_pooled_transport():
+    async with LocalLLMServer() as server:
+        config = LLMConfig(model_name="test-model", api_key="k", base_url=server.base_url)
+        with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=config), \
+             patch("src.utils.llm.client.uses_system_proxy", return_value=False), \
+             patch("urllib.request.urlopen") as mock_urlopen:
+            results = await asyncio.gather(*(call_llm(f"p{i}") for i in range(3)))
+
+        mock_urlopen.assert_not_called()
+        assert sorted(results) == ["reply-1", "reply-2", "reply-3"]
+        assert server.requests[0]["headers"]["authorization"] == "Bearer k"
+        assert server.requests[0]["body"]["model"] == "test-model"
+
+
+def _llm_settings(base_url: str, max_concurrent_requests: int) -> LLMSettingsUpdate:
+    return LLMSettingsUpdate(
+        base_url=base_url,
+        api_key="k",
+        model_name="m",
+        fast_model_name="m",
+        mode="default",
+        max_concurrent_requests=max_concurrent_requests,
+        clear_api_key=False,
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_settings_change_rebuilds_semaphore_and_retires_old_pools():
+    service = get_settings_service()
+    service.update_llm(_llm_settings("http://old.example/v1", 4))
+    first = client_module._get_semaphore()
+    get_connection_pool("http://old.example/v1/chat/completions", pool_key=("http://old.example/v1", "openai"))
+
+    assert client_module._get_semaphore() is first
+    service.update_llm(_llm_settings("http://new.example/v1", 2))
+
+    second = client_module._get_semaphore()
+    assert second is not first
+    assert second._value == 2
+    assert ("http://old.example/v1", "openai") not in transport_module._POOLS
+
+
+@pytest.mark.asyncio
+async def test_call_llm_maps_http_error_status():
+    async with LocalLLMServer(status=500) as server:
+        config = LLMConfig(model_name="test-model", api_key="k", base_url=server.base_url)
+        with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=config), \
+             patch("src.utils.llm.client.uses_system_proxy", return_value=False):
+            with pytest.raises(Exception) as exc_info:
+                await call_llm("p")
+
+        assert str(exc_info.value).startswith("HTTP_500::")
+
+
+@pytest.mark.asyncio
+async def test_call_llm_maps_connection_refused_to_network_error():
+    async with LocalLLMServer() as server:
+        base_url = server.base_url
+    # 服务器已关闭，端口不再监听
+    config = LLMConfig(model_name="test-model", api_key="k", base_url=base_url)
+    with patch("src.utils.llm.client.LLMConfig.from_mode", return_value=config), \
+         patch("src.utils.llm.client.uses_system_proxy", return_value=False):
+        with pytest.raises(Exception) as exc_info:
+            await call_llm("p")
+
+    assert str(exc_info.value).startswith("NETWORK_ERROR::")
+
+
+def test_transport_settings_read_static_config():
+    settings = transport_module.TransportSettings.from_config()
+
+    assert settings.connect_timeout < settings.read_timeout
+    assert settings.max_idle_connections > 0
+
+
+def test_uses_system_proxy_respects_environment(monkeypatch):
+    monkeypatch.setattr(transport_module.urllib.request, "getproxies", lambda: {"https": "http://proxy:8080"})
+    monkeypatch.setattr(transport_module.urllib.request, "proxy_bypass", lambda host: host == "localhost")
+
+    assert uses_system_proxy("https://api.example.com/v1") is True
+    assert uses_system_proxy("https://localhost/v1") is False
+    assert uses_system_proxy("http://api.example.com/v1") is False
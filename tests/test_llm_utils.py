@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import patch
 from src.utils.llm.prompt import build_prompt
 from src.utils.llm.parser import parse_json
 from src.utils.llm.exceptions import ParseError
@@ -59,3 +60,19 @@ def test_parse_fail():
     text = "Not a json"
     with pytest.raises(ParseError):
         parse_json(text)
+
+def test_parse_repairs_common_llm_mistakes_without_json5():
+    text = "Sure:\n```json\n{'action': 'Move', 'args': [1, 2,], 'ok': True, 'note': None,}\n```"
+    with patch("src.utils.llm.parser.json5.loads", side_effect=AssertionError("json5 should not run")):
+        result = parse_json(text)
+    assert result == {"action": "Move", "args": [1, 2], "ok": True, "note": None}
+
+def test_parse_closes_truncated_brackets_but_not_truncated_values():
+    assert parse_json('{"a": {"b": [1, 2], "c": "x"') == {"a": {"b": [1, 2], "c": "x"}}
+    with pytest.raises(ParseError):
+        parse_json('{"a": 1, "b":')
+    with pytest.raises(ParseError):
+        parse_json('{"a": 1, "b": "half a sen')
+
+def test_parse_extracts_object_from_surrounding_prose():
+    assert parse_json('Here you go: {"x": 1} -- hope it helps') == {"x": 1}
@@ -65,6 +65,92 @@ def test_build_avatar_updates_includes_birth_death_and_position_deltas():
     assert updates[2]["action_emoji"] == "✨"
 
 
+def _delta_world(avatars):
+    born: list[str] = []
+    dead: list[str] = []
+
+    def pop(queue):
+        items = list(queue)
+        queue.clear()
+        return items
+
+    avatar_manager = SimpleNamespace(
+        avatars={a.id: a for a in avatars},
+        born=born,
+        dead=dead,
+        pop_newly_born=lambda: pop(born),
+        pop_newly_dead=lambda: pop(dead),
+        get_avatar=lambda avatar_id: next((a for a in avatars if a.id == avatar_id), None),
+        get_living_avatars=lambda: [a for a in avatars if not getattr(a, "is_dead", False)],
+    )
+    return SimpleNamespace(avatar_manager=avatar_manager)
+
+
+def _delta_avatar(avatar_id, x=0, y=0, realm="QI_REFINEMENT"):
+    return SimpleNamespace(
+        id=avatar_id,
+        name=avatar_id,
+        pos_x=x,
+        pos_y=y,
+        gender=SimpleNamespace(value="male"),
+        cultivation_progress=SimpleNamespace(realm=SimpleNamespace(value=realm)),
+        current_action_name="修炼",
+    )
+
+
+def _updates(world):
+    return build_avatar_updates(
+        world=world,
+        resolve_avatar_pic_id=lambda avatar: 1,
+        resolve_avatar_action_emoji=lambda avatar: getattr(avatar, "emoji", ""),
+    )
+
+
+def test_build_avatar_updates_streams_only_changed_fields_without_cap():
+    avatars = [_delta_avatar(f"a{i}", x=i % 30, y=i // 30) for i in range(200)]
+    world = _delta_world(avatars)
+
+    baseline = _updates(world)
+    assert len(baseline) == 200
+    assert _updates(world) == []
+
+    avatars[150].pos_x += 1
+    avatars[3].emoji = "⚔️"
+    avatars[7].cultivation_progress.realm = SimpleNamespace(value="FOUNDATION_ESTABLISHMENT")
+    updates = {entry["id"]: entry for entry in _updates(world)}
+
+    assert set(updates) == {"a3", "a7", "a150"}
+    assert updates["a150"] == {"id": "a150", "x": avatars[150].pos_x, "y": avatars[150].pos_y}
+    assert updates["a3"] == {"id": "a3", "action_emoji": "⚔️"}
+    assert set(updates["a7"]) == {"id", "realm", "cultivation", "cultivation_display"}
+    assert updates["a7"]["cultivation_display"] == "筑基前期"
+    assert _updates(world) == []
+
+
+def test_build_avatar_updates_births_and_deaths_reset_baseline():
+    alive = _delta_avatar("alive")
+    world = _delta_world([alive])
+    _updates(world)
+
+    newborn = _delta_avatar("newborn", x=5, y=5)
+    world.avatar_manager.avatars["newborn"] = newborn
+    world.avatar_manager.get_living_avatars = lambda: [alive, newborn]
+    world.avatar_manager.born.append("newborn")
+    updates = _updates(world)
+    assert [entry["id"] for entry in updates] == ["newborn"]
+    assert updates[0]["is_dead"] is False
+    assert _updates(world) == []
+
+    newborn.is_dead = True
+    world.avatar_manager.get_avatar = lambda avatar_id: newborn if avatar_id == "newborn" else None
+    world.avatar_manager.get_living_avatars = lambda: [alive]
+    world.avatar_manager.dead.append("newborn")
+    assert _updates(world) == [
+        {"id": "newborn", "name": "newborn", "is_dead": True, "action": "已故"}
+    ]
+    assert len(world._avatar_broadcast_tracker) == 1
+
+
 def test_build_tick_state_uses_serializer_hooks():
     world = SimpleNamespace(
         month_stamp=SimpleNamespace(
@@ -0,0 +1,94 @@
+"""
+Tests for the phase dependency graph and overlapped phase execution.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.sim.simulator_engine.phase_registry import SimulationPhase, get_simulation_phases
+from src.sim.simulator_engine.phase_runner import (
+    PHASE_MODE_DAG,
+    PHASE_MODE_SEQUENTIAL,
+    SimulationPhaseRunner,
+    build_phase_dependencies,
+    resolve_phase_mode,
+)
+
+
+def _positions():
+    phases = get_simulation_phases()
+    return phases, {phase.name: position for position, phase in enumerate(phases)}, build_phase_dependencies(phases)
+
+
+def test_registry_llm_phases_do_not_depend_on_each_other():
+    _phases, pos, deps = _positions()
+
+    assert pos["long_term_objective_thinking"] not in deps[pos["process_gatherings"]]
+    for name in ("autonomous_custom_creation", "random_minor_events", "sect_random_event"):
+        assert pos["backstory_generation"] not in deps[pos[name]]
+    assert pos["autonomous_custom_creation"] not in deps[pos["random_minor_events"]]
+    assert pos["random_minor_events"] not in deps[pos["sect_random_event"]]
+    for name in ("update_celestial_phenomenon", "update_city_population", "update_dynasty_and_officials"):
+        assert pos["nickname_generation"] not in deps[pos[name]]
+
+
+def test_registry_barriers_and_conflicts_keep_order():
+    phases, pos, deps = _positions()
+
+    # 未声明读写的相位是屏障
+    assert deps[pos["decide_actions"]] == frozenset(range(pos["decide_actions"]))
+    assert deps[pos["finalize_step"]] == frozenset(range(len(phases) - 1))
+    # passive_effects 写角色数值，读它的自定义创作必须排在其后
+    assert pos["passive_effects"] in deps[pos["autonomous_custom_creation"]]
+
+
+def _make_phases(log):
+    def _phase(name, delay, *events):
+        async def _handler(_simulator, ctx):
+            log.append(("start", name))
+            await asyncio.sleep(delay)
+            log.append(("end", name))
+            ctx.add_events(list(events))
+
+        return _handler
+
+    def _finalize(_simulator, ctx):
+        return list(ctx.events)
+
+    return (
+        SimulationPhase("slow", 1, "slow", _phase("slow", 0.05, "s1", "s2"), reads=frozenset({"a"}), writes=frozenset({"a"})),
+        SimulationPhase("fast", 2, "fast", _phase("fast", 0.0, "f1"), reads=frozenset({"b"}), writes=frozenset({"b"})),
+        SimulationPhase("after_slow", 3, "after_slow", _phase("after_slow", 0.0, "x1"), reads=frozenset({"a"}), writes=frozenset()),
+        SimulationPhase("finalize_step", 4, "finalize_step", _finalize, reset_check_after=False),
+    )
+
+
+async def test_graph_mode_overlaps_independent_phases_with_stable_event_order(base_world):
+    log = []
+    simulator = SimpleNamespace(world=base_world)
+
+    events = await SimulationPhaseRunner(simulator, phases=_make_phases(log), mode=PHASE_MODE_DAG).run()
+
+    assert events == ["s1", "s2", "f1", "x1"]
+    assert log.index(("end", "fast")) < log.index(("end", "slow"))
+    assert log.index(("end", "slow")) < log.index(("start", "after_slow"))
+
+
+async def test_sequential_mode_runs_phases_one_by_one(base_world):
+    log = []
+    simulator = SimpleNamespace(world=base_world)
+
+    events = await SimulationPhaseRunner(simulator, phases=_make_phases(log), mode=PHASE_MODE_SEQUENTIAL).run()
+
+    assert events == ["s1", "s2", "f1", "x1"]
+    assert log == [
+        ("start", "slow"), ("end", "slow"),
+        ("start", "fast"), ("end", "fast"),
+        ("start", "after_slow"), ("end", "after_slow"),
+    ]
+
+
+def test_phase_mode_env_override(monkeypatch):
+    assert resolve_phase_mode() == PHASE_MODE_DAG
+    monkeypatch.setenv("CWS_PHASE_MODE", "sequential")
+    assert resolve_phase_mode() == PHASE_MODE_SEQUENTIAL
@@ -0,0 +1,116 @@
+"""
+Tests for per-phase timing, LLM wait accounting and the optional phase profiler.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from src.server import main
+from src.sim.simulator_engine.metrics import PhaseMetricsRecorder
+from src.sim.simulator_engine.phase_registry import SimulationPhase
+from src.sim.simulator_engine.phase_runner import SimulationPhaseRunner
+from src.utils.llm import client as llm_client
+
+
+async def _slow_transport(_config, _prompt):
+    await asyncio.sleep(0.02)
+    return "ok"
+
+
+async def _llm_phase(_simulator, ctx):
+    with patch.object(llm_client, "_call_with_transport", _slow_transport):
+        await asyncio.gather(llm_client.call_llm("a"), llm_client.call_llm("b"))
+    ctx.add_events(["e1", "e2"])
+
+
+def _quiet_phase(_simulator, _ctx):
+    return None
+
+
+def _finalize(_simulator, ctx):
+    return list(ctx.events)
+
+
+PHASES = (
+    SimulationPhase("llm_phase", 1, "llm_phase", _llm_phase),
+    SimulationPhase("quiet_phase", 2, "quiet_phase", _quiet_phase),
+    SimulationPhase("finalize_step", 3, "finalize_step", _finalize, reset_check_after=False),
+)
+
+
+async def test_runner_records_wall_llm_and_event_counts(base_world):
+    recorder = PhaseMetricsRecorder(history_size=2)
+    simulator = SimpleNamespace(world=base_world, phase_metrics=recorder)
+
+    events = await SimulationPhaseRunner(simulator, phases=PHASES).run()
+
+    assert events == ["e1", "e2"]
+    [step] = recorder.steps()
+    assert step.month_stamp == int(base_world.month_stamp)
+    assert [phase.name for phase in step.phases] == ["llm_phase", "quiet_phase", "finalize_step"]
+    llm_phase, quiet_phase, _ = step.phases
+    assert llm_phase.llm_calls == 2
+    assert llm_phase.llm_wait_seconds >= 0.04
+    assert llm_phase.wall_seconds >= 0.02
+    assert llm_phase.events == 2
+    assert quiet_phase.llm_calls == 0 and quiet_phase.events == 0
+    assert step.wall_seconds >= llm_phase.wall_seconds
+
+
+async def test_recorder_is_a_ring_buffer_with_summary(base_world):
+    recorder = PhaseMetricsRecorder(history_size=2)
+    simulator = SimpleNamespace(world=base_world, phase_metrics=recorder)
+
+    for _ in range(3):
+        await SimulationPhaseRunner(simulator, phases=PHASES).run()
+
+    payload = recorder.to_dict(limit=1)
+    assert len(recorder.steps()) == 2
+    assert len(payload["steps"]) == 1
+    summary = {row["name"]: row for row in payload["summary"]}
+    assert summary["llm_phase"]["samples"] == 2
+    assert summary["llm_phase"]["llm_calls"] == 4
+    assert summary["llm_phase"]["events"] == 4
+
+
+async def test_profile_phase_dumps_stats_to_logs(base_world, isolate_settings_data_root):
+    recorder = PhaseMetricsRecorder(profile_phase="quiet_phase")
+    simulator = SimpleNamespace(world=base_world, phase_metrics=recorder)
+
+    await SimulationPhaseRunner(simulator, phases=PHASES).run()
+
+    profile_dir = isolate_settings_data_root / "logs" / "profiles"
+    assert len(list(profile_dir.glob("quiet_phase_*.prof"))) == 1
+    assert len(list(profile_dir.glob("quiet_phase_*.txt"))) == 1
+    assert not list(profile_dir.glob("llm_phase_*"))
+
+
+def test_profile_phase_env_overrides_config(monkeypatch):
+    monkeypatch.setenv("CWS_PROFILE_PHASE", "decide_actions")
+    assert PhaseMetricsRecorder.from_config().profile_phase == "decide_actions"
+
+
+async def test_phase_metrics_endpoint(base_world):
+    recorder = PhaseMetricsRecorder(history_size=5)
+    await SimulationPhaseRunner(SimpleNamespace(world=base_world, phase_metrics=recorder), phases=PHASES).run()
+
+    original = dict(main.game_instance)
+    try:
+        main.game_instance["sim"] = None
+        client = TestClient(main.app)
+        empty = client.get("/api/v1/query/runtime/phase-metrics").json()
+        assert empty["ok"] is True
+        assert empty["data"]["steps"] == []
+
+        main.game_instance["sim"] = SimpleNamespace(phase_metrics=recorder)
+        payload = client.get("/api/v1/query/runtime/phase-metrics?limit=5").json()
+        assert payload["ok"] is True
+        [step] = payload["data"]["steps"]
+        assert [phase["name"] for phase in step["phases"]] == ["llm_phase", "quiet_phase", "finalize_step"]
+        assert step["phases"][0]["llm_calls"] == 2
+    finally:
+        main.game_instance.clear()
+        main.game_instance.update(original)
@@ -0,0 +1,78 @@
+"""
+Tests for cached prompt fragments used when building decision prompts.
+"""
+
+import json
+import os
+
+from src.classes.actions import get_action_infos, get_action_infos_str
+from src.classes.action.param_options import build_param_options
+from src.classes.action.move_to_avatar import MoveToAvatar
+from src.classes.language import language_manager
+from src.classes.mutual_action.talk import Talk
+from src.utils.llm.prompt import load_template
+from src.utils.prompt_fragments import (
+    get_prompt_fragment,
+    invalidate_prompt_fragments,
+    prompt_fragment_count,
+)
+from tests.test_action_param_options import _register_nearby_avatar
+
+
+def test_action_infos_str_matches_plain_json_dump(avatar_in_city, base_world, mock_item_data):
+    city = avatar_in_city.tile.region
+    city.store_items = [mock_item_data["obj_elixir"], mock_item_data["obj_weapon"]]
+    base_world.map.regions[city.id] = city
+    avatar_in_city.known_regions.add(city.id)
+    avatar_in_city.add_material(mock_item_data["obj_material"], quantity=2)
+    _register_nearby_avatar(base_world, avatar_in_city)
+
+    text = get_action_infos_str(avatar_in_city)
+
+    assert text == json.dumps(get_action_infos(avatar_in_city), ensure_ascii=False, indent=2)
+    assert "NearbyNPC" in text
+    assert get_action_infos_str(None) == json.dumps(get_action_infos(None), ensure_ascii=False, indent=2)
+
+
+def test_shared_param_options_are_built_once_per_memo(avatar_in_city, base_world):
+    _register_nearby_avatar(base_world, avatar_in_city)
+    memo: dict = {}
+
+    talk = build_param_options(Talk, avatar_in_city, memo)
+    move = build_param_options(MoveToAvatar, avatar_in_city, memo)
+
+    assert talk and move
+    assert next(iter(talk.values())) is next(iter(move.values()))
+    assert build_param_options(Talk, avatar_in_city) == talk
+
+
+def test_fragments_are_scoped_by_language_and_invalidated_on_reload(monkeypatch):
+    invalidate_prompt_fragments()
+    calls = []
+
+    def build():
+        calls.append(str(language_manager))
+        return len(calls)
+
+    assert get_prompt_fragment("test", "key", build) == 1
+    assert get_prompt_fragment("test", "key", build) == 1
+
+    monkeypatch.setattr(language_manager, "_current", "en-US")
+    assert get_prompt_fragment("test", "key", build) == 2
+    assert calls == ["zh-CN", "en-US"]
+
+    from src.i18n import reload_translations
+
+    reload_translations()
+    assert prompt_fragment_count() == 0
+
+
+def test_load_template_refreshes_after_file_change(tmp_path):
+    template = tmp_path / "ai.txt"
+    template.write_text("v1 {x}", encoding="utf-8")
+    assert load_template(template) == "v1 {x}"
+
+    template.write_text("version 2 {x}", encoding="utf-8")
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_template(template) == "version 2 {x}"
@@ -1,5 +1,6 @@
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 from src.classes.core.world import World
 from src.classes.core.sect import Sect, SectHeadQuarter
@@ -10,7 +11,11 @@ from src.classes.language import language_manager
 from src.i18n import reload_translations
 from src.sim.managers.sect_manager import SectManager
 from src.systems.time import MonthStamp
-from src.systems.sect_decision_context import build_sect_decision_context, SectDecisionContext
+from src.systems.sect_decision_context import (
+    SectDecisionContext,
+    SectDecisionSharedContext,
+    build_sect_decision_context,
+)
 
 
 def _create_world_with_sects(base_world: World) -> tuple[World, Sect, Sect]:
@@ -163,6 +168,30 @@ def test_build_sect_decision_context_relations(base_world):
     assert ctx.diplomacy_targets[0]["status"] in {"war", "peace"}
 
 
+def test_shared_context_computes_snapshot_once_for_all_sects(base_world, dummy_avatar):
+    """同一轮为多个宗门构建上下文时，势力快照与散修信息只计算一次，结果与单独构建一致。"""
+    world, sect1, sect2 = _create_world_with_sects(base_world)
+    SectManager(world).update_sects()
+    world.avatar_manager.register_avatar(dummy_avatar)
+
+    storage = _create_event_storage_with_sect_events(sect1.id)
+    try:
+        expected = build_sect_decision_context(sect2, world, storage, history_limit=0)
+        shared = SectDecisionSharedContext(world)
+        with patch.object(SectManager, "get_snapshot", autospec=True, side_effect=SectManager.get_snapshot) as mock_snapshot, \
+             patch.object(type(dummy_avatar), "get_info", autospec=True, side_effect=type(dummy_avatar).get_info) as mock_info:
+            ctx1 = build_sect_decision_context(sect1, world, storage, history_limit=0, shared=shared)
+            ctx2 = build_sect_decision_context(sect2, world, storage, history_limit=0, shared=shared)
+    finally:
+        _cleanup_event_storage(storage)
+
+    assert mock_snapshot.call_count == 1
+    assert mock_info.call_count == 1
+    assert ctx2.relations == expected.relations
+    assert ctx2.recruitment_candidates == expected.recruitment_candidates
+    assert ctx1.recruitment_candidates[0]["detailed_info"] == ctx2.recruitment_candidates[0]["detailed_info"]
+
+
 def test_build_sect_decision_context_localizes_runtime_notes(base_world):
     world, sect1, _ = _create_world_with_sects(base_world)
 
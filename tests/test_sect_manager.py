@@ -381,3 +381,73 @@ def test_sect_manager_updates_war_weariness_annually(base_world):
 
     assert sect_a.war_weariness == 8
     assert sect_b.war_weariness == 0
+
+
+def _brute_force_owners(manager, snapshot, game_map):
+    """旧实现：全图格子 × 全部宗门逐一打分。"""
+    owners = {}
+    for x, y in game_map.tiles.keys():
+        best_owner, best_score = None, float("-inf")
+        for sect in snapshot.active_sects:
+            if sect.id not in snapshot.sect_centers:
+                continue
+            cx, cy = snapshot.sect_centers[sect.id]
+            score = manager._get_claim_score(
+                sect_id=sect.id,
+                tile_x=x,
+                tile_y=y,
+                center_x=cx,
+                center_y=cy,
+                radius=int(sect.influence_radius),
+                total_battle_strength=float(sect.total_battle_strength),
+            )
+            if score > best_score:
+                best_score, best_owner = score, sect.id
+        if best_owner is not None:
+            owners[(x, y)] = [best_owner]
+    return owners
+
+
+def _add_sect_region(world, region_id, sect_id, cors):
+    from src.classes.environment.sect_region import SectRegion
+    region = SectRegion(id=region_id, name=f"R{region_id}", desc="", sect_id=sect_id, sect_name="", cors=cors)
+    world.map.regions[region_id] = region
+    world.map.region_cors[region_id] = cors
+    world.map.update_sect_regions()
+
+
+def test_territory_matches_brute_force_scoring(mock_world):
+    """按势力菱形枚举的结果与逐格打分完全一致（含接壤争夺）。"""
+    sect1, sect2 = mock_world.existed_sects
+    _add_sect_region(mock_world, 1002, 2, [(6, 6)])
+    create_mock_avatar(mock_world, "a1", sect1)
+    create_mock_avatar(mock_world, "a2", sect2)
+
+    with patch("src.sim.managers.sect_manager.get_base_strength", side_effect=[60.0, 45.0]):
+        snapshot = SectManager(mock_world).get_snapshot()
+
+    assert snapshot.owned_tiles_by_sect[1] and snapshot.owned_tiles_by_sect[2]
+    expected = _brute_force_owners(SectManager(mock_world), snapshot, mock_world.map)
+    assert snapshot.tile_owners == expected
+    assert list(snapshot.tile_owners) == list(expected)
+
+
+def test_territory_snapshot_cached_within_month(mock_world):
+    """同月、战力不变时复用快照；换月或战力变化时重新计算。"""
+    sect1 = mock_world.existed_sects[0]
+    create_mock_avatar(mock_world, "a1", sect1)
+
+    with patch("src.sim.managers.sect_manager.get_base_strength", return_value=30.0):
+        first = SectManager(mock_world).get_snapshot()
+        second = SectManager(mock_world).get_snapshot()
+        assert second is first
+
+        mock_world.month_stamp = MonthStamp(int(mock_world.month_stamp) + 1)
+        third = SectManager(mock_world).get_snapshot()
+        assert third is not first
+        assert third.tile_owners == first.tile_owners
+
+    with patch("src.sim.managers.sect_manager.get_base_strength", return_value=50.0):
+        fourth = SectManager(mock_world).get_snapshot()
+    assert fourth is not third
+    assert len(fourth.owned_tiles_by_sect[1]) > len(third.owned_tiles_by_sect[1])
@@ -494,3 +494,96 @@ def test_llm_api_uses_saved_secret_when_testing(monkeypatch):
 
     assert res["status"] == "ok"
     assert captured["api_key"] == "stored-secret"
+
+
+def _llm_update(model_name: str, api_key: str = "secret-key") -> LLMSettingsUpdate:
+    return LLMSettingsUpdate(
+        base_url="https://api.example.com/v1",
+        api_key=api_key,
+        model_name=model_name,
+        fast_model_name="model-fast",
+        mode="default",
+        max_concurrent_requests=4,
+        clear_api_key=False,
+    )
+
+
+def test_llm_runtime_config_is_served_from_memory_snapshot(monkeypatch):
+    service = get_settings_service()
+    service.update_llm(_llm_update("model-a"))
+    first = service.get_llm_runtime_snapshot()
+
+    monkeypatch.setattr(
+        service,
+        "_load_model",
+        lambda *_args: (_ for _ in ()).throw(AssertionError("hot path should not read settings files")),
+    )
+    for _ in range(100):
+        profile, api_key = service.get_llm_runtime_config()
+
+    assert service.get_llm_runtime_snapshot() is first
+    assert (profile.model_name, api_key) == ("model-a", "secret-key")
+
+
+def test_llm_snapshot_is_replaced_and_listeners_notified_on_api_update():
+    service = get_settings_service()
+    service.get_llm_runtime_config()
+    seen = []
+    service.add_change_listener(seen.append)
+
+    service.update_llm(_llm_update("model-b", api_key="new-key"))
+
+    assert [(snapshot.profile.model_name, snapshot.api_key) for snapshot in seen] == [("model-b", "new-key")]
+    assert service.get_llm_runtime_config()[0].model_name == "model-b"
+
+
+def test_llm_snapshot_profile_is_read_only():
+    service = get_settings_service()
+    service.update_llm(_llm_update("model-a"))
+    profile, _ = service.get_llm_runtime_config()
+
+    with pytest.raises(ValidationError):
+        profile.model_name = "mutated"
+    assert service.get_llm_runtime_config()[0].model_name == "model-a"
+
+
+def test_failing_change_listener_is_logged_and_does_not_block_others(monkeypatch):
+    from src.run import log as log_module
+
+    service = get_settings_service()
+    service.get_llm_runtime_config()
+    logged = []
+    monkeypatch.setattr(
+        log_module.get_logger().logger,
+        "exception",
+        lambda message, *args: logged.append(message % args),
+    )
+
+    def broken(_snapshot):
+        raise RuntimeError("listener boom")
+
+    seen = []
+    service.add_change_listener(broken)
+    service.add_change_listener(seen.append)
+    service.update_llm(_llm_update("model-b"))
+
+    assert len(seen) == 1
+    assert len(logged) == 1 and "broken" in logged[0]
+
+
+def test_llm_snapshot_picks_up_external_settings_edit(monkeypatch):
+    service = get_settings_service()
+    service.update_llm(_llm_update("model-a"))
+    seen = []
+    service.add_change_listener(seen.append)
+
+    settings_file = get_data_paths().settings_file
+    payload = json.loads(settings_file.read_text(encoding="utf-8"))
+    payload["llm"]["profile"]["model_name"] = "edited-by-hand"
+    settings_file.write_text(json.dumps(payload), encoding="utf-8")
+    monkeypatch.setattr(settings_service_module, "_EXTERNAL_EDIT_CHECK_SECONDS", 0.0)
+
+    profile, _ = service.get_llm_runtime_config()
+
+    assert profile.model_name == "edited-by-hand"
+    assert len(seen) == 1
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -88,20 +90,23 @@ async def test_phase_passive_effects_collects_fate_revelation_event(base_world,
         event_type="fate_revelation",
     )
 
+    hits = {"fortune": [], "misfortune": [], "fate_revelation": [dummy_avatar], "opportunity": []}
     with patch(
-        "src.sim.simulator_engine.phases.world.try_trigger_fortune",
-        new=AsyncMock(return_value=[]),
+        "src.sim.simulator_engine.phases.world.screen_world_triggers",
+        return_value=hits,
     ), patch(
-        "src.sim.simulator_engine.phases.world.try_trigger_misfortune",
+        "src.sim.simulator_engine.phases.world.apply_fortune",
         new=AsyncMock(return_value=[]),
-    ), patch(
-        "src.sim.simulator_engine.phases.world.try_trigger_fate_revelation",
+    ) as mock_fortune, patch(
+        "src.sim.simulator_engine.phases.world.apply_fate_revelation",
         new=AsyncMock(return_value=[event]),
     ) as mock_fate:
         events = await world_phases.phase_passive_effects(base_world, [dummy_avatar])
 
     assert events == [event]
     mock_fate.assert_awaited_once_with(dummy_avatar, base_world)
+    # 未命中的触发不创建协程
+    mock_fortune.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -120,13 +125,12 @@ async def test_simulator_event_deduplication(base_world, dummy_avatar, mock_llm_
         new=AsyncMock(return_value=[ev]),
     ):
 
-        base_world.event_manager.add_event = MagicMock()
+        base_world.event_manager.add_events = MagicMock()
         await sim.step()
 
-    target_calls = [
-        call for call in base_world.event_manager.add_event.call_args_list if call.args[0].id == ev_id
-    ]
-    assert len(target_calls) == 1
+    base_world.event_manager.add_events.assert_called_once()
+    written = base_world.event_manager.add_events.call_args.args[0]
+    assert [event.id for event in written].count(ev_id) == 1
 
 
 @pytest.mark.asyncio
@@ -283,7 +287,10 @@ async def test_phase_sect_periodic_decision_emits_summary_event(base_world, mock
     with patch.object(annual.CONFIG.sect, "decision_interval_years", 5), patch(
         "src.classes.core.sect.get_sect_decision_context", return_value=MagicMock()
     ), patch(
-        "src.sim.simulator_engine.phases.annual.SectDecider.decide",
+        "src.sim.simulator_engine.phases.annual.SectDecider.plan",
+        new=AsyncMock(return_value=None),
+    ), patch(
+        "src.sim.simulator_engine.phases.annual.SectDecider.execute",
         new=AsyncMock(
             return_value=SectDecisionResult(
                 events=[],
@@ -300,6 +307,59 @@ async def test_phase_sect_periodic_decision_emits_summary_event(base_world, mock
     assert sect.last_decision_summary == "Test Sect 本轮宗门决策：招徕散修 1 人。"
 
 
+@pytest.mark.asyncio
+async def test_phase_sect_periodic_decision_plans_concurrently_and_executes_in_sect_order(base_world, mock_llm_managers):
+    base_world.start_year = 1
+    base_world.month_stamp = create_month_stamp(Year(6), Month.JANUARY)
+
+    sim = Simulator(base_world)
+    sects = []
+    for sect_id, name in ((1, "甲宗"), (2, "乙宗"), (3, "丙宗")):
+        sect = MagicMock()
+        sect.id = sect_id
+        sect.name = name
+        sects.append(sect)
+    base_world.existed_sects = sects
+    base_world.event_manager._storage = MagicMock()
+
+    in_flight = 0
+    peak = 0
+    contexts_shared = []
+
+    def _fake_context(*, sect, world, event_storage, shared):
+        contexts_shared.append(shared)
+        return MagicMock()
+
+    async def _fake_plan(sect, ctx, world, *, world_info=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # 先发起的宗门后返回，验证落地顺序不受完成顺序影响
+        await asyncio.sleep(0.01 * (4 - int(sect.id)))
+        in_flight -= 1
+        return sect.name
+
+    executed = []
+
+    async def _fake_execute(sect, ctx, world, plan):
+        executed.append(plan)
+        return SectDecisionResult(summary_text=f"{sect.name} summary")
+
+    with patch.object(annual.CONFIG.sect, "decision_interval_years", 5), patch(
+        "src.classes.core.sect.get_sect_decision_context", side_effect=_fake_context
+    ), patch(
+        "src.sim.simulator_engine.phases.annual.SectDecider.plan", new=_fake_plan
+    ), patch(
+        "src.sim.simulator_engine.phases.annual.SectDecider.execute", new=_fake_execute
+    ):
+        events = await annual.phase_sect_periodic_decision(sim)
+
+    assert peak == 3
+    assert executed == ["甲宗", "乙宗", "丙宗"]
+    assert [event.related_sects for event in events] == [[1], [2], [3]]
+    assert len({id(shared) for shared in contexts_shared}) == 1
+
+
 @pytest.mark.asyncio
 async def test_phase_handle_sect_wars_auto_battles_and_teleports_loser(base_world, mock_llm_managers):
     from src.classes.environment.sect_region import SectRegion
@@ -378,3 +438,31 @@ async def test_phase_handle_sect_wars_auto_battles_and_teleports_loser(base_worl
     assert any("立即爆发战斗" in event.content for event in events)
     assert defender.pos_x == 4 and defender.pos_y == 4
     assert sect_b.war_weariness == 3
+
+
+@pytest.mark.asyncio
+async def test_simulator_prefetches_next_month_decisions_when_enabled(base_world, dummy_avatar, mock_llm_managers, monkeypatch):
+    monkeypatch.setenv("CWS_DECISION_PREFETCH", "1")
+    base_world.avatar_manager.avatars[dummy_avatar.id] = dummy_avatar
+    sim = Simulator(base_world)
+    mock_ai = mock_llm_managers["ai"]
+    mock_ai.prefetch = MagicMock(return_value=1)
+
+    await sim.step()
+
+    mock_ai.prefetch.assert_called_once()
+    prefetch_world, prefetch_avatars = mock_ai.prefetch.call_args.args
+    assert prefetch_world is base_world
+    # 预取发生在月份推进之后，针对下个月仍然空闲的角色
+    assert all(avatar.current_action is None and not avatar.has_plans() for avatar in prefetch_avatars)
+
+
+@pytest.mark.asyncio
+async def test_simulator_does_not_prefetch_by_default(base_world, mock_llm_managers):
+    sim = Simulator(base_world)
+    mock_ai = mock_llm_managers["ai"]
+    mock_ai.prefetch = MagicMock(return_value=0)
+
+    await sim.step()
+
+    mock_ai.prefetch.assert_not_called()
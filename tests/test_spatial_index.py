@@ -0,0 +1,144 @@
+"""
+Tests for the avatar spatial index behind observation / same-region / name lookups.
+"""
+
+import pytest
+
+from src.classes.action.move import Move
+from src.classes.core.avatar import Avatar, Gender
+from src.classes.environment.map import Map
+from src.classes.environment.region import CityRegion
+from src.classes.environment.tile import TileType
+from src.classes.core.world import World
+from src.classes.observe import get_observable_avatars
+from src.sim.managers.spatial_index import AvatarSpatialIndex
+from src.systems.cultivation import Realm
+from src.systems.time import Month, Year, create_month_stamp
+from src.utils.id_generator import get_avatar_id
+from src.utils.resolution import resolve_query
+from src.classes.age import Age
+
+
+@pytest.fixture
+def big_world():
+    game_map = Map(width=40, height=40)
+    city = CityRegion(id=1, name="TestCity", desc="测试城市")
+    for x in range(40):
+        for y in range(40):
+            game_map.create_tile(x, y, TileType.PLAIN)
+            if x < 5 and y < 5:
+                game_map.get_tile(x, y).region = city
+    return World(map=game_map, month_stamp=create_month_stamp(Year(1), Month.JANUARY))
+
+
+def _spawn(world, name, x, y):
+    avatar = Avatar(
+        world=world,
+        name=name,
+        id=get_avatar_id(),
+        birth_month_stamp=create_month_stamp(Year(1), Month.JANUARY),
+        age=Age(20, Realm.Qi_Refinement, innate_max_lifespan=80),
+        gender=Gender.MALE,
+        pos_x=x,
+        pos_y=y,
+        personas=[],
+    )
+    avatar.personas = []
+    avatar.technique = None
+    avatar.tile = world.map.get_tile(x, y)
+    avatar.recalc_effects()
+    world.avatar_manager.register_avatar(avatar)
+    return avatar
+
+
+def _brute_force_observable(world, avatar):
+    return get_observable_avatars(avatar, world.avatar_manager.avatars.values())
+
+
+def test_radius_query_matches_linear_scan(big_world):
+    avatars = [_spawn(big_world, f"A{i}", (i * 7) % 40, (i * 13) % 40) for i in range(60)]
+
+    for avatar in avatars:
+        assert big_world.get_observable_avatars(avatar) == _brute_force_observable(big_world, avatar)
+
+
+def test_move_updates_index(big_world):
+    mover = _spawn(big_world, "Mover", 20, 20)
+    watcher = _spawn(big_world, "Watcher", 30, 30)
+    assert mover not in big_world.get_observable_avatars(watcher)
+
+    for _ in range(9):
+        Move(mover, big_world).execute(delta_x=1, delta_y=1)
+
+    assert (mover.pos_x, mover.pos_y) == (29, 29)
+    assert mover in big_world.get_observable_avatars(watcher)
+
+
+def test_same_region_tracks_moves_and_deaths(big_world):
+    a = _spawn(big_world, "A", 1, 1)
+    b = _spawn(big_world, "B", 3, 3)
+    c = _spawn(big_world, "C", 20, 20)
+
+    assert big_world.get_avatars_in_same_region(a) == [b]
+
+    Move(c, big_world).execute(delta_x=-18, delta_y=-18)
+    Move(c, big_world).execute(delta_x=-18, delta_y=-18)
+    while big_world.map.get_tile(c.pos_x, c.pos_y).region is None:
+        Move(c, big_world).execute(delta_x=-18, delta_y=-18)
+    assert big_world.get_avatars_in_same_region(a) == [b, c]
+
+    big_world.avatar_manager.handle_death(b.id)
+    assert big_world.get_avatars_in_same_region(a) == [c]
+
+    big_world.avatar_manager.remove_avatar(c.id)
+    assert big_world.get_avatars_in_same_region(a) == []
+
+
+def test_name_lookup_uses_index_and_skips_dead(big_world):
+    first = _spawn(big_world, "张三", 1, 1)
+    _spawn(big_world, "李四", 2, 2)
+
+    assert resolve_query("张三", big_world, expected_types=[Avatar]).obj is first
+
+    big_world.avatar_manager.handle_death(first.id)
+    assert resolve_query("张三", big_world, expected_types=[Avatar]).obj is None
+
+
+def test_index_rebuilds_when_avatar_dict_is_replaced(big_world):
+    a = _spawn(big_world, "A", 1, 1)
+    b = _spawn(big_world, "B", 2, 2)
+    manager = big_world.avatar_manager
+
+    manager.avatars = {str(a.id): a}
+    assert manager.get_observable_avatars(a) == []
+
+    manager.avatars[str(b.id)] = b
+    assert manager.get_observable_avatars(a) == [b]
+
+
+def test_rebuild_picks_up_unreported_position_writes(big_world):
+    a = _spawn(big_world, "A", 1, 1)
+    b = _spawn(big_world, "B", 30, 30)
+
+    b.pos_x, b.pos_y = 2, 2
+    big_world.avatar_manager.rebuild_spatial_index()
+
+    assert big_world.get_observable_avatars(a) == [b]
+
+
+def test_index_cell_boundaries_and_negative_radius():
+    class _Stub:
+        def __init__(self, aid, x, y):
+            self.id, self.name, self.pos_x, self.pos_y, self.tile = aid, f"n{aid}", x, y, None
+
+    index = AvatarSpatialIndex(cell_size=4)
+    stubs = [_Stub(i, x, y) for i, (x, y) in enumerate([(3, 3), (4, 4), (7, 0), (0, 8)])]
+    index.rebuild(stubs)
+
+    assert [s.id for s in index.query_radius(3, 3, 2)] == [0, 1]
+    assert [s.id for s in index.query_radius(3, 3, 7)] == [0, 1, 2]
+    assert index.query_radius(3, 3, -1) == []
+
+    index.remove(1)
+    assert [s.id for s in index.query_radius(4, 4, 0)] == []
+    assert len(index) == 3
@@ -6,7 +6,8 @@ Tests for WebSocket handlers and connection management.
 - ConnectionManager class:
   - connect(): accepts WebSocket, stores in active_connections
   - disconnect(): removes WebSocket, auto-pauses when last client leaves
-  - broadcast(): sends JSON to all connections, handles errors gracefully
+  - broadcast(): encodes once off the event loop (JSON text or opt-in msgpack
+    binary frames), sends to all connections, handles errors gracefully
 
 - WebSocket endpoint /ws:
   - Connection acceptance
@@ -187,10 +188,11 @@ class TestConnectionManager:
         message = {"type": "test", "data": "hello"}
         await fresh_manager.broadcast(message)
 
-        expected_json = json.dumps(message, default=str)
-        ws1.send_text.assert_called_once_with(expected_json)
-        ws2.send_text.assert_called_once_with(expected_json)
-        ws3.send_text.assert_called_once_with(expected_json)
+        for ws in (ws1, ws2, ws3):
+            ws.send_text.assert_called_once()
+            assert json.loads(ws.send_text.call_args.args[0]) == message
+        # 同一条消息只编码一次，所有连接共享同一帧
+        assert ws1.send_text.call_args.args[0] is ws2.send_text.call_args.args[0]
 
     @pytest.mark.asyncio
     async def test_broadcast_handles_errors_gracefully(self, fresh_manager):
@@ -227,6 +229,69 @@ class TestConnectionManager:
         fast.send_text.assert_called_once()
         assert slow not in fresh_manager.active_connections
 
+    @pytest.mark.asyncio
+    async def test_broadcast_encodes_off_the_event_loop(self, fresh_manager):
+        import threading
+        from src.server import ws_codec
+
+        encode_threads = []
+        original = ws_codec.encode_json
+
+        def tracking_encode(message):
+            encode_threads.append(threading.get_ident())
+            return original(message)
+
+        ws = AsyncMock()
+        fresh_manager.active_connections.append(ws)
+        with patch.object(ws_codec, "encode_json", tracking_encode):
+            await fresh_manager.broadcast({"type": "tick", "events": [{"id": i} for i in range(100)]})
+
+        assert encode_threads and threading.get_ident() not in encode_threads
+        assert len(json.loads(ws.send_text.call_args.args[0])["events"]) == 100
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_binary_frames_to_msgpack_clients(self, fresh_manager, monkeypatch):
+        from src.server import ws_codec
+
+        fake_msgpack = MagicMock()
+        fake_msgpack.packb.side_effect = lambda message, **_kwargs: json.dumps(message).encode("utf-8")
+        monkeypatch.setattr(ws_codec, "msgpack", fake_msgpack)
+
+        text_ws = AsyncMock()
+        binary_ws = AsyncMock()
+        await fresh_manager.connect(text_ws)
+        await fresh_manager.connect(binary_ws, frame_format="msgpack")
+        await fresh_manager.broadcast({"type": "tick"})
+
+        text_ws.send_text.assert_called_once()
+        text_ws.send_bytes.assert_not_called()
+        binary_ws.send_bytes.assert_called_once_with(b'{"type": "tick"}')
+        binary_ws.send_text.assert_not_called()
+        fake_msgpack.packb.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_msgpack_request_falls_back_to_json_when_unavailable(self, fresh_manager, monkeypatch):
+        from src.server import ws_codec
+
+        monkeypatch.setattr(ws_codec, "msgpack", None)
+        ws = AsyncMock()
+        await fresh_manager.connect(ws, frame_format="msgpack")
+        await fresh_manager.broadcast({"type": "tick"})
+
+        assert fresh_manager.get_frame_format(ws) == "json"
+        ws.send_text.assert_called_once()
+
+    def test_encode_json_matches_stdlib_semantics(self, monkeypatch):
+        from pathlib import PurePosixPath
+        from src.server import ws_codec
+
+        message = {"type": "tick", "path": PurePosixPath("a/b"), 7: "int-key"}
+        expected = json.loads(json.dumps(message, default=str))
+        assert json.loads(ws_codec.encode_json(message)) == expected
+
+        monkeypatch.setattr(ws_codec, "orjson", None)
+        assert ws_codec.encode_json(message) == json.dumps(message, default=str)
+
     @pytest.mark.asyncio
     async def test_broadcast_empty_connections(self, fresh_manager):
         """Test broadcast() with no connections."""